@@ -1,46 +1,75 @@
 from flask import Flask, render_template, jsonify
-from flask_cors import CORS
-from flask_jwt_extended import JWTManager
 from os import environ
-from dotenv import load_dotenv
-from models import db
-from routes import register_routes
-
-# Cargar variables de entorno
-load_dotenv()
+from config import config  # también carga las variables de entorno (.env)
 
 def create_app(config_name='development'):
     """
     Función de fábrica para crear la aplicación Flask
     
+    Compatible con gunicorn --preload: las extensiones, los modelos y las
+    rutas se importan aquí (una vez en el proceso maestro) y al terminar se
+    cierran las conexiones abiertas durante el arranque.
+    
     Args:
         config_name (str): Nombre de la configuración a utilizar (development, testing, production)
         
     Returns:
         Flask: Aplicación Flask configurada
+        
+    Raises:
+        RuntimeError: Si SCHEMA_ON_STARTUP es 'check' y el esquema no está al día
     """
+    from flask_cors import CORS
+    from flask_jwt_extended import JWTManager
+    from models import db
+    from routes import register_routes
+    from migrations import register_commands, check_schema
+    from utils.database import init_database, release_connections
+    from utils.replica import init_replica
+    from utils.response_cache import init_response_cache
+    from utils.json_provider import init_json_provider
+    from utils.password_hasher import init_password_hasher
+    from utils.profiling import init_profiling
+    from utils.metrics import init_metrics
+    from utils.warmup import warmup
+    
     app = Flask(__name__,
                 static_folder='../frontend/static',
                 template_folder='../frontend/templates')
     
-    # Configuración de la aplicación
-    app.config['SECRET_KEY'] = environ.get('SECRET_KEY', 'mi_clave_secreta_por_defecto')
-    app.config['SQLALCHEMY_DATABASE_URI'] = environ.get('DATABASE_URL', 'sqlite:///project_management.db')
-    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-    app.config['JWT_SECRET_KEY'] = environ.get('JWT_SECRET_KEY', 'jwt_clave_secreta_por_defecto')
-    app.config['JWT_ACCESS_TOKEN_EXPIRES'] = 3600 * 24  # 24 horas
+    # Configuración de la aplicación según el entorno
+    app.config.from_object(config.get(config_name, config['default']))
+    init_json_provider(app)
     
     # Inicialización de extensiones
-    db.init_app(app)
+    init_database(app)
+    init_metrics(app)
+    init_profiling(app)
+    init_password_hasher(app)
+    init_response_cache(app)
     jwt = JWTManager(app)
     CORS(app)
     
     # Registro de rutas
     register_routes(app)
     
-    # Crear tablas en la base de datos
+    # Registro de comandos de migración (flask db-upgrade)
+    register_commands(app)
+    
+    # Esquema: crear las tablas (desarrollo) o solo verificarlas (producción)
+    schema_mode = app.config.get('SCHEMA_ON_STARTUP', 'create')
     with app.app_context():
-        db.create_all()
+        if schema_mode == 'create':
+            # Solo el primario: la réplica se sincroniza aparte (los modelos no usan otros binds)
+            db.create_all(bind_key=None)
+        elif schema_mode == 'check':
+            problems = check_schema(db.engine, db.metadata)
+            if problems:
+                raise RuntimeError('El esquema de la base de datos no está al día '
+                                   f'(ejecute flask db-upgrade): {"; ".join(problems)}')
+    
+    # Enrutamiento de lecturas a la réplica, si está configurada
+    init_replica(app)
     
     # Manejador de errores para JWT
     @jwt.expired_token_loader
@@ -89,6 +118,10 @@ def create_app(config_name='development'):
     def project(project_id):
         return render_template('project.html')
     
+    if app.config.get('WARMUP_ON_STARTUP'):
+        warmup(app)
+    release_connections(app)
+    
     return app
 
 if __name__ == '__main__':
@@ -0,0 +1,11 @@
+"""
+Punto de entrada ASGI de la API de lectura
+
+Ejemplo de despliegue (desde backend/), junto a los workers WSGI que
+atienden las escrituras:
+    gunicorn -k uvicorn.workers.UvicornWorker -w 2 asgi:app
+"""
+from os import environ
+from async_api import create_asgi_app
+
+app = create_asgi_app(environ.get('APP_CONFIG', 'default'))
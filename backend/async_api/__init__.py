@@ -0,0 +1,2 @@
+# API de lectura asíncrona (ASGI); el punto de entrada es backend/asgi.py
+from .app import create_asgi_app
@@ -0,0 +1,63 @@
+import os
+from contextlib import asynccontextmanager
+from flask import Config
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from config import config
+from utils.database import create_async_database_engine
+from utils.json_provider import orjson
+from .auth import decode_options
+from .responses import ApiError, JSONResponse, error_response
+from .routes import routes
+
+def create_asgi_app(config_name='development'):
+    """
+    Función de fábrica de la API de lectura asíncrona (ASGI)
+
+    Sirve las rutas GET de proyectos, tareas, hitos, línea de tiempo y
+    estadísticas con las mismas URLs, respuestas y semántica JWT que la app
+    Flask, pero sobre el motor asyncio de SQLAlchemy: mientras una solicitud
+    espera a la base de datos, el mismo proceso atiende a las demás. Las
+    escrituras siguen en la app WSGI.
+
+    Args:
+        config_name (str): Nombre de la configuración (development, testing, production)
+
+    Returns:
+        Starlette: Aplicación ASGI
+    """
+    settings = Config(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    settings.from_object(config.get(config_name, config['default']))
+
+    backend = settings.get('JSON_BACKEND', 'auto')
+    if backend == 'orjson' and orjson is None:
+        raise RuntimeError('JSON_BACKEND=orjson requiere el paquete orjson')
+    JSONResponse.use_orjson = orjson is not None and backend != 'stdlib'
+
+    engine = create_async_database_engine(
+        settings, settings.get('ASYNC_DATABASE_URI') or settings['SQLALCHEMY_DATABASE_URI']
+    )
+    replica_engine = None
+    if settings.get('SQLALCHEMY_REPLICA_URI'):
+        replica_engine = create_async_database_engine(settings, settings['SQLALCHEMY_REPLICA_URI'])
+
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        await engine.dispose()
+        if replica_engine is not None:
+            await replica_engine.dispose()
+
+    app = Starlette(
+        routes=routes,
+        middleware=[Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])],
+        exception_handlers={ApiError: error_response},
+        lifespan=lifespan
+    )
+    app.state.config = settings
+    app.state.jwt_options = decode_options(settings)
+    app.state.sessions = async_sessionmaker(engine, expire_on_commit=False)
+    app.state.replica_sessions = async_sessionmaker(replica_engine, expire_on_commit=False) if replica_engine else None
+    return app
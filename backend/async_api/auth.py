@@ -0,0 +1,89 @@
+import jwt
+from models import Project
+from .responses import ApiError
+
+# Mismos cuerpos que los manejadores de JWT registrados en create_app
+TOKEN_EXPIRED = {'error': 'El token ha expirado', 'code': 'token_expired'}
+TOKEN_INVALID = {'error': 'Token inválido', 'code': 'invalid_token'}
+TOKEN_MISSING = {'error': 'No se proporcionó token de acceso', 'code': 'authorization_required'}
+
+def decode_options(config):
+    """Parámetros de decodificación equivalentes a los de Flask-JWT-Extended"""
+    algorithms = config.get('JWT_DECODE_ALGORITHMS') or [config.get('JWT_ALGORITHM', 'HS256')]
+    return {
+        'key': config.get('JWT_SECRET_KEY') or config.get('SECRET_KEY'),
+        'algorithms': algorithms,
+        'leeway': config.get('JWT_DECODE_LEEWAY', 0),
+        'audience': config.get('JWT_DECODE_AUDIENCE'),
+        'issuer': config.get('JWT_DECODE_ISSUER')
+    }
+
+def get_identity(request):
+    """
+    Obtiene el usuario del token de acceso de la solicitud
+
+    Reproduce jwt_required() para tokens en el encabezado Authorization:
+    mismos errores (401) para tokens ausentes, vencidos o inválidos.
+
+    Args:
+        request (Request): Solicitud
+
+    Returns:
+        int: ID del usuario (claim 'sub')
+
+    Raises:
+        ApiError: Si el token falta o no es válido
+    """
+    config = request.app.state.config
+    header_name = config.get('JWT_HEADER_NAME', 'Authorization')
+    header_type = config.get('JWT_HEADER_TYPE', 'Bearer')
+
+    header = request.headers.get(header_name)
+    if not header:
+        raise ApiError(401, TOKEN_MISSING)
+    parts = header.split()
+    if header_type:
+        if len(parts) != 2 or parts[0] != header_type:
+            raise ApiError(401, TOKEN_MISSING)
+        token = parts[1]
+    elif len(parts) == 1:
+        token = parts[0]
+    else:
+        raise ApiError(401, TOKEN_MISSING)
+
+    options = request.app.state.jwt_options
+    try:
+        claims = jwt.decode(token, options['key'], algorithms=options['algorithms'],
+                            leeway=options['leeway'], audience=options['audience'],
+                            issuer=options['issuer'])
+    except jwt.ExpiredSignatureError:
+        raise ApiError(401, TOKEN_EXPIRED)
+    except jwt.InvalidTokenError:
+        raise ApiError(401, TOKEN_INVALID)
+
+    # Los tokens de refresco tampoco sirven para estas rutas
+    identity_claim = config.get('JWT_IDENTITY_CLAIM', 'sub')
+    if identity_claim not in claims or claims.get('type', 'access') != 'access':
+        raise ApiError(401, TOKEN_INVALID)
+    return claims[identity_claim]
+
+async def get_project(session, project_id, identity):
+    """
+    Obtiene un proyecto si el usuario tiene acceso (como project_access_required)
+
+    Args:
+        session (AsyncSession): Sesión
+        project_id (int): ID del proyecto
+        identity (int): ID del usuario
+
+    Returns:
+        Project: Proyecto
+
+    Raises:
+        ApiError: 404 si no existe o el usuario no tiene acceso
+    """
+    project = await session.get(Project, project_id)
+    # Los participantes no están vinculados a usuarios: solo el creador tiene acceso
+    if project is None or project.user_id != identity:
+        raise ApiError(404, {'error': 'Proyecto no encontrado'})
+    return project
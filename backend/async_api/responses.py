@@ -0,0 +1,40 @@
+import json
+from starlette.responses import JSONResponse as BaseJSONResponse
+from utils.json_provider import FastJSONProvider, orjson, orjson_options
+
+class ApiError(Exception):
+    """
+    Error que se responde como JSON con el código de estado indicado
+
+    Args:
+        status_code (int): Código HTTP
+        body (dict): Cuerpo de la respuesta
+    """
+
+    def __init__(self, status_code, body):
+        super().__init__(body)
+        self.status_code = status_code
+        self.body = body
+
+def encode_json(content, use_orjson=True):
+    """Codifica a bytes como el proveedor JSON de la app (sin salto de línea final)"""
+    if use_orjson and orjson is not None:
+        return orjson.dumps(content, default=FastJSONProvider.default, option=orjson_options())
+    return json.dumps(content, default=FastJSONProvider.default, sort_keys=True, separators=(',', ':')).encode()
+
+class JSONResponse(BaseJSONResponse):
+    """
+    Respuesta JSON con la misma codificación que la app Flask
+
+    Claves ordenadas, fechas en ISO 8601 y orjson si está instalado, de modo
+    que los cuerpos coinciden con los de la API WSGI.
+    """
+
+    use_orjson = orjson is not None
+
+    def render(self, content):
+        return encode_json(content, self.use_orjson) + b'\n'
+
+def error_response(request, exc):
+    """Manejador de ApiError"""
+    return JSONResponse(exc.body, status_code=exc.status_code)
@@ -0,0 +1,413 @@
+import time
+from email.utils import parsedate_to_datetime
+from functools import wraps
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+from werkzeug.http import http_date
+from models import Project, Task, Milestone, Participant
+from models.milestone import UPCOMING_DAYS
+from services import (ProjectService, SerializationService, TimelineService, VIEW_PERIOD_MONTHS,
+                      TASK_FIELDS, MILESTONE_FIELDS)
+from sqlalchemy import select
+from utils.filters import (parse_int_arg, parse_fields_arg, apply_status_filter, apply_date_range_filter,
+                           apply_upcoming_filter, uses_current_date)
+from utils.http_cache import project_etag, is_dated
+from utils.pagination import get_page_args, keyset_query, keyset_page
+from utils.replica import STICKY_COOKIE
+from .auth import get_identity, get_project
+from .responses import ApiError, JSONResponse, encode_json
+
+TASK_ORDER = [(Task.end_date, False), (Task.id, False)]
+MILESTONE_ORDER = [(Milestone.date, False), (Milestone.id, False)]
+PROJECT_ORDER = [(Project.created_at, True), (Project.id, True)]
+
+def open_session(request):
+    """
+    Abre una sesión de lectura, en la réplica si está configurada
+
+    Igual que la app WSGI, el cliente que escribió hace menos de
+    REPLICA_STICKY_SECONDS (cookie db_primary_until) lee del primario.
+    """
+    state = request.app.state
+    if state.replica_sessions is not None:
+        try:
+            sticky = float(request.cookies.get(STICKY_COOKIE, 0)) > time.time()
+        except ValueError:
+            sticky = False
+        if not sticky:
+            return state.replica_sessions()
+    return state.sessions()
+
+def _not_modified(request, etag, last_modified):
+    """Evalúa If-None-Match / If-Modified-Since como conditional_project_get"""
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match:
+        for value in if_none_match.split(','):
+            value = value.strip()
+            # Comparación fuerte: las etiquetas débiles no coinciden
+            if value == '*' or value == f'"{etag}"':
+                return True
+        return False
+
+    if_modified_since = request.headers.get('if-modified-since')
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since).replace(tzinfo=None)
+        except (TypeError, ValueError):
+            return False
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+def read_route(fn):
+    """
+    Decorador de rutas de lectura: exige el token y abre la sesión
+
+    La ruta recibe (request, session, identity). Los ValueError de los
+    parámetros se responden con 400, como en la app WSGI.
+    """
+    @wraps(fn)
+    async def endpoint(request):
+        identity = get_identity(request)
+        async with open_session(request) as session:
+            try:
+                return await fn(request, session, identity)
+            except ValueError as e:
+                raise ApiError(400, {'error': str(e)})
+    return endpoint
+
+def project_route(conditional=False, dated=False):
+    """
+    Decorador de rutas de un proyecto: exige el token y el acceso al proyecto
+
+    La ruta recibe (request, session, project). Con conditional=True aplica
+    los mismos ETag y Last-Modified que conditional_project_get, así que un
+    ETag obtenido de la app WSGI es válido aquí y viceversa; dated tiene el
+    mismo significado que allí.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        async def endpoint(request):
+            identity = get_identity(request)
+            async with open_session(request) as session:
+                project = await get_project(session, request.path_params['project_id'], identity)
+                if conditional:
+                    path = f'{request.url.path}?{request.url.query}'
+                    if is_dated(dated, request.query_params):
+                        etag = project_etag(project, path, dated=True)
+                        last_modified = None
+                    else:
+                        etag = project_etag(project, path)
+                        last_modified = project.updated_at or project.created_at
+                if conditional and _not_modified(request, etag, last_modified):
+                    response = Response(status_code=304)
+                else:
+                    try:
+                        response = await fn(request, session, project)
+                    except ValueError as e:
+                        raise ApiError(400, {'error': str(e)})
+
+            if not conditional or response.status_code not in (200, 304):
+                return response
+            response.headers['ETag'] = f'"{etag}"'
+            if last_modified:
+                response.headers['Last-Modified'] = http_date(last_modified)
+            # El navegador debe revalidar siempre: los datos son privados del usuario
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return endpoint
+    return decorator
+
+async def _participant_names(session, participant_ids):
+    statement = SerializationService.participant_names_select(participant_ids)
+    if statement is None:
+        return {}
+    return dict((await session.execute(statement)).all())
+
+async def _serialize_tasks(session, rows, fields):
+    assignee_names = None
+    if fields is None or 'assignee_name' in fields:
+        assignee_names = await _participant_names(session, {row.assignee_id for row in rows})
+    return list(SerializationService.task_dicts(rows, fields, assignee_names))
+
+async def _serialize_milestones(session, rows, fields):
+    responsible_names = None
+    if fields is None or 'responsible_name' in fields:
+        responsible_names = await _participant_names(session, {row.responsible_id for row in rows})
+    return list(SerializationService.milestone_dicts(rows, fields, responsible_names))
+
+async def _paginate(request, session, statement, order_by):
+    limit, cursor = get_page_args(request.query_params, request.app.state.config)
+    rows = (await session.execute(keyset_query(statement, order_by, limit, cursor))).all()
+    return keyset_page(rows, order_by, limit)
+
+# Proyectos
+
+@read_route
+async def get_projects(request, session, identity):
+    """Igual que GET /api/projects/ de la app WSGI"""
+    statement = select(Project).where(Project.user_id == identity)
+    statement = apply_date_range_filter(statement, Project.start_date, Project.end_date, request.query_params)
+    limit, cursor = get_page_args(request.query_params, request.app.state.config)
+    projects = (await session.scalars(keyset_query(statement, PROJECT_ORDER, limit, cursor))).all()
+    projects, next_cursor = keyset_page(projects, PROJECT_ORDER, limit)
+    return JSONResponse({
+        'projects': [project.to_dict() for project in projects],
+        'next_cursor': next_cursor
+    })
+
+@project_route(conditional=True)
+async def get_project_detail(request, session, project):
+    """Igual que GET /api/projects/<id> de la app WSGI"""
+    return JSONResponse({'project': project.to_dict()})
+
+@project_route(conditional=True, dated=True)
+async def get_project_statistics(request, session, project):
+    """Igual que GET /api/projects/<id>/statistics de la app WSGI"""
+    task_counts, milestone_counts = ProjectService.statistics_selects(project.id)
+    return JSONResponse({
+        'statistics': ProjectService.build_statistics(
+            (await session.execute(task_counts)).one(),
+            (await session.execute(milestone_counts)).one()
+        )
+    })
+
+@project_route(conditional=True)
+async def get_project_timeline(request, session, project):
+    """Igual que GET /api/projects/<id>/timeline de la app WSGI (mismos parámetros)"""
+    args = request.query_params
+    view = args.get('view', 'quarterly')
+    if view not in VIEW_PERIOD_MONTHS:
+        return JSONResponse({'error': 'Vista inválida. Utilice quarterly, biannual o annual'}, status_code=400)
+    task_fields = parse_fields_arg(TASK_FIELDS, args=args)
+    milestone_fields = parse_fields_arg(MILESTONE_FIELDS, 'milestone_fields', args)
+
+    # Detalle de un período
+    if 'bucket' in args:
+        try:
+            index = int(args['bucket'])
+        except ValueError:
+            index = None
+        selects = None
+        if index is not None:
+            selects = TimelineService.bucket_detail_selects(project, view, index, task_fields, milestone_fields)
+        if selects is None:
+            return JSONResponse({'error': 'Período no encontrado'}, status_code=404)
+        tasks, milestones = [(await session.execute(statement)).all() for statement in selects]
+        return JSONResponse({
+            'project': project.to_dict(),
+            'view': view,
+            'bucket': TimelineService.build_bucket_detail(
+                project, view, index,
+                await _serialize_tasks(session, tasks, task_fields),
+                await _serialize_milestones(session, milestones, milestone_fields)
+            )
+        })
+
+    # Agregados por período
+    if args.get('buckets', '').lower() == 'true':
+        tasks, milestones = [(await session.execute(statement)).all()
+                             for statement in TimelineService.bucket_selects(project)]
+        return JSONResponse({
+            'project': project.to_dict(),
+            'view': view,
+            'buckets': TimelineService.aggregate_buckets(project, view, tasks, milestones)
+        })
+
+    # Respuesta en streaming, con su propia sesión
+    if args.get('format') == 'ndjson':
+        return StreamingResponse(_stream_timeline(request, project.id, project.to_dict(), view,
+                                                  task_fields, milestone_fields),
+                                 media_type='application/x-ndjson')
+
+    tasks = (await session.execute(
+        SerializationService.task_select(task_fields).where(Task.project_id == project.id)
+    )).all()
+    milestones = (await session.execute(
+        SerializationService.milestone_select(milestone_fields).where(Milestone.project_id == project.id)
+    )).all()
+    return JSONResponse({
+        'project': project.to_dict(),
+        'tasks': await _serialize_tasks(session, tasks, task_fields),
+        'milestones': await _serialize_milestones(session, milestones, milestone_fields),
+        'view': view
+    })
+
+async def _stream_timeline(request, project_id, project_data, view, task_fields, milestone_fields):
+    """Genera la línea de tiempo en NDJSON por lotes, como _stream_timeline de la app WSGI"""
+    use_orjson = JSONResponse.use_orjson
+    batch_size = request.app.state.config.get('STREAM_BATCH_SIZE', 500)
+
+    yield encode_json({'type': 'project', 'data': project_data, 'view': view}, use_orjson) + b'\n'
+
+    sections = (
+        ('task', task_fields, 'assignee_name', SerializationService.task_dicts,
+         SerializationService.task_select(task_fields).where(Task.project_id == project_id).order_by(Task.id)),
+        ('milestone', milestone_fields, 'responsible_name', SerializationService.milestone_dicts,
+         SerializationService.milestone_select(milestone_fields).where(
+             Milestone.project_id == project_id
+         ).order_by(Milestone.id))
+    )
+    async with open_session(request) as session:
+        for record_type, fields, name_field, to_dicts, statement in sections:
+            names = None
+            if fields is None or name_field in fields:
+                names = dict((await session.execute(
+                    select(Participant.id, Participant.name).where(Participant.project_id == project_id)
+                )).all())
+
+            result = await session.stream(statement.execution_options(yield_per=batch_size))
+            async for rows in result.partitions():
+                lines = [encode_json({'type': record_type, 'data': record}, use_orjson)
+                         for record in to_dicts(rows, fields, names)]
+                yield b'\n'.join(lines) + b'\n'
+
+# Tareas
+
+@project_route(conditional=True, dated=uses_current_date)
+async def get_tasks(request, session, project):
+    """Igual que GET /api/tasks/<project_id>/tasks de la app WSGI"""
+    args = request.query_params
+    fields = parse_fields_arg(TASK_FIELDS, args=args)
+    statement = SerializationService.task_select(fields, (Task.end_date,)).where(Task.project_id == project.id)
+    statement = apply_status_filter(statement, Task, args)
+    statement = apply_date_range_filter(statement, Task.start_date, Task.end_date, args)
+
+    assignee_id = parse_int_arg('assignee_id', args)
+    if assignee_id is not None:
+        statement = statement.where(Task.assignee_id == assignee_id)
+
+    tasks, next_cursor = await _paginate(request, session, statement, TASK_ORDER)
+    return JSONResponse({
+        'tasks': await _serialize_tasks(session, tasks, fields),
+        'next_cursor': next_cursor
+    })
+
+@project_route()
+async def get_overdue_tasks(request, session, project):
+    """Igual que GET /api/tasks/<project_id>/tasks/overdue de la app WSGI"""
+    fields = parse_fields_arg(TASK_FIELDS, args=request.query_params)
+    statement = SerializationService.task_select(fields, (Task.end_date,)).where(
+        Task.project_id == project.id, Task.is_overdue
+    )
+    tasks, next_cursor = await _paginate(request, session, statement, TASK_ORDER)
+    return JSONResponse({
+        'tasks': await _serialize_tasks(session, tasks, fields),
+        'next_cursor': next_cursor
+    })
+
+@read_route
+async def get_all_overdue_tasks(request, session, identity):
+    """Igual que GET /api/tasks/overdue de la app WSGI"""
+    fields = parse_fields_arg(TASK_FIELDS, args=request.query_params)
+    statement = SerializationService.task_select(fields, (Task.end_date,)).join(
+        Project, Project.id == Task.project_id
+    ).where(Project.user_id == identity, Task.is_overdue)
+    tasks, next_cursor = await _paginate(request, session, statement, TASK_ORDER)
+    return JSONResponse({
+        'tasks': await _serialize_tasks(session, tasks, fields),
+        'next_cursor': next_cursor
+    })
+
+@read_route
+async def get_task(request, session, identity):
+    """Igual que GET /api/tasks/tasks/<id> de la app WSGI"""
+    row = (await session.execute(
+        SerializationService.task_select().where(Task.id == request.path_params['task_id'])
+    )).first()
+    if row is None:
+        return JSONResponse({'error': 'Tarea no encontrada'}, status_code=404)
+
+    project = await session.get(Project, row.project_id)
+    if project is None or project.user_id != identity:
+        return JSONResponse({'error': 'No tienes permiso para ver esta tarea'}, status_code=403)
+
+    tasks = await _serialize_tasks(session, [row], None)
+    return JSONResponse({'task': tasks[0]})
+
+# Hitos
+
+@project_route(conditional=True, dated=uses_current_date)
+async def get_milestones(request, session, project):
+    """Igual que GET /api/milestones/<project_id>/milestones de la app WSGI"""
+    args = request.query_params
+    fields = parse_fields_arg(MILESTONE_FIELDS, args=args)
+    statement = SerializationService.milestone_select(fields, (Milestone.date,)).where(
+        Milestone.project_id == project.id
+    )
+    statement = apply_status_filter(statement, Milestone, args)
+    statement = apply_upcoming_filter(statement, Milestone, args)
+    statement = apply_date_range_filter(statement, Milestone.date, args=args)
+
+    responsible_id = parse_int_arg('responsible_id', args)
+    if responsible_id is not None:
+        statement = statement.where(Milestone.responsible_id == responsible_id)
+
+    milestones, next_cursor = await _paginate(request, session, statement, MILESTONE_ORDER)
+    return JSONResponse({
+        'milestones': await _serialize_milestones(session, milestones, fields),
+        'next_cursor': next_cursor
+    })
+
+async def _upcoming_milestones_response(request, session, statement, fields):
+    """Filtra por la ventana de días, pagina y construye la respuesta"""
+    days = parse_int_arg('days', request.query_params)
+    if days is None:
+        days = UPCOMING_DAYS
+    if days < 0 or days > 366:
+        raise ValueError('El parámetro days debe estar entre 0 y 366')
+
+    statement = statement.where(Milestone.upcoming_within(days))
+    milestones, next_cursor = await _paginate(request, session, statement, MILESTONE_ORDER)
+    return JSONResponse({
+        'milestones': await _serialize_milestones(session, milestones, fields),
+        'next_cursor': next_cursor
+    })
+
+@project_route()
+async def get_upcoming_milestones(request, session, project):
+    """Igual que GET /api/milestones/<project_id>/milestones/upcoming de la app WSGI"""
+    fields = parse_fields_arg(MILESTONE_FIELDS, args=request.query_params)
+    statement = SerializationService.milestone_select(fields, (Milestone.date,)).where(
+        Milestone.project_id == project.id
+    )
+    return await _upcoming_milestones_response(request, session, statement, fields)
+
+@read_route
+async def get_all_upcoming_milestones(request, session, identity):
+    """Igual que GET /api/milestones/upcoming de la app WSGI"""
+    fields = parse_fields_arg(MILESTONE_FIELDS, args=request.query_params)
+    statement = SerializationService.milestone_select(fields, (Milestone.date,)).join(
+        Project, Project.id == Milestone.project_id
+    ).where(Project.user_id == identity)
+    return await _upcoming_milestones_response(request, session, statement, fields)
+
+@read_route
+async def get_milestone(request, session, identity):
+    """Igual que GET /api/milestones/milestones/<id> de la app WSGI"""
+    row = (await session.execute(
+        SerializationService.milestone_select().where(Milestone.id == request.path_params['milestone_id'])
+    )).first()
+    if row is None:
+        return JSONResponse({'error': 'Hito no encontrado'}, status_code=404)
+
+    project = await session.get(Project, row.project_id)
+    if project is None or project.user_id != identity:
+        return JSONResponse({'error': 'No tienes permiso para ver este hito'}, status_code=403)
+
+    milestones = await _serialize_milestones(session, [row], None)
+    return JSONResponse({'milestone': milestones[0]})
+
+routes = [
+    Route('/api/projects/', get_projects, methods=['GET']),
+    Route('/api/projects/{project_id:int}', get_project_detail, methods=['GET']),
+    Route('/api/projects/{project_id:int}/statistics', get_project_statistics, methods=['GET']),
+    Route('/api/projects/{project_id:int}/timeline', get_project_timeline, methods=['GET']),
+    Route('/api/tasks/{project_id:int}/tasks', get_tasks, methods=['GET']),
+    Route('/api/tasks/{project_id:int}/tasks/overdue', get_overdue_tasks, methods=['GET']),
+    Route('/api/tasks/overdue', get_all_overdue_tasks, methods=['GET']),
+    Route('/api/tasks/tasks/{task_id:int}', get_task, methods=['GET']),
+    Route('/api/milestones/{project_id:int}/milestones', get_milestones, methods=['GET']),
+    Route('/api/milestones/{project_id:int}/milestones/upcoming', get_upcoming_milestones, methods=['GET']),
+    Route('/api/milestones/upcoming', get_all_upcoming_milestones, methods=['GET']),
+    Route('/api/milestones/milestones/{milestone_id:int}', get_milestone, methods=['GET'])
+]
@@ -14,6 +14,42 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///project_management.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Pool de conexiones para servidores de bases de datos (MySQL vía pymysql)
+    DB_POOL_SIZE = 5
+    DB_MAX_OVERFLOW = 10
+    DB_POOL_TIMEOUT = 30    # segundos de espera por una conexión libre
+    DB_POOL_RECYCLE = 280   # segundos; menor que el wait_timeout del servidor
+    DB_POOL_PRE_PING = True
+    
+    # Réplica de solo lectura (opcional): las solicitudes GET leen de ella,
+    # salvo durante REPLICA_STICKY_SECONDS tras una escritura del mismo usuario
+    SQLALCHEMY_REPLICA_URI = os.environ.get('DATABASE_REPLICA_URL')
+    REPLICA_STICKY_SECONDS = 5
+    REPLICA_STICKY_USERS = 10000
+    # Solo desarrollo: copiar la base SQLite a la réplica tras cada escritura
+    REPLICA_SQLITE_AUTO_SYNC = os.environ.get('REPLICA_SQLITE_AUTO_SYNC', '').lower() in ('1', 'true')
+    
+    # API de lectura asíncrona (asgi.py): por defecto usa la misma base con
+    # el driver asyncio equivalente (aiosqlite o aiomysql)
+    ASYNC_DATABASE_URI = os.environ.get('ASYNC_DATABASE_URL')
+    
+    # Esquema al iniciar: 'create' (create_all), 'check' (solo verifica que
+    # las tablas existan y no falten migraciones) o 'skip'
+    SCHEMA_ON_STARTUP = os.environ.get('SCHEMA_ON_STARTUP', 'create')
+    
+    # Ejecutar las consultas frecuentes y compilar plantillas antes de
+    # recibir tráfico (ver utils/warmup.py)
+    WARMUP_ON_STARTUP = False
+    
+    # PRAGMAs aplicados a cada conexión SQLite
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',          # lecturas concurrentes con una escritura
+        'synchronous': 'NORMAL',        # seguro con WAL y más rápido que FULL
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64 * 1024,       # en KiB (64 MB)
+        'busy_timeout': 5000            # ms de espera si la base está bloqueada
+    }
+    
     # Configuración JWT
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'jwt_clave_secreta_por_defecto')
     JWT_ACCESS_TOKEN_EXPIRES = 3600 * 24  # 24 horas
@@ -22,6 +58,68 @@ class Config:
     UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'uploads')
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16 MB máximo para subida de archivos
     ALLOWED_EXTENSIONS = {'pdf', 'png', 'jpg', 'jpeg', 'gif', 'doc', 'docx', 'xls', 'xlsx', 'ppt', 'pptx', 'txt', 'zip', 'rar'}
+    
+    # Codificación JSON: 'auto' (orjson si está instalado), 'orjson' o 'stdlib'
+    JSON_BACKEND = os.environ.get('JSON_BACKEND', 'auto')
+    
+    # Configuración de paginación de listados
+    PAGINATION_DEFAULT_LIMIT = 100
+    PAGINATION_MAX_LIMIT = 1000
+    
+    # Filas leídas por lote en las respuestas en streaming
+    STREAM_BATCH_SIZE = 500
+    
+    # Hash de contraseñas: método de werkzeug con sus parámetros de costo.
+    # Los hashes con otros parámetros se regeneran al iniciar sesión.
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:600000'
+    PASSWORD_HASH_SALT_LENGTH = 16
+    PASSWORD_HASH_EXECUTOR = 'thread'  # 'thread', 'process' o 'inline'
+    PASSWORD_HASH_WORKERS = 2
+    PASSWORD_HASH_MAX_PENDING = 32
+    PASSWORD_HASH_TIMEOUT = 10  # segundos
+    
+    # Máximo de elementos por solicitud en las operaciones masivas
+    BULK_MAX_ITEMS = 50000
+    
+    # Importación de archivos CSV/NDJSON: filas por transacción y tamaño
+    # máximo del cuerpo cuando el archivo se envía sin multipart (con
+    # multipart rige MAX_CONTENT_LENGTH)
+    IMPORT_BATCH_SIZE = 1000
+    IMPORT_MAX_CONTENT_LENGTH = 1024 * 1024 * 1024  # 1 GB
+    
+    # Exportación completa de proyectos: nivel de gzip (1-9) cuando el
+    # cliente acepta Content-Encoding gzip
+    EXPORT_GZIP_LEVEL = 6
+    
+    # Caché de respuestas GET por proyecto: 'memory' (LRU del proceso) o una
+    # fábrica 'modulo:funcion' que recibe la configuración y devuelve un
+    # ResponseCacheBackend compartido
+    RESPONSE_CACHE_ENABLED = True
+    RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', 'memory')
+    RESPONSE_CACHE_SIZE = 1024
+    RESPONSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+    
+    # Métricas en formato de Prometheus en /metrics (latencia por endpoint,
+    # pool de conexiones y cachés). Con METRICS_TOKEN se exige ese token; en
+    # producción, sin él, /metrics no se expone.
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() in ('1', 'true')
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+    
+    # Usuarios administradores de la aplicación (IDs separados por comas),
+    # únicos con acceso a las rutas protegidas con admin_required
+    ADMIN_USER_IDS = {int(user_id) for user_id in os.environ.get('ADMIN_USER_IDS', '').split(',') if user_id.strip()}
+    
+    # Perfilado por solicitud (encabezado Server-Timing y /api/debug/profiles,
+    # solo para ADMIN_USER_IDS). Una sentencia ejecutada
+    # PROFILING_N_PLUS_ONE_THRESHOLD veces o más en la misma solicitud se
+    # informa como posible N+1.
+    PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', '').lower() in ('1', 'true')
+    PROFILING_HISTORY = 200
+    PROFILING_N_PLUS_ONE_THRESHOLD = 5
+    
+    # Caché de programaciones por ruta crítica (una por proyecto)
+    SCHEDULE_CACHE_SIZE = 16
+    SCHEDULE_CACHE_TTL = 300  # segundos
 
 class DevelopmentConfig(Config):
     """Configuración para entorno de desarrollo"""
@@ -37,6 +135,10 @@ class TestingConfig(Config):
     
     # Desactivar protección CSRF para pruebas
     WTF_CSRF_ENABLED = False
+    
+    # Hash de bajo costo para que las pruebas sean rápidas
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'
+    PASSWORD_HASH_EXECUTOR = 'inline'
 
 class ProductionConfig(Config):
     """Configuración para entorno de producción"""
@@ -50,11 +152,28 @@ class ProductionConfig(Config):
     # En producción, se debe usar una base de datos más robusta
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL')
     
+    # Pool por proceso: con varios workers de gunicorn el total de
+    # conexiones es workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 20))
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))
+    
+    # Arranque rápido: sin DDL y con el proceso preparado antes del tráfico
+    SCHEMA_ON_STARTUP = os.environ.get('SCHEMA_ON_STARTUP', 'check')
+    WARMUP_ON_STARTUP = True
+    
+    # /metrics solo se expone con METRICS_TOKEN
+    METRICS_ENABLED = Config.METRICS_ENABLED and bool(Config.METRICS_TOKEN)
+    
     # Configuración de seguridad
     SESSION_COOKIE_SECURE = True
     REMEMBER_COOKIE_SECURE = True
     SESSION_COOKIE_HTTPONLY = True
     REMEMBER_COOKIE_HTTPONLY = True
+    
+    # Hash de contraseñas en un pool de procesos, sin competir por el GIL
+    PASSWORD_HASH_EXECUTOR = 'process'
+    PASSWORD_HASH_WORKERS = os.cpu_count() or 2
 
 # Diccionario de configuraciones
 config = {
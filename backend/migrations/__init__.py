@@ -0,0 +1,93 @@
+# Migraciones versionadas del esquema de la base de datos
+from .runner import MIGRATIONS, upgrade, current_version, latest_version, check_schema
+from .explain import check_indexes
+
+def register_commands(app):
+    """
+    Registra los comandos de migración y de importación en la CLI de Flask
+
+    Args:
+        app (Flask): Aplicación Flask
+    """
+    import click
+    from models import db
+
+    @app.cli.command('db-upgrade')
+    @click.option('--target', type=int, default=None, help='Versión final (por defecto la última)')
+    def db_upgrade(target):
+        """Aplica las migraciones pendientes"""
+        applied = upgrade(db.engine, target=target, log=click.echo)
+        if not applied:
+            click.echo('La base de datos ya está actualizada')
+        click.echo(f'Versión actual: {current_version(db.engine)}')
+
+    @app.cli.command('db-version')
+    def db_version():
+        """Muestra la versión actual del esquema"""
+        click.echo(f'Versión actual: {current_version(db.engine)} (última: {latest_version()})')
+
+    @app.cli.command('db-check-schema')
+    def db_check_schema():
+        """Verifica que existan todas las tablas y que no falten migraciones"""
+        problems = check_schema(db.engine, db.metadata)
+        for problem in problems:
+            click.echo(problem)
+        if problems:
+            raise SystemExit(1)
+        click.echo('El esquema está al día')
+
+    @app.cli.command('db-check-indexes')
+    def db_check_indexes():
+        """Verifica con EXPLAIN que las consultas frecuentes usen índices"""
+        results = check_indexes(db.engine)
+        for name, uses_index, plan in results:
+            click.echo(f"{'OK ' if uses_index else 'SIN ÍNDICE'} {name}: {plan}")
+        if not all(uses_index for _, uses_index, _ in results):
+            raise SystemExit(1)
+
+    @app.cli.command('db-sync-replica')
+    def db_sync_replica():
+        """Copia la base SQLite principal sobre la réplica (desarrollo)"""
+        from utils.replica import sync_sqlite_replica
+        try:
+            sync_sqlite_replica()
+        except ValueError as e:
+            raise click.ClickException(str(e))
+        click.echo('Réplica sincronizada')
+
+    @app.cli.command('import-project')
+    @click.argument('project_id', type=int)
+    @click.argument('path', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--format', 'format', type=click.Choice(['csv', 'ndjson']), default=None,
+                  help='Formato del archivo (por defecto según la extensión)')
+    @click.option('--batch-size', type=int, default=None, help='Filas por transacción')
+    def import_project(project_id, path, format, batch_size):
+        """Importa participantes, tareas, subtareas e hitos desde un CSV o NDJSON"""
+        from models import Project
+        from services import ImportService
+
+        project = db.session.get(Project, project_id)
+        if project is None:
+            raise click.ClickException('Proyecto no encontrado')
+        if format is None:
+            format = 'csv' if path.lower().endswith('.csv') else 'ndjson'
+        batch_size = batch_size or app.config.get('IMPORT_BATCH_SIZE', 1000)
+        if batch_size < 1:
+            raise click.ClickException('--batch-size debe ser un número positivo')
+
+        with open(path, 'rb') as stream:
+            try:
+                batches = ImportService.import_batches(project, stream, format, batch_size)
+            except ValueError as e:
+                raise click.ClickException(str(e))
+            for result in batches:
+                click.echo(f"Lote {result['batches']}: {result['rows']} filas leídas, "
+                           f"{sum(result['created'].values())} registros creados, {result['errors']} errores")
+
+        for error in result['error_details']:
+            click.echo(f"Línea {error['line']}: {error['error']}", err=True)
+        if result['errors'] > len(result['error_details']):
+            click.echo(f"... y {result['errors'] - len(result['error_details'])} errores más", err=True)
+        click.echo('Creados: ' + ', '.join(f'{count} {name}' for name, count in result['created'].items()))
+        if result['errors']:
+            raise SystemExit(1)
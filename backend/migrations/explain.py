@@ -0,0 +1,98 @@
+from datetime import date, timedelta
+from sqlalchemy import text
+
+# Consultas frecuentes de la API y los índices que deberían usar.
+# {pending} es la condición "no completado" tal como la compila el dialecto
+# (completed.isnot(True) en los híbridos de los modelos).
+HOT_QUERIES = [
+    ('projects_by_user',
+     'SELECT id FROM projects WHERE user_id = :id ORDER BY created_at DESC, id DESC LIMIT 100',
+     ['ix_projects_user_created_at']),
+    ('participants_by_project',
+     'SELECT id FROM participants WHERE project_id = :id ORDER BY id LIMIT 100',
+     ['ix_participants_project_id']),
+    ('tasks_by_project',
+     'SELECT id FROM tasks WHERE project_id = :id ORDER BY end_date, id LIMIT 100',
+     ['ix_tasks_project_end_date']),
+    ('overdue_tasks',
+     'SELECT id FROM tasks WHERE project_id = :id AND end_date < :today AND completed {pending} '
+     'ORDER BY end_date, id LIMIT 100',
+     ['ix_tasks_project_completed_end_date', 'ix_tasks_project_end_date']),
+    ('overdue_subtasks',
+     'SELECT subtasks.id FROM subtasks JOIN tasks ON tasks.id = subtasks.task_id '
+     'WHERE tasks.project_id = :id AND subtasks.end_date < :today AND subtasks.completed {pending}',
+     ['ix_subtasks_task_end_date']),
+    ('subtasks_by_task',
+     'SELECT id FROM subtasks WHERE task_id = :id ORDER BY end_date, id LIMIT 100',
+     ['ix_subtasks_task_end_date']),
+    ('milestones_by_project',
+     'SELECT id FROM milestones WHERE project_id = :id ORDER BY date, id LIMIT 100',
+     ['ix_milestones_project_date']),
+    ('upcoming_milestones',
+     'SELECT id FROM milestones WHERE project_id = :id AND date >= :today AND date <= :upcoming_end '
+     'AND completed {pending} ORDER BY date, id LIMIT 100',
+     ['ix_milestones_project_date']),
+    ('tasks_by_assignee',
+     'SELECT COUNT(*) FROM tasks WHERE assignee_id = :id',
+     ['ix_tasks_assignee_id']),
+]
+
+def hot_queries(dialect_name):
+    """
+    Obtiene HOT_QUERIES con la sintaxis del dialecto
+
+    Args:
+        dialect_name (str): Nombre del dialecto ('sqlite', 'mysql', ...)
+
+    Returns:
+        list: Tuplas (nombre, consulta, índices esperados)
+    """
+    pending = 'IS NOT 1' if dialect_name == 'sqlite' else 'IS NOT TRUE'
+    return [(name, sql.format(pending=pending), expected) for name, sql, expected in HOT_QUERIES]
+
+def hot_query_params(today=None):
+    """Parámetros de HOT_QUERIES: la ventana de próximos es la de Milestone.is_upcoming"""
+    from models.milestone import UPCOMING_DAYS
+
+    today = today or date.today()
+    return {'id': 1, 'today': today, 'upcoming_end': today + timedelta(days=UPCOMING_DAYS)}
+
+def explain(connection, sql, params):
+    """
+    Obtiene el plan de ejecución de una consulta como texto
+
+    Args:
+        connection (Connection): Conexión a la base de datos
+        sql (str): Consulta
+        params (dict): Parámetros de la consulta
+
+    Returns:
+        str: Plan de ejecución (una línea por paso)
+    """
+    if connection.dialect.name == 'sqlite':
+        rows = connection.execute(text(f'EXPLAIN QUERY PLAN {sql}'), params).all()
+        return '\n'.join(str(row[-1]) for row in rows)
+
+    # MySQL: la columna "key" indica el índice elegido
+    result = connection.execute(text(f'EXPLAIN {sql}'), params)
+    return '\n'.join(f"key={row._mapping.get('key')} type={row._mapping.get('type')}"
+                     for row in result)
+
+def check_indexes(engine):
+    """
+    Verifica que las consultas frecuentes usen los índices esperados
+
+    Args:
+        engine (Engine): Motor de la base de datos
+
+    Returns:
+        list: Tuplas (nombre, usa_indice, plan)
+    """
+    params = hot_query_params()
+    results = []
+    with engine.connect() as connection:
+        for name, sql, expected in hot_queries(connection.dialect.name):
+            plan = explain(connection, sql, params)
+            uses_index = any(index in plan for index in expected)
+            results.append((name, uses_index, plan))
+    return results
@@ -0,0 +1,39 @@
+from sqlalchemy import text
+from .operations import add_column
+
+VERSION = 1
+NAME = 'progress_rollups'
+
+def upgrade(connection):
+    """Agrega los acumulados de progreso de tareas y proyectos y los calcula"""
+    add_column(connection, 'tasks', 'subtasks_progress_sum', 'INTEGER NOT NULL DEFAULT 0')
+    add_column(connection, 'tasks', 'subtasks_count', 'INTEGER NOT NULL DEFAULT 0')
+    add_column(connection, 'projects', 'tasks_progress_sum', 'INTEGER NOT NULL DEFAULT 0')
+    add_column(connection, 'projects', 'tasks_count', 'INTEGER NOT NULL DEFAULT 0')
+
+    # Calcular los acumulados a partir de los datos existentes
+    connection.execute(text("""
+        UPDATE tasks SET
+            subtasks_progress_sum = (SELECT COALESCE(SUM(subtasks.progress), 0)
+                                     FROM subtasks WHERE subtasks.task_id = tasks.id),
+            subtasks_count = (SELECT COUNT(*) FROM subtasks WHERE subtasks.task_id = tasks.id)
+    """))
+    _update_progress(connection, 'tasks', 'subtasks_progress_sum', 'subtasks_count',
+                     "progress = :progress, completed = CASE WHEN :progress >= 100 THEN 1 ELSE completed END")
+
+    connection.execute(text("""
+        UPDATE projects SET
+            tasks_progress_sum = (SELECT COALESCE(SUM(tasks.progress), 0)
+                                  FROM tasks WHERE tasks.project_id = projects.id),
+            tasks_count = (SELECT COUNT(*) FROM tasks WHERE tasks.project_id = projects.id)
+    """))
+    _update_progress(connection, 'projects', 'tasks_progress_sum', 'tasks_count', "progress = :progress")
+
+def _update_progress(connection, table, sum_column, count_column, assignments):
+    """Actualiza el progreso de las filas con hijos como el promedio truncado"""
+    rows = connection.execute(text(
+        f'SELECT id, {sum_column}, {count_column} FROM {table} WHERE {count_column} > 0'
+    )).all()
+    params = [{'id': row[0], 'progress': int(row[1] / row[2])} for row in rows]
+    if params:
+        connection.execute(text(f'UPDATE {table} SET {assignments} WHERE id = :id'), params)
@@ -0,0 +1,21 @@
+from .operations import create_index
+
+VERSION = 2
+NAME = 'indexes'
+
+# Índices para las claves foráneas y fechas de los accesos más frecuentes
+INDEXES = [
+    ('ix_projects_user_created_at', 'projects', ['user_id', 'created_at']),
+    ('ix_participants_project_id', 'participants', ['project_id']),
+    ('ix_tasks_project_end_date', 'tasks', ['project_id', 'end_date']),
+    ('ix_tasks_project_completed_end_date', 'tasks', ['project_id', 'completed', 'end_date']),
+    ('ix_tasks_assignee_id', 'tasks', ['assignee_id']),
+    ('ix_subtasks_task_end_date', 'subtasks', ['task_id', 'end_date']),
+    ('ix_milestones_project_date', 'milestones', ['project_id', 'date']),
+    ('ix_milestones_responsible_id', 'milestones', ['responsible_id']),
+]
+
+def upgrade(connection):
+    """Crea los índices compuestos de las consultas frecuentes"""
+    for name, table, columns in INDEXES:
+        create_index(connection, name, table, columns)
@@ -0,0 +1,11 @@
+from sqlalchemy import text
+from .operations import add_column
+
+VERSION = 3
+NAME = 'project_versions'
+
+def upgrade(connection):
+    """Agrega la versión y la fecha de modificación de los proyectos"""
+    add_column(connection, 'projects', 'version', 'INTEGER NOT NULL DEFAULT 1')
+    if add_column(connection, 'projects', 'updated_at', 'DATETIME NULL'):
+        connection.execute(text('UPDATE projects SET updated_at = created_at'))
@@ -0,0 +1,30 @@
+from sqlalchemy import (Column, DateTime, ForeignKey, Index, Integer, MetaData, Table,
+                        UniqueConstraint)
+from .operations import create_table
+
+VERSION = 4
+NAME = 'task_dependencies'
+
+# Copia de la tabla al momento de esta migración (no depende de los modelos)
+_metadata = MetaData()
+
+task_dependencies = Table(
+    'task_dependencies', _metadata,
+    Column('id', Integer, primary_key=True),
+    Column('project_id', Integer, ForeignKey('projects.id'), nullable=False),
+    Column('predecessor_id', Integer, ForeignKey('tasks.id'), nullable=False),
+    Column('successor_id', Integer, ForeignKey('tasks.id'), nullable=False),
+    Column('lag_days', Integer, nullable=False, default=0),
+    Column('created_at', DateTime),
+    UniqueConstraint('predecessor_id', 'successor_id', name='uq_task_dependencies_pair'),
+    Index('ix_task_dependencies_project_id', 'project_id'),
+    Index('ix_task_dependencies_successor_id', 'successor_id'),
+)
+
+# Las claves foráneas necesitan las tablas referenciadas en el mismo MetaData
+Table('projects', _metadata, Column('id', Integer, primary_key=True))
+Table('tasks', _metadata, Column('id', Integer, primary_key=True))
+
+def upgrade(connection):
+    """Crea la tabla de dependencias entre tareas"""
+    create_table(connection, task_dependencies)
@@ -0,0 +1,64 @@
+from sqlalchemy import inspect, text
+
+# Operaciones de esquema idempotentes: cada migración puede volver a
+# ejecutarse sobre una base creada con db.create_all() sin fallar.
+
+def has_column(connection, table, column):
+    """Verifica si una tabla tiene una columna"""
+    return column in {col['name'] for col in inspect(connection).get_columns(table)}
+
+def has_index(connection, table, name):
+    """Verifica si una tabla tiene un índice con el nombre indicado"""
+    return name in {index['name'] for index in inspect(connection).get_indexes(table)}
+
+def add_column(connection, table, column, ddl):
+    """
+    Agrega una columna si no existe
+
+    Args:
+        connection (Connection): Conexión con transacción abierta
+        table (str): Nombre de la tabla
+        column (str): Nombre de la columna
+        ddl (str): Tipo y restricciones, ej. 'INTEGER NOT NULL DEFAULT 0'
+
+    Returns:
+        bool: True si la columna fue creada
+    """
+    if has_column(connection, table, column):
+        return False
+    connection.execute(text(f'ALTER TABLE {table} ADD COLUMN {column} {ddl}'))
+    return True
+
+def create_index(connection, name, table, columns):
+    """
+    Crea un índice si no existe
+
+    Args:
+        connection (Connection): Conexión con transacción abierta
+        name (str): Nombre del índice
+        table (str): Nombre de la tabla
+        columns (list): Columnas del índice, en orden
+
+    Returns:
+        bool: True si el índice fue creado
+    """
+    if has_index(connection, table, name):
+        return False
+    connection.execute(text(f'CREATE INDEX {name} ON {table} ({", ".join(columns)})'))
+    return True
+
+def create_table(connection, table):
+    """
+    Crea una tabla (con sus índices) si no existe
+
+    Args:
+        connection (Connection): Conexión con transacción abierta
+        table (Table): Definición de la tabla
+
+    Returns:
+        bool: True si la tabla fue creada
+    """
+    if inspect(connection).has_table(table.name):
+        return False
+    table.create(connection)
+    return True
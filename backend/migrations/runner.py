@@ -0,0 +1,109 @@
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, inspect, select
+from . import m0001_progress_rollups, m0002_indexes, m0003_project_versions, m0004_task_dependencies
+
+# Migraciones registradas, en orden de versión
+MIGRATIONS = [
+    m0001_progress_rollups,
+    m0002_indexes,
+    m0003_project_versions,
+    m0004_task_dependencies,
+]
+
+_metadata = MetaData()
+
+schema_migrations = Table(
+    'schema_migrations', _metadata,
+    Column('version', Integer, primary_key=True),
+    Column('name', String(100), nullable=False),
+    Column('applied_at', DateTime, nullable=False)
+)
+
+def latest_version():
+    """Obtiene la versión de la última migración registrada"""
+    return MIGRATIONS[-1].VERSION if MIGRATIONS else 0
+
+def applied_versions(engine):
+    """
+    Obtiene las versiones ya aplicadas en la base de datos
+
+    Args:
+        engine (Engine): Motor de la base de datos
+
+    Returns:
+        set: Versiones aplicadas
+    """
+    schema_migrations.create(engine, checkfirst=True)
+    with engine.connect() as connection:
+        return set(connection.execute(select(schema_migrations.c.version)).scalars())
+
+def check_schema(engine, metadata):
+    """
+    Verifica sin DDL que el esquema esté creado y al día
+
+    Pensado para el arranque en producción en lugar de create_all: solo lee
+    la lista de tablas y la versión registrada.
+
+    Args:
+        engine (Engine): Motor de la base de datos
+        metadata (MetaData): Metadatos de los modelos
+
+    Returns:
+        list: Problemas encontrados (vacía si el esquema está al día)
+    """
+    tables = set(inspect(engine).get_table_names())
+    problems = []
+
+    missing = sorted(set(metadata.tables) - tables)
+    if missing:
+        problems.append(f'Faltan tablas: {", ".join(missing)}')
+
+    version = 0
+    if schema_migrations.name in tables:
+        with engine.connect() as connection:
+            version = connection.execute(select(func.max(schema_migrations.c.version))).scalar() or 0
+    if version < latest_version():
+        problems.append(f'El esquema está en la versión {version} y la última es {latest_version()}')
+
+    return problems
+
+def current_version(engine):
+    """Obtiene la versión más alta aplicada (0 si no hay ninguna)"""
+    return max(applied_versions(engine), default=0)
+
+def upgrade(engine, target=None, log=None):
+    """
+    Aplica las migraciones pendientes hasta la versión indicada
+
+    Cada migración se ejecuta en su propia transacción junto con el registro
+    de su versión. En MySQL el DDL confirma implícitamente, por eso las
+    operaciones de esquema son idempotentes y una migración interrumpida
+    puede volver a ejecutarse.
+
+    Args:
+        engine (Engine): Motor de la base de datos
+        target (int, optional): Versión final (por defecto la última)
+        log (callable, optional): Función para informar el avance
+
+    Returns:
+        list: Versiones aplicadas en esta ejecución
+    """
+    target = latest_version() if target is None else target
+    applied = applied_versions(engine)
+    newly_applied = []
+
+    for migration in MIGRATIONS:
+        if migration.VERSION in applied or migration.VERSION > target:
+            continue
+        if log:
+            log(f'Aplicando migración {migration.VERSION:04d} {migration.NAME}')
+        with engine.begin() as connection:
+            migration.upgrade(connection)
+            connection.execute(schema_migrations.insert().values(
+                version=migration.VERSION,
+                name=migration.NAME,
+                applied_at=datetime.utcnow()
+            ))
+        newly_applied.append(migration.VERSION)
+
+    return newly_applied
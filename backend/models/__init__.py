@@ -1,6 +1,8 @@
 from flask_sqlalchemy import SQLAlchemy
+from .routing_session import RoutingSession
 
-db = SQLAlchemy()
+# Las lecturas pueden ir a una réplica (ver utils/replica.py)
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 # Importar modelos para que estén disponibles desde el módulo
 from .user import User
@@ -8,4 +10,10 @@ from .project import Project
 from .participant import Participant
 from .task import Task
 from .subtask import Subtask
-from .milestone import Milestone
\ No newline at end of file
+from .milestone import Milestone
+from .task_dependency import TaskDependency
+
+# Registrar los eventos que mantienen los acumulados de progreso y las
+# versiones de los proyectos
+from . import progress_rollup
+from . import change_tracking
\ No newline at end of file
@@ -0,0 +1,63 @@
+from datetime import datetime
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from .project import Project
+from .participant import Participant
+from .task import Task
+from .subtask import Subtask
+from .milestone import Milestone
+from .task_dependency import TaskDependency
+
+# Incrementa Project.version y actualiza Project.updated_at cuando se escribe
+# el proyecto o cualquiera de sus tareas, subtareas, hitos, participantes o
+# dependencias entre tareas.
+# El incremento se emite como "version = version + 1" para que sea atómico
+# entre workers concurrentes.
+
+def _project_id(session, obj):
+    """Obtiene el ID del proyecto afectado por un objeto modificado"""
+    if isinstance(obj, Project):
+        return obj.id
+    if isinstance(obj, (Task, Milestone, Participant, TaskDependency)):
+        return obj.project_id
+    if isinstance(obj, Subtask):
+        task = obj.__dict__.get('task')
+        if task is None and obj.task_id is not None:
+            task = session.get(Task, obj.task_id)
+        return task.project_id if task is not None else None
+    return None
+
+def mark_project_changed(project, now=None):
+    """
+    Incrementa la versión de un proyecto en el próximo flush
+
+    Las escrituras masivas con Core no disparan los eventos del ORM, por lo
+    que deben llamar a esta función explícitamente.
+
+    Args:
+        project (Project): Proyecto modificado
+        now (datetime, optional): Fecha de modificación
+    """
+    project.version = Project.version + 1
+    project.updated_at = now or datetime.utcnow()
+
+@event.listens_for(Session, 'before_flush')
+def bump_project_versions(session, flush_context, instances):
+    """Marca como modificados los proyectos afectados por el flush"""
+    deleted_projects = {obj.id for obj in session.deleted if isinstance(obj, Project)}
+    project_ids = set()
+
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Project) and (obj in session.new or obj in session.deleted):
+            continue
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        project_id = _project_id(session, obj)
+        if project_id is not None and project_id not in deleted_projects:
+            project_ids.add(project_id)
+
+    now = datetime.utcnow()
+    for project_id in project_ids:
+        project = session.get(Project, project_id)
+        if project is not None:
+            mark_project_changed(project, now)
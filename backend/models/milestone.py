@@ -1,8 +1,17 @@
 from . import db
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
+from sqlalchemy import and_
+from sqlalchemy.ext.hybrid import hybrid_property
+
+# Días de anticipación para considerar un hito como próximo
+UPCOMING_DAYS = 7
 
 class Milestone(db.Model):
     __tablename__ = 'milestones'
+    __table_args__ = (
+        db.Index('ix_milestones_project_date', 'project_id', 'date'),
+        db.Index('ix_milestones_responsible_id', 'responsible_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False)
@@ -13,27 +22,63 @@ class Milestone(db.Model):
     completed = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
-    def to_dict(self):
+    def to_dict(self, responsible_names=None):
+        """
+        Serializa el hito
+        
+        Args:
+            responsible_names (dict, optional): Nombres de participantes precargados {id: nombre}
+            
+        Returns:
+            dict: Datos del hito
+        """
+        if responsible_names is not None:
+            responsible_name = responsible_names.get(self.responsible_id)
+        else:
+            responsible_name = self.responsible.name if self.responsible else None
+        
         return {
             'id': self.id,
             'project_id': self.project_id,
             'name': self.name,
             'description': self.description,
             'responsible_id': self.responsible_id,
-            'responsible_name': self.responsible.name if self.responsible else None,
+            'responsible_name': responsible_name,
             'date': self.date.isoformat(),
             'completed': self.completed,
             'created_at': self.created_at.isoformat()
         }
     
-    @property
+    @hybrid_property
     def is_upcoming(self):
         """Verifica si el hito está próximo a ocurrir (en los próximos 7 días)"""
         today = date.today()
         days_until = (self.date - today).days
-        return 0 <= days_until <= 7 and not self.completed
+        return 0 <= days_until <= UPCOMING_DAYS and not self.completed
+    
+    @is_upcoming.expression
+    def is_upcoming(cls):
+        return cls.upcoming_within(UPCOMING_DAYS)
     
-    @property
+    @classmethod
+    def upcoming_within(cls, days):
+        """
+        Condición SQL de hitos pendientes en los próximos días
+        
+        Args:
+            days (int): Ventana en días desde hoy
+            
+        Returns:
+            ColumnElement: Condición sobre el rango de fechas
+        """
+        today = date.today()
+        return and_(cls.date >= today, cls.date <= today + timedelta(days=days), cls.completed.isnot(True))
+    
+    @hybrid_property
     def is_overdue(self):
         """Verifica si el hito está vencido"""
-        return date.today() > self.date and not self.completed
\ No newline at end of file
+        return date.today() > self.date and not self.completed
+    
+    @is_overdue.expression
+    def is_overdue(cls):
+        return and_(cls.date < date.today(), cls.completed.isnot(True))
\ No newline at end of file
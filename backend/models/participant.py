@@ -3,6 +3,9 @@ from datetime import datetime
 
 class Participant(db.Model):
     __tablename__ = 'participants'
+    __table_args__ = (
+        db.Index('ix_participants_project_id', 'project_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False)
@@ -15,7 +18,27 @@ class Participant(db.Model):
     tasks = db.relationship('Task', backref='assignee', lazy=True)
     milestones = db.relationship('Milestone', backref='responsible', lazy=True)
     
-    def to_dict(self):
+    def to_dict(self, tasks_counts=None, milestones_counts=None):
+        """
+        Serializa el participante
+        
+        Args:
+            tasks_counts (dict, optional): Cantidad de tareas asignadas precargada {id: cantidad}
+            milestones_counts (dict, optional): Cantidad de hitos a cargo precargada {id: cantidad}
+            
+        Returns:
+            dict: Datos del participante
+        """
+        if tasks_counts is not None:
+            tasks_count = tasks_counts.get(self.id, 0)
+        else:
+            tasks_count = len(self.tasks)
+        
+        if milestones_counts is not None:
+            milestones_count = milestones_counts.get(self.id, 0)
+        else:
+            milestones_count = len(self.milestones)
+        
         return {
             'id': self.id,
             'project_id': self.project_id,
@@ -23,6 +46,6 @@ class Participant(db.Model):
             'email': self.email,
             'role': self.role,
             'created_at': self.created_at.isoformat(),
-            'tasks_count': len(self.tasks),
-            'milestones_count': len(self.milestones)
+            'tasks_count': tasks_count,
+            'milestones_count': milestones_count
         }
\ No newline at end of file
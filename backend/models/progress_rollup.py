@@ -0,0 +1,255 @@
+from sqlalchemy import bindparam, case, event, inspect, select, update
+from sqlalchemy.orm import Session
+from .project import Project
+from .task import Task
+from .subtask import Subtask
+
+# Mantiene los acumulados de progreso (suma y cantidad de hijos) de Task y
+# Project aplicando deltas en cada flush, de modo que actualizar una subtarea
+# o tarea cuesta O(1) y `progress` siempre está al día.
+#
+# El delta se calcula contra el valor confirmado. Task.progress,
+# Task.project_id, Subtask.progress y Subtask.task_id se mapean con
+# active_history=True: si el atributo no está cargado (instancia expirada tras
+# un commit) el valor anterior se lee de la base antes de reemplazarlo, en
+# lugar de quedar sin historial y tomarse como 0.
+#
+# Los deltas se aplican como incrementos en SQL ("suma = suma + :delta") y el
+# progreso del padre se calcula después, con la fila ya bloqueada por ese
+# UPDATE: dos workers que modifican hijos del mismo padre no pierden la
+# actualización del otro. Las escrituras masivas con Core pueden usar las
+# mismas funciones (apply_rollup_deltas y expire_rollups).
+
+TASK_ROLLUP_ATTRS = ['subtasks_progress_sum', 'subtasks_count', 'progress', 'completed']
+PROJECT_ROLLUP_ATTRS = ['tasks_progress_sum', 'tasks_count', 'progress']
+
+def _add_delta(deltas, key, progress_delta, count_delta):
+    if key is None:
+        return
+    entry = deltas.setdefault(key, [0, 0])
+    entry[0] += progress_delta
+    entry[1] += count_delta
+
+def apply_task_deltas(connection, deltas):
+    """
+    Incrementa los acumulados de subtareas de tareas existentes y recalcula su progreso
+
+    Args:
+        connection (Connection): Conexión de la transacción actual
+        deltas (dict): {task_id: (delta de la suma de progreso, delta de la cantidad)}
+
+    Returns:
+        dict: {project_id: delta de la suma de progreso de las tareas del proyecto}
+    """
+    deltas = {task_id: delta for task_id, delta in deltas.items() if delta[0] or delta[1]}
+    if not deltas:
+        return {}
+
+    table = Task.__table__
+    connection.execute(
+        update(table).where(table.c.id == bindparam('task_key')).values(
+            subtasks_progress_sum=table.c.subtasks_progress_sum + bindparam('progress_delta'),
+            subtasks_count=table.c.subtasks_count + bindparam('count_delta')
+        ),
+        [{'task_key': task_id, 'progress_delta': progress_delta, 'count_delta': count_delta}
+         for task_id, (progress_delta, count_delta) in deltas.items()]
+    )
+
+    # Las filas ya están bloqueadas por el UPDATE: los valores leídos son los vigentes
+    rows = connection.execute(
+        select(table.c.id, table.c.project_id, table.c.progress, table.c.completed,
+               table.c.subtasks_progress_sum, table.c.subtasks_count)
+        .where(table.c.id.in_(list(deltas))).with_for_update()
+    ).all()
+
+    # Mismo cálculo que Task.apply_rollup
+    updates = []
+    project_deltas = {}
+    for row in rows:
+        if not row.subtasks_count:
+            continue
+        progress = int(row.subtasks_progress_sum / row.subtasks_count)
+        completed = True if progress >= 100 else row.completed
+        if progress != (row.progress or 0) or completed != row.completed:
+            updates.append({'task_key': row.id, 'new_progress': progress, 'new_completed': completed})
+            _add_delta(project_deltas, row.project_id, progress - (row.progress or 0), 0)
+    if updates:
+        connection.execute(
+            update(table).where(table.c.id == bindparam('task_key')).values(
+                progress=bindparam('new_progress'), completed=bindparam('new_completed')
+            ),
+            updates
+        )
+    return project_deltas
+
+def apply_project_deltas(connection, deltas):
+    """
+    Incrementa los acumulados de tareas de proyectos existentes y recalcula su progreso
+
+    Args:
+        connection (Connection): Conexión de la transacción actual
+        deltas (dict): {project_id: (delta de la suma de progreso, delta de la cantidad)}
+    """
+    deltas = {project_id: delta for project_id, delta in deltas.items() if delta[0] or delta[1]}
+    if not deltas:
+        return
+
+    table = Project.__table__
+    connection.execute(
+        update(table).where(table.c.id == bindparam('project_key')).values(
+            tasks_progress_sum=table.c.tasks_progress_sum + bindparam('progress_delta'),
+            tasks_count=table.c.tasks_count + bindparam('count_delta')
+        ),
+        [{'project_key': project_id, 'progress_delta': progress_delta, 'count_delta': count_delta}
+         for project_id, (progress_delta, count_delta) in deltas.items()]
+    )
+    # Sentencia aparte: en MySQL un SET ve los valores ya asignados por los anteriores.
+    # Mismo cálculo que Project.apply_rollup.
+    connection.execute(
+        update(table).where(table.c.id.in_(list(deltas))).values(
+            progress=case((table.c.tasks_count > 0, table.c.tasks_progress_sum // table.c.tasks_count), else_=0)
+        )
+    )
+
+def apply_rollup_deltas(connection, task_deltas=None, project_deltas=None):
+    """
+    Aplica deltas de subtareas a sus tareas y de tareas a sus proyectos
+
+    Los cambios de progreso de las tareas se propagan a sus proyectos.
+
+    Args:
+        connection (Connection): Conexión de la transacción actual
+        task_deltas (dict, optional): {task_id: (delta de suma, delta de cantidad)}
+        project_deltas (dict, optional): {project_id: (delta de suma, delta de cantidad)}
+    """
+    merged = {project_id: list(delta) for project_id, delta in (project_deltas or {}).items()}
+    for project_id, (progress_delta, _) in apply_task_deltas(connection, task_deltas or {}).items():
+        _add_delta(merged, project_id, progress_delta, 0)
+    apply_project_deltas(connection, merged)
+
+def _values(obj, attr):
+    """
+    Obtiene el valor confirmado y el valor actual de un atributo
+
+    Returns:
+        tuple: (valor_anterior, valor_actual)
+    """
+    history = inspect(obj).attrs[attr].history
+    current = getattr(obj, attr)
+    if not history.has_changes():
+        return current, current
+    previous = history.deleted[0] if history.deleted else None
+    return previous, current
+
+def _parent_key(session, obj, relation, parent_id):
+    """Padre de un objeto: la instancia si aún no se insertó, si no su ID"""
+    parent = obj.__dict__.get(relation)
+    if parent is not None and parent in session.new:
+        return parent
+    return parent.id if parent is not None else parent_id
+
+def _collect(session, objects, model, relation, fk, deleted):
+    """
+    Acumula los deltas de los hijos de un tipo, por padre
+
+    Returns:
+        dict: {padre (ID o instancia pendiente): [delta de suma, delta de cantidad]}
+    """
+    deltas = {}
+
+    for obj in objects['new']:
+        if isinstance(obj, model):
+            parent = _parent_key(session, obj, relation, getattr(obj, fk))
+            _add_delta(deltas, parent, obj.progress or 0, 1)
+
+    for obj in objects['dirty']:
+        if not isinstance(obj, model) or obj in deleted:
+            continue
+        old_progress, new_progress = _values(obj, 'progress')
+        old_parent_id, new_parent_id = _values(obj, fk)
+        if old_parent_id != new_parent_id:
+            # El hijo cambió de padre: se descuenta del anterior y se suma al nuevo
+            _add_delta(deltas, old_parent_id, -(old_progress or 0), -1)
+            _add_delta(deltas, _parent_key(session, obj, relation, new_parent_id), new_progress or 0, 1)
+        elif (old_progress or 0) != (new_progress or 0):
+            parent = _parent_key(session, obj, relation, new_parent_id)
+            _add_delta(deltas, parent, (new_progress or 0) - (old_progress or 0), 0)
+
+    for obj in objects['deleted']:
+        if isinstance(obj, model):
+            old_progress, _ = _values(obj, 'progress')
+            old_parent_id, _ = _values(obj, fk)
+            _add_delta(deltas, old_parent_id, -(old_progress or 0), -1)
+
+    return deltas
+
+def _split(deltas, deleted, sum_attr, count_attr):
+    """
+    Aplica en memoria los deltas de padres pendientes de inserción
+
+    Returns:
+        dict: {ID: [delta de suma, delta de cantidad]} de los padres existentes
+    """
+    deleted_ids = {obj.id for obj in deleted}
+    existing = {}
+    for parent, (progress_delta, count_delta) in deltas.items():
+        if not isinstance(parent, int):
+            setattr(parent, sum_attr, (getattr(parent, sum_attr) or 0) + progress_delta)
+            setattr(parent, count_attr, (getattr(parent, count_attr) or 0) + count_delta)
+            parent.apply_rollup()
+        elif parent not in deleted_ids:
+            existing[parent] = (progress_delta, count_delta)
+    return existing
+
+@event.listens_for(Session, 'before_flush')
+def update_progress_rollups(session, flush_context, instances):
+    """Calcula los deltas de los acumulados de tareas y proyectos"""
+    deleted = set(session.deleted)
+    objects = {
+        'new': list(session.new),
+        'dirty': list(session.dirty),
+        'deleted': list(deleted)
+    }
+
+    # Subtareas -> tareas
+    task_deltas = _split(_collect(session, objects, Subtask, 'task', 'task_id', deleted),
+                         [obj for obj in deleted if isinstance(obj, Task)],
+                         'subtasks_progress_sum', 'subtasks_count')
+
+    # Tareas -> proyectos; los cambios de progreso de las tareas existentes por
+    # sus subtareas se suman después del flush (apply_rollup_deltas)
+    project_deltas = _split(_collect(session, objects, Task, 'project', 'project_id', deleted),
+                            [obj for obj in deleted if isinstance(obj, Project)],
+                            'tasks_progress_sum', 'tasks_count')
+
+    if task_deltas or project_deltas:
+        session.info['progress_rollups'] = (task_deltas, project_deltas)
+    else:
+        session.info.pop('progress_rollups', None)
+
+@event.listens_for(Session, 'after_flush_postexec')
+def apply_progress_rollups(session, flush_context):
+    """Escribe los deltas calculados antes del flush y expira los valores en memoria"""
+    pending = session.info.pop('progress_rollups', None)
+    if pending is None:
+        return
+    task_deltas, project_deltas = pending
+    apply_rollup_deltas(session.connection(), task_deltas, project_deltas)
+
+    # Los objetos cargados se releen con los valores calculados en la base
+    expire_rollups(session, task_deltas)
+
+def expire_rollups(session, task_ids=()):
+    """
+    Expira los acumulados en memoria tras aplicarlos con apply_rollup_deltas
+
+    Args:
+        session (Session): Sesión con los objetos cargados
+        task_ids (iterable, optional): IDs de las tareas actualizadas
+    """
+    task_ids = set(task_ids)
+    for obj in list(session.identity_map.values()):
+        if isinstance(obj, Task) and obj.id in task_ids:
+            session.expire(obj, TASK_ROLLUP_ATTRS)
+        elif isinstance(obj, Project):
+            session.expire(obj, PROJECT_ROLLUP_ATTRS)
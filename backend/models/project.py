@@ -1,8 +1,12 @@
 from . import db
 from datetime import datetime
+from sqlalchemy import func
 
 class Project(db.Model):
     __tablename__ = 'projects'
+    __table_args__ = (
+        db.Index('ix_projects_user_created_at', 'user_id', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -14,6 +18,15 @@ class Project(db.Model):
     budget = db.Column(db.Float, default=0.0)    # Presupuesto total del proyecto
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # Control de cambios: versión incrementada por cada escritura en el
+    # proyecto o sus hijos (models/change_tracking.py), usada para los ETag
+    version = db.Column(db.Integer, default=1, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Acumulados de tareas, mantenidos por models/progress_rollup.py
+    tasks_progress_sum = db.Column(db.Integer, default=0, nullable=False)
+    tasks_count = db.Column(db.Integer, default=0, nullable=False)
+    
     # Relaciones
     participants = db.relationship('Participant', backref='project', lazy=True, cascade='all, delete-orphan')
     tasks = db.relationship('Task', backref='project', lazy=True, cascade='all, delete-orphan')
@@ -32,17 +45,23 @@ class Project(db.Model):
             'created_at': self.created_at.isoformat()
         }
         
+    def apply_rollup(self):
+        """Actualiza el progreso a partir del acumulado de tareas"""
+        if not self.tasks_count:
+            self.progress = 0
+        else:
+            self.progress = int(self.tasks_progress_sum / self.tasks_count)
+        return self.progress
+    
     def update_progress(self):
-        """Calcula el progreso del proyecto basado en las tareas"""
-        if not self.tasks:
-            return 0
-            
-        total_tasks = len(self.tasks)
-        if total_tasks == 0:
-            return 0
-            
-        completed_percentage = sum(task.progress for task in self.tasks) / total_tasks
+        """Recalcula desde cero el acumulado de tareas y el progreso del proyecto"""
+        from .task import Task
+        
+        total, count = db.session.query(
+            func.coalesce(func.sum(Task.progress), 0),
+            func.count(Task.id)
+        ).filter(Task.project_id == self.id).one()
         
-        # Actualizar progreso
-        self.progress = int(completed_percentage)
-        return self.progress
\ No newline at end of file
+        self.tasks_progress_sum = int(total)
+        self.tasks_count = count
+        return self.apply_rollup()
\ No newline at end of file
@@ -0,0 +1,20 @@
+from flask import g, has_request_context
+from flask_sqlalchemy.session import Session
+
+class RoutingSession(Session):
+    """
+    Sesión que envía las lecturas a la réplica cuando la solicitud lo permite
+
+    utils/replica.py marca en g._db_read_replica las solicitudes de solo
+    lectura. Los flush y las sentencias INSERT/UPDATE/DELETE siempre van al
+    primario, igual que todo si no hay un motor 'replica' configurado.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and not self._flushing
+                and not (clause is not None and getattr(clause, 'is_dml', False))
+                and has_request_context() and g.get('_db_read_replica')):
+            replica = self._db.engines.get('replica')
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
@@ -1,16 +1,23 @@
 from . import db
 from datetime import datetime, date
+from sqlalchemy import and_
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import column_property
 
 class Subtask(db.Model):
     __tablename__ = 'subtasks'
+    __table_args__ = (
+        db.Index('ix_subtasks_task_end_date', 'task_id', 'end_date'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    task_id = db.Column(db.Integer, db.ForeignKey('tasks.id'), nullable=False)
+    task_id = column_property(db.Column(db.Integer, db.ForeignKey('tasks.id'), nullable=False), active_history=True)
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text, nullable=True)
     start_date = db.Column(db.Date, nullable=False)
     end_date = db.Column(db.Date, nullable=False)
-    progress = db.Column(db.Integer, default=0)  # Porcentaje de progreso (0-100)
+    # Con active_history para los deltas de models/progress_rollup.py
+    progress = column_property(db.Column(db.Integer, default=0), active_history=True)  # Porcentaje de progreso (0-100)
     budget = db.Column(db.Float, default=0.0)    # Presupuesto asignado
     completed = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -29,7 +36,12 @@ class Subtask(db.Model):
             'created_at': self.created_at.isoformat()
         }
     
-    @property
+    @hybrid_property
     def is_overdue(self):
         """Verifica si la subtarea está vencida"""
-        return date.today() > self.end_date and not self.completed
\ No newline at end of file
+        return date.today() > self.end_date and not self.completed
+    
+    @is_overdue.expression
+    def is_overdue(cls):
+        # Rango sobre end_date para aprovechar ix_subtasks_task_end_date
+        return and_(cls.end_date < date.today(), cls.completed.isnot(True))
\ No newline at end of file
@@ -1,25 +1,56 @@
 from . import db
 from datetime import datetime, date
+from sqlalchemy import and_, func
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import column_property
 
 class Task(db.Model):
     __tablename__ = 'tasks'
+    __table_args__ = (
+        db.Index('ix_tasks_project_end_date', 'project_id', 'end_date'),
+        db.Index('ix_tasks_project_completed_end_date', 'project_id', 'completed', 'end_date'),
+        db.Index('ix_tasks_assignee_id', 'assignee_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False)
+    project_id = column_property(db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False), active_history=True)
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text, nullable=True)
     start_date = db.Column(db.Date, nullable=False)
     end_date = db.Column(db.Date, nullable=False)
-    progress = db.Column(db.Integer, default=0)  # Porcentaje de progreso (0-100)
+    # Con active_history para los deltas de models/progress_rollup.py
+    progress = column_property(db.Column(db.Integer, default=0), active_history=True)  # Porcentaje de progreso (0-100)
     budget = db.Column(db.Float, default=0.0)    # Presupuesto asignado
     assignee_id = db.Column(db.Integer, db.ForeignKey('participants.id'), nullable=True)
     completed = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # Acumulados de subtareas, mantenidos por models/progress_rollup.py
+    subtasks_progress_sum = db.Column(db.Integer, default=0, nullable=False)
+    subtasks_count = db.Column(db.Integer, default=0, nullable=False)
+    
     # Relaciones
     subtasks = db.relationship('Subtask', backref='task', lazy=True, cascade='all, delete-orphan')
+    successor_links = db.relationship('TaskDependency', foreign_keys='TaskDependency.predecessor_id',
+                                      lazy=True, cascade='all, delete-orphan')
+    predecessor_links = db.relationship('TaskDependency', foreign_keys='TaskDependency.successor_id',
+                                        lazy=True, cascade='all, delete-orphan')
     
-    def to_dict(self):
+    def to_dict(self, assignee_names=None):
+        """
+        Serializa la tarea
+        
+        Args:
+            assignee_names (dict, optional): Nombres de participantes precargados {id: nombre}
+            
+        Returns:
+            dict: Datos de la tarea
+        """
+        if assignee_names is not None:
+            assignee_name = assignee_names.get(self.assignee_id)
+        else:
+            assignee_name = self.assignee.name if self.assignee else None
+        
         return {
             'id': self.id,
             'project_id': self.project_id,
@@ -30,33 +61,44 @@ class Task(db.Model):
             'progress': self.progress,
             'budget': self.budget,
             'assignee_id': self.assignee_id,
-            'assignee_name': self.assignee.name if self.assignee else None,
+            'assignee_name': assignee_name,
             'completed': self.completed,
             'created_at': self.created_at.isoformat(),
-            'subtasks_count': len(self.subtasks)
+            'subtasks_count': self.subtasks_count or 0
         }
     
-    @property
+    @hybrid_property
     def is_overdue(self):
         """Verifica si la tarea está vencida"""
         return date.today() > self.end_date and not self.completed
     
-    def update_progress(self):
-        """Actualiza el progreso basado en subtareas"""
-        if not self.subtasks:
-            return self.progress
-            
-        total_subtasks = len(self.subtasks)
-        if total_subtasks == 0:
+    @is_overdue.expression
+    def is_overdue(cls):
+        # Rango sobre end_date para aprovechar ix_tasks_project_end_date
+        return and_(cls.end_date < date.today(), cls.completed.isnot(True))
+    
+    def apply_rollup(self):
+        """Actualiza el progreso a partir del acumulado de subtareas"""
+        if not self.subtasks_count:
             return self.progress
-            
-        completed_percentage = sum(subtask.progress for subtask in self.subtasks) / total_subtasks
         
-        # Actualizar progreso
-        self.progress = int(completed_percentage)
+        self.progress = int(self.subtasks_progress_sum / self.subtasks_count)
         
         # Si el progreso es 100%, marcar como completada
         if self.progress >= 100:
             self.completed = True
         
-        return self.progress
\ No newline at end of file
+        return self.progress
+    
+    def update_progress(self):
+        """Recalcula desde cero el acumulado de subtareas y el progreso"""
+        from .subtask import Subtask
+        
+        total, count = db.session.query(
+            func.coalesce(func.sum(Subtask.progress), 0),
+            func.count(Subtask.id)
+        ).filter(Subtask.task_id == self.id).one()
+        
+        self.subtasks_progress_sum = int(total)
+        self.subtasks_count = count
+        return self.apply_rollup()
\ No newline at end of file
@@ -0,0 +1,28 @@
+from . import db
+from datetime import datetime
+
+class TaskDependency(db.Model):
+    """Dependencia fin-a-inicio entre dos tareas de un mismo proyecto"""
+    __tablename__ = 'task_dependencies'
+    __table_args__ = (
+        db.UniqueConstraint('predecessor_id', 'successor_id', name='uq_task_dependencies_pair'),
+        db.Index('ix_task_dependencies_project_id', 'project_id'),
+        db.Index('ix_task_dependencies_successor_id', 'successor_id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False)
+    predecessor_id = db.Column(db.Integer, db.ForeignKey('tasks.id'), nullable=False)
+    successor_id = db.Column(db.Integer, db.ForeignKey('tasks.id'), nullable=False)
+    lag_days = db.Column(db.Integer, default=0, nullable=False)  # Días de espera tras el fin del predecesor
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'project_id': self.project_id,
+            'predecessor_id': self.predecessor_id,
+            'successor_id': self.successor_id,
+            'lag_days': self.lag_days,
+            'created_at': self.created_at.isoformat()
+        }
@@ -1,5 +1,4 @@
 from . import db
-from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
 
 class User(db.Model):
@@ -15,10 +14,33 @@ class User(db.Model):
     projects = db.relationship('Project', backref='creator', lazy=True)
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        from utils.password_hasher import get_password_hasher
+        self.password_hash = get_password_hasher().hash(password)
         
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        """
+        Verifica la contraseña del usuario
+        
+        Si es correcta y el hash fue generado con parámetros de costo
+        anteriores, lo regenera con los actuales (se guarda al confirmar
+        la sesión).
+        
+        Args:
+            password (str): Contraseña sin encriptar
+            
+        Returns:
+            bool: True si la contraseña es correcta
+        """
+        from utils.password_hasher import get_password_hasher
+        hasher = get_password_hasher()
+        
+        if not hasher.verify(self.password_hash, password):
+            return False
+        
+        if hasher.needs_rehash(self.password_hash):
+            self.password_hash = hasher.hash(password)
+        
+        return True
     
     def to_dict(self):
         return {
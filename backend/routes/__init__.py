@@ -1,3 +1,20 @@
+from importlib import import_module
+
+# (módulo, blueprint, prefijo). Los módulos se importan al registrar, no al
+# importar el paquete: así importar routes no arrastra servicios ni modelos.
+BLUEPRINTS = [
+    ('.auth', 'auth_bp', '/api/auth'),
+    ('.projects', 'projects_bp', '/api/projects'),
+    ('.participants', 'participants_bp', '/api/participants'),
+    ('.tasks', 'tasks_bp', '/api/tasks'),
+    ('.milestones', 'milestones_bp', '/api/milestones'),
+]
+
+# Blueprints que solo se registran si la opción de configuración está activa
+OPTIONAL_BLUEPRINTS = [
+    ('PROFILING_ENABLED', '.debug', 'debug_bp', '/api/debug'),
+]
+
 def register_routes(app):
     """
     Registra todas las rutas de la API en la aplicación Flask
@@ -5,16 +22,7 @@ def register_routes(app):
     Args:
         app (Flask): Aplicación Flask
     """
-    # Importar los blueprints
-    from .auth import auth_bp
-    from .projects import projects_bp
-    from .participants import participants_bp
-    from .tasks import tasks_bp
-    from .milestones import milestones_bp
-    
-    # Registrar los blueprints
-    app.register_blueprint(auth_bp, url_prefix='/api/auth')
-    app.register_blueprint(projects_bp, url_prefix='/api/projects')
-    app.register_blueprint(participants_bp, url_prefix='/api/participants')
-    app.register_blueprint(tasks_bp, url_prefix='/api/tasks')
-    app.register_blueprint(milestones_bp, url_prefix='/api/milestones')
\ No newline at end of file
+    blueprints = BLUEPRINTS + [entry[1:] for entry in OPTIONAL_BLUEPRINTS if app.config.get(entry[0])]
+    for module_name, blueprint_name, url_prefix in blueprints:
+        blueprint = getattr(import_module(module_name, __name__), blueprint_name)
+        app.register_blueprint(blueprint, url_prefix=url_prefix)
@@ -2,6 +2,7 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
 from models import db, User
+from utils.password_hasher import PasswordHasherBusy
 from datetime import datetime
 
 auth_bp = Blueprint('auth', __name__)
@@ -33,7 +34,10 @@ def register():
         name=data['name'],
         email=data['email']
     )
-    user.set_password(data['password'])
+    try:
+        user.set_password(data['password'])
+    except PasswordHasherBusy:
+        return jsonify({'error': 'Servidor ocupado, intente nuevamente', 'code': 'server_busy'}), 503
     
     db.session.add(user)
     db.session.commit()
@@ -68,8 +72,15 @@ def login():
     user = User.query.filter_by(email=data['email']).first()
     
     # Verificar credenciales
-    if not user or not user.check_password(data['password']):
-        return jsonify({'error': 'Credenciales inválidas'}), 401
+    try:
+        if not user or not user.check_password(data['password']):
+            return jsonify({'error': 'Credenciales inválidas'}), 401
+    except PasswordHasherBusy:
+        return jsonify({'error': 'Servidor ocupado, intente nuevamente', 'code': 'server_busy'}), 503
+    
+    # Guardar el hash actualizado si se regeneró con los parámetros actuales
+    if user in db.session.dirty:
+        db.session.commit()
     
     # Generar token
     access_token = create_access_token(identity=user.id)
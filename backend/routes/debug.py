@@ -0,0 +1,24 @@
+# backend/routes/debug.py
+from flask import Blueprint, request, jsonify
+from utils import admin_required, parse_int_arg, get_profiles
+
+debug_bp = Blueprint('debug', __name__)
+
+@debug_bp.route('/profiles', methods=['GET'])
+@admin_required
+def list_profiles():
+    """
+    Obtiene los perfiles de las últimas solicitudes (PROFILING_ENABLED)
+    ---
+    Parámetros de consulta:
+    - limit: cantidad máxima de perfiles (más recientes primero)
+    - n_plus_one: 'true' para ver solo las solicitudes con sentencias repetidas
+    """
+    try:
+        limit = parse_int_arg('limit')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    n_plus_one = request.args.get('n_plus_one', '').lower() in ('1', 'true')
+    profiles = get_profiles(limit, n_plus_one)
+    return jsonify({'profiles': profiles, 'count': len(profiles)}), 200
@@ -2,12 +2,16 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from models import db, Milestone, Project, Participant
+from models.milestone import UPCOMING_DAYS
+from services import SerializationService, MILESTONE_FIELDS
+from utils import project_access_required, conditional_project_get, has_project_access, get_page_args, keyset_paginate, parse_int_arg, parse_fields_arg, apply_status_filter, apply_date_range_filter, apply_upcoming_filter, uses_current_date
 from datetime import datetime
 
 milestones_bp = Blueprint('milestones', __name__)
 
 @milestones_bp.route('/<int:project_id>/milestones', methods=['POST'])
 @jwt_required()
+@project_access_required
 def create_milestone(project_id):
     """
     Crea un nuevo hito en un proyecto
@@ -20,16 +24,13 @@ def create_milestone(project_id):
     }
     """
     data = request.get_json()
-    user_id = get_jwt_identity()
     
     # Validar datos
     if not data or not all(key in data for key in ['name', 'date']):
         return jsonify({'error': 'Datos incompletos'}), 400
     
-    # Verificar si el proyecto existe y pertenece al usuario actual
-    project = Project.query.filter_by(id=project_id, user_id=user_id).first()
-    if not project:
-        return jsonify({'error': 'Proyecto no encontrado'}), 404
+    # El proyecto ya está en la sesión tras verificar el acceso
+    project = db.session.get(Project, project_id)
     
     try:
         # Convertir fecha
@@ -67,21 +68,90 @@ def create_milestone(project_id):
 
 @milestones_bp.route('/<int:project_id>/milestones', methods=['GET'])
 @jwt_required()
+@project_access_required
+@conditional_project_get(dated=uses_current_date)
 def get_milestones(project_id):
     """
-    Obtiene todos los hitos de un proyecto
+    Obtiene los hitos de un proyecto, paginados y ordenados por fecha
+    Parámetros de consulta opcionales:
+    - limit, cursor: paginación por cursor (usar next_cursor de la respuesta anterior)
+    - status: 'pending', 'completed', 'overdue'
+    - upcoming: 'true' para hitos pendientes de los próximos 7 días
+    - date_from, date_to: hitos dentro del rango (YYYY-MM-DD)
+    - responsible_id: ID del participante responsable
+    - fields: campos a devolver separados por comas (p. ej. id,name,date,completed)
     """
-    user_id = get_jwt_identity()
-    
-    # Verificar si el proyecto existe y pertenece al usuario actual
-    project = Project.query.filter_by(id=project_id, user_id=user_id).first()
-    if not project:
-        return jsonify({'error': 'Proyecto no encontrado'}), 404
+    try:
+        limit, cursor = get_page_args()
+        fields = parse_fields_arg(MILESTONE_FIELDS)
+        
+        query = SerializationService.milestone_query(fields, (Milestone.date,)).filter(Milestone.project_id == project_id)
+        query = apply_status_filter(query, Milestone)
+        query = apply_upcoming_filter(query, Milestone)
+        query = apply_date_range_filter(query, Milestone.date)
+        
+        responsible_id = parse_int_arg('responsible_id')
+        if responsible_id is not None:
+            query = query.filter(Milestone.responsible_id == responsible_id)
+        
+        milestones, next_cursor = keyset_paginate(query, [(Milestone.date, False), (Milestone.id, False)], limit, cursor)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    milestones = Milestone.query.filter_by(project_id=project_id).all()
+    return jsonify({
+        'milestones': SerializationService.serialize_milestone_rows(milestones, fields),
+        'next_cursor': next_cursor
+    }), 200
+
+@milestones_bp.route('/<int:project_id>/milestones/upcoming', methods=['GET'])
+@jwt_required()
+@project_access_required
+def get_upcoming_milestones(project_id):
+    """
+    Obtiene los hitos pendientes de los próximos días de un proyecto
+    Parámetros de consulta opcionales:
+    - days: ventana en días desde hoy (por defecto 7)
+    - limit, cursor: paginación por cursor (usar next_cursor de la respuesta anterior)
+    - fields: campos a devolver separados por comas
+    """
+    query = SerializationService.milestone_query().filter(Milestone.project_id == project_id)
+    return _upcoming_milestones_response(query)
+
+@milestones_bp.route('/upcoming', methods=['GET'])
+@jwt_required()
+def get_all_upcoming_milestones():
+    """
+    Obtiene los hitos pendientes de los próximos días de todos los proyectos del usuario actual
+    Parámetros de consulta opcionales:
+    - days: ventana en días desde hoy (por defecto 7)
+    - limit, cursor: paginación por cursor (usar next_cursor de la respuesta anterior)
+    - fields: campos a devolver separados por comas
+    """
+    query = SerializationService.milestone_query().join(Project, Project.id == Milestone.project_id).filter(
+        Project.user_id == get_jwt_identity()
+    )
+    return _upcoming_milestones_response(query)
+
+def _upcoming_milestones_response(query):
+    """Filtra por la ventana de días, pagina y construye la respuesta"""
+    try:
+        days = parse_int_arg('days')
+        if days is None:
+            days = UPCOMING_DAYS
+        if days < 0 or days > 366:
+            raise ValueError('El parámetro days debe estar entre 0 y 366')
+        
+        limit, cursor = get_page_args()
+        fields = parse_fields_arg(MILESTONE_FIELDS)
+        query = query.with_entities(*SerializationService.milestone_columns(fields, (Milestone.date,)))
+        query = query.filter(Milestone.upcoming_within(days))
+        milestones, next_cursor = keyset_paginate(query, [(Milestone.date, False), (Milestone.id, False)], limit, cursor)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     return jsonify({
-        'milestones': [milestone.to_dict() for milestone in milestones]
+        'milestones': SerializationService.serialize_milestone_rows(milestones, fields),
+        'next_cursor': next_cursor
     }), 200
 
 @milestones_bp.route('/milestones/<int:milestone_id>', methods=['GET'])
@@ -90,8 +160,6 @@ def get_milestone(milestone_id):
     """
     Obtiene un hito específico
     """
-    user_id = get_jwt_identity()
-    
     # Obtener hito
     milestone = Milestone.query.get(milestone_id)
     
@@ -99,8 +167,7 @@ def get_milestone(milestone_id):
         return jsonify({'error': 'Hito no encontrado'}), 404
     
     # Verificar permisos
-    project = Project.query.filter_by(id=milestone.project_id, user_id=user_id).first()
-    if not project:
+    if not has_project_access(milestone.project_id):
         return jsonify({'error': 'No tienes permiso para ver este hito'}), 403
     
     return jsonify({
@@ -114,7 +181,6 @@ def update_milestone(milestone_id):
     Actualiza un hito existente
     """
     data = request.get_json()
-    user_id = get_jwt_identity()
     
     # Obtener hito
     milestone = Milestone.query.get(milestone_id)
@@ -123,10 +189,11 @@ def update_milestone(milestone_id):
         return jsonify({'error': 'Hito no encontrado'}), 404
     
     # Verificar permisos
-    project = Project.query.filter_by(id=milestone.project_id, user_id=user_id).first()
-    if not project:
+    if not has_project_access(milestone.project_id):
         return jsonify({'error': 'No tienes permiso para modificar este hito'}), 403
     
+    project = db.session.get(Project, milestone.project_id)
+    
     # Actualizar campos si están presentes
     if 'name' in data:
         milestone.name = data['name']
@@ -166,8 +233,6 @@ def delete_milestone(milestone_id):
     """
     Elimina un hito
     """
-    user_id = get_jwt_identity()
-    
     # Obtener hito
     milestone = Milestone.query.get(milestone_id)
     
@@ -175,8 +240,7 @@ def delete_milestone(milestone_id):
         return jsonify({'error': 'Hito no encontrado'}), 404
     
     # Verificar permisos
-    project = Project.query.filter_by(id=milestone.project_id, user_id=user_id).first()
-    if not project:
+    if not has_project_access(milestone.project_id):
         return jsonify({'error': 'No tienes permiso para eliminar este hito'}), 403
     
     db.session.delete(milestone)
@@ -1,7 +1,8 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from models import db, Participant, Project, User
-from utils import project_access_required, project_admin_required
+from flask_jwt_extended import jwt_required
+from models import db, Participant
+from utils import project_access_required, conditional_project_get, project_admin_required, has_project_access, get_page_args, keyset_paginate
+from services import SerializationService
 
 participants_bp = Blueprint('participants', __name__)
 
@@ -20,17 +21,11 @@ def create_participant(project_id):
     }
     """
     data = request.get_json()
-    user_id = get_jwt_identity()
     
     # Validar datos
     if not data or not all(key in data for key in ['name', 'role']):
         return jsonify({'error': 'Datos incompletos'}), 400
     
-    # Verificar si el proyecto existe
-    project = Project.query.get(project_id)
-    if not project:
-        return jsonify({'error': 'Proyecto no encontrado'}), 404
-    
     # Validar rol
     valid_roles = ['administrator', 'collaborator', 'external']
     if data['role'] not in valid_roles:
@@ -55,14 +50,30 @@ def create_participant(project_id):
 @participants_bp.route('/<int:project_id>/participants', methods=['GET'])
 @jwt_required()
 @project_access_required
+@conditional_project_get
 def get_participants(project_id):
     """
-    Obtiene todos los participantes de un proyecto
+    Obtiene los participantes de un proyecto, paginados por ID
+    Parámetros de consulta opcionales:
+    - limit, cursor: paginación por cursor (usar next_cursor de la respuesta anterior)
+    - role: 'administrator', 'collaborator', 'external'
     """
-    participants = Participant.query.filter_by(project_id=project_id).all()
+    try:
+        limit, cursor = get_page_args()
+        
+        query = Participant.query.filter_by(project_id=project_id)
+        
+        role = request.args.get('role')
+        if role:
+            query = query.filter(Participant.role == role)
+        
+        participants, next_cursor = keyset_paginate(query, [(Participant.id, False)], limit, cursor)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     return jsonify({
-        'participants': [participant.to_dict() for participant in participants]
+        'participants': SerializationService.serialize_participants(participants),
+        'next_cursor': next_cursor
     }), 200
 
 @participants_bp.route('/participants/<int:participant_id>', methods=['GET'])
@@ -71,8 +82,6 @@ def get_participant(participant_id):
     """
     Obtiene un participante específico
     """
-    user_id = get_jwt_identity()
-    
     # Obtener participante
     participant = Participant.query.get(participant_id)
     
@@ -80,10 +89,7 @@ def get_participant(participant_id):
         return jsonify({'error': 'Participante no encontrado'}), 404
     
     # Verificar permisos
-    project = Project.query.get(participant.project_id)
-    if not project or (project.user_id != user_id and not Participant.query.filter_by(
-            project_id=participant.project_id,
-            user_id=user_id).first()):
+    if not has_project_access(participant.project_id):
         return jsonify({'error': 'No tienes permiso para ver este participante'}), 403
     
     return jsonify({
@@ -97,7 +103,6 @@ def update_participant(participant_id):
     Actualiza un participante existente
     """
     data = request.get_json()
-    user_id = get_jwt_identity()
     
     # Obtener participante
     participant = Participant.query.get(participant_id)
@@ -106,11 +111,7 @@ def update_participant(participant_id):
         return jsonify({'error': 'Participante no encontrado'}), 404
     
     # Verificar permisos
-    project = Project.query.get(participant.project_id)
-    if not project or (project.user_id != user_id and not Participant.query.filter_by(
-            project_id=participant.project_id,
-            user_id=user_id,
-            role='administrator').first()):
+    if not has_project_access(participant.project_id, roles=('owner',)):
         return jsonify({'error': 'No tienes permiso para modificar este participante'}), 403
     
     # Actualizar campos si están presentes
@@ -139,8 +140,6 @@ def delete_participant(participant_id):
     """
     Elimina un participante
     """
-    user_id = get_jwt_identity()
-    
     # Obtener participante
     participant = Participant.query.get(participant_id)
     
@@ -148,11 +147,7 @@ def delete_participant(participant_id):
         return jsonify({'error': 'Participante no encontrado'}), 404
     
     # Verificar permisos
-    project = Project.query.get(participant.project_id)
-    if not project or (project.user_id != user_id and not Participant.query.filter_by(
-            project_id=participant.project_id,
-            user_id=user_id,
-            role='administrator').first()):
+    if not has_project_access(participant.project_id, roles=('owner',)):
         return jsonify({'error': 'No tienes permiso para eliminar este participante'}), 403
     
     db.session.delete(participant)
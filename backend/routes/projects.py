@@ -1,7 +1,10 @@
 # backend/routes/projects.py
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from werkzeug.wsgi import get_input_stream
 from models import db, Project, User
+from services import ProjectService, SerializationService, TimelineService, ImportService, ExportService, VIEW_PERIOD_MONTHS, TASK_FIELDS, MILESTONE_FIELDS
+from utils import project_access_required, conditional_project_get, get_page_args, keyset_paginate, parse_fields_arg, apply_date_range_filter
 from datetime import datetime
 
 projects_bp = Blueprint('projects', __name__)
@@ -56,31 +59,54 @@ def create_project():
 @jwt_required()
 def get_projects():
     """
-    Obtiene todos los proyectos del usuario actual
+    Obtiene los proyectos del usuario actual, del más reciente al más antiguo
+    Parámetros de consulta opcionales:
+    - limit, cursor: paginación por cursor (usar next_cursor de la respuesta anterior)
+    - date_from, date_to: proyectos que se cruzan con el rango (YYYY-MM-DD)
     """
     user_id = get_jwt_identity()
-    projects = Project.query.filter_by(user_id=user_id).all()
+    
+    try:
+        limit, cursor = get_page_args()
+        
+        query = Project.query.filter_by(user_id=user_id)
+        query = apply_date_range_filter(query, Project.start_date, Project.end_date)
+        
+        projects, next_cursor = keyset_paginate(query, [(Project.created_at, True), (Project.id, True)], limit, cursor)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     return jsonify({
-        'projects': [project.to_dict() for project in projects]
+        'projects': [project.to_dict() for project in projects],
+        'next_cursor': next_cursor
     }), 200
 
 @projects_bp.route('/<int:project_id>', methods=['GET'])
 @jwt_required()
+@project_access_required
+@conditional_project_get
 def get_project(project_id):
     """
     Obtiene un proyecto específico
     """
-    user_id = get_jwt_identity()
-    project = Project.query.filter_by(id=project_id, user_id=user_id).first()
-    
-    if not project:
-        return jsonify({'error': 'Proyecto no encontrado'}), 404
+    project = db.session.get(Project, project_id)
     
     return jsonify({
         'project': project.to_dict()
     }), 200
 
+@projects_bp.route('/<int:project_id>/statistics', methods=['GET'])
+@jwt_required()
+@project_access_required
+@conditional_project_get(dated=True)
+def get_project_statistics(project_id):
+    """
+    Obtiene las estadísticas de un proyecto (tareas, hitos y participantes)
+    """
+    return jsonify({
+        'statistics': ProjectService.get_project_statistics(project_id)
+    }), 200
+
 @projects_bp.route('/<int:project_id>', methods=['PUT'])
 @jwt_required()
 def update_project(project_id):
@@ -143,37 +169,233 @@ def delete_project(project_id):
 
 @projects_bp.route('/<int:project_id>/timeline', methods=['GET'])
 @jwt_required()
+@project_access_required
+@conditional_project_get
 def get_project_timeline(project_id):
     """
     Obtiene datos para el gráfico de línea de tiempo del proyecto
     Parámetros de consulta opcionales:
     - view: 'quarterly', 'biannual', 'annual' (por defecto 'quarterly')
+    - format: 'ndjson' para recibir la respuesta en streaming, un registro
+      JSON por línea ({"type": "project"|"task"|"milestone", "data": {...}})
+    - buckets: 'true' para recibir agregados por período de la vista en
+      lugar de todas las tareas e hitos
+    - bucket: índice de un período para recibir solo sus tareas e hitos
+    - fields: campos de las tareas a devolver separados por comas
+      (p. ej. id,name,start_date,end_date,progress)
+    - milestone_fields: campos de los hitos a devolver separados por comas
     """
     from models import Task, Milestone
     
-    user_id = get_jwt_identity()
-    project = Project.query.filter_by(id=project_id, user_id=user_id).first()
-    
-    if not project:
-        return jsonify({'error': 'Proyecto no encontrado'}), 404
+    project = db.session.get(Project, project_id)
     
     # Obtener el tipo de vista solicitada
     view = request.args.get('view', 'quarterly')
+    if view not in VIEW_PERIOD_MONTHS:
+        return jsonify({'error': 'Vista inválida. Utilice quarterly, biannual o annual'}), 400
+    
+    try:
+        task_fields = parse_fields_arg(TASK_FIELDS)
+        milestone_fields = parse_fields_arg(MILESTONE_FIELDS, 'milestone_fields')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # Detalle de un período
+    if 'bucket' in request.args:
+        index = request.args.get('bucket', type=int)
+        detail = TimelineService.bucket_detail(project, view, index, task_fields, milestone_fields) if index is not None else None
+        if detail is None:
+            return jsonify({'error': 'Período no encontrado'}), 404
+        return jsonify({
+            'project': project.to_dict(),
+            'view': view,
+            'bucket': detail
+        }), 200
+    
+    # Agregados por período
+    if request.args.get('buckets', '').lower() == 'true':
+        return jsonify({
+            'project': project.to_dict(),
+            'view': view,
+            'buckets': TimelineService.bucket_project(project, view)
+        }), 200
+    
+    # Respuesta en streaming: memoria acotada y primer byte inmediato
+    if request.args.get('format') == 'ndjson':
+        return Response(stream_with_context(_stream_timeline(project, view, task_fields, milestone_fields)),
+                        mimetype='application/x-ndjson')
     
     # Obtener tareas y hitos del proyecto
-    tasks = Task.query.filter_by(project_id=project_id).all()
-    milestones = Milestone.query.filter_by(project_id=project_id).all()
+    tasks = SerializationService.task_query(task_fields).filter(Task.project_id == project_id).all()
+    milestones = SerializationService.milestone_query(milestone_fields).filter(Milestone.project_id == project_id).all()
     
     # Datos para la línea de tiempo
     timeline_data = {
         'project': project.to_dict(),
-        'tasks': [task.to_dict() for task in tasks],
-        'milestones': [milestone.to_dict() for milestone in milestones],
+        'tasks': SerializationService.serialize_task_rows(tasks, task_fields),
+        'milestones': SerializationService.serialize_milestone_rows(milestones, milestone_fields),
         'view': view
     }
     
     return jsonify(timeline_data), 200
 
+def _stream_timeline(project, view, task_fields=None, milestone_fields=None):
+    """
+    Genera la línea de tiempo en formato NDJSON por bloques
+    
+    Args:
+        project (Project): Proyecto
+        view (str): Tipo de vista solicitada
+        task_fields (list, optional): Campos de las tareas a devolver
+        milestone_fields (list, optional): Campos de los hitos a devolver
+        
+    Yields:
+        str: Bloques de líneas JSON
+    """
+    dumps = current_app.json.dumps
+    batch_size = current_app.config.get('STREAM_BATCH_SIZE', 500)
+    
+    yield dumps({'type': 'project', 'data': project.to_dict(), 'view': view}) + '\n'
+    
+    sections = (
+        ('task', SerializationService.iter_tasks(project.id, batch_size, task_fields)),
+        ('milestone', SerializationService.iter_milestones(project.id, batch_size, milestone_fields))
+    )
+    for record_type, records in sections:
+        lines = []
+        for record in records:
+            lines.append(dumps({'type': record_type, 'data': record}))
+            if len(lines) >= batch_size:
+                yield '\n'.join(lines) + '\n'
+                lines = []
+        if lines:
+            yield '\n'.join(lines) + '\n'
+
+@projects_bp.route('/<int:project_id>/import', methods=['POST'])
+@jwt_required()
+@project_access_required
+def import_project_data(project_id):
+    """
+    Importa participantes, tareas, subtareas e hitos desde un archivo CSV o NDJSON
+
+    El archivo se lee en streaming y se escribe por lotes de IMPORT_BATCH_SIZE
+    filas, cada uno en su propia transacción. Puede enviarse como cuerpo de la
+    solicitud (hasta IMPORT_MAX_CONTENT_LENGTH) o como campo "file" de un
+    formulario multipart.
+    Parámetros de consulta:
+    - format: 'csv' o 'ndjson' (por defecto según la extensión o el tipo de contenido)
+    - batch_size: filas por transacción (entre 1 e IMPORT_BATCH_SIZE)
+    - progress: 'true' para recibir en NDJSON el avance tras cada lote
+      ({"type": "progress"|"result", "data": {...}})
+    ---
+    Ejemplo de archivo CSV:
+    type,ref,name,email,role,start_date,end_date,date,assignee,task,progress
+    participant,ana,Ana,ana@example.com,collaborator,,,,,,
+    task,t1,Diseño,,,2023-01-01,2023-02-01,,ana,,
+    subtask,,Bocetos,,,2023-01-02,2023-01-10,,,t1,50
+    milestone,,Entrega,,,,,2023-02-01,,,
+    """
+    project = db.session.get(Project, project_id)
+    
+    if request.mimetype == 'multipart/form-data':
+        upload = request.files.get('file')
+        if upload is None:
+            return jsonify({'error': 'Se requiere el archivo en el campo "file"'}), 400
+        stream, filename, mimetype = upload.stream, upload.filename or '', upload.mimetype
+    else:
+        # Sin pasar por request.stream, que aplica MAX_CONTENT_LENGTH
+        stream = get_input_stream(request.environ,
+                                  max_content_length=current_app.config.get('IMPORT_MAX_CONTENT_LENGTH'))
+        filename, mimetype = '', request.mimetype
+    
+    format = request.args.get('format')
+    if format is None:
+        if filename.lower().endswith('.csv') or mimetype == 'text/csv':
+            format = 'csv'
+        elif filename.lower().endswith(('.ndjson', '.jsonl')) or mimetype in ('application/x-ndjson', 'application/jsonl'):
+            format = 'ndjson'
+    # Un lote mayor que IMPORT_BATCH_SIZE retendría más memoria y bloqueos
+    max_batch_size = current_app.config.get('IMPORT_BATCH_SIZE', 1000)
+    batch_size = request.args.get('batch_size', max_batch_size, type=int)
+    batch_size = max(1, min(batch_size, max_batch_size))
+    
+    try:
+        batches = ImportService.import_batches(project, stream, format, batch_size)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    if request.args.get('progress', '').lower() == 'true':
+        return Response(stream_with_context(_stream_import(project_id, batches)),
+                        mimetype='application/x-ndjson')
+    
+    result = None
+    for result in batches:
+        _log_import_progress(project_id, result)
+    
+    created = sum(result['created'].values())
+    if result['errors'] == 0:
+        status_code = 201
+    elif created == 0:
+        status_code = 400
+    else:
+        status_code = 207
+    return jsonify(result), status_code
+
+def _log_import_progress(project_id, result):
+    current_app.logger.info(
+        'Importación en el proyecto %s: lote %s, %s filas leídas, %s creadas, %s errores',
+        project_id, result['batches'], result['rows'], sum(result['created'].values()), result['errors'])
+
+def _stream_import(project_id, batches):
+    """
+    Genera el avance de una importación en formato NDJSON
+    
+    Yields:
+        str: Una línea por lote confirmado y una final con el resultado
+    """
+    dumps = current_app.json.dumps
+    result = None
+    for result in batches:
+        _log_import_progress(project_id, result)
+        # El detalle de los errores solo se envía en la línea final
+        progress = {key: value for key, value in result.items() if key != 'error_details'}
+        yield dumps({'type': 'progress', 'data': progress}) + '\n'
+    yield dumps({'type': 'result', 'data': result}) + '\n'
+
+@projects_bp.route('/<int:project_id>/export', methods=['GET'])
+@jwt_required()
+@project_access_required
+def export_project(project_id):
+    """
+    Exporta el proyecto completo (participantes, tareas, subtareas e hitos)
+    
+    La respuesta se genera en streaming leyendo con cursores del servidor, y
+    se comprime en gzip a medida que se genera si el cliente lo acepta
+    (Accept-Encoding). El archivo se puede importar en otro proyecto con
+    POST /api/projects/<id>/import.
+    Parámetros de consulta:
+    - format: 'ndjson' (por defecto) o 'csv'
+    """
+    project = db.session.get(Project, project_id)
+    format = request.args.get('format', 'ndjson')
+    batch_size = current_app.config.get('STREAM_BATCH_SIZE', 500)
+    
+    try:
+        chunks = ExportService.iter_chunks(project, format, batch_size)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    headers = {
+        'Content-Disposition': f'attachment; filename=proyecto-{project_id}.{format}',
+        'Vary': 'Accept-Encoding'
+    }
+    if 'gzip' in request.accept_encodings:
+        chunks = ExportService.gzip_chunks(chunks, current_app.config.get('EXPORT_GZIP_LEVEL', 6))
+        headers['Content-Encoding'] = 'gzip'
+    
+    mimetype = 'text/csv' if format == 'csv' else 'application/x-ndjson'
+    return Response(stream_with_context(chunks), mimetype=mimetype, headers=headers)
+
 # backend/routes/participants.py
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
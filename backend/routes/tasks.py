@@ -1,13 +1,16 @@
 # backend/routes/tasks.py
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from models import db, Task, Subtask, Project, Participant
+from models import db, Task, Subtask, Project, Participant, TaskDependency
+from services import SerializationService, BulkService, ScheduleService, ScheduleCycleError, TASK_FIELDS
+from utils import project_access_required, conditional_project_get, has_project_access, get_page_args, keyset_paginate, parse_int_arg, parse_fields_arg, apply_status_filter, apply_date_range_filter, uses_current_date
 from datetime import datetime
 
 tasks_bp = Blueprint('tasks', __name__)
 
 @tasks_bp.route('/<int:project_id>/tasks', methods=['POST'])
 @jwt_required()
+@project_access_required
 def create_task(project_id):
     """
     Crea una nueva tarea en un proyecto
@@ -22,16 +25,13 @@ def create_task(project_id):
     }
     """
     data = request.get_json()
-    user_id = get_jwt_identity()
     
     # Validar datos
     if not data or not all(key in data for key in ['name', 'start_date', 'end_date']):
         return jsonify({'error': 'Datos incompletos'}), 400
     
-    # Verificar si el proyecto existe y pertenece al usuario actual
-    project = Project.query.filter_by(id=project_id, user_id=user_id).first()
-    if not project:
-        return jsonify({'error': 'Proyecto no encontrado'}), 404
+    # El proyecto ya está en la sesión tras verificar el acceso
+    project = db.session.get(Project, project_id)
     
     try:
         # Convertir fechas
@@ -77,21 +77,357 @@ def create_task(project_id):
 
 @tasks_bp.route('/<int:project_id>/tasks', methods=['GET'])
 @jwt_required()
+@project_access_required
+@conditional_project_get(dated=uses_current_date)
 def get_tasks(project_id):
     """
-    Obtiene todas las tareas de un proyecto
+    Obtiene las tareas de un proyecto, paginadas y ordenadas por fecha de término
+    Parámetros de consulta opcionales:
+    - limit, cursor: paginación por cursor (usar next_cursor de la respuesta anterior)
+    - status: 'pending', 'completed', 'overdue'
+    - date_from, date_to: tareas que se cruzan con el rango (YYYY-MM-DD)
+    - assignee_id: ID del participante asignado
+    - fields: campos a devolver separados por comas (p. ej. id,name,end_date,progress)
     """
-    user_id = get_jwt_identity()
+    try:
+        limit, cursor = get_page_args()
+        fields = parse_fields_arg(TASK_FIELDS)
+        
+        query = SerializationService.task_query(fields, (Task.end_date,)).filter(Task.project_id == project_id)
+        query = apply_status_filter(query, Task)
+        query = apply_date_range_filter(query, Task.start_date, Task.end_date)
+        
+        assignee_id = parse_int_arg('assignee_id')
+        if assignee_id is not None:
+            query = query.filter(Task.assignee_id == assignee_id)
+        
+        tasks, next_cursor = keyset_paginate(query, [(Task.end_date, False), (Task.id, False)], limit, cursor)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({
+        'tasks': SerializationService.serialize_task_rows(tasks, fields),
+        'next_cursor': next_cursor
+    }), 200
+
+@tasks_bp.route('/<int:project_id>/tasks/overdue', methods=['GET'])
+@jwt_required()
+@project_access_required
+def get_overdue_tasks(project_id):
+    """
+    Obtiene las tareas vencidas de un proyecto, ordenadas por fecha de término
+    Parámetros de consulta opcionales:
+    - limit, cursor: paginación por cursor (usar next_cursor de la respuesta anterior)
+    - fields: campos a devolver separados por comas
+    """
+    query = SerializationService.task_query().filter(Task.project_id == project_id, Task.is_overdue)
+    return _overdue_tasks_response(query)
+
+@tasks_bp.route('/overdue', methods=['GET'])
+@jwt_required()
+def get_all_overdue_tasks():
+    """
+    Obtiene las tareas vencidas de todos los proyectos del usuario actual
+    Parámetros de consulta opcionales:
+    - limit, cursor: paginación por cursor (usar next_cursor de la respuesta anterior)
+    - fields: campos a devolver separados por comas
+    """
+    query = SerializationService.task_query().join(Project, Project.id == Task.project_id).filter(
+        Project.user_id == get_jwt_identity(),
+        Task.is_overdue
+    )
+    return _overdue_tasks_response(query)
+
+@tasks_bp.route('/<int:project_id>/subtasks/overdue', methods=['GET'])
+@jwt_required()
+@project_access_required
+def get_overdue_subtasks(project_id):
+    """
+    Obtiene las subtareas vencidas de un proyecto, ordenadas por fecha de término
+    Parámetros de consulta opcionales:
+    - limit, cursor: paginación por cursor (usar next_cursor de la respuesta anterior)
+    """
+    query = Subtask.query.join(Task, Task.id == Subtask.task_id).filter(
+        Task.project_id == project_id,
+        Subtask.is_overdue
+    )
+    return _overdue_subtasks_response(query)
+
+@tasks_bp.route('/subtasks/overdue', methods=['GET'])
+@jwt_required()
+def get_all_overdue_subtasks():
+    """
+    Obtiene las subtareas vencidas de todos los proyectos del usuario actual
+    Parámetros de consulta opcionales:
+    - limit, cursor: paginación por cursor (usar next_cursor de la respuesta anterior)
+    """
+    query = Subtask.query.join(Task, Task.id == Subtask.task_id).join(
+        Project, Project.id == Task.project_id
+    ).filter(
+        Project.user_id == get_jwt_identity(),
+        Subtask.is_overdue
+    )
+    return _overdue_subtasks_response(query)
+
+def _overdue_tasks_response(query):
+    """Pagina una consulta de tareas vencidas y construye la respuesta"""
+    try:
+        limit, cursor = get_page_args()
+        fields = parse_fields_arg(TASK_FIELDS)
+        query = query.with_entities(*SerializationService.task_columns(fields, (Task.end_date,)))
+        tasks, next_cursor = keyset_paginate(query, [(Task.end_date, False), (Task.id, False)], limit, cursor)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({
+        'tasks': SerializationService.serialize_task_rows(tasks, fields),
+        'next_cursor': next_cursor
+    }), 200
+
+def _overdue_subtasks_response(query):
+    """Pagina una consulta de subtareas vencidas y construye la respuesta"""
+    try:
+        limit, cursor = get_page_args()
+        subtasks, next_cursor = keyset_paginate(query, [(Subtask.end_date, False), (Subtask.id, False)], limit, cursor)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({
+        'subtasks': [subtask.to_dict() for subtask in subtasks],
+        'next_cursor': next_cursor
+    }), 200
+
+@tasks_bp.route('/<int:project_id>/tasks/bulk', methods=['POST'])
+@jwt_required()
+@project_access_required
+def bulk_create_tasks(project_id):
+    """
+    Crea varias tareas en una sola transacción
+    ---
+    Ejemplo de cuerpo de solicitud:
+    {
+        "tasks": [
+            {"name": "Tarea 1", "start_date": "2023-01-01", "end_date": "2023-02-01"},
+            {"name": "Tarea 2", "start_date": "2023-02-01", "end_date": "2023-03-01", "assignee_id": 1}
+        ]
+    }
+    """
+    items, error = _get_bulk_items('tasks')
+    if error:
+        return error
+    
+    project = db.session.get(Project, project_id)
+    results = BulkService.create_tasks(project, items)
+    return _bulk_response(results, success_code=201)
+
+@tasks_bp.route('/<int:project_id>/tasks/bulk', methods=['PATCH'])
+@jwt_required()
+@project_access_required
+def bulk_update_tasks(project_id):
+    """
+    Actualiza progreso, fechas o presupuesto de varias tareas
+    ---
+    Ejemplo de cuerpo de solicitud:
+    {
+        "tasks": [
+            {"id": 1, "progress": 50},
+            {"id": 2, "end_date": "2023-03-15", "budget": 1500.00}
+        ]
+    }
+    """
+    items, error = _get_bulk_items('tasks')
+    if error:
+        return error
+    
+    project = db.session.get(Project, project_id)
+    results = BulkService.update_tasks(project, items)
+    return _bulk_response(results)
+
+@tasks_bp.route('/<int:project_id>/subtasks/bulk', methods=['POST'])
+@jwt_required()
+@project_access_required
+def bulk_create_subtasks(project_id):
+    """
+    Crea varias subtareas, de una o más tareas del proyecto
+    ---
+    Ejemplo de cuerpo de solicitud:
+    {
+        "subtasks": [
+            {"task_id": 1, "name": "Subtarea 1", "start_date": "2023-01-01", "end_date": "2023-01-15"}
+        ]
+    }
+    """
+    items, error = _get_bulk_items('subtasks')
+    if error:
+        return error
+    
+    project = db.session.get(Project, project_id)
+    results = BulkService.create_subtasks(project, items)
+    return _bulk_response(results, success_code=201)
+
+@tasks_bp.route('/<int:project_id>/subtasks/bulk', methods=['PATCH'])
+@jwt_required()
+@project_access_required
+def bulk_update_subtasks(project_id):
+    """
+    Actualiza progreso, fechas o presupuesto de varias subtareas
+    ---
+    Ejemplo de cuerpo de solicitud:
+    {
+        "subtasks": [
+            {"id": 1, "progress": 100}
+        ]
+    }
+    """
+    items, error = _get_bulk_items('subtasks')
+    if error:
+        return error
+    
+    project = db.session.get(Project, project_id)
+    results = BulkService.update_subtasks(project, items)
+    return _bulk_response(results)
+
+def _get_bulk_items(key):
+    """
+    Obtiene y valida la lista de elementos de una solicitud masiva
+    
+    Returns:
+        tuple: (items, error_response)
+    """
+    data = request.get_json()
+    if not data or not isinstance(data.get(key), list) or not data[key]:
+        return None, (jsonify({'error': f'Se requiere una lista no vacía en "{key}"'}), 400)
+    
+    max_items = current_app.config.get('BULK_MAX_ITEMS', 50000)
+    if len(data[key]) > max_items:
+        return None, (jsonify({'error': f'Se permiten como máximo {max_items} elementos por solicitud'}), 400)
+    
+    return data[key], None
+
+def _bulk_response(results, success_code=200):
+    """
+    Construye la respuesta de una operación masiva
+    
+    Responde success_code si todos los elementos se procesaron, 207 si solo
+    algunos y 400 si ninguno.
+    """
+    errors = sum(1 for result in results if result['status'] == 'error')
+    if errors == 0:
+        status_code = success_code
+    elif errors == len(results):
+        status_code = 400
+    else:
+        status_code = 207
+    
+    return jsonify({
+        'results': results,
+        'processed': len(results) - errors,
+        'errors': errors
+    }), status_code
+
+@tasks_bp.route('/<int:project_id>/dependencies', methods=['POST'])
+@jwt_required()
+@project_access_required
+def create_dependency(project_id):
+    """
+    Crea una dependencia fin-a-inicio entre dos tareas del proyecto
+    ---
+    Ejemplo de cuerpo de solicitud:
+    {
+        "predecessor_id": 1,
+        "successor_id": 2,
+        "lag_days": 0  // Días de espera tras el fin del predecesor (opcional)
+    }
+    """
+    data = request.get_json()
+    
+    # Validar datos
+    if not data or not all(key in data for key in ['predecessor_id', 'successor_id']):
+        return jsonify({'error': 'Datos incompletos'}), 400
+    
+    project = db.session.get(Project, project_id)
+    dependency, error = ScheduleService.add_dependency(
+        project,
+        data['predecessor_id'],
+        data['successor_id'],
+        data.get('lag_days', 0)
+    )
+    
+    if error:
+        return jsonify({'error': error}), 400
+    
+    return jsonify({
+        'message': 'Dependencia creada exitosamente',
+        'dependency': dependency.to_dict()
+    }), 201
+
+@tasks_bp.route('/<int:project_id>/dependencies', methods=['GET'])
+@jwt_required()
+@project_access_required
+@conditional_project_get
+def get_dependencies(project_id):
+    """
+    Obtiene las dependencias entre tareas de un proyecto
+    Parámetros de consulta opcionales:
+    - limit, cursor: paginación por cursor (usar next_cursor de la respuesta anterior)
+    """
+    try:
+        limit, cursor = get_page_args()
+        query = TaskDependency.query.filter_by(project_id=project_id)
+        dependencies, next_cursor = keyset_paginate(query, [(TaskDependency.id, False)], limit, cursor)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    # Verificar si el proyecto existe y pertenece al usuario actual
-    project = Project.query.filter_by(id=project_id, user_id=user_id).first()
-    if not project:
-        return jsonify({'error': 'Proyecto no encontrado'}), 404
+    return jsonify({
+        'dependencies': [dependency.to_dict() for dependency in dependencies],
+        'next_cursor': next_cursor
+    }), 200
+
+@tasks_bp.route('/dependencies/<int:dependency_id>', methods=['DELETE'])
+@jwt_required()
+def delete_dependency(dependency_id):
+    """
+    Elimina una dependencia entre tareas
+    """
+    dependency = db.session.get(TaskDependency, dependency_id)
+    
+    if not dependency:
+        return jsonify({'error': 'Dependencia no encontrada'}), 404
+    
+    # Verificar permisos
+    if not has_project_access(dependency.project_id):
+        return jsonify({'error': 'No tienes permiso para eliminar esta dependencia'}), 403
     
-    tasks = Task.query.filter_by(project_id=project_id).all()
+    ScheduleService.remove_dependency(dependency)
     
     return jsonify({
-        'tasks': [task.to_dict() for task in tasks]
+        'message': 'Dependencia eliminada exitosamente'
+    }), 200
+
+@tasks_bp.route('/<int:project_id>/schedule', methods=['GET'])
+@jwt_required()
+@project_access_required
+@conditional_project_get
+def get_schedule(project_id):
+    """
+    Obtiene la programación por ruta crítica del proyecto: inicio y fin
+    tempranos y tardíos, holgura de cada tarea y la ruta crítica
+    Parámetros de consulta opcionales:
+    - critical: 'true' para incluir solo las tareas críticas
+    
+    Responde 409 si las dependencias guardadas forman un ciclo (dos
+    solicitudes concurrentes pueden insertar cada una un lado del ciclo).
+    """
+    project = db.session.get(Project, project_id)
+    try:
+        schedule = ScheduleService.get_schedule(project)
+    except ScheduleCycleError as e:
+        return jsonify({'error': str(e)}), 409
+    critical_only = request.args.get('critical', '').lower() in ('true', '1')
+    
+    return jsonify({
+        'project_id': project_id,
+        **schedule.to_dict(critical_only=critical_only)
     }), 200
 
 @tasks_bp.route('/tasks/<int:task_id>', methods=['GET'])
@@ -100,8 +436,6 @@ def get_task(task_id):
     """
     Obtiene una tarea específica
     """
-    user_id = get_jwt_identity()
-    
     # Obtener tarea
     task = Task.query.get(task_id)
     
@@ -109,8 +443,7 @@ def get_task(task_id):
         return jsonify({'error': 'Tarea no encontrada'}), 404
     
     # Verificar permisos
-    project = Project.query.filter_by(id=task.project_id, user_id=user_id).first()
-    if not project:
+    if not has_project_access(task.project_id):
         return jsonify({'error': 'No tienes permiso para ver esta tarea'}), 403
     
     return jsonify({
@@ -124,7 +457,6 @@ def update_task(task_id):
     Actualiza una tarea existente
     """
     data = request.get_json()
-    user_id = get_jwt_identity()
     
     # Obtener tarea
     task = Task.query.get(task_id)
@@ -133,10 +465,12 @@ def update_task(task_id):
         return jsonify({'error': 'Tarea no encontrada'}), 404
     
     # Verificar permisos
-    project = Project.query.filter_by(id=task.project_id, user_id=user_id).first()
-    if not project:
+    if not has_project_access(task.project_id):
         return jsonify({'error': 'No tienes permiso para modificar esta tarea'}), 403
     
+    project = db.session.get(Project, task.project_id)
+    previous_version = project.version
+    
     # Actualizar campos si están presentes
     if 'name' in data:
         task.name = data['name']
@@ -185,8 +519,13 @@ def update_task(task_id):
         except ValueError:
             return jsonify({'error': 'El presupuesto debe ser un número válido'}), 400
     
+    dates_changed = 'start_date' in data or 'end_date' in data
     db.session.commit()
     
+    # Recalcular solo las tareas afectadas en la programación cacheada
+    if dates_changed:
+        ScheduleService.task_dates_changed(project, previous_version, task)
+    
     return jsonify({
         'message': 'Tarea actualizada exitosamente',
         'task': task.to_dict()
@@ -198,8 +537,6 @@ def delete_task(task_id):
     """
     Elimina una tarea
     """
-    user_id = get_jwt_identity()
-    
     # Obtener tarea
     task = Task.query.get(task_id)
     
@@ -207,8 +544,7 @@ def delete_task(task_id):
         return jsonify({'error': 'Tarea no encontrada'}), 404
     
     # Verificar permisos
-    project = Project.query.filter_by(id=task.project_id, user_id=user_id).first()
-    if not project:
+    if not has_project_access(task.project_id):
         return jsonify({'error': 'No tienes permiso para eliminar esta tarea'}), 403
     
     db.session.delete(task)
@@ -233,7 +569,6 @@ def create_subtask(task_id):
     }
     """
     data = request.get_json()
-    user_id = get_jwt_identity()
     
     # Validar datos
     if not data or not all(key in data for key in ['name', 'start_date', 'end_date']):
@@ -246,8 +581,7 @@ def create_subtask(task_id):
         return jsonify({'error': 'Tarea no encontrada'}), 404
     
     # Verificar permisos
-    project = Project.query.filter_by(id=task.project_id, user_id=user_id).first()
-    if not project:
+    if not has_project_access(task.project_id):
         return jsonify({'error': 'No tienes permiso para modificar esta tarea'}), 403
     
     try:
@@ -288,10 +622,12 @@ def create_subtask(task_id):
 @jwt_required()
 def get_subtasks(task_id):
     """
-    Obtiene todas las subtareas de una tarea
+    Obtiene las subtareas de una tarea, paginadas y ordenadas por fecha de término
+    Parámetros de consulta opcionales:
+    - limit, cursor: paginación por cursor (usar next_cursor de la respuesta anterior)
+    - status: 'pending', 'completed', 'overdue'
+    - date_from, date_to: subtareas que se cruzan con el rango (YYYY-MM-DD)
     """
-    user_id = get_jwt_identity()
-    
     # Obtener tarea
     task = Task.query.get(task_id)
     
@@ -299,14 +635,23 @@ def get_subtasks(task_id):
         return jsonify({'error': 'Tarea no encontrada'}), 404
     
     # Verificar permisos
-    project = Project.query.filter_by(id=task.project_id, user_id=user_id).first()
-    if not project:
+    if not has_project_access(task.project_id):
         return jsonify({'error': 'No tienes permiso para ver esta tarea'}), 403
     
-    subtasks = Subtask.query.filter_by(task_id=task_id).all()
+    try:
+        limit, cursor = get_page_args()
+        
+        query = Subtask.query.filter_by(task_id=task_id)
+        query = apply_status_filter(query, Subtask)
+        query = apply_date_range_filter(query, Subtask.start_date, Subtask.end_date)
+        
+        subtasks, next_cursor = keyset_paginate(query, [(Subtask.end_date, False), (Subtask.id, False)], limit, cursor)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     return jsonify({
-        'subtasks': [subtask.to_dict() for subtask in subtasks]
+        'subtasks': [subtask.to_dict() for subtask in subtasks],
+        'next_cursor': next_cursor
     }), 200
 
 @tasks_bp.route('/subtasks/<int:subtask_id>', methods=['PUT'])
@@ -316,18 +661,18 @@ def update_subtask(subtask_id):
     Actualiza una subtarea existente
     """
     data = request.get_json()
-    user_id = get_jwt_identity()
     
-    # Obtener subtarea
-    subtask = Subtask.query.get(subtask_id)
+    # Obtener subtarea y su tarea (para el proyecto y el rango de fechas) en una consulta
+    row = db.session.execute(
+        db.select(Subtask, Task).join(Task, Task.id == Subtask.task_id).filter(Subtask.id == subtask_id)
+    ).first()
     
-    if not subtask:
+    if not row:
         return jsonify({'error': 'Subtarea no encontrada'}), 404
+    subtask, task = row
     
-    # Obtener tarea y proyecto para verificar permisos
-    task = Task.query.get(subtask.task_id)
-    project = Project.query.filter_by(id=task.project_id, user_id=user_id).first()
-    if not project:
+    # Verificar permisos
+    if not has_project_access(task.project_id):
         return jsonify({'error': 'No tienes permiso para modificar esta subtarea'}), 403
     
     # Actualizar campos si están presentes
@@ -382,18 +727,17 @@ def delete_subtask(subtask_id):
     """
     Elimina una subtarea
     """
-    user_id = get_jwt_identity()
+    # Obtener subtarea y el proyecto de su tarea en una consulta
+    row = db.session.execute(
+        db.select(Subtask, Task.project_id).join(Task, Task.id == Subtask.task_id).filter(Subtask.id == subtask_id)
+    ).first()
     
-    # Obtener subtarea
-    subtask = Subtask.query.get(subtask_id)
-    
-    if not subtask:
+    if not row:
         return jsonify({'error': 'Subtarea no encontrada'}), 404
+    subtask, project_id = row
     
-    # Obtener tarea y proyecto para verificar permisos
-    task = Task.query.get(subtask.task_id)
-    project = Project.query.filter_by(id=task.project_id, user_id=user_id).first()
-    if not project:
+    # Verificar permisos
+    if not has_project_access(project_id):
         return jsonify({'error': 'No tienes permiso para eliminar esta subtarea'}), 403
     
     db.session.delete(subtask)
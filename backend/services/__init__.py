@@ -1,3 +1,9 @@
 # Importamos los servicios para que estén disponibles desde el módulo
 from .auth_service import AuthService
-from .project_service import ProjectService
\ No newline at end of file
+from .project_service import ProjectService
+from .serialization_service import SerializationService, TASK_FIELDS, MILESTONE_FIELDS
+from .bulk_service import BulkService
+from .timeline_service import TimelineService, VIEW_PERIOD_MONTHS
+from .schedule_service import ScheduleService, ProjectSchedule, ScheduleCycleError
+from .import_service import ImportService, ProjectImporter, IMPORT_FORMATS
+from .export_service import ExportService, EXPORT_FORMATS, EXPORT_COLUMNS
@@ -1,5 +1,6 @@
 from models import db, User
 from flask_jwt_extended import create_access_token
+from utils.password_hasher import PasswordHasherBusy
 from datetime import timedelta
 import re
 
@@ -68,8 +69,15 @@ class AuthService:
         user = User.query.filter_by(email=email).first()
         
         # Verificar si el usuario existe y la contraseña es correcta
-        if not user or not user.check_password(password):
-            return None, None, "Email o contraseña incorrectos"
+        try:
+            if not user or not user.check_password(password):
+                return None, None, "Email o contraseña incorrectos"
+        except PasswordHasherBusy:
+            return None, None, "Servidor ocupado, intente nuevamente"
+        
+        # Guardar el hash actualizado si se regeneró con los parámetros actuales
+        if user in db.session.dirty:
+            db.session.commit()
         
         # Generar token
         token = create_access_token(
@@ -0,0 +1,368 @@
+from models import db, Task, Subtask, Participant
+from models.change_tracking import mark_project_changed
+from models.progress_rollup import apply_rollup_deltas
+from sqlalchemy import insert, update
+from datetime import datetime
+
+class BulkService:
+    """
+    Servicio para crear y actualizar tareas y subtareas en bloque
+
+    Valida todos los elementos antes de escribir, resuelve las referencias con
+    una consulta IN por tipo y escribe con executemany en una sola
+    transacción. Devuelve un resultado por elemento, en el mismo orden de la
+    solicitud; los elementos inválidos se informan y no se escriben.
+
+    Como las escrituras con Core no disparan los eventos del ORM, los
+    acumulados de progreso (con incrementos en SQL, apply_rollup_deltas) y
+    la versión del proyecto se ajustan aquí. Por eso una actualización que
+    repite un ID se rechaza en sus apariciones posteriores: su delta de
+    progreso se contaría dos veces.
+    """
+
+    @staticmethod
+    def _is_id(value):
+        return isinstance(value, int) and not isinstance(value, bool)
+
+    @staticmethod
+    def _collect_ids(items, key):
+        """IDs referenciados por los elementos; los valores que no son enteros se rechazan por elemento"""
+        return {item[key] for item in items if isinstance(item, dict) and BulkService._is_id(item.get(key))}
+
+    @staticmethod
+    def _lookup(rows, value):
+        """Busca una fila por ID sin fallar con valores no hashables"""
+        return rows.get(value) if BulkService._is_id(value) else None
+
+    @staticmethod
+    def _check_repeated(seen, value):
+        if value in seen:
+            raise ValueError('El elemento está repetido en la solicitud')
+        seen.add(value)
+
+    @staticmethod
+    def _parse_date(value):
+        return datetime.strptime(value, '%Y-%m-%d').date()
+
+    @staticmethod
+    def _parse_budget(value):
+        budget = float(value)
+        if budget < 0:
+            raise ValueError('El presupuesto no puede ser negativo')
+        return budget
+
+    @staticmethod
+    def _parse_progress(value):
+        if not isinstance(value, int) or isinstance(value, bool) or value < 0 or value > 100:
+            raise ValueError('El progreso debe ser un número entero entre 0 y 100')
+        return value
+
+    @staticmethod
+    def _parse_dates(item, current_start=None, current_end=None):
+        """Obtiene las fechas de un elemento, usando las actuales si no vienen"""
+        try:
+            start_date = BulkService._parse_date(item['start_date']) if 'start_date' in item else current_start
+            end_date = BulkService._parse_date(item['end_date']) if 'end_date' in item else current_end
+        except (TypeError, ValueError):
+            raise ValueError('Formato de fecha inválido. Utilice YYYY-MM-DD')
+        if start_date > end_date:
+            raise ValueError('La fecha de inicio debe ser anterior a la fecha de término')
+        return start_date, end_date
+
+    @staticmethod
+    def _insert(model, rows):
+        """
+        Inserta filas con executemany y devuelve sus IDs en el mismo orden
+
+        Usa RETURNING cuando el dialecto lo soporta en executemany (SQLite
+        3.35+, MariaDB, PostgreSQL); en MySQL inserta fila por fila para
+        conocer los IDs.
+        """
+        if not rows:
+            return []
+        if db.session.get_bind().dialect.insert_executemany_returning:
+            statement = insert(model).returning(model.id, sort_by_parameter_order=True)
+            return list(db.session.scalars(statement, rows))
+        return [db.session.execute(insert(model).values(**row)).inserted_primary_key[0] for row in rows]
+
+    @staticmethod
+    def _result(results, index, error=None, **values):
+        if error:
+            results[index] = {'index': index, 'status': 'error', 'error': error}
+        else:
+            results[index] = {'index': index, 'status': values.pop('status'), **values}
+
+    @staticmethod
+    def create_tasks(project, items):
+        """
+        Crea tareas en bloque
+
+        Args:
+            project (Project): Proyecto destino
+            items (list): Diccionarios con name, start_date, end_date y
+                opcionalmente description, assignee_id y budget
+
+        Returns:
+            list: Un resultado por elemento
+        """
+        results = [None] * len(items)
+
+        # Validar los participantes asignados con una sola consulta
+        assignee_ids = BulkService._collect_ids(items, 'assignee_id')
+        valid_assignees = set()
+        if assignee_ids:
+            valid_assignees = set(db.session.scalars(
+                db.select(Participant.id).filter(
+                    Participant.project_id == project.id,
+                    Participant.id.in_(assignee_ids)
+                )
+            ))
+
+        rows = []
+        indexes = []
+        for index, item in enumerate(items):
+            try:
+                if not isinstance(item, dict) or not all(key in item for key in ['name', 'start_date', 'end_date']):
+                    raise ValueError('Datos incompletos')
+                start_date, end_date = BulkService._parse_dates(item)
+                if start_date < project.start_date or end_date > project.end_date:
+                    raise ValueError('Las fechas de la tarea deben estar dentro del rango del proyecto')
+                assignee_id = item.get('assignee_id')
+                if assignee_id and not (BulkService._is_id(assignee_id) and assignee_id in valid_assignees):
+                    raise ValueError('Participante asignado no encontrado en este proyecto')
+                budget = BulkService._parse_budget(item.get('budget', 0.0))
+            except (TypeError, ValueError) as e:
+                BulkService._result(results, index, error=str(e))
+                continue
+
+            rows.append({
+                'project_id': project.id,
+                'name': item['name'],
+                'description': item.get('description'),
+                'start_date': start_date,
+                'end_date': end_date,
+                'assignee_id': assignee_id or None,
+                'budget': budget,
+                'progress': 0
+            })
+            indexes.append(index)
+
+        for index, task_id in zip(indexes, BulkService._insert(Task, rows)):
+            BulkService._result(results, index, status='created', id=task_id)
+
+        if rows:
+            # Las tareas nuevas empiezan con 0% de progreso
+            apply_rollup_deltas(db.session.connection(), project_deltas={project.id: (0, len(rows))})
+            mark_project_changed(project)
+
+        db.session.commit()
+        return results
+
+    @staticmethod
+    def create_subtasks(project, items):
+        """
+        Crea subtareas en bloque en tareas de un proyecto
+
+        Args:
+            project (Project): Proyecto al que pertenecen las tareas
+            items (list): Diccionarios con task_id, name, start_date, end_date
+                y opcionalmente description y budget
+
+        Returns:
+            list: Un resultado por elemento
+        """
+        results = [None] * len(items)
+
+        # Cargar las tareas referenciadas con una sola consulta
+        task_ids = BulkService._collect_ids(items, 'task_id')
+        tasks = {}
+        if task_ids:
+            tasks = {task.id: task for task in Task.query.filter(
+                Task.project_id == project.id,
+                Task.id.in_(task_ids)
+            )}
+
+        rows = []
+        indexes = []
+        for index, item in enumerate(items):
+            try:
+                if not isinstance(item, dict) or not all(key in item for key in ['task_id', 'name', 'start_date', 'end_date']):
+                    raise ValueError('Datos incompletos')
+                task = BulkService._lookup(tasks, item['task_id'])
+                if task is None:
+                    raise ValueError('Tarea no encontrada en este proyecto')
+                start_date, end_date = BulkService._parse_dates(item)
+                if start_date < task.start_date or end_date > task.end_date:
+                    raise ValueError('Las fechas de la subtarea deben estar dentro del rango de la tarea')
+                budget = BulkService._parse_budget(item.get('budget', 0.0))
+            except (TypeError, ValueError) as e:
+                BulkService._result(results, index, error=str(e))
+                continue
+
+            rows.append({
+                'task_id': task.id,
+                'name': item['name'],
+                'description': item.get('description'),
+                'start_date': start_date,
+                'end_date': end_date,
+                'budget': budget,
+                'progress': 0
+            })
+            indexes.append(index)
+
+        for index, subtask_id in zip(indexes, BulkService._insert(Subtask, rows)):
+            BulkService._result(results, index, status='created', id=subtask_id)
+
+        # Las subtareas nuevas empiezan con 0% de progreso
+        task_deltas = {}
+        for row in rows:
+            progress_delta, count_delta = task_deltas.get(row['task_id'], (0, 0))
+            task_deltas[row['task_id']] = (progress_delta, count_delta + 1)
+        if rows:
+            apply_rollup_deltas(db.session.connection(), task_deltas=task_deltas)
+            mark_project_changed(project)
+
+        db.session.commit()
+        return results
+
+    @staticmethod
+    def update_tasks(project, items):
+        """
+        Actualiza progreso, fechas y presupuesto de tareas en bloque
+
+        Args:
+            project (Project): Proyecto de las tareas
+            items (list): Diccionarios con id y opcionalmente progress,
+                start_date, end_date y budget
+
+        Returns:
+            list: Un resultado por elemento
+        """
+        results = [None] * len(items)
+
+        ids = BulkService._collect_ids(items, 'id')
+        current = {}
+        if ids:
+            # Bloquea las filas: el delta de progreso se calcula contra estos valores
+            current = {row.id: row for row in db.session.query(
+                Task.id, Task.progress, Task.start_date, Task.end_date
+            ).filter(Task.project_id == project.id, Task.id.in_(ids)).with_for_update()}
+
+        rows = []
+        seen = set()
+        progress_delta = 0
+        for index, item in enumerate(items):
+            try:
+                if not isinstance(item, dict) or 'id' not in item:
+                    raise ValueError('Datos incompletos')
+                task = BulkService._lookup(current, item['id'])
+                if task is None:
+                    raise ValueError('Tarea no encontrada en este proyecto')
+                BulkService._check_repeated(seen, task.id)
+                row = {'id': task.id}
+                if 'start_date' in item or 'end_date' in item:
+                    row['start_date'], row['end_date'] = BulkService._parse_dates(item, task.start_date, task.end_date)
+                    if row['start_date'] < project.start_date or row['end_date'] > project.end_date:
+                        raise ValueError('Las fechas de la tarea deben estar dentro del rango del proyecto')
+                if 'progress' in item:
+                    row['progress'] = BulkService._parse_progress(item['progress'])
+                if 'budget' in item:
+                    row['budget'] = BulkService._parse_budget(item['budget'])
+            except (TypeError, ValueError) as e:
+                BulkService._result(results, index, error=str(e))
+                continue
+
+            if 'progress' in row:
+                progress_delta += row['progress'] - (task.progress or 0)
+            rows.append(row)
+            BulkService._result(results, index, status='updated', id=task.id)
+
+        BulkService._update(Task, rows)
+
+        if rows:
+            apply_rollup_deltas(db.session.connection(), project_deltas={project.id: (progress_delta, 0)})
+            mark_project_changed(project)
+
+        db.session.commit()
+        return results
+
+    @staticmethod
+    def update_subtasks(project, items):
+        """
+        Actualiza progreso, fechas y presupuesto de subtareas en bloque
+
+        Args:
+            project (Project): Proyecto de las subtareas
+            items (list): Diccionarios con id y opcionalmente progress,
+                start_date, end_date y budget
+
+        Returns:
+            list: Un resultado por elemento
+        """
+        results = [None] * len(items)
+
+        ids = BulkService._collect_ids(items, 'id')
+        current = {}
+        if ids:
+            # Bloquea las filas: el delta de progreso se calcula contra estos valores
+            current = {row.id: row for row in db.session.query(
+                Subtask.id, Subtask.task_id, Subtask.progress, Subtask.start_date, Subtask.end_date
+            ).join(Task, Task.id == Subtask.task_id).filter(
+                Task.project_id == project.id,
+                Subtask.id.in_(ids)
+            ).with_for_update()}
+
+        # Tareas afectadas, para validar los rangos
+        tasks = {}
+        task_ids = {row.task_id for row in current.values()}
+        if task_ids:
+            tasks = {task.id: task for task in Task.query.filter(Task.id.in_(task_ids))}
+
+        rows = []
+        seen = set()
+        task_deltas = {}
+        for index, item in enumerate(items):
+            try:
+                if not isinstance(item, dict) or 'id' not in item:
+                    raise ValueError('Datos incompletos')
+                subtask = BulkService._lookup(current, item['id'])
+                if subtask is None:
+                    raise ValueError('Subtarea no encontrada en este proyecto')
+                BulkService._check_repeated(seen, subtask.id)
+                task = tasks[subtask.task_id]
+                row = {'id': subtask.id}
+                if 'start_date' in item or 'end_date' in item:
+                    row['start_date'], row['end_date'] = BulkService._parse_dates(item, subtask.start_date, subtask.end_date)
+                    if row['start_date'] < task.start_date or row['end_date'] > task.end_date:
+                        raise ValueError('Las fechas de la subtarea deben estar dentro del rango de la tarea')
+                if 'progress' in item:
+                    row['progress'] = BulkService._parse_progress(item['progress'])
+                if 'budget' in item:
+                    row['budget'] = BulkService._parse_budget(item['budget'])
+            except (TypeError, ValueError) as e:
+                BulkService._result(results, index, error=str(e))
+                continue
+
+            if 'progress' in row:
+                progress_delta = task_deltas.get(task.id, (0, 0))[0]
+                task_deltas[task.id] = (progress_delta + row['progress'] - (subtask.progress or 0), 0)
+            rows.append(row)
+            BulkService._result(results, index, status='updated', id=subtask.id)
+
+        BulkService._update(Subtask, rows)
+
+        if rows:
+            apply_rollup_deltas(db.session.connection(), task_deltas=task_deltas)
+            mark_project_changed(project)
+
+        db.session.commit()
+        return results
+
+    @staticmethod
+    def _update(model, rows):
+        """Actualiza filas por clave primaria con executemany, agrupadas por columnas"""
+        groups = {}
+        for row in rows:
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+        for group in groups.values():
+            db.session.execute(update(model), group)
@@ -0,0 +1,190 @@
+import csv
+import io
+import zlib
+from flask import current_app
+from sqlalchemy import select
+from models import db, Participant, Task, Subtask, Milestone
+
+EXPORT_FORMATS = ('ndjson', 'csv')
+
+# Columnas del CSV; las claves de cada registro NDJSON son las mismas. Los
+# nombres coinciden con los de la importación, así que un archivo exportado
+# se puede importar en otro proyecto.
+EXPORT_COLUMNS = ('type', 'id', 'ref', 'name', 'description', 'email', 'role', 'start_date', 'end_date',
+                  'date', 'budget', 'progress', 'completed', 'assignee', 'responsible', 'task', 'created_at')
+
+def _iso(value):
+    return value.isoformat() if value is not None else None
+
+def _ref(prefix, value):
+    return f'{prefix}{value}' if value is not None else None
+
+class ExportService:
+    """
+    Servicio de exportación completa de proyectos
+
+    Los registros se leen con cursores del servidor (yield_per) como filas de
+    columnas, sin cargar objetos del ORM, y se generan por bloques: la memoria
+    usada depende del tamaño del bloque y no del tamaño del proyecto.
+    """
+
+    @staticmethod
+    def iter_records(project, batch_size=500):
+        """
+        Itera los registros de un proyecto en orden de importación
+
+        Primero el proyecto y sus participantes, luego tareas, subtareas e
+        hitos. Las referencias entre registros usan ref ('p<ID>' para
+        participantes, 't<ID>' para tareas).
+
+        Args:
+            project (Project): Proyecto a exportar
+            batch_size (int): Filas leídas por lote (yield_per)
+
+        Yields:
+            dict: Registro con su type
+        """
+        yield {
+            'type': 'project',
+            'id': project.id,
+            'name': project.name,
+            'description': project.description,
+            'start_date': _iso(project.start_date),
+            'end_date': _iso(project.end_date),
+            'budget': project.budget,
+            'progress': project.progress,
+            'created_at': _iso(project.created_at)
+        }
+
+        def rows(statement):
+            return db.session.execute(statement.execution_options(yield_per=batch_size))
+
+        for row in rows(select(Participant.id, Participant.name, Participant.email, Participant.role,
+                               Participant.created_at)
+                        .where(Participant.project_id == project.id).order_by(Participant.id)):
+            yield {
+                'type': 'participant',
+                'id': row.id,
+                'ref': _ref('p', row.id),
+                'name': row.name,
+                'email': row.email,
+                'role': row.role,
+                'created_at': _iso(row.created_at)
+            }
+
+        for row in rows(select(Task.id, Task.name, Task.description, Task.start_date, Task.end_date, Task.budget,
+                               Task.progress, Task.completed, Task.assignee_id, Task.created_at)
+                        .where(Task.project_id == project.id).order_by(Task.id)):
+            yield {
+                'type': 'task',
+                'id': row.id,
+                'ref': _ref('t', row.id),
+                'name': row.name,
+                'description': row.description,
+                'start_date': _iso(row.start_date),
+                'end_date': _iso(row.end_date),
+                'budget': row.budget,
+                'progress': row.progress,
+                'completed': row.completed,
+                'assignee': _ref('p', row.assignee_id),
+                'created_at': _iso(row.created_at)
+            }
+
+        for row in rows(select(Subtask.id, Subtask.task_id, Subtask.name, Subtask.description, Subtask.start_date,
+                               Subtask.end_date, Subtask.budget, Subtask.progress, Subtask.completed,
+                               Subtask.created_at)
+                        .join(Task, Task.id == Subtask.task_id)
+                        .where(Task.project_id == project.id).order_by(Subtask.task_id, Subtask.id)):
+            yield {
+                'type': 'subtask',
+                'id': row.id,
+                'task': _ref('t', row.task_id),
+                'name': row.name,
+                'description': row.description,
+                'start_date': _iso(row.start_date),
+                'end_date': _iso(row.end_date),
+                'budget': row.budget,
+                'progress': row.progress,
+                'completed': row.completed,
+                'created_at': _iso(row.created_at)
+            }
+
+        for row in rows(select(Milestone.id, Milestone.name, Milestone.description, Milestone.date,
+                               Milestone.completed, Milestone.responsible_id, Milestone.created_at)
+                        .where(Milestone.project_id == project.id).order_by(Milestone.id)):
+            yield {
+                'type': 'milestone',
+                'id': row.id,
+                'name': row.name,
+                'description': row.description,
+                'date': _iso(row.date),
+                'completed': row.completed,
+                'responsible': _ref('p', row.responsible_id),
+                'created_at': _iso(row.created_at)
+            }
+
+    @staticmethod
+    def iter_chunks(project, format, batch_size=500):
+        """
+        Genera la exportación como texto, un bloque cada batch_size registros
+
+        Args:
+            project (Project): Proyecto a exportar
+            format (str): 'ndjson' o 'csv' (con encabezado EXPORT_COLUMNS)
+            batch_size (int): Registros por bloque
+
+        Yields:
+            str: Bloques de líneas
+
+        Raises:
+            ValueError: Si el formato no es válido
+        """
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f'Formato no soportado. Use uno de: {", ".join(EXPORT_FORMATS)}')
+        return ExportService._chunks(project, format, batch_size)
+
+    @staticmethod
+    def _chunks(project, format, batch_size):
+        buffer = io.StringIO()
+        if format == 'csv':
+            writer = csv.DictWriter(buffer, EXPORT_COLUMNS, lineterminator='\n')
+            writer.writeheader()
+            write = writer.writerow
+        else:
+            dumps = current_app.json.dumps
+
+            def write(record):
+                buffer.write(dumps(record))
+                buffer.write('\n')
+
+        pending = 0
+        for record in ExportService.iter_records(project, batch_size):
+            write(record)
+            pending += 1
+            if pending >= batch_size:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                pending = 0
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    @staticmethod
+    def gzip_chunks(chunks, level=6):
+        """
+        Comprime en gzip a medida que se generan los bloques
+
+        Args:
+            chunks (iterable): Bloques de texto
+            level (int): Nivel de compresión (1-9)
+
+        Yields:
+            bytes: Bloques comprimidos (solo los no vacíos)
+        """
+        # wbits 31: formato gzip (encabezado y CRC) en lugar de zlib
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            data = compressor.compress(chunk.encode('utf-8'))
+            if data:
+                yield data
+        yield compressor.flush()
@@ -0,0 +1,462 @@
+import csv
+import io
+import json
+from sqlalchemy.exc import DataError, IntegrityError
+from models import db, Participant, Task, Subtask, Milestone
+from models.change_tracking import mark_project_changed
+from models.progress_rollup import apply_rollup_deltas
+from .bulk_service import BulkService
+
+IMPORT_FORMATS = ('csv', 'ndjson')
+IMPORT_TYPES = ('participant', 'task', 'subtask', 'milestone')
+PARTICIPANT_ROLES = ('administrator', 'collaborator', 'external')
+
+# Columnas reconocidas en CSV (en NDJSON son las claves de cada objeto)
+IMPORT_COLUMNS = ('type', 'ref', 'name', 'description', 'email', 'role', 'start_date', 'end_date',
+                  'date', 'budget', 'progress', 'completed', 'assignee', 'responsible', 'task')
+
+# Marca de un participante o tarea del lote actual, aún sin ID
+PENDING = object()
+
+def read_records(stream, format):
+    """
+    Lee los registros de un archivo sin cargarlo completo
+
+    El formato y el encabezado del CSV se validan al llamar; las filas se
+    leen a medida que se recorre el resultado.
+
+    Args:
+        stream: Flujo binario (archivo, cuerpo de la solicitud)
+        format (str): 'csv' (con encabezado) o 'ndjson'
+
+    Returns:
+        iterator: Tuplas (número de línea, registro o None, error o None)
+
+    Raises:
+        ValueError: Si el formato no es válido o el CSV no tiene columna type
+    """
+    if format not in IMPORT_FORMATS:
+        raise ValueError(f'Formato no soportado. Use uno de: {", ".join(IMPORT_FORMATS)}')
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+    if format == 'ndjson':
+        return _read_ndjson(text)
+    reader = csv.DictReader(text)
+    try:
+        fieldnames = reader.fieldnames
+    except (csv.Error, UnicodeDecodeError) as e:
+        raise ValueError(f'Archivo inválido: {e}')
+    if fieldnames is not None and 'type' not in fieldnames:
+        raise ValueError('El CSV debe tener encabezado con la columna type')
+    return _read_csv(reader)
+
+def _read_csv(reader):
+    try:
+        for row in reader:
+            # Las celdas vacías equivalen a valores ausentes
+            yield reader.line_num, {key: value for key, value in row.items() if key and value not in (None, '')}, None
+    except (csv.Error, UnicodeDecodeError) as e:
+        # El resto del archivo no se puede leer
+        yield reader.line_num, None, f'Archivo inválido: {e}'
+
+def _read_ndjson(text):
+    number = 0
+    try:
+        for number, line in enumerate(text, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield number, None, 'JSON inválido'
+                continue
+            if not isinstance(record, dict):
+                yield number, None, 'Cada línea debe ser un objeto JSON'
+                continue
+            # Los null equivalen a valores ausentes, como las celdas vacías del CSV
+            yield number, {key: value for key, value in record.items() if value is not None}, None
+    except UnicodeDecodeError as e:
+        yield number + 1, None, f'Archivo inválido: {e}'
+
+def _parse_int(value, name):
+    if isinstance(value, bool):
+        raise ValueError(f'{name} debe ser un número entero')
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'{name} debe ser un número entero')
+
+def _parse_bool(value):
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'si', 'sí', 'yes', 'x')
+    return bool(value)
+
+def _parse_date(value):
+    try:
+        return BulkService._parse_date(value)
+    except (TypeError, ValueError):
+        raise ValueError('Formato de fecha inválido. Utilice YYYY-MM-DD')
+
+def _parse_budget(value):
+    try:
+        return BulkService._parse_budget(value)
+    except TypeError:
+        raise ValueError('El presupuesto debe ser un número')
+    except ValueError as e:
+        if 'negativo' in str(e):
+            raise
+        raise ValueError('El presupuesto debe ser un número')
+
+class ProjectImporter:
+    """
+    Importa participantes, tareas, subtareas e hitos a un proyecto
+
+    Los registros se validan al leerlos y se escriben por lotes de
+    batch_size filas, cada lote en su propia transacción con inserciones
+    masivas de Core; los acumulados de progreso y la versión del proyecto se
+    ajustan en cada lote como en BulkService. Un registro inválido se informa
+    (con su número de línea) y no se escribe; un lote que la base de datos
+    rechaza (p. ej. por una restricción) se revierte y se informa como un
+    error del lote. Los lotes ya confirmados se conservan aunque el resto
+    del archivo falle.
+
+    Las referencias se resuelven en memoria: los participantes se nombran por
+    su ref (o su email si no tienen ref; también los que ya existen en el
+    proyecto) y las tareas por su ref; una subtarea sin task pertenece a la
+    última tarea del archivo. Un registro solo puede referirse a otros
+    anteriores. La memoria usada no depende de la cantidad de filas: solo
+    crece el índice de refs (un entero por tarea o participante con ref)
+    además del lote actual.
+    """
+
+    def __init__(self, project, batch_size=1000, max_errors=100):
+        """
+        Args:
+            project (Project): Proyecto destino
+            batch_size (int): Filas por transacción
+            max_errors (int): Cantidad de errores que se conservan con detalle
+        """
+        self.project = project
+        self.project_id = project.id
+        self.start_date = project.start_date
+        self.end_date = project.end_date
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+
+        # ref o email -> ID (o PENDING hasta escribir el lote)
+        self.participants = {}
+        for participant_id, email in db.session.query(Participant.id, Participant.email).filter(
+                Participant.project_id == self.project_id, Participant.email.isnot(None)):
+            self.participants[email] = participant_id
+        self.tasks = {}
+        self.last_task = None
+
+        self.batch = {record_type: [] for record_type in IMPORT_TYPES}
+        self.batch_rows = 0
+        self.stats = {'rows': 0, 'batches': 0, 'errors': 0,
+                      'created': {record_type: 0 for record_type in IMPORT_TYPES}}
+        self.errors = []
+
+    def run(self, records):
+        """
+        Importa los registros de read_records()
+
+        Returns:
+            dict: Estadísticas (filas, lotes, creados por tipo, errores)
+        """
+        for _ in self.batches(records):
+            pass
+        return self.result()
+
+    def batches(self, records):
+        """
+        Importa los registros de read_records() lote por lote
+
+        Yields:
+            dict: Estadísticas acumuladas tras confirmar cada lote; la
+                última entrega es el resultado final
+        """
+        for line, record, error in records:
+            self.stats['rows'] += 1
+            if error is None:
+                try:
+                    self._add(line, record)
+                except (TypeError, ValueError) as e:
+                    error = str(e)
+            if error is not None:
+                self._error(line, record, error)
+            if self.batch_rows >= self.batch_size:
+                self.flush()
+                yield self.result()
+        # El último resultado es el final, también si no hubo filas válidas
+        if self.batch_rows or not self.stats['batches']:
+            self.flush()
+            yield self.result()
+
+    def result(self):
+        return {**self.stats, 'created': dict(self.stats['created']), 'error_details': list(self.errors)}
+
+    def _error(self, line, record, message):
+        self.stats['errors'] += 1
+        if len(self.errors) < self.max_errors:
+            record_type = record.get('type') if isinstance(record, dict) else None
+            self.errors.append({'line': line, 'type': record_type, 'error': message})
+
+    def _queue(self, record_type, line, row, ref=None):
+        self.batch[record_type].append((line, row, ref))
+        self.batch_rows += 1
+
+    def _participant_ref(self, value):
+        if value is None:
+            return None
+        if value not in self.participants:
+            raise ValueError(f'Participante no encontrado: {value}')
+        return value
+
+    def _add(self, line, record):
+        """Valida un registro y lo agrega al lote"""
+        record_type = record.get('type')
+        if record_type == 'project':
+            # Encabezado de un archivo exportado: el destino es el proyecto actual
+            return
+        if record_type not in IMPORT_TYPES:
+            raise ValueError(f'Tipo inválido. Use uno de: {", ".join(IMPORT_TYPES)}')
+        if not record.get('name'):
+            raise ValueError('Datos incompletos: falta name')
+        budget = _parse_budget(record.get('budget', 0.0))
+
+        if record_type == 'participant':
+            role = record.get('role')
+            if role not in PARTICIPANT_ROLES:
+                raise ValueError(f'Rol inválido. Debe ser uno de: {", ".join(PARTICIPANT_ROLES)}')
+            ref = record.get('ref') or record.get('email')
+            if ref is not None and ref in self.participants:
+                raise ValueError(f'El participante ya existe o la referencia está repetida: {ref}')
+            if ref is not None:
+                self.participants[ref] = PENDING
+            self._queue('participant', line, {
+                'project_id': self.project_id,
+                'name': record['name'],
+                'email': record.get('email'),
+                'role': role
+            }, ref)
+            return
+
+        if record_type == 'milestone':
+            if 'date' not in record:
+                raise ValueError('Datos incompletos: falta date')
+            milestone_date = _parse_date(record['date'])
+            if milestone_date < self.start_date or milestone_date > self.end_date:
+                raise ValueError('La fecha del hito debe estar dentro del rango del proyecto')
+            self._queue('milestone', line, {
+                'project_id': self.project_id,
+                'name': record['name'],
+                'description': record.get('description'),
+                'date': milestone_date,
+                'completed': _parse_bool(record.get('completed', False)),
+                'responsible_id': self._participant_ref(record.get('responsible'))
+            })
+            return
+
+        if 'start_date' not in record or 'end_date' not in record:
+            raise ValueError('Datos incompletos: faltan start_date o end_date')
+        start_date, end_date = BulkService._parse_dates(record)
+        progress = BulkService._parse_progress(_parse_int(record.get('progress', 0), 'progress'))
+
+        if record_type == 'task':
+            if start_date < self.start_date or end_date > self.end_date:
+                raise ValueError('Las fechas de la tarea deben estar dentro del rango del proyecto')
+            ref = record.get('ref')
+            if ref is not None and ref in self.tasks:
+                raise ValueError(f'Referencia repetida: {ref}')
+            row = {
+                'project_id': self.project_id,
+                'name': record['name'],
+                'description': record.get('description'),
+                'start_date': start_date,
+                'end_date': end_date,
+                'budget': budget,
+                'progress': progress,
+                'completed': progress >= 100 or _parse_bool(record.get('completed', False)),
+                'assignee_id': self._participant_ref(record.get('assignee'))
+            }
+            if ref is not None:
+                self.tasks[ref] = PENDING
+            self.last_task = row
+            self._queue('task', line, row, ref)
+            return
+
+        # Subtarea: la validación contra el rango de la tarea se hace al escribir el lote
+        task = record.get('task')
+        if task is not None:
+            if task not in self.tasks:
+                raise ValueError(f'Tarea no encontrada: {task}')
+        elif self.last_task is None:
+            raise ValueError('La subtarea no indica su tarea y no hay una tarea anterior')
+        self._queue('subtask', line, {
+            'task': task if task is not None else self.last_task,
+            'name': record['name'],
+            'description': record.get('description'),
+            'start_date': start_date,
+            'end_date': end_date,
+            'budget': budget,
+            'progress': progress,
+            'completed': progress >= 100
+        })
+
+    def _task_id(self, task):
+        """ID de la tarea de una subtarea: una ref o la fila de la última tarea"""
+        if isinstance(task, dict):
+            return task.get('id')
+        return self.tasks.get(task)
+
+    def flush(self):
+        """Escribe el lote actual en una transacción"""
+        if not self.batch_rows:
+            return
+        try:
+            created = self._write_batch()
+        except (IntegrityError, DataError) as e:
+            db.session.rollback()
+            self._discard_batch(e)
+        else:
+            for record_type, count in created.items():
+                self.stats['created'][record_type] += count
+
+        # Solo la última tarea se conserva entre lotes (para subtareas sin task)
+        self.batch = {record_type: [] for record_type in IMPORT_TYPES}
+        self.batch_rows = 0
+        self.stats['batches'] += 1
+
+    def _discard_batch(self, error):
+        """Informa un lote revertido y olvida las refs que definía"""
+        for _, _, ref in self.batch['participant']:
+            if ref is not None:
+                self.participants.pop(ref, None)
+        for _, row, ref in self.batch['task']:
+            if ref is not None:
+                self.tasks.pop(ref, None)
+            if row is self.last_task:
+                self.last_task = None
+
+        lines = [line for rows in self.batch.values() for line, _, _ in rows]
+        self.stats['errors'] += len(lines)
+        if len(self.errors) < self.max_errors:
+            self.errors.append({'line': min(lines), 'type': None,
+                                'error': f'Lote no importado (líneas {min(lines)} a {max(lines)}): {error.orig}'})
+
+    def _write_batch(self):
+        """
+        Inserta el lote y confirma la transacción
+
+        Returns:
+            dict: Registros creados por tipo
+        """
+        created = {record_type: 0 for record_type in IMPORT_TYPES}
+
+        # Participantes y tareas primero: los demás registros del lote los referencian
+        participants = self.batch['participant']
+        ids = BulkService._insert(Participant, [row for _, row, _ in participants])
+        for (_, _, ref), participant_id in zip(participants, ids):
+            if ref is not None:
+                self.participants[ref] = participant_id
+        created['participant'] += len(ids)
+
+        tasks = self.batch['task']
+        for _, row, _ in tasks:
+            ref = row['assignee_id']
+            row['assignee_id'] = self.participants[ref] if ref is not None else None
+        ids = BulkService._insert(Task, [row for _, row, _ in tasks])
+        for (_, row, ref), task_id in zip(tasks, ids):
+            row['id'] = task_id
+            if ref is not None:
+                self.tasks[ref] = task_id
+        created['task'] += len(ids)
+        project_delta = (sum(row['progress'] for _, row, _ in tasks), len(ids))
+
+        task_deltas = self._flush_subtasks(created)
+
+        milestones = self.batch['milestone']
+        for _, row, _ in milestones:
+            ref = row['responsible_id']
+            row['responsible_id'] = self.participants[ref] if ref is not None else None
+        created['milestone'] += len(BulkService._insert(Milestone, [row for _, row, _ in milestones]))
+
+        # Incrementos en SQL: otro worker puede escribir en el mismo proyecto a la vez
+        apply_rollup_deltas(db.session.connection(), task_deltas, {self.project_id: project_delta})
+        mark_project_changed(self.project)
+        db.session.commit()
+        return created
+
+    def _flush_subtasks(self, created):
+        """
+        Inserta las subtareas del lote
+
+        Args:
+            created (dict): Registros creados por tipo en el lote
+
+        Returns:
+            dict: {task_id: (delta de suma, delta de cantidad)} de las tareas
+                referenciadas, para apply_rollup_deltas
+        """
+        subtasks = self.batch['subtask']
+        if not subtasks:
+            return {}
+
+        # Rango de las tareas referenciadas, en una consulta
+        task_ids = {self._task_id(row['task']) for _, row, _ in subtasks}
+        tasks = {row.id: row for row in db.session.query(
+            Task.id, Task.start_date, Task.end_date
+        ).filter(Task.project_id == self.project_id, Task.id.in_(task_ids))}
+
+        rows = []
+        task_deltas = {}
+        for line, row, _ in subtasks:
+            task = tasks.get(self._task_id(row.pop('task')))
+            if task is None:
+                self._error(line, {'type': 'subtask'}, 'Tarea no encontrada en este proyecto')
+                continue
+            if row['start_date'] < task.start_date or row['end_date'] > task.end_date:
+                self._error(line, {'type': 'subtask'},
+                            'Las fechas de la subtarea deben estar dentro del rango de la tarea')
+                continue
+            row['task_id'] = task.id
+            rows.append(row)
+            total, count = task_deltas.get(task.id, (0, 0))
+            task_deltas[task.id] = (total + row['progress'], count + 1)
+
+        created['subtask'] += len(BulkService._insert(Subtask, rows))
+        return task_deltas
+
+class ImportService:
+    """Servicio de importación de planes desde archivos CSV o NDJSON"""
+
+    @staticmethod
+    def import_batches(project, stream, format, batch_size=1000):
+        """
+        Importa un archivo a un proyecto leyéndolo en streaming
+
+        Args:
+            project (Project): Proyecto destino
+            stream: Flujo binario con el contenido
+            format (str): 'csv' o 'ndjson'
+            batch_size (int): Filas por transacción
+
+        Yields:
+            dict: Estadísticas acumuladas tras cada lote (filas leídas, lotes,
+                registros creados por tipo y errores)
+
+        Raises:
+            ValueError: Si el formato no es válido
+        """
+        return ProjectImporter(project, batch_size).batches(read_records(stream, format))
+
+    @staticmethod
+    def import_file(project, stream, format, batch_size=1000):
+        """
+        Importa un archivo completo y devuelve las estadísticas finales
+
+        Raises:
+            ValueError: Si el formato no es válido
+        """
+        return ProjectImporter(project, batch_size).run(read_records(stream, format))
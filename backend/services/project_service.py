@@ -1,5 +1,6 @@
 from models import db, Project, Task, Milestone, Participant
 from datetime import datetime
+from sqlalchemy import func, case, select
 
 class ProjectService:
     """Servicio para gestionar proyectos"""
@@ -71,32 +72,71 @@ class ProjectService:
         Returns:
             dict: Estadísticas del proyecto
         """
-        stats = {
-            'total_tasks': 0,
-            'completed_tasks': 0,
-            'pending_tasks': 0,
-            'overdue_tasks': 0,
-            'upcoming_milestones': 0,
-            'total_milestones': 0,
-            'total_participants': 0
-        }
+        task_counts, milestone_counts = ProjectService.statistics_selects(project_id)
+        return ProjectService.build_statistics(
+            db.session.execute(task_counts).one(),
+            db.session.execute(milestone_counts).one()
+        )
+    
+    @staticmethod
+    def statistics_selects(project_id):
+        """
+        Consultas agregadas de las estadísticas de un proyecto
         
-        # Contar tareas
-        tasks = Task.query.filter_by(project_id=project_id).all()
-        stats['total_tasks'] = len(tasks)
-        stats['completed_tasks'] = sum(1 for t in tasks if t.completed)
-        stats['pending_tasks'] = stats['total_tasks'] - stats['completed_tasks']
-        stats['overdue_tasks'] = sum(1 for t in tasks if t.is_overdue)
+        Se ejecutan con una sesión síncrona o asíncrona y sus resultados se
+        combinan con build_statistics.
         
-        # Contar hitos
-        milestones = Milestone.query.filter_by(project_id=project_id).all()
-        stats['total_milestones'] = len(milestones)
-        stats['upcoming_milestones'] = sum(1 for m in milestones if m.is_upcoming)
+        Args:
+            project_id (int): ID del proyecto
+            
+        Returns:
+            tuple: (conteos de tareas, conteos de hitos y participantes)
+        """
+        # Contar tareas con una sola consulta agregada; vencidas y próximos
+        # usan los mismos predicados que los endpoints de consulta
+        task_counts = select(
+            func.count(Task.id),
+            func.count(case((Task.completed.is_(True), 1))),
+            func.count(case((Task.is_overdue, 1)))
+        ).where(Task.project_id == project_id)
         
-        # Contar participantes
-        stats['total_participants'] = Participant.query.filter_by(project_id=project_id).count()
+        # Contar hitos y participantes con una segunda consulta
+        participants_count = select(func.count(Participant.id)).where(
+            Participant.project_id == project_id
+        ).scalar_subquery()
         
-        return stats
+        milestone_counts = select(
+            func.count(Milestone.id),
+            func.count(case((Milestone.is_upcoming, 1))),
+            participants_count
+        ).where(Milestone.project_id == project_id)
+        
+        return task_counts, milestone_counts
+    
+    @staticmethod
+    def build_statistics(task_counts, milestone_counts):
+        """
+        Construye las estadísticas a partir de las filas de statistics_selects
+        
+        Args:
+            task_counts (Row): (total, completadas, vencidas)
+            milestone_counts (Row): (total, próximos, participantes)
+            
+        Returns:
+            dict: Estadísticas del proyecto
+        """
+        total_tasks, completed_tasks, overdue_tasks = task_counts
+        total_milestones, upcoming_milestones, total_participants = milestone_counts
+        
+        return {
+            'total_tasks': total_tasks,
+            'completed_tasks': completed_tasks,
+            'pending_tasks': total_tasks - completed_tasks,
+            'overdue_tasks': overdue_tasks,
+            'upcoming_milestones': upcoming_milestones,
+            'total_milestones': total_milestones,
+            'total_participants': total_participants or 0
+        }
         
     @staticmethod
     def calculate_project_progress(project_id):
@@ -0,0 +1,556 @@
+from models import db, Project, Task, TaskDependency
+from flask import current_app
+from heapq import heapify, heappop, heappush
+from datetime import date
+from utils.cache import TTLCache
+
+class ScheduleCycleError(ValueError):
+    """Se lanza cuando las dependencias forman un ciclo"""
+
+class ProjectSchedule:
+    """
+    Programación por ruta crítica (CPM) de las tareas de un proyecto
+
+    Las fechas se manejan como ordinales de día y las tareas como índices en
+    listas paralelas, de modo que las pasadas hacia adelante y hacia atrás
+    son lineales en tareas más dependencias. Todas las dependencias son
+    fin-a-inicio: el sucesor empieza como mínimo lag_days días después del
+    día de término del predecesor. La fecha planificada de inicio de cada
+    tarea funciona como restricción "no antes de".
+
+    Se mantiene un orden topológico con la posición de cada tarea, lo que
+    permite recalcular solo el subgrafo afectado por un cambio y detectar
+    ciclos al agregar dependencias explorando solo las tareas entre ambas
+    posiciones (algoritmo de Pearce-Kelly).
+    """
+
+    def __init__(self, tasks, dependencies):
+        """
+        Args:
+            tasks (iterable): Tuplas (id, start_date, end_date)
+            dependencies (iterable): Tuplas (predecessor_id, successor_id, lag_days)
+
+        Raises:
+            ScheduleCycleError: Si las dependencias forman un ciclo
+        """
+        tasks = list(tasks)
+        self.ids = [task_id for task_id, _, _ in tasks]
+        self.index = {task_id: node for node, task_id in enumerate(self.ids)}
+        self.start = [start_date.toordinal() for _, start_date, _ in tasks]
+        self.duration = [end_date.toordinal() - start + 1
+                         for (_, _, end_date), start in zip(tasks, self.start)]
+
+        count = len(self.ids)
+        index = self.index
+        preds = self.preds = [[] for _ in range(count)]
+        succs = self.succs = [[] for _ in range(count)]
+        for predecessor_id, successor_id, lag in dependencies:
+            predecessor = index[predecessor_id]
+            successor = index[successor_id]
+            lag = lag or 0
+            preds[successor].append((predecessor, lag))
+            succs[predecessor].append((successor, lag))
+
+        self.order = self._topological_order()
+        self.position = [0] * count
+        for position, node in enumerate(self.order):
+            self.position[node] = position
+
+        self.es = [0] * count
+        self.ef = [0] * count
+        self.ls = [0] * count
+        self.lf = [0] * count
+        self.finish = None
+        self.compute()
+
+    def copy(self):
+        """
+        Copia independiente de la programación
+
+        Returns:
+            ProjectSchedule: Copia que puede modificarse sin afectar a la original
+        """
+        other = ProjectSchedule.__new__(ProjectSchedule)
+        other.ids = list(self.ids)
+        other.index = dict(self.index)
+        for name in ('start', 'duration', 'order', 'position', 'es', 'ef', 'ls', 'lf'):
+            setattr(other, name, list(getattr(self, name)))
+        other.preds = [list(preds) for preds in self.preds]
+        other.succs = [list(succs) for succs in self.succs]
+        other.finish = self.finish
+        return other
+
+    def _topological_order(self):
+        """Orden topológico con el algoritmo de Kahn"""
+        pending = [len(preds) for preds in self.preds]
+        order = [node for node, degree in enumerate(pending) if degree == 0]
+        # La lista crece mientras se recorre
+        for node in order:
+            for successor, _ in self.succs[node]:
+                pending[successor] -= 1
+                if pending[successor] == 0:
+                    order.append(successor)
+        if len(order) != len(self.ids):
+            raise ScheduleCycleError('Las dependencias de las tareas forman un ciclo')
+        return order
+
+    def compute(self):
+        """Recalcula la programación completa"""
+        es, ef, start, duration, preds = self.es, self.ef, self.start, self.duration, self.preds
+        for node in self.order:
+            earliest = start[node]
+            for predecessor, lag in preds[node]:
+                candidate = ef[predecessor] + 1 + lag
+                if candidate > earliest:
+                    earliest = candidate
+            es[node] = earliest
+            ef[node] = earliest + duration[node] - 1
+        self.finish = max(ef) if ef else None
+        self._backward_all()
+
+    def _backward_all(self):
+        ls, lf, duration, succs, finish = self.ls, self.lf, self.duration, self.succs, self.finish
+        for node in reversed(self.order):
+            latest = finish
+            for successor, lag in succs[node]:
+                candidate = ls[successor] - 1 - lag
+                if candidate < latest:
+                    latest = candidate
+            lf[node] = latest
+            ls[node] = latest - duration[node] + 1
+
+    def _forward(self, seeds):
+        """Propaga los inicios tempranos desde seeds, en orden topológico"""
+        es, ef, position = self.es, self.ef, self.position
+        heap = [(position[node], node) for node in seeds]
+        heapify(heap)
+        queued = set(seeds)
+        changed = set()
+        while heap:
+            _, node = heappop(heap)
+            earliest = self.start[node]
+            for predecessor, lag in self.preds[node]:
+                candidate = ef[predecessor] + 1 + lag
+                if candidate > earliest:
+                    earliest = candidate
+            finish = earliest + self.duration[node] - 1
+            if earliest == es[node] and finish == ef[node]:
+                continue
+            es[node] = earliest
+            ef[node] = finish
+            changed.add(node)
+            for successor, _ in self.succs[node]:
+                if successor not in queued:
+                    queued.add(successor)
+                    heappush(heap, (position[successor], successor))
+        return changed
+
+    def _backward(self, seeds):
+        """Propaga los inicios tardíos desde seeds, en orden topológico inverso"""
+        ls, lf, position = self.ls, self.lf, self.position
+        heap = [(-position[node], node) for node in seeds]
+        heapify(heap)
+        queued = set(seeds)
+        changed = set()
+        while heap:
+            _, node = heappop(heap)
+            latest = self.finish
+            for successor, lag in self.succs[node]:
+                candidate = ls[successor] - 1 - lag
+                if candidate < latest:
+                    latest = candidate
+            start = latest - self.duration[node] + 1
+            if latest == lf[node] and start == ls[node]:
+                continue
+            lf[node] = latest
+            ls[node] = start
+            changed.add(node)
+            for predecessor, _ in self.preds[node]:
+                if predecessor not in queued:
+                    queued.add(predecessor)
+                    heappush(heap, (-position[predecessor], predecessor))
+        return changed
+
+    def _propagate(self, forward_seeds, backward_seeds):
+        """
+        Recalcula incrementalmente tras un cambio
+
+        Los inicios tempranos solo cambian aguas abajo de forward_seeds. Si
+        el fin del proyecto no cambia, los inicios tardíos solo cambian aguas
+        arriba de backward_seeds; si cambia, se repite la pasada hacia atrás.
+
+        Returns:
+            set: IDs de las tareas cuya programación cambió
+        """
+        changed = self._forward(forward_seeds)
+        finish = max(self.ef) if self.ef else None
+        if finish != self.finish:
+            self.finish = finish
+            self._backward_all()
+            return set(self.ids)
+        changed |= self._backward(backward_seeds)
+        return {self.ids[node] for node in changed}
+
+    def update_task(self, task_id, start_date, end_date):
+        """
+        Cambia las fechas planificadas de una tarea y recalcula lo afectado
+
+        Args:
+            task_id (int): ID de la tarea
+            start_date (date): Nueva fecha de inicio
+            end_date (date): Nueva fecha de término
+
+        Returns:
+            set: IDs de las tareas cuya programación cambió
+        """
+        node = self.index[task_id]
+        self.start[node] = start_date.toordinal()
+        self.duration[node] = end_date.toordinal() - start_date.toordinal() + 1
+        return self._propagate([node], [node])
+
+    def check_dependency(self, predecessor_id, successor_id):
+        """
+        Valida que una dependencia nueva sea posible
+
+        Args:
+            predecessor_id (int): ID de la tarea predecesora
+            successor_id (int): ID de la tarea sucesora
+
+        Raises:
+            ValueError: Si alguna tarea no existe o la dependencia ya existe
+            ScheduleCycleError: Si la dependencia formaría un ciclo
+        """
+        predecessor, successor = self._dependency_nodes(predecessor_id, successor_id)
+        self._affected_region(predecessor, successor)
+
+    def _dependency_nodes(self, predecessor_id, successor_id):
+        """Obtiene los índices de una dependencia nueva, validando que no exista"""
+        if predecessor_id not in self.index or successor_id not in self.index:
+            raise ValueError('Tarea no encontrada en este proyecto')
+        if predecessor_id == successor_id:
+            raise ScheduleCycleError('Una tarea no puede depender de sí misma')
+        predecessor = self.index[predecessor_id]
+        successor = self.index[successor_id]
+        if any(node == successor for node, _ in self.succs[predecessor]):
+            raise ValueError('La dependencia ya existe')
+        return predecessor, successor
+
+    def _affected_region(self, predecessor, successor):
+        """
+        Obtiene las tareas a reordenar para agregar predecessor -> successor
+
+        Si el predecesor ya está antes en el orden no hay nada que reordenar.
+        Si no, se buscan las tareas alcanzables desde el sucesor y las que
+        alcanzan al predecesor, limitadas a las posiciones entre ambos.
+
+        Returns:
+            tuple: (alcanzables desde el sucesor, que alcanzan al predecesor)
+
+        Raises:
+            ScheduleCycleError: Si el sucesor alcanza al predecesor
+        """
+        position = self.position
+        lower, upper = position[successor], position[predecessor]
+        if lower > upper:
+            return [], []
+
+        forward = [successor]
+        seen = {successor}
+        for node in forward:
+            for next_node, _ in self.succs[node]:
+                if next_node == predecessor:
+                    raise ScheduleCycleError('La dependencia formaría un ciclo')
+                if next_node not in seen and position[next_node] < upper:
+                    seen.add(next_node)
+                    forward.append(next_node)
+
+        backward = [predecessor]
+        seen = {predecessor}
+        for node in backward:
+            for previous, _ in self.preds[node]:
+                if previous not in seen and position[previous] > lower:
+                    seen.add(previous)
+                    backward.append(previous)
+
+        return forward, backward
+
+    def add_dependency(self, predecessor_id, successor_id, lag_days=0):
+        """
+        Agrega una dependencia y recalcula lo afectado
+
+        Args:
+            predecessor_id (int): ID de la tarea predecesora
+            successor_id (int): ID de la tarea sucesora
+            lag_days (int): Días de espera
+
+        Returns:
+            set: IDs de las tareas cuya programación cambió
+
+        Raises:
+            ValueError: Si alguna tarea no existe o la dependencia ya existe
+            ScheduleCycleError: Si la dependencia formaría un ciclo
+        """
+        predecessor, successor = self._dependency_nodes(predecessor_id, successor_id)
+        forward, backward = self._affected_region(predecessor, successor)
+
+        # Reordenar: las que alcanzan al predecesor pasan antes que las
+        # alcanzables desde el sucesor, reutilizando las mismas posiciones
+        if forward:
+            backward.sort(key=self.position.__getitem__)
+            forward.sort(key=self.position.__getitem__)
+            nodes = backward + forward
+            slots = sorted(self.position[node] for node in nodes)
+            for slot, node in zip(slots, nodes):
+                self.position[node] = slot
+                self.order[slot] = node
+
+        lag = lag_days or 0
+        self.preds[successor].append((predecessor, lag))
+        self.succs[predecessor].append((successor, lag))
+        return self._propagate([successor], [predecessor])
+
+    def remove_dependency(self, predecessor_id, successor_id):
+        """
+        Elimina una dependencia y recalcula lo afectado
+
+        Args:
+            predecessor_id (int): ID de la tarea predecesora
+            successor_id (int): ID de la tarea sucesora
+
+        Returns:
+            set: IDs de las tareas cuya programación cambió
+        """
+        predecessor = self.index[predecessor_id]
+        successor = self.index[successor_id]
+        lag = next(lag for node, lag in self.succs[predecessor] if node == successor)
+        self.preds[successor].remove((predecessor, lag))
+        self.succs[predecessor].remove((successor, lag))
+        return self._propagate([successor], [predecessor])
+
+    def critical_path(self):
+        """
+        Obtiene una ruta crítica, desde el inicio hasta el fin del proyecto
+
+        Returns:
+            list: IDs de las tareas de la ruta, en orden
+        """
+        if self.finish is None:
+            return []
+        es, ef, ls = self.es, self.ef, self.ls
+        node = min((node for node in range(len(self.ids)) if ef[node] == self.finish),
+                   key=self.position.__getitem__)
+        path = [node]
+        while True:
+            previous = next((predecessor for predecessor, lag in self.preds[node]
+                             if ls[predecessor] == es[predecessor] and ef[predecessor] + 1 + lag == es[node]), None)
+            if previous is None:
+                break
+            path.append(previous)
+            node = previous
+        return [self.ids[node] for node in reversed(path)]
+
+    def task_schedule(self, task_id):
+        """
+        Serializa la programación de una tarea
+
+        Args:
+            task_id (int): ID de la tarea
+
+        Returns:
+            dict: Fechas tempranas y tardías, holgura y si es crítica
+        """
+        node = self.index[task_id]
+        slack = self.ls[node] - self.es[node]
+        return {
+            'task_id': task_id,
+            'earliest_start': date.fromordinal(self.es[node]).isoformat(),
+            'earliest_finish': date.fromordinal(self.ef[node]).isoformat(),
+            'latest_start': date.fromordinal(self.ls[node]).isoformat(),
+            'latest_finish': date.fromordinal(self.lf[node]).isoformat(),
+            'slack': slack,
+            'critical': slack == 0
+        }
+
+    def to_dict(self, critical_only=False):
+        """
+        Serializa la programación completa, en orden topológico
+
+        Args:
+            critical_only (bool): Incluir solo las tareas críticas
+
+        Returns:
+            dict: Fin del proyecto, ruta crítica y programación de las tareas
+        """
+        nodes = self.order
+        if critical_only:
+            nodes = [node for node in nodes if self.ls[node] == self.es[node]]
+        return {
+            'finish': date.fromordinal(self.finish).isoformat() if self.finish is not None else None,
+            'critical_path': self.critical_path(),
+            'tasks': [self.task_schedule(self.ids[node]) for node in nodes]
+        }
+
+class ScheduleService:
+    """
+    Servicio para las dependencias entre tareas y su programación
+
+    Las programaciones se guardan en caché por proyecto junto con la versión
+    del proyecto. Cuando una escritura hecha por este proceso es la única
+    desde la versión cacheada, la programación se actualiza de forma
+    incremental en lugar de recalcularse desde la base de datos. La
+    actualización se hace sobre una copia: otros hilos pueden estar leyendo
+    la programación cacheada.
+    """
+
+    _schedules = None
+
+    @staticmethod
+    def _cache():
+        if ScheduleService._schedules is None:
+            ScheduleService._schedules = TTLCache(
+                maxsize=current_app.config.get('SCHEDULE_CACHE_SIZE', 16),
+                ttl=current_app.config.get('SCHEDULE_CACHE_TTL', 300)
+            )
+        return ScheduleService._schedules
+
+    @staticmethod
+    def load(project_id):
+        """
+        Construye la programación de un proyecto desde la base de datos
+
+        Args:
+            project_id (int): ID del proyecto
+
+        Returns:
+            ProjectSchedule: Programación calculada
+        """
+        tasks = db.session.query(Task.id, Task.start_date, Task.end_date).filter(
+            Task.project_id == project_id
+        ).order_by(Task.id).all()
+        dependencies = db.session.query(
+            TaskDependency.predecessor_id, TaskDependency.successor_id, TaskDependency.lag_days
+        ).filter(TaskDependency.project_id == project_id).all()
+        # Las dos lecturas no comparten instantánea: si otro proceso borró o creó
+        # una tarea entre ambas se omiten sus dependencias (el cambio también
+        # incrementa la versión del proyecto, así que esta copia no se reutiliza)
+        known = {task_id for task_id, _, _ in tasks}
+        dependencies = [dependency for dependency in dependencies
+                        if dependency[0] in known and dependency[1] in known]
+        return ProjectSchedule(tasks, dependencies)
+
+    @staticmethod
+    def get_schedule(project):
+        """
+        Obtiene la programación vigente de un proyecto
+
+        Args:
+            project (Project): Proyecto
+
+        Returns:
+            ProjectSchedule: Programación para la versión actual del proyecto
+        """
+        cache = ScheduleService._cache()
+        entry = cache.get(project.id)
+        if entry is not None and entry[0] == project.version:
+            return entry[1]
+        schedule = ScheduleService.load(project.id)
+        cache.set(project.id, (project.version, schedule))
+        return schedule
+
+    @staticmethod
+    def _advance(project, previous_version, apply):
+        """
+        Aplica un cambio ya confirmado a la programación cacheada
+
+        Solo se aplica si la programación estaba vigente antes del cambio y
+        ninguna otra escritura ocurrió entre medio; si no, se descarta y se
+        recalculará en la próxima lectura.
+
+        Args:
+            project (Project): Proyecto modificado
+            previous_version (int): Versión del proyecto antes del cambio
+            apply (callable): Recibe una copia de la programación y la actualiza
+        """
+        cache = ScheduleService._cache()
+        entry = cache.get(project.id)
+        if entry is None or project.version == previous_version:
+            return
+        if entry[0] != previous_version or project.version != previous_version + 1:
+            cache.delete(project.id)
+            return
+        schedule = entry[1].copy()
+        try:
+            apply(schedule)
+        except (KeyError, ValueError):
+            # La copia no refleja el cambio (p. ej. otro hilo la reemplazó)
+            cache.delete(project.id)
+            return
+        cache.set(project.id, (project.version, schedule))
+
+    @staticmethod
+    def task_dates_changed(project, previous_version, task):
+        """
+        Actualiza la programación tras cambiar las fechas de una tarea
+
+        Args:
+            project (Project): Proyecto de la tarea
+            previous_version (int): Versión del proyecto antes del cambio
+            task (Task): Tarea modificada (ya confirmada)
+        """
+        ScheduleService._advance(project, previous_version,
+                                 lambda schedule: schedule.update_task(task.id, task.start_date, task.end_date))
+
+    @staticmethod
+    def add_dependency(project, predecessor_id, successor_id, lag_days=0):
+        """
+        Crea una dependencia fin-a-inicio entre dos tareas del proyecto
+
+        Args:
+            project (Project): Proyecto
+            predecessor_id (int): ID de la tarea predecesora
+            successor_id (int): ID de la tarea sucesora
+            lag_days (int): Días de espera tras el fin del predecesor
+
+        Returns:
+            tuple: (dependencia, mensaje de error)
+        """
+        if not isinstance(lag_days, int) or isinstance(lag_days, bool) or lag_days < 0:
+            return None, 'lag_days debe ser un número entero no negativo'
+
+        schedule = ScheduleService.get_schedule(project)
+        try:
+            schedule.check_dependency(predecessor_id, successor_id)
+        except ValueError as e:
+            return None, str(e)
+
+        previous_version = project.version
+        dependency = TaskDependency(
+            project_id=project.id,
+            predecessor_id=predecessor_id,
+            successor_id=successor_id,
+            lag_days=lag_days
+        )
+        db.session.add(dependency)
+        db.session.commit()
+
+        ScheduleService._advance(project, previous_version,
+                                 lambda schedule: schedule.add_dependency(predecessor_id, successor_id, lag_days))
+        return dependency, None
+
+    @staticmethod
+    def remove_dependency(dependency):
+        """
+        Elimina una dependencia
+
+        Args:
+            dependency (TaskDependency): Dependencia a eliminar
+        """
+        project = db.session.get(Project, dependency.project_id)
+        previous_version = project.version
+        predecessor_id, successor_id = dependency.predecessor_id, dependency.successor_id
+
+        db.session.delete(dependency)
+        db.session.commit()
+
+        ScheduleService._advance(project, previous_version,
+                                 lambda schedule: schedule.remove_dependency(predecessor_id, successor_id))
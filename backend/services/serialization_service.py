@@ -0,0 +1,352 @@
+from models import db, Task, Milestone, Participant
+from sqlalchemy import func, select
+
+# Campos que pueden pedirse con ?fields= y las columnas que necesita cada uno;
+# los campos derivados (nombres de participantes) leen solo la columna con el
+# ID y se resuelven con una consulta adicional únicamente si se piden
+TASK_FIELDS = {
+    'id': (Task.id,),
+    'project_id': (Task.project_id,),
+    'name': (Task.name,),
+    'description': (Task.description,),
+    'start_date': (Task.start_date,),
+    'end_date': (Task.end_date,),
+    'progress': (Task.progress,),
+    'budget': (Task.budget,),
+    'assignee_id': (Task.assignee_id,),
+    'assignee_name': (Task.assignee_id,),
+    'completed': (Task.completed,),
+    'created_at': (Task.created_at,),
+    'subtasks_count': (Task.subtasks_count,)
+}
+
+MILESTONE_FIELDS = {
+    'id': (Milestone.id,),
+    'project_id': (Milestone.project_id,),
+    'name': (Milestone.name,),
+    'description': (Milestone.description,),
+    'date': (Milestone.date,),
+    'responsible_id': (Milestone.responsible_id,),
+    'responsible_name': (Milestone.responsible_id,),
+    'completed': (Milestone.completed,),
+    'created_at': (Milestone.created_at,)
+}
+
+def _columns(field_map, fields, extra_columns):
+    """Columnas (sin repetir) que necesitan los campos y las columnas extra"""
+    names = field_map if fields is None else ['id', *fields]
+    columns = {}
+    for name in names:
+        for column in field_map[name]:
+            columns.setdefault(column.key, column)
+    for column in extra_columns:
+        columns.setdefault(column.key, column)
+    return tuple(columns.values())
+
+class SerializationService:
+    """
+    Servicio para serializar listas de modelos en bloque
+
+    Precarga los nombres de participantes y los conteos de relaciones con un
+    número fijo de consultas, en lugar de una consulta por fila desde to_dict()
+
+    Los serializadores de filas (task_query/serialize_task_rows, etc.) leen
+    solo columnas y dejan las fechas como date/datetime: el proveedor JSON de
+    la app (utils/json_provider.py) las codifica en formato ISO 8601. Con
+    fields (ver TASK_FIELDS y MILESTONE_FIELDS) se leen y devuelven solo los
+    campos pedidos; el id se incluye siempre.
+    """
+
+    @staticmethod
+    def task_columns(fields=None, extra_columns=()):
+        """
+        Columnas de tareas que se deben leer para los campos indicados
+
+        Args:
+            fields (list, optional): Campos de TASK_FIELDS (por defecto todos)
+            extra_columns (tuple): Columnas adicionales, p. ej. las de ordenamiento
+
+        Returns:
+            tuple: Columnas sin repetir
+        """
+        return _columns(TASK_FIELDS, fields, extra_columns)
+
+    @staticmethod
+    def milestone_columns(fields=None, extra_columns=()):
+        """
+        Columnas de hitos que se deben leer para los campos indicados
+
+        Args:
+            fields (list, optional): Campos de MILESTONE_FIELDS (por defecto todos)
+            extra_columns (tuple): Columnas adicionales, p. ej. las de ordenamiento
+
+        Returns:
+            tuple: Columnas sin repetir
+        """
+        return _columns(MILESTONE_FIELDS, fields, extra_columns)
+
+    @staticmethod
+    def task_query(fields=None, extra_columns=()):
+        """Consulta de las columnas de tareas para serialize_task_rows"""
+        return db.session.query(*SerializationService.task_columns(fields, extra_columns))
+
+    @staticmethod
+    def milestone_query(fields=None, extra_columns=()):
+        """Consulta de las columnas de hitos para serialize_milestone_rows"""
+        return db.session.query(*SerializationService.milestone_columns(fields, extra_columns))
+
+    @staticmethod
+    def task_select(fields=None, extra_columns=()):
+        """Igual que task_query() pero como select(), para sesiones asíncronas"""
+        return select(*SerializationService.task_columns(fields, extra_columns))
+
+    @staticmethod
+    def milestone_select(fields=None, extra_columns=()):
+        """Igual que milestone_query() pero como select(), para sesiones asíncronas"""
+        return select(*SerializationService.milestone_columns(fields, extra_columns))
+
+    @staticmethod
+    def task_dicts(rows, fields=None, assignee_names=None):
+        """
+        Convierte filas de tareas en diccionarios
+
+        Args:
+            rows (iterable): Filas (Row) de task_query() o task_select()
+            fields (list, optional): Campos a devolver
+            assignee_names (dict, optional): {participant_id: nombre}; si se
+                omite no se agrega assignee_name
+
+        Yields:
+            dict: Datos de cada tarea
+        """
+        keys = None if fields is None else ['id', *fields]
+        for row in rows:
+            item = row._asdict()
+            if 'subtasks_count' in item:
+                item['subtasks_count'] = item['subtasks_count'] or 0
+            if assignee_names is not None:
+                item['assignee_name'] = assignee_names.get(item['assignee_id'])
+            if keys is not None:
+                item = {key: item[key] for key in keys}
+            yield item
+
+    @staticmethod
+    def milestone_dicts(rows, fields=None, responsible_names=None):
+        """
+        Convierte filas de hitos en diccionarios
+
+        Args:
+            rows (iterable): Filas (Row) de milestone_query() o milestone_select()
+            fields (list, optional): Campos a devolver
+            responsible_names (dict, optional): {participant_id: nombre}; si se
+                omite no se agrega responsible_name
+
+        Yields:
+            dict: Datos de cada hito
+        """
+        keys = None if fields is None else ['id', *fields]
+        for row in rows:
+            item = row._asdict()
+            if responsible_names is not None:
+                item['responsible_name'] = responsible_names.get(item['responsible_id'])
+            if keys is not None:
+                item = {key: item[key] for key in keys}
+            yield item
+
+    @staticmethod
+    def serialize_task_rows(rows, fields=None):
+        """
+        Serializa filas de tareas obtenidas con task_query()
+
+        Args:
+            rows (list): Filas (Row) de tareas
+            fields (list, optional): Campos a devolver, los mismos de task_query()
+
+        Returns:
+            list: Lista de diccionarios de tareas
+        """
+        if not rows:
+            return []
+
+        assignee_names = None
+        if fields is None or 'assignee_name' in fields:
+            assignee_names = SerializationService._participant_names_by_id({row.assignee_id for row in rows})
+        return list(SerializationService.task_dicts(rows, fields, assignee_names))
+
+    @staticmethod
+    def serialize_milestone_rows(rows, fields=None):
+        """
+        Serializa filas de hitos obtenidas con milestone_query()
+
+        Args:
+            rows (list): Filas (Row) de hitos
+            fields (list, optional): Campos a devolver, los mismos de milestone_query()
+
+        Returns:
+            list: Lista de diccionarios de hitos
+        """
+        if not rows:
+            return []
+
+        responsible_names = None
+        if fields is None or 'responsible_name' in fields:
+            responsible_names = SerializationService._participant_names_by_id({row.responsible_id for row in rows})
+        return list(SerializationService.milestone_dicts(rows, fields, responsible_names))
+
+    @staticmethod
+    def _participant_names_by_id(participant_ids):
+        """
+        Obtiene los nombres de los participantes indicados
+
+        Args:
+            participant_ids (set): IDs de participantes (se ignora None)
+
+        Returns:
+            dict: {participant_id: nombre}
+        """
+        statement = SerializationService.participant_names_select(participant_ids)
+        if statement is None:
+            return {}
+        return dict(db.session.execute(statement).all())
+
+    @staticmethod
+    def participant_names_select(participant_ids):
+        """
+        Consulta de los nombres de los participantes indicados
+
+        Args:
+            participant_ids (set): IDs de participantes (se ignora None)
+
+        Returns:
+            Select: Consulta de (id, nombre), o None si no hay IDs
+        """
+        participant_ids = {participant_id for participant_id in participant_ids if participant_id is not None}
+        if not participant_ids:
+            return None
+        return select(Participant.id, Participant.name).where(Participant.id.in_(participant_ids))
+
+    @staticmethod
+    def _participant_names(project_ids):
+        """
+        Obtiene los nombres de los participantes de los proyectos indicados
+
+        Args:
+            project_ids (set): IDs de proyectos
+
+        Returns:
+            dict: {participant_id: nombre}
+        """
+        if not project_ids:
+            return {}
+
+        rows = db.session.query(Participant.id, Participant.name).filter(
+            Participant.project_id.in_(project_ids)
+        )
+        return dict(rows.all())
+
+    @staticmethod
+    def serialize_tasks(tasks):
+        """
+        Serializa una lista de tareas
+
+        Args:
+            tasks (list): Tareas a serializar
+
+        Returns:
+            list: Lista de diccionarios de tareas
+        """
+        if not tasks:
+            return []
+
+        project_ids = {task.project_id for task in tasks}
+        assignee_names = SerializationService._participant_names(project_ids)
+
+        return [task.to_dict(assignee_names=assignee_names) for task in tasks]
+
+    @staticmethod
+    def serialize_milestones(milestones):
+        """
+        Serializa una lista de hitos
+
+        Args:
+            milestones (list): Hitos a serializar
+
+        Returns:
+            list: Lista de diccionarios de hitos
+        """
+        if not milestones:
+            return []
+
+        project_ids = {milestone.project_id for milestone in milestones}
+        responsible_names = SerializationService._participant_names(project_ids)
+
+        return [milestone.to_dict(responsible_names=responsible_names) for milestone in milestones]
+
+    @staticmethod
+    def serialize_participants(participants):
+        """
+        Serializa una lista de participantes
+
+        Args:
+            participants (list): Participantes a serializar
+
+        Returns:
+            list: Lista de diccionarios de participantes
+        """
+        if not participants:
+            return []
+
+        project_ids = {participant.project_id for participant in participants}
+
+        tasks_counts = dict(db.session.query(Task.assignee_id, func.count(Task.id)).filter(
+            Task.project_id.in_(project_ids),
+            Task.assignee_id.isnot(None)
+        ).group_by(Task.assignee_id).all())
+
+        milestones_counts = dict(db.session.query(Milestone.responsible_id, func.count(Milestone.id)).filter(
+            Milestone.project_id.in_(project_ids),
+            Milestone.responsible_id.isnot(None)
+        ).group_by(Milestone.responsible_id).all())
+
+        return [participant.to_dict(tasks_counts=tasks_counts, milestones_counts=milestones_counts)
+                for participant in participants]
+
+    @staticmethod
+    def iter_tasks(project_id, batch_size=500, fields=None):
+        """
+        Itera las tareas de un proyecto serializadas, leyendo por lotes
+
+        Args:
+            project_id (int): ID del proyecto
+            batch_size (int): Filas leídas por lote (yield_per)
+            fields (list, optional): Campos de TASK_FIELDS a devolver
+
+        Yields:
+            dict: Datos de cada tarea
+        """
+        assignee_names = None
+        if fields is None or 'assignee_name' in fields:
+            assignee_names = SerializationService._participant_names({project_id})
+        query = SerializationService.task_query(fields).filter(Task.project_id == project_id)
+        rows = query.order_by(Task.id).yield_per(batch_size)
+        yield from SerializationService.task_dicts(rows, fields, assignee_names)
+
+    @staticmethod
+    def iter_milestones(project_id, batch_size=500, fields=None):
+        """
+        Itera los hitos de un proyecto serializados, leyendo por lotes
+
+        Args:
+            project_id (int): ID del proyecto
+            batch_size (int): Filas leídas por lote (yield_per)
+            fields (list, optional): Campos de MILESTONE_FIELDS a devolver
+
+        Yields:
+            dict: Datos de cada hito
+        """
+        responsible_names = None
+        if fields is None or 'responsible_name' in fields:
+            responsible_names = SerializationService._participant_names({project_id})
+        query = SerializationService.milestone_query(fields).filter(Milestone.project_id == project_id)
+        rows = query.order_by(Milestone.id).yield_per(batch_size)
+        yield from SerializationService.milestone_dicts(rows, fields, responsible_names)
@@ -0,0 +1,255 @@
+from models import db, Task, Milestone
+from bisect import bisect_left
+from datetime import date, timedelta
+from itertools import accumulate
+from sqlalchemy import select
+from .serialization_service import SerializationService
+
+# Meses por período de cada vista de la línea de tiempo
+VIEW_PERIOD_MONTHS = {
+    'quarterly': 3,
+    'biannual': 6,
+    'annual': 12
+}
+
+class TimelineService:
+    """
+    Servicio para agrupar la línea de tiempo de un proyecto por períodos
+
+    En lugar de enviar cada tarea al navegador, calcula agregados por período
+    (tareas activas, progreso, presupuesto, hitos). Las fechas se ordenan una
+    vez y cada período se resuelve con búsquedas binarias sobre sumas
+    prefijas, por lo que el costo es O(n log n) en tareas y el tamaño de la
+    respuesta depende solo de la cantidad de períodos.
+    """
+
+    @staticmethod
+    def _add_months(day, months):
+        month_index = day.month - 1 + months
+        return date(day.year + month_index // 12, month_index % 12 + 1, 1)
+
+    @staticmethod
+    def _label(start, view):
+        if view == 'quarterly':
+            return f'Q{(start.month - 1) // 3 + 1} {start.year}'
+        if view == 'biannual':
+            return f'S{(start.month - 1) // 6 + 1} {start.year}'
+        return str(start.year)
+
+    @staticmethod
+    def build_grid(start_date, end_date, view):
+        """
+        Genera los períodos de la vista, igual que timeline.js
+
+        Empieza el primer día del mes de inicio y avanza de a 3, 6 o 12 meses
+        hasta cubrir el fin del proyecto.
+
+        Args:
+            start_date (date): Inicio del proyecto
+            end_date (date): Fin del proyecto
+            view (str): 'quarterly', 'biannual' o 'annual'
+
+        Returns:
+            list: Tuplas (inicio, fin_exclusivo) de cada período
+        """
+        months = VIEW_PERIOD_MONTHS[view]
+        grid = []
+        current = date(start_date.year, start_date.month, 1)
+        while current <= end_date:
+            following = TimelineService._add_months(current, months)
+            grid.append((current, following))
+            current = following
+        return grid
+
+    @staticmethod
+    def _prefix(values):
+        return [0] + list(accumulate(values))
+
+    @staticmethod
+    def bucket_project(project, view):
+        """
+        Calcula los agregados de la línea de tiempo por período
+
+        Una tarea está activa en un período si se cruza con él; se cuenta en
+        cada período que abarca. El presupuesto es la suma del presupuesto de
+        las tareas activas y el progreso su promedio.
+
+        Args:
+            project (Project): Proyecto
+            view (str): 'quarterly', 'biannual' o 'annual'
+
+        Returns:
+            list: Un diccionario por período
+        """
+        tasks, milestones = TimelineService.bucket_selects(project)
+        return TimelineService.aggregate_buckets(
+            project, view, db.session.execute(tasks).all(), db.session.execute(milestones).all()
+        )
+
+    @staticmethod
+    def bucket_selects(project):
+        """
+        Consultas de las columnas que necesita aggregate_buckets
+
+        Args:
+            project (Project): Proyecto
+
+        Returns:
+            tuple: (consulta de tareas, consulta de hitos ordenados por fecha)
+        """
+        # Solo columnas, sin instanciar modelos
+        tasks = select(
+            Task.start_date, Task.end_date, Task.progress, Task.budget, Task.completed
+        ).where(Task.project_id == project.id)
+        milestones = select(
+            Milestone.date, Milestone.completed
+        ).where(Milestone.project_id == project.id).order_by(Milestone.date)
+        return tasks, milestones
+
+    @staticmethod
+    def aggregate_buckets(project, view, tasks, milestones):
+        """
+        Calcula los agregados por período a partir de las filas de bucket_selects
+
+        Args:
+            project (Project): Proyecto
+            view (str): 'quarterly', 'biannual' o 'annual'
+            tasks (list): Filas de tareas
+            milestones (list): Filas de hitos ordenadas por fecha
+
+        Returns:
+            list: Un diccionario por período
+        """
+        grid = TimelineService.build_grid(project.start_date, project.end_date, view)
+
+        by_start = sorted(tasks, key=lambda task: task.start_date)
+        by_end = sorted(tasks, key=lambda task: task.end_date)
+        starts = [task.start_date for task in by_start]
+        ends = [task.end_date for task in by_end]
+
+        # Sumas prefijas de cada métrica en ambos órdenes
+        metrics = {
+            'progress': lambda task: task.progress or 0,
+            'budget': lambda task: task.budget or 0.0,
+            'completed': lambda task: 1 if task.completed else 0
+        }
+        start_prefix = {name: TimelineService._prefix(map(fn, by_start)) for name, fn in metrics.items()}
+        end_prefix = {name: TimelineService._prefix(map(fn, by_end)) for name, fn in metrics.items()}
+
+        milestone_dates = [milestone.date for milestone in milestones]
+        milestone_completed = TimelineService._prefix(1 if milestone.completed else 0 for milestone in milestones)
+
+        buckets = []
+        for index, (bucket_start, bucket_end) in enumerate(grid):
+            # Las tareas activas son las que empezaron antes del fin del
+            # período menos las que terminaron antes de su inicio (estas
+            # últimas siempre están incluidas en las primeras)
+            started = bisect_left(starts, bucket_end)
+            finished = bisect_left(ends, bucket_start)
+            active = started - finished
+
+            sums = {
+                name: start_prefix[name][started] - end_prefix[name][finished]
+                for name in metrics
+            }
+
+            first = bisect_left(milestone_dates, bucket_start)
+            last = bisect_left(milestone_dates, bucket_end)
+
+            buckets.append({
+                'index': index,
+                'label': TimelineService._label(bucket_start, view),
+                'start': bucket_start.isoformat(),
+                'end': (bucket_end - timedelta(days=1)).isoformat(),
+                'active_tasks': active,
+                'completed_tasks': sums['completed'],
+                'progress': int(sums['progress'] / active) if active else 0,
+                'budget': sums['budget'],
+                'milestones': last - first,
+                'completed_milestones': milestone_completed[last] - milestone_completed[first]
+            })
+
+        return buckets
+
+    @staticmethod
+    def bucket_detail(project, view, index, task_fields=None, milestone_fields=None):
+        """
+        Obtiene las tareas y los hitos de un período de la vista
+
+        Args:
+            project (Project): Proyecto
+            view (str): Vista
+            index (int): Índice del período
+            task_fields (list, optional): Campos de las tareas a devolver
+            milestone_fields (list, optional): Campos de los hitos a devolver
+
+        Returns:
+            dict: Período con sus tareas e hitos, o None si el índice no existe
+        """
+        selects = TimelineService.bucket_detail_selects(project, view, index, task_fields, milestone_fields)
+        if selects is None:
+            return None
+        tasks, milestones = (db.session.execute(statement).all() for statement in selects)
+
+        return TimelineService.build_bucket_detail(
+            project, view, index,
+            SerializationService.serialize_task_rows(tasks, task_fields),
+            SerializationService.serialize_milestone_rows(milestones, milestone_fields)
+        )
+
+    @staticmethod
+    def bucket_detail_selects(project, view, index, task_fields=None, milestone_fields=None):
+        """
+        Consultas de las tareas y los hitos de un período de la vista
+
+        Args:
+            project (Project): Proyecto
+            view (str): Vista
+            index (int): Índice del período
+            task_fields (list, optional): Campos de las tareas a devolver
+            milestone_fields (list, optional): Campos de los hitos a devolver
+
+        Returns:
+            tuple: (consulta de tareas, consulta de hitos), o None si el índice no existe
+        """
+        grid = TimelineService.build_grid(project.start_date, project.end_date, view)
+        if index < 0 or index >= len(grid):
+            return None
+        bucket_start, bucket_end = grid[index]
+
+        tasks = SerializationService.task_select(task_fields).where(
+            Task.project_id == project.id,
+            Task.start_date < bucket_end,
+            Task.end_date >= bucket_start
+        ).order_by(Task.start_date, Task.id)
+        milestones = SerializationService.milestone_select(milestone_fields).where(
+            Milestone.project_id == project.id,
+            Milestone.date >= bucket_start,
+            Milestone.date < bucket_end
+        ).order_by(Milestone.date, Milestone.id)
+        return tasks, milestones
+
+    @staticmethod
+    def build_bucket_detail(project, view, index, tasks, milestones):
+        """
+        Construye el detalle de un período con sus tareas e hitos ya serializados
+
+        Args:
+            project (Project): Proyecto
+            view (str): Vista
+            index (int): Índice válido del período
+            tasks (list): Tareas serializadas
+            milestones (list): Hitos serializados
+
+        Returns:
+            dict: Período con sus tareas e hitos
+        """
+        bucket_start, bucket_end = TimelineService.build_grid(project.start_date, project.end_date, view)[index]
+        return {
+            'index': index,
+            'label': TimelineService._label(bucket_start, view),
+            'start': bucket_start.isoformat(),
+            'end': (bucket_end - timedelta(days=1)).isoformat(),
+            'tasks': tasks,
+            'milestones': milestones
+        }
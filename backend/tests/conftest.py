@@ -0,0 +1,102 @@
+import os
+import sys
+
+# La configuración lee el entorno al importarse: base en memoria por prueba
+os.environ['DATABASE_URL'] = 'sqlite://'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from sqlalchemy import event
+
+def _reset_process_caches():
+    """Vacía las cachés del proceso, que sobreviven entre apps"""
+    from services.schedule_service import ScheduleService
+
+    ScheduleService._schedules = None
+
+@pytest.fixture
+def app_config():
+    """Atributos de TestingConfig a reemplazar; un módulo puede redefinirlo"""
+    return {}
+
+@pytest.fixture
+def app(app_config, monkeypatch):
+    from app import create_app
+    from config import TestingConfig
+    from models import db
+
+    for name, value in app_config.items():
+        monkeypatch.setattr(TestingConfig, name, value)
+    _reset_process_caches()
+    app = create_app('testing')
+    yield app
+    with app.app_context():
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+    _reset_process_caches()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+def register(client, email='owner@example.com'):
+    """Registra un usuario y devuelve los encabezados con su token"""
+    response = client.post('/api/auth/register', json={'name': email.split('@')[0], 'email': email,
+                                                       'password': 'secret1'})
+    assert response.status_code == 201, response.get_json()
+    return {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+
+def create_project(client, headers, start_date='2024-01-01', end_date='2024-12-31', name='Proyecto'):
+    response = client.post('/api/projects/', json={'name': name, 'start_date': start_date, 'end_date': end_date},
+                           headers=headers)
+    assert response.status_code == 201, response.get_json()
+    return response.get_json()['project']['id']
+
+def create_task(client, headers, project_id, name='Tarea', start_date='2024-02-01', end_date='2024-03-01', **extra):
+    response = client.post(f'/api/tasks/{project_id}/tasks',
+                           json={'name': name, 'start_date': start_date, 'end_date': end_date, **extra},
+                           headers=headers)
+    assert response.status_code == 201, response.get_json()
+    return response.get_json()['task']['id']
+
+def create_subtask(client, headers, task_id, name='Subtarea', start_date='2024-02-02', end_date='2024-02-10',
+                   **extra):
+    response = client.post(f'/api/tasks/tasks/{task_id}/subtasks',
+                           json={'name': name, 'start_date': start_date, 'end_date': end_date, **extra},
+                           headers=headers)
+    assert response.status_code == 201, response.get_json()
+    return response.get_json()['subtask']['id']
+
+@pytest.fixture
+def headers(client):
+    return register(client)
+
+@pytest.fixture
+def project_id(client, headers):
+    return create_project(client, headers)
+
+class QueryCounter:
+    """Cuenta las sentencias SQL ejecutadas por el motor de la app"""
+
+    def __init__(self, app):
+        from models import db
+
+        self.count = 0
+        with app.app_context():
+            self.engine = db.engine
+        event.listen(self.engine, 'before_cursor_execute', self._count)
+
+    def _count(self, *args, **kwargs):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+@pytest.fixture
+def queries(app):
+    return QueryCounter(app)
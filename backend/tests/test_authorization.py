@@ -0,0 +1,69 @@
+from sqlalchemy import event, text
+from models import db
+from conftest import register, create_project, create_task, create_subtask
+
+def _delete_elsewhere(app, project_id):
+    """Elimina el proyecto sin eventos del ORM, como lo haría otro worker"""
+    with app.app_context():
+        db.session.execute(text('DELETE FROM projects WHERE id = :id'), {'id': project_id})
+        db.session.commit()
+
+def test_other_users_cannot_access_a_project(client, headers, project_id):
+    intruder = register(client, 'intruder@example.com')
+    assert client.get(f'/api/projects/{project_id}', headers=headers).status_code == 200
+    assert client.get(f'/api/projects/{project_id}', headers=intruder).status_code == 404
+    assert client.post(f'/api/tasks/{project_id}/tasks', headers=intruder,
+                       json={'name': 'x', 'start_date': '2024-02-01', 'end_date': '2024-02-02'}).status_code == 404
+
+def test_project_deleted_by_another_worker_returns_404(app, client, headers, project_id):
+    assert client.get(f'/api/projects/{project_id}', headers=headers).status_code == 200
+
+    _delete_elsewhere(app, project_id)
+
+    response = client.post(f'/api/tasks/{project_id}/tasks', headers=headers,
+                           json={'name': 'x', 'start_date': '2024-02-01', 'end_date': '2024-02-02'})
+    assert response.status_code == 404
+    response = client.post(f'/api/tasks/{project_id}/tasks/bulk', headers=headers,
+                           json={'tasks': [{'name': 'x', 'start_date': '2024-02-01', 'end_date': '2024-02-02'}]})
+    assert response.status_code == 404
+
+def test_access_does_not_leak_into_a_reused_project_id(app, client, headers, project_id):
+    assert client.get(f'/api/projects/{project_id}', headers=headers).status_code == 200
+    _delete_elsewhere(app, project_id)
+
+    # SQLite reutiliza el mayor rowid tras eliminarlo
+    other = register(client, 'other@example.com')
+    reused_id = create_project(client, other, name='Ajeno')
+    assert reused_id == project_id
+
+    assert client.get(f'/api/projects/{reused_id}', headers=headers).status_code == 404
+    assert client.get(f'/api/tasks/{reused_id}/tasks', headers=headers).status_code == 404
+    assert client.get(f'/api/projects/{reused_id}', headers=other).status_code == 200
+
+def test_access_check_reuses_the_project_row(app, client, headers, project_id):
+    statements = []
+    with app.app_context():
+        engine = db.engine
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        assert client.get(f'/api/projects/{project_id}/statistics', headers=headers).status_code == 200
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+    # La verificación es la lectura de la fila; la ruta usa la misma instancia
+    assert sum(1 for statement in statements if 'FROM projects' in statement) == 1
+
+def test_subtask_routes_check_the_project_of_the_task(client, headers, project_id):
+    subtask_id = create_subtask(client, headers, create_task(client, headers, project_id))
+    intruder = register(client, 'intruder@example.com')
+
+    assert client.put(f'/api/tasks/subtasks/{subtask_id}', headers=intruder, json={'progress': 10}).status_code == 403
+    assert client.delete(f'/api/tasks/subtasks/{subtask_id}', headers=intruder).status_code == 403
+    assert client.put(f'/api/tasks/subtasks/{subtask_id + 1}', headers=headers, json={'progress': 10}).status_code == 404
+
+    assert client.put(f'/api/tasks/subtasks/{subtask_id}', headers=headers, json={'progress': 10}).status_code == 200
+    assert client.delete(f'/api/tasks/subtasks/{subtask_id}', headers=headers).status_code == 200
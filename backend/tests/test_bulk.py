@@ -0,0 +1,112 @@
+from models import db, Project, Task
+from conftest import create_task, create_subtask
+
+def _patch(client, headers, url, key, items):
+    response = client.patch(url, json={key: items}, headers=headers)
+    return response.status_code, response.get_json()
+
+def _project_progress(client, headers, project_id):
+    return client.get(f'/api/projects/{project_id}', headers=headers).get_json()['project']['progress']
+
+def _task(client, headers, task_id):
+    return client.get(f'/api/tasks/tasks/{task_id}', headers=headers).get_json()['task']
+
+def test_bulk_update_rejects_repeated_tasks(client, headers, project_id):
+    task_id = create_task(client, headers, project_id)
+    other_id = create_task(client, headers, project_id, name='Otra')
+
+    status, data = _patch(client, headers, f'/api/tasks/{project_id}/tasks/bulk', 'tasks',
+                          [{'id': task_id, 'progress': 50}, {'id': task_id, 'progress': 80},
+                           {'id': other_id, 'progress': 30}])
+    assert status == 207
+    assert [result['status'] for result in data['results']] == ['updated', 'error', 'updated']
+    assert 'repetido' in data['results'][1]['error']
+
+    assert _task(client, headers, task_id)['progress'] == 50
+    assert _project_progress(client, headers, project_id) == 40
+
+def test_bulk_update_rejects_repeated_subtasks(client, headers, project_id):
+    task_id = create_task(client, headers, project_id)
+    subtask_id = create_subtask(client, headers, task_id)
+    create_subtask(client, headers, task_id, name='Otra')
+
+    status, data = _patch(client, headers, f'/api/tasks/{project_id}/subtasks/bulk', 'subtasks',
+                          [{'id': subtask_id, 'progress': 60}, {'id': subtask_id, 'progress': 100}])
+    assert status == 207
+    assert data['results'][1]['status'] == 'error'
+
+    # (60 + 0) / 2: el progreso repetido no se acumula dos veces
+    assert _task(client, headers, task_id)['progress'] == 30
+    assert _project_progress(client, headers, project_id) == 30
+
+def test_bulk_rejects_unhashable_ids_per_item(client, headers, project_id):
+    task_id = create_task(client, headers, project_id)
+
+    status, data = _patch(client, headers, f'/api/tasks/{project_id}/tasks/bulk', 'tasks',
+                          [{'id': [task_id], 'progress': 10}, {'id': task_id, 'progress': 20}])
+    assert status == 207
+    assert [result['status'] for result in data['results']] == ['error', 'updated']
+
+    status, data = _patch(client, headers, f'/api/tasks/{project_id}/subtasks/bulk', 'subtasks',
+                          [{'id': {'id': 1}, 'progress': 10}])
+    assert status == 400
+
+    task = {'name': 'x', 'start_date': '2024-02-01', 'end_date': '2024-02-02'}
+    response = client.post(f'/api/tasks/{project_id}/tasks/bulk', headers=headers,
+                           json={'tasks': [{**task, 'assignee_id': [1]}, task]})
+    assert response.status_code == 207
+    assert response.get_json()['results'][0]['error'] == 'Participante asignado no encontrado en este proyecto'
+
+    response = client.post(f'/api/tasks/{project_id}/subtasks/bulk', headers=headers,
+                           json={'subtasks': [{**task, 'task_id': [task_id]}]})
+    assert response.status_code == 400
+    assert response.get_json()['results'][0]['error'] == 'Tarea no encontrada en este proyecto'
+
+def _rollups(app, project_id):
+    """Acumulados guardados y recalculados desde cero de las tareas y el proyecto"""
+    with app.app_context():
+        tasks = db.session.scalars(db.select(Task).filter_by(project_id=project_id).order_by(Task.id)).all()
+        project = db.session.get(Project, project_id)
+        stored = ([(task.subtasks_progress_sum, task.subtasks_count, task.progress) for task in tasks],
+                  (project.tasks_progress_sum, project.tasks_count, project.progress))
+        for task in tasks:
+            task.update_progress()
+        project.update_progress()
+        recomputed = ([(task.subtasks_progress_sum, task.subtasks_count, task.progress) for task in tasks],
+                      (project.tasks_progress_sum, project.tasks_count, project.progress))
+        db.session.rollback()
+    return stored, recomputed
+
+def test_bulk_create_and_update_keep_rollups(app, client, headers, project_id):
+    existing_id = create_task(client, headers, project_id, progress=40)
+    task = {'start_date': '2024-02-01', 'end_date': '2024-03-01'}
+
+    response = client.post(f'/api/tasks/{project_id}/tasks/bulk', headers=headers,
+                           json={'tasks': [{**task, 'name': 'A'}, {**task, 'name': 'B'}]})
+    assert response.status_code == 201
+    data = response.get_json()
+    assert [result['status'] for result in data['results']] == ['created', 'created']
+    assert [result['index'] for result in data['results']] == [0, 1]
+    first_id, second_id = [result['id'] for result in data['results']]
+
+    subtask = {'start_date': '2024-02-02', 'end_date': '2024-02-10'}
+    response = client.post(f'/api/tasks/{project_id}/subtasks/bulk', headers=headers,
+                           json={'subtasks': [{**subtask, 'name': 'a1', 'task_id': first_id},
+                                              {**subtask, 'name': 'a2', 'task_id': first_id},
+                                              {**subtask, 'name': 'b1', 'task_id': second_id}]})
+    assert response.status_code == 201
+    subtask_ids = [result['id'] for result in response.get_json()['results']]
+    assert len(set(subtask_ids)) == 3
+
+    status, data = _patch(client, headers, f'/api/tasks/{project_id}/subtasks/bulk', 'subtasks',
+                          [{'id': subtask_ids[0], 'progress': 100}, {'id': subtask_ids[2], 'progress': 30}])
+    assert status == 200
+    assert [result['id'] for result in data['results']] == [subtask_ids[0], subtask_ids[2]]
+
+    status, _ = _patch(client, headers, f'/api/tasks/{project_id}/tasks/bulk', 'tasks',
+                       [{'id': existing_id, 'progress': 70}])
+    assert status == 200
+
+    stored, recomputed = _rollups(app, project_id)
+    assert stored == recomputed
+    assert stored == ([(0, 0, 70), (100, 2, 50), (30, 1, 30)], (150, 3, 50))
@@ -0,0 +1,46 @@
+import pytest
+from sqlalchemy import text
+from config import Config, ProductionConfig
+from models import db
+from utils.database import engine_options
+from utils.metrics import TimedQueuePool
+
+def _settings(config_class, **overrides):
+    settings = {name: getattr(config_class, name) for name in dir(config_class) if name.isupper()}
+    settings.update(overrides)
+    return settings
+
+@pytest.fixture
+def app_config(tmp_path):
+    return {'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "app.db"}'}
+
+def test_sqlite_connections_apply_the_pragmas(app):
+    with app.app_context():
+        pragmas = {name: db.session.execute(text(f'PRAGMA {name}')).scalar()
+                   for name in ('journal_mode', 'synchronous', 'busy_timeout')}
+    assert pragmas == {'journal_mode': 'wal', 'synchronous': 1, 'busy_timeout': 5000}
+
+def test_sqlite_options_only_set_the_lock_timeout():
+    options = engine_options(_settings(Config, SQLALCHEMY_DATABASE_URI='sqlite:///app.db'))
+    assert options == {'connect_args': {'timeout': 5.0}}
+
+@pytest.mark.parametrize('config_class', [Config, ProductionConfig])
+def test_mysql_options_come_from_the_config_class(config_class):
+    settings = _settings(config_class, SQLALCHEMY_DATABASE_URI='mysql+pymysql://user:secret@db/app',
+                         METRICS_ENABLED=True)
+    options = engine_options(settings)
+    assert options == {
+        'pool_size': config_class.DB_POOL_SIZE,
+        'max_overflow': config_class.DB_MAX_OVERFLOW,
+        'pool_timeout': config_class.DB_POOL_TIMEOUT,
+        'pool_recycle': config_class.DB_POOL_RECYCLE,
+        'pool_pre_ping': config_class.DB_POOL_PRE_PING,
+        'poolclass': TimedQueuePool
+    }
+
+def test_explicit_engine_options_take_precedence():
+    settings = _settings(Config, SQLALCHEMY_DATABASE_URI='mysql+pymysql://user:secret@db/app',
+                         METRICS_ENABLED=False, SQLALCHEMY_ENGINE_OPTIONS={'pool_size': 1})
+    options = engine_options(settings)
+    assert options['pool_size'] == 1
+    assert 'poolclass' not in options
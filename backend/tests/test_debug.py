@@ -0,0 +1,41 @@
+import time
+import pytest
+from utils.json_provider import FastJSONProvider
+from conftest import register
+
+@pytest.fixture
+def app_config():
+    # El primer usuario registrado (ID 1) es administrador. Con json estándar
+    # response() llama a dumps(), y ambos están envueltos por el perfilado
+    return {'PROFILING_ENABLED': True, 'ADMIN_USER_IDS': {1}, 'JSON_BACKEND': 'stdlib'}
+
+@pytest.fixture
+def slow_dumps(monkeypatch):
+    """Hace que codificar JSON domine el tiempo de la solicitud (antes de crear la app)"""
+    dumps = FastJSONProvider.dumps
+
+    def slow(self, obj, **kwargs):
+        time.sleep(0.05)
+        return dumps(self, obj, **kwargs)
+
+    monkeypatch.setattr(FastJSONProvider, 'dumps', slow)
+
+def test_profiles_require_an_admin(client, headers):
+    client.get('/api/projects/', headers=headers)
+    response = client.get('/api/debug/profiles', headers=headers)
+    assert response.status_code == 200
+    assert response.get_json()['count'] >= 1
+
+    other = register(client, 'other@example.com')
+    assert client.get('/api/debug/profiles', headers=other).status_code == 403
+    assert client.get('/api/debug/profiles').status_code == 401
+
+def test_profiled_responses_report_server_timing(client, headers):
+    response = client.get('/api/projects/', headers=headers)
+    assert 'db;' in response.headers['Server-Timing']
+
+def test_serialization_is_counted_once(slow_dumps, client, headers):
+    client.get('/api/projects/', headers=headers)
+    profiles = client.get('/api/debug/profiles', headers=headers, query_string={'limit': 5}).get_json()['profiles']
+    listed = next(item for item in profiles if item['path'] == '/api/projects/')
+    assert 50 <= listed['serialize_ms'] <= listed['total_ms']
@@ -0,0 +1,79 @@
+import csv
+import gzip
+import io
+import json
+import pytest
+from conftest import create_project, create_task, create_subtask
+
+@pytest.fixture
+def app_config():
+    # Lotes pequeños para recorrer varias lecturas por tipo
+    return {'STREAM_BATCH_SIZE': 2}
+
+def _populate(client, headers, project_id):
+    response = client.post(f'/api/participants/{project_id}/participants', headers=headers,
+                           json={'name': 'Ana', 'role': 'collaborator'})
+    participant_id = response.get_json()['participant']['id']
+    for number in range(3):
+        task_id = create_task(client, headers, project_id, name=f'Tarea {number}', assignee_id=participant_id,
+                              budget=number * 1.5)
+        subtask_id = create_subtask(client, headers, task_id, name=f'Subtarea {number}')
+        client.put(f'/api/tasks/subtasks/{subtask_id}', headers=headers, json={'progress': 50})
+    client.post(f'/api/milestones/{project_id}/milestones', headers=headers,
+                json={'name': 'Entrega', 'date': '2024-05-01', 'responsible_id': participant_id})
+
+def _export(client, headers, project_id, format='ndjson', **request_headers):
+    response = client.get(f'/api/projects/{project_id}/export', query_string={'format': format},
+                          headers={**headers, **request_headers})
+    assert response.status_code == 200
+    return response
+
+def _records(body, format):
+    if format == 'csv':
+        return [{key: value for key, value in row.items() if value != ''} for row in csv.DictReader(io.StringIO(body))]
+    return [json.loads(line) for line in body.splitlines()]
+
+def _normalize(records):
+    """Quita IDs y fechas de creación y renombra las refs por orden de aparición"""
+    refs = {}
+    normalized = []
+    for record in records:
+        if record['type'] == 'project':
+            continue
+        record = {key: value for key, value in record.items() if key not in ('id', 'created_at')}
+        for key in ('ref', 'assignee', 'responsible', 'task'):
+            if key in record:
+                record[key] = refs.setdefault(record[key], f'r{len(refs)}')
+        normalized.append(record)
+    return normalized
+
+@pytest.mark.parametrize('format', ['ndjson', 'csv'])
+def test_export_round_trips_through_import(client, headers, project_id, format):
+    _populate(client, headers, project_id)
+    body = _export(client, headers, project_id, format).get_data(as_text=True)
+
+    target_id = create_project(client, headers, name='Copia')
+    response = client.post(f'/api/projects/{target_id}/import', query_string={'format': format}, data=body,
+                           content_type='text/csv' if format == 'csv' else 'application/x-ndjson', headers=headers)
+    assert response.status_code == 201, response.get_json()
+    assert response.get_json()['created'] == {'participant': 1, 'task': 3, 'subtask': 3, 'milestone': 1}
+
+    copy = _export(client, headers, target_id, format).get_data(as_text=True)
+    assert _normalize(_records(copy, format)) == _normalize(_records(body, format))
+
+    source = client.get(f'/api/projects/{project_id}', headers=headers).get_json()['project']
+    target = client.get(f'/api/projects/{target_id}', headers=headers).get_json()['project']
+    assert target['progress'] == source['progress'] == 50
+
+def test_export_is_gzipped_when_accepted(client, headers, project_id):
+    _populate(client, headers, project_id)
+    plain = _export(client, headers, project_id)
+    assert 'Content-Encoding' not in plain.headers
+
+    compressed = _export(client, headers, project_id, **{'Accept-Encoding': 'gzip'})
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert compressed.headers['Vary'] == 'Accept-Encoding'
+    assert gzip.decompress(compressed.get_data()) == plain.get_data()
+
+def test_export_rejects_unknown_formats(client, headers, project_id):
+    assert client.get(f'/api/projects/{project_id}/export?format=xml', headers=headers).status_code == 400
@@ -0,0 +1,94 @@
+from datetime import date, timedelta
+import pytest
+import config
+import models.task
+import models.milestone
+import utils.http_cache
+import utils.response_cache
+from conftest import register, create_project, create_task
+
+class Tomorrow(date):
+    @classmethod
+    def today(cls):
+        return date.today() + timedelta(days=1)
+
+def _next_day(monkeypatch):
+    for module in (models.task, models.milestone, utils.http_cache, utils.response_cache):
+        monkeypatch.setattr(module, 'date', Tomorrow)
+
+def _today(offset=0):
+    return (date.today() + timedelta(days=offset)).isoformat()
+
+@pytest.fixture
+def dated_project(client, headers):
+    project_id = create_project(client, headers, start_date=_today(-30), end_date=_today(30))
+    create_task(client, headers, project_id, name='Vence hoy', start_date=_today(-5), end_date=_today())
+    return project_id
+
+def test_project_get_revalidates_with_etag_and_last_modified(client, headers, project_id):
+    url = f'/api/tasks/{project_id}/tasks'
+    response = client.get(url, headers=headers)
+    assert response.last_modified is not None
+
+    assert client.get(url, headers={**headers, 'If-None-Match': response.headers['ETag']}).status_code == 304
+    assert client.get(url, headers={**headers, 'If-Modified-Since': response.headers['Last-Modified']}).status_code == 304
+
+    create_task(client, headers, project_id)
+    assert client.get(url, headers={**headers, 'If-None-Match': response.headers['ETag']}).status_code == 200
+
+@pytest.mark.parametrize('path', ['/api/tasks/{}/tasks?status=overdue', '/api/projects/{}/statistics'])
+def test_date_dependent_responses_change_with_the_day(client, headers, dated_project, monkeypatch, path):
+    url = path.format(dated_project)
+    response = client.get(url, headers=headers)
+    etag = response.headers['ETag']
+    assert response.last_modified is None
+    assert client.get(url, headers={**headers, 'If-None-Match': etag}).status_code == 304
+
+    _next_day(monkeypatch)
+    response = client.get(url, headers={**headers, 'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    data = response.get_json()
+    if 'tasks' in data:
+        assert [task['name'] for task in data['tasks']] == ['Vence hoy']
+    else:
+        assert data['statistics']['overdue_tasks'] == 1
+
+def test_date_dependent_responses_ignore_if_modified_since(client, headers, dated_project):
+    url = f'/api/milestones/{dated_project}/milestones?upcoming=true'
+    since = client.get(f'/api/projects/{dated_project}', headers=headers).headers['Last-Modified']
+
+    response = client.get(url, headers={**headers, 'If-Modified-Since': since})
+    assert response.status_code == 200
+    assert response.last_modified is None
+
+def test_async_api_uses_the_same_dated_etag(tmp_path, monkeypatch):
+    from starlette.testclient import TestClient
+    from app import create_app
+    from async_api import create_asgi_app
+    from models import db
+
+    monkeypatch.setattr(config.TestingConfig, 'SQLALCHEMY_DATABASE_URI', f'sqlite:///{tmp_path / "app.db"}')
+    app = create_app('testing')
+    try:
+        client = app.test_client()
+        headers = register(client)
+        project_id = create_project(client, headers, start_date=_today(-30), end_date=_today(30))
+        create_task(client, headers, project_id, name='Vence hoy', start_date=_today(-5), end_date=_today())
+
+        with TestClient(create_asgi_app('testing')) as async_client:
+            for path in (f'/api/tasks/{project_id}/tasks?status=overdue', f'/api/projects/{project_id}/statistics',
+                         f'/api/tasks/{project_id}/tasks'):
+                wsgi, asgi = client.get(path, headers=headers), async_client.get(path, headers=headers)
+                assert wsgi.headers['ETag'] == asgi.headers['etag']
+                assert wsgi.headers.get('Last-Modified') == asgi.headers.get('last-modified')
+
+            url = f'/api/projects/{project_id}/statistics'
+            etag = async_client.get(url, headers=headers).headers['etag']
+            assert async_client.get(url, headers={**headers, 'If-None-Match': etag}).status_code == 304
+            _next_day(monkeypatch)
+            assert async_client.get(url, headers={**headers, 'If-None-Match': etag}).status_code == 200
+    finally:
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
@@ -0,0 +1,69 @@
+import json
+import pytest
+from sqlalchemy import text
+from models import db, Project, Task
+from conftest import create_task
+
+@pytest.fixture
+def app_config():
+    return {'IMPORT_BATCH_SIZE': 2}
+
+def _import(client, headers, project_id, records, **params):
+    body = '\n'.join(json.dumps(record) for record in records)
+    response = client.post(f'/api/projects/{project_id}/import', query_string={'format': 'ndjson', **params},
+                           data=body, content_type='application/x-ndjson', headers=headers)
+    return response.status_code, response.get_json()
+
+def _task(name, **extra):
+    return {'type': 'task', 'name': name, 'start_date': '2024-02-01', 'end_date': '2024-03-01', **extra}
+
+def _tasks(app, project_id):
+    with app.app_context():
+        project = db.session.get(Project, project_id)
+        names = sorted(db.session.scalars(db.select(Task.name).filter_by(project_id=project_id)))
+        return names, project.tasks_count, project.progress
+
+def test_import_resolves_references_and_rollups(app, client, headers, project_id):
+    status, result = _import(client, headers, project_id, [
+        {'type': 'participant', 'ref': 'ana', 'name': 'Ana', 'role': 'collaborator'},
+        _task('Diseño', ref='t1', assignee='ana'),
+        {'type': 'subtask', 'task': 't1', 'name': 'Bocetos', 'start_date': '2024-02-02',
+         'end_date': '2024-02-10', 'progress': 50},
+        _task('Construcción', progress=100),
+        {'type': 'milestone', 'name': 'Entrega', 'date': '2024-03-01', 'responsible': 'ana'},
+    ])
+    assert status == 201
+    assert result['created'] == {'participant': 1, 'task': 2, 'subtask': 1, 'milestone': 1}
+    assert result['batches'] == 3
+    assert _tasks(app, project_id) == (['Construcción', 'Diseño'], 2, 75)
+
+def test_batch_size_is_clamped_to_the_configured_maximum(client, headers, project_id):
+    records = [_task(f'Tarea {number}') for number in range(5)]
+    assert _import(client, headers, project_id, records, batch_size=1000)[1]['batches'] == 3
+    status, result = _import(client, headers, project_id, records, batch_size=0)
+    assert status == 201
+    assert result['batches'] == 5
+
+def test_rejected_batch_is_rolled_back_and_reported(app, client, headers, project_id):
+    create_task(client, headers, project_id, name='Existente')
+    with app.app_context():
+        db.session.execute(text("CREATE TRIGGER reject_milestone BEFORE INSERT ON milestones "
+                                "WHEN NEW.name = 'Rechazado' BEGIN SELECT RAISE(ABORT, 'hito rechazado'); END"))
+        db.session.commit()
+
+    status, result = _import(client, headers, project_id, [
+        _task('Primera'), _task('Segunda'),
+        _task('Perdida', ref='t3'), {'type': 'milestone', 'name': 'Rechazado', 'date': '2024-03-01'},
+        {'type': 'subtask', 'task': 't3', 'name': 'Huérfana', 'start_date': '2024-02-02', 'end_date': '2024-02-10'},
+        _task('Última'),
+    ])
+    assert status == 207
+    assert result['created']['task'] == 3
+    assert result['created']['milestone'] == 0
+    assert result['errors'] == 3
+    batch_error, subtask_error = result['error_details']
+    assert batch_error['line'] == 3 and 'hito rechazado' in batch_error['error']
+    assert subtask_error == {'line': 5, 'type': 'subtask', 'error': 'Tarea no encontrada: t3'}
+
+    # Los acumulados del proyecto no incluyen el lote revertido
+    assert _tasks(app, project_id) == (['Existente', 'Primera', 'Segunda', 'Última'], 4, 0)
@@ -0,0 +1,66 @@
+import json
+from datetime import date, datetime
+import pytest
+from flask import Flask
+from utils.json_provider import init_json_provider
+
+BACKENDS = ('stdlib', 'orjson')
+
+PAYLOAD = {
+    'name': 'Planificación',
+    'start_date': date(2024, 1, 2),
+    'created_at': datetime(2024, 1, 2, 3, 4, 5, 600000),
+    'budget': 1.5,
+    'tasks': [{'progress': 10, 'completed': False, 'assignee_id': None}]
+}
+
+def _provider(backend, debug=False):
+    app = Flask(__name__)
+    app.config['JSON_BACKEND'] = backend
+    app.debug = debug
+    init_json_provider(app)
+    return app
+
+def _outputs(backend, obj, **settings):
+    app = _provider(backend, settings.pop('debug', False))
+    for name, value in settings.items():
+        setattr(app.json, name, value)
+    with app.app_context():
+        return app.json.dumps(obj), app.json.response(obj).get_data()
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_dates_use_iso_format(backend):
+    dumped, body = _outputs(backend, PAYLOAD)
+    assert '"start_date":"2024-01-02"' in dumped
+    assert '"created_at":"2024-01-02T03:04:05.600000"' in dumped
+    assert json.loads(body) == json.loads(dumped)
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_output_matches_the_stdlib_provider(backend):
+    assert _outputs(backend, PAYLOAD) == _outputs('stdlib', PAYLOAD)
+    # Claves ordenadas y UTF-8 sin escapes
+    dumped, body = _outputs(backend, PAYLOAD)
+    assert dumped.index('"budget"') < dumped.index('"created_at"') < dumped.index('"name"')
+    assert 'Planificación' in body.decode()
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_sort_keys_can_be_disabled(backend):
+    dumped, body = _outputs(backend, {'b': 1, 'a': 2}, sort_keys=False)
+    assert (dumped, body) == ('{"b":1,"a":2}', b'{"b":1,"a":2}\n')
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_non_str_keys_are_written_as_text(backend):
+    dumped, body = _outputs(backend, {'by_id': {2: 'b', 10: 'a'}})
+    assert json.loads(dumped) == json.loads(body) == {'by_id': {'2': 'b', '10': 'a'}}
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('settings, pretty', [
+    ({}, False),
+    ({'debug': True}, True),
+    ({'compact': False}, True),
+    ({'debug': True, 'compact': True}, False)
+])
+def test_pretty_and_compact_responses(backend, settings, pretty):
+    _, body = _outputs(backend, {'b': [1], 'a': 1}, **settings)
+    expected = '{\n  "a": 1,\n  "b": [\n    1\n  ]\n}\n' if pretty else '{"a":1,"b":[1]}\n'
+    assert body.decode() == expected
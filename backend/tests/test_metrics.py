@@ -0,0 +1,48 @@
+from threading import Thread
+import pytest
+from config import ProductionConfig
+from utils.metrics import Counter, Histogram
+
+@pytest.fixture
+def app_config():
+    return {'METRICS_ENABLED': True, 'METRICS_TOKEN': 'secreto'}
+
+def test_metrics_require_the_token(client, headers):
+    client.get('/api/projects/', headers=headers)
+
+    assert client.get('/metrics').status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer otro'}).status_code == 401
+    response = client.get('/metrics', headers={'Authorization': 'Bearer secreto'})
+    assert response.status_code == 200
+    assert 'http_requests_total{blueprint="projects"' in response.get_data(as_text=True)
+
+def test_production_exposes_metrics_only_with_a_token():
+    assert ProductionConfig.METRICS_ENABLED == bool(ProductionConfig.METRICS_TOKEN)
+
+def _in_threads(fn, count):
+    threads = [Thread(target=fn) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+def test_shards_of_finished_threads_are_folded():
+    counter = Counter('test_total', 'Prueba', ('kind',))
+    histogram = Histogram('test_seconds', 'Prueba', buckets=(1.0,))
+    counter.inc(('main',))
+
+    def work():
+        counter.inc(('thread',), 2)
+        histogram.observe(0.5)
+
+    _in_threads(work, 5)
+    assert counter.samples() == [('', {'kind': 'main'}, 1), ('', {'kind': 'thread'}, 10)]
+    # Solo queda el fragmento del hilo principal, que sigue vivo
+    assert len(counter._shards._live) == 1
+    histogram.samples()
+    assert histogram._shards._live == []
+
+    _in_threads(work, 3)
+    assert counter.samples()[1][2] == 16
+    assert ('_count', {}, 8) in histogram.samples()
+    assert ('_bucket', {'le': '1.0'}, 8) in histogram.samples()
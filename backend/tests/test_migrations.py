@@ -0,0 +1,40 @@
+from datetime import date, timedelta
+from sqlalchemy.dialects import mysql, sqlite
+from migrations import check_indexes, check_schema
+from migrations.explain import HOT_QUERIES, hot_queries, hot_query_params
+from models import db, Task
+from models.milestone import UPCOMING_DAYS
+
+def test_hot_queries_use_their_indexes(app):
+    with app.app_context():
+        results = check_indexes(db.engine)
+    assert [name for name, uses_index, _ in results if not uses_index] == []
+    assert len(results) == len(HOT_QUERIES)
+
+def test_hot_queries_use_the_dialect_pending_condition():
+    """La condición coincide con la que compila Task.completed.isnot(True)"""
+    for dialect in (sqlite.dialect(), mysql.dialect()):
+        compiled = str(Task.completed.isnot(True).compile(dialect=dialect,
+                                                          compile_kwargs={'literal_binds': True}))
+        pending = compiled.split('completed ', 1)[1].upper()
+        for name, sql, _ in hot_queries(dialect.name):
+            assert '{' not in sql, name
+            if 'completed' in sql:
+                assert f'completed {pending}' in sql.replace('subtasks.completed', 'completed'), name
+
+def test_upcoming_query_covers_the_upcoming_window():
+    today = date(2024, 1, 1)
+    params = hot_query_params(today)
+    assert params['upcoming_end'] - params['today'] == timedelta(days=UPCOMING_DAYS)
+    sql = dict((name, sql) for name, sql, _ in hot_queries('sqlite'))['upcoming_milestones']
+    assert ':upcoming_end' in sql
+
+def test_upgrade_stamps_a_created_schema(app):
+    """Sobre un esquema creado con create_all las migraciones solo registran la versión"""
+    from migrations import upgrade, current_version, latest_version
+
+    with app.app_context():
+        assert check_schema(db.engine, db.metadata) != []
+        upgrade(db.engine)
+        assert current_version(db.engine) == latest_version()
+        assert check_schema(db.engine, db.metadata) == []
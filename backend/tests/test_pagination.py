@@ -0,0 +1,43 @@
+from conftest import create_task, create_subtask
+
+def _pages(client, headers, url):
+    items, cursor = [], None
+    while True:
+        response = client.get(url + (f'&cursor={cursor}' if cursor else ''), headers=headers)
+        assert response.status_code == 200, response.get_json()
+        data = response.get_json()
+        items.extend(data['tasks'])
+        cursor = data['next_cursor']
+        if cursor is None:
+            return items
+
+def test_keyset_pages_cover_every_row_once_in_order(client, headers, project_id):
+    # Fechas de término repetidas: el id desempata y el orden es estable
+    for number in range(23):
+        create_task(client, headers, project_id, name=f'Tarea {number}',
+                    end_date=f'2024-03-{1 + number % 4:02d}')
+
+    tasks = _pages(client, headers, f'/api/tasks/{project_id}/tasks?limit=5')
+
+    keys = [(task['end_date'], task['id']) for task in tasks]
+    assert len(keys) == 23
+    assert keys == sorted(keys)
+    assert len(set(keys)) == 23
+
+def test_filters_apply_before_paginating(client, headers, project_id):
+    for number in range(8):
+        task_id = create_task(client, headers, project_id, name=f'Tarea {number}')
+        if number % 2:
+            # Una subtarea al 100% completa la tarea
+            subtask_id = create_subtask(client, headers, task_id)
+            client.put(f'/api/tasks/subtasks/{subtask_id}', json={'progress': 100}, headers=headers)
+
+    completed = _pages(client, headers, f'/api/tasks/{project_id}/tasks?limit=3&status=completed')
+    pending = _pages(client, headers, f'/api/tasks/{project_id}/tasks?limit=3&status=pending')
+    assert len(completed) == len(pending) == 4
+    assert all(task['completed'] for task in completed)
+
+def test_invalid_pagination_arguments_are_rejected(client, headers, project_id):
+    for query in ('limit=0', 'limit=abc', 'cursor=no-es-un-cursor'):
+        response = client.get(f'/api/tasks/{project_id}/tasks?{query}', headers=headers)
+        assert response.status_code == 400, query
@@ -0,0 +1,40 @@
+import time
+from threading import Event
+import pytest
+from werkzeug.security import generate_password_hash
+from utils.password_hasher import PasswordHasher, PasswordHasherBusy
+
+def test_needs_rehash_compares_against_generated_prefix():
+    hasher = PasswordHasher(method='pbkdf2', executor='inline')
+
+    # werkzeug guarda 'pbkdf2' con sus parámetros por defecto
+    assert not hasher.needs_rehash(hasher.hash('secret1'))
+    assert hasher.needs_rehash(generate_password_hash('secret1', 'pbkdf2:sha256:1000'))
+    assert not hasher.needs_rehash(None)
+
+def test_needs_rehash_with_full_method():
+    hasher = PasswordHasher(method='pbkdf2:sha256:1000', executor='inline')
+
+    assert not hasher.needs_rehash(hasher.hash('secret1'))
+    assert hasher.needs_rehash(generate_password_hash('secret1', 'pbkdf2:sha256:2000'))
+
+def test_timed_out_operation_keeps_its_slot_until_it_finishes():
+    hasher = PasswordHasher(executor='thread', workers=1, max_pending=1, timeout=0.05)
+    release = Event()
+    try:
+        with pytest.raises(PasswordHasherBusy):
+            hasher._run(release.wait)
+
+        # La operación sigue en ejecución: el cupo no se liberó con la espera
+        with pytest.raises(PasswordHasherBusy, match='en espera'):
+            hasher._run(lambda: None)
+
+        release.set()
+        deadline = time.monotonic() + 5
+        while not hasher._slots.acquire(timeout=0.01):
+            assert time.monotonic() < deadline
+        hasher._slots.release()
+        assert hasher._run(lambda: 'ok') == 'ok'
+    finally:
+        release.set()
+        hasher.shutdown()
@@ -0,0 +1,77 @@
+from models import db, Project, Task, Subtask
+from conftest import create_task, create_subtask
+
+def _rollups(project_id, task_id):
+    db.session.expire_all()
+    task = db.session.get(Task, task_id)
+    project = db.session.get(Project, project_id)
+    return (task.subtasks_progress_sum, task.subtasks_count, task.progress,
+            project.tasks_progress_sum, project.tasks_count, project.progress)
+
+def _recomputed(project_id, task_id):
+    task = db.session.get(Task, task_id)
+    project = db.session.get(Project, project_id)
+    task.update_progress()
+    project.update_progress()
+    values = (task.subtasks_progress_sum, task.subtasks_count, task.progress,
+              project.tasks_progress_sum, project.tasks_count, project.progress)
+    db.session.rollback()
+    return values
+
+def test_editing_expired_subtask_applies_delta_against_committed_value(app, client, headers, project_id):
+    task_id = create_task(client, headers, project_id)
+    subtask_id = create_subtask(client, headers, task_id)
+    with app.app_context():
+        subtask = db.session.get(Subtask, subtask_id)
+        subtask.progress = 10
+        db.session.commit()
+
+        # Tras el commit la instancia está expirada: progress no está cargado
+        subtask.progress = 50
+        db.session.commit()
+
+        assert _rollups(project_id, task_id) == (50, 1, 50, 50, 1, 50)
+        assert _recomputed(project_id, task_id) == (50, 1, 50, 50, 1, 50)
+
+def test_editing_expired_task_applies_delta_against_committed_value(app, client, headers, project_id):
+    task_id = create_task(client, headers, project_id)
+    other_id = create_task(client, headers, project_id)
+    with app.app_context():
+        task = db.session.get(Task, task_id)
+        task.progress = 40
+        db.session.commit()
+        task.progress = 80
+        db.session.commit()
+
+        project = db.session.get(Project, project_id)
+        assert (project.tasks_progress_sum, project.tasks_count, project.progress) == (80, 2, 40)
+
+def test_moving_expired_subtask_between_tasks(app, client, headers, project_id):
+    first_id = create_task(client, headers, project_id)
+    second_id = create_task(client, headers, project_id)
+    subtask_id = create_subtask(client, headers, first_id, progress=60)
+    with app.app_context():
+        subtask = db.session.get(Subtask, subtask_id)
+        subtask.progress = 60
+        db.session.commit()
+
+        subtask.task_id = second_id
+        db.session.commit()
+
+        db.session.expire_all()
+        first = db.session.get(Task, first_id)
+        second = db.session.get(Task, second_id)
+        assert (first.subtasks_progress_sum, first.subtasks_count) == (0, 0)
+        assert (second.subtasks_progress_sum, second.subtasks_count, second.progress) == (60, 1, 60)
+
+def test_updates_through_api_match_full_recomputation(app, client, headers, project_id):
+    task_id = create_task(client, headers, project_id)
+    subtask_ids = [create_subtask(client, headers, task_id, name=f'Sub {n}') for n in range(3)]
+    for subtask_id, progress in zip(subtask_ids, (10, 50, 100)):
+        response = client.put(f'/api/tasks/subtasks/{subtask_id}', json={'progress': progress}, headers=headers)
+        assert response.status_code == 200
+    client.put(f'/api/tasks/subtasks/{subtask_ids[0]}', json={'progress': 40}, headers=headers)
+    client.delete(f'/api/tasks/subtasks/{subtask_ids[2]}', headers=headers)
+
+    with app.app_context():
+        assert _rollups(project_id, task_id) == _recomputed(project_id, task_id) == (90, 2, 45, 45, 1, 45)
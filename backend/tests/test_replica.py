@@ -0,0 +1,89 @@
+import pytest
+from sqlalchemy import event
+from models import db
+from utils.replica import STICKY_COOKIE, sync_sqlite_replica
+from conftest import register, create_project
+
+@pytest.fixture
+def app_config(tmp_path):
+    return {'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "primary.db"}',
+            'SQLALCHEMY_REPLICA_URI': f'sqlite:///{tmp_path / "replica.db"}'}
+
+@pytest.fixture
+def binds(app):
+    """Motores ('primary' o 'replica') de cada sentencia ejecutada"""
+    used = []
+    with app.app_context():
+        for key, engine in db.engines.items():
+            event.listen(engine, 'before_cursor_execute',
+                         lambda *args, name=key or 'primary', **kwargs: used.append(name))
+    return used
+
+@pytest.fixture
+def synced(app):
+    """Sincroniza la réplica y la agrega al enrutamiento (la app se creó con la réplica vacía)"""
+    from utils.replica import init_replica
+    with app.app_context():
+        sync_sqlite_replica()
+    init_replica(app)
+    return lambda: _sync(app)
+
+def _sync(app):
+    with app.app_context():
+        sync_sqlite_replica()
+    # Otro worker: sin cookie ni registro de escrituras recientes
+    app.extensions['replica'].clear()
+
+def _read(client, headers, used, url='/api/projects/'):
+    used.clear()
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    return response.get_json(), set(used)
+
+def test_unsynced_replica_is_not_used(app, client, binds):
+    # La app se creó con la réplica vacía: las lecturas siguen en el primario
+    assert 'replica' not in app.extensions
+    headers = register(client)
+    create_project(client, headers)
+    data, used = _read(app.test_client(), headers, binds)
+    assert len(data['projects']) == 1
+    assert used == {'primary'}
+
+def test_reads_go_to_the_replica_after_a_sync(app, client, binds, synced):
+    headers = register(client)
+    create_project(client, headers)
+    synced()
+
+    reader = app.test_client()
+    data, used = _read(reader, headers, binds)
+    assert len(data['projects']) == 1
+    assert used == {'replica'}
+
+def test_reads_after_a_write_go_to_the_primary(app, client, binds, synced):
+    headers = register(client)
+    synced()
+    create_project(client, headers)
+    assert client.get_cookie(STICKY_COOKIE) is not None
+
+    # El mismo cliente (cookie) y el mismo usuario desde otro cliente (TTLCache)
+    for reader in (client, app.test_client()):
+        data, used = _read(reader, headers, binds)
+        assert len(data['projects']) == 1
+        assert used == {'primary'}
+
+    # Vencida la marca de escritura del usuario, otro cliente lee la réplica sin sincronizar
+    app.extensions['replica'].clear()
+    data, used = _read(app.test_client(), headers, binds)
+    assert data['projects'] == []
+    assert used == {'replica'}
+
+def test_writes_always_use_the_primary(app, client, binds, synced):
+    headers = register(client)
+    synced()
+    binds.clear()
+    project_id = create_project(client, headers)
+    assert set(binds) == {'primary'}
+
+    binds.clear()
+    assert client.delete(f'/api/projects/{project_id}', headers=headers).status_code == 200
+    assert set(binds) == {'primary'}
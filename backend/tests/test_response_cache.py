@@ -0,0 +1,86 @@
+import pytest
+from utils.response_cache import LRUResponseCache
+from conftest import register, create_task, create_subtask
+
+@pytest.fixture
+def app_config():
+    # El primer usuario registrado (ID 1) es administrador
+    return {'ADMIN_USER_IDS': {1}}
+
+def _get(client, headers, url):
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    return response.headers.get('X-Cache'), response.get_json()
+
+def _stats(client, headers):
+    response = client.get('/api/cache/stats', headers=headers)
+    assert response.status_code == 200
+    return response.get_json()
+
+def test_stats_require_an_admin(client, headers):
+    other = register(client, 'other@example.com')
+    assert client.get('/api/cache/stats', headers=other).status_code == 403
+    assert client.get('/api/cache/stats').status_code == 401
+    assert 'hits' in _stats(client, headers)
+
+def test_repeated_gets_are_served_from_cache(client, headers, project_id):
+    create_task(client, headers, project_id)
+    url = f'/api/tasks/{project_id}/tasks?status=pending&limit=5'
+
+    state, body = _get(client, headers, url)
+    assert state == 'MISS'
+    assert _get(client, headers, url) == ('HIT', body)
+    # El orden de los parámetros no cambia la clave
+    assert _get(client, headers, f'/api/tasks/{project_id}/tasks?limit=5&status=pending') == ('HIT', body)
+    assert _get(client, headers, f'/api/tasks/{project_id}/tasks?limit=4')[0] == 'MISS'
+
+    stats = _stats(client, headers)
+    assert (stats['hits'], stats['misses'], stats['entries']) == (2, 2, 2)
+
+def test_writes_invalidate_the_project_responses(client, headers, project_id):
+    task_id = create_task(client, headers, project_id)
+    subtask_id = create_subtask(client, headers, task_id)
+    url = f'/api/tasks/{project_id}/tasks'
+    _get(client, headers, url)
+
+    writes = [
+        lambda: client.put(f'/api/tasks/tasks/{task_id}', headers=headers, json={'name': 'Renombrada'}),
+        lambda: client.put(f'/api/tasks/subtasks/{subtask_id}', headers=headers, json={'progress': 40}),
+        lambda: client.patch(f'/api/tasks/{project_id}/tasks/bulk', headers=headers,
+                             json={'tasks': [{'id': task_id, 'budget': 10}]}),
+        lambda: create_task(client, headers, project_id, name='Nueva'),
+    ]
+    for write in writes:
+        write()
+        state, body = _get(client, headers, url)
+        assert state == 'MISS'
+        assert _get(client, headers, url) == ('HIT', body)
+
+    tasks = {task['name']: task for task in body['tasks']}
+    assert set(tasks) == {'Renombrada', 'Nueva'}
+    assert tasks['Renombrada']['progress'] == 40 and tasks['Renombrada']['budget'] == 10
+    assert _stats(client, headers)['invalidations'] >= len(writes)
+
+def test_cached_responses_still_check_access(client, headers, project_id):
+    url = f'/api/projects/{project_id}'
+    _get(client, headers, url)
+    intruder = register(client, 'intruder@example.com')
+    assert client.get(url, headers=intruder).status_code == 404
+
+def test_lru_backend_is_bounded_by_entries_and_bytes():
+    cache = LRUResponseCache(maxsize=2, max_bytes=10)
+    cache.set('a', 1, (b'1234', 'application/json'))
+    cache.set('b', 1, (b'1234', 'application/json'))
+    cache.get('a')
+    cache.set('c', 2, (b'1234', 'application/json'))
+    # 'b' es la menos usada; luego el límite de bytes desaloja 'c'
+    assert cache.get('b') is None and cache.get('a') is not None
+    cache.set('d', 2, (b'123456', 'application/json'))
+    assert cache.get('c') is None
+    assert cache.size() == (2, 10)
+
+    cache.set('big', 3, (b'x' * 11, 'application/json'))
+    assert cache.get('big') is None
+
+    cache.delete_project(2)
+    assert cache.size() == (1, 4)
@@ -0,0 +1,57 @@
+from datetime import date
+import pytest
+from sqlalchemy.orm import Session
+from models import db, Project, Task, Subtask
+from conftest import create_task
+
+# Dos sesiones sobre una base en archivo simulan dos workers que escriben a la vez
+
+@pytest.fixture
+def app_config(tmp_path):
+    return {'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "app.db"}'}
+
+def _subtask(task_id, progress):
+    return Subtask(task_id=task_id, name=f'Subtarea {progress}', progress=progress,
+                   start_date=date(2024, 2, 2), end_date=date(2024, 2, 10))
+
+def test_concurrent_subtasks_do_not_lose_rollup_updates(app, client, headers, project_id):
+    task_id = create_task(client, headers, project_id)
+    with app.app_context():
+        first, second = Session(db.engine), Session(db.engine)
+        try:
+            # Ambas sesiones leen la tarea antes de que la otra escriba (se conservan las
+            # referencias: el mapa de identidad es débil)
+            loaded = [first.get(Task, task_id), second.get(Task, task_id)]
+            assert [task.subtasks_count for task in loaded] == [0, 0]
+
+            first.add(_subtask(task_id, 100))
+            second.add(_subtask(task_id, 0))
+            first.commit()
+            second.commit()
+        finally:
+            first.close()
+            second.close()
+
+        task = db.session.get(Task, task_id)
+        project = db.session.get(Project, project_id)
+        assert (task.subtasks_progress_sum, task.subtasks_count, task.progress) == (100, 2, 50)
+        assert (project.tasks_progress_sum, project.tasks_count, project.progress) == (50, 1, 50)
+
+def test_concurrent_tasks_do_not_lose_project_rollup_updates(app, client, headers, project_id):
+    with app.app_context():
+        first, second = Session(db.engine), Session(db.engine)
+        try:
+            loaded = [first.get(Project, project_id), second.get(Project, project_id)]
+            assert [project.tasks_count for project in loaded] == [0, 0]
+
+            for session, progress in ((first, 80), (second, 20)):
+                session.add(Task(project_id=project_id, name=f'Tarea {progress}', progress=progress,
+                                 start_date=date(2024, 2, 1), end_date=date(2024, 3, 1)))
+            first.commit()
+            second.commit()
+        finally:
+            first.close()
+            second.close()
+
+        project = db.session.get(Project, project_id)
+        assert (project.tasks_progress_sum, project.tasks_count, project.progress) == (100, 2, 50)
@@ -0,0 +1,89 @@
+from sqlalchemy import text
+from models import db, Project
+from services.schedule_service import ScheduleService
+from conftest import create_task
+
+def _add_dependency(client, headers, project_id, predecessor_id, successor_id, lag_days=0):
+    return client.post(f'/api/tasks/{project_id}/dependencies', headers=headers,
+                       json={'predecessor_id': predecessor_id, 'successor_id': successor_id, 'lag_days': lag_days})
+
+def _schedule(client, headers, project_id):
+    response = client.get(f'/api/tasks/{project_id}/schedule', headers=headers)
+    assert response.status_code == 200
+    data = response.get_json()
+    return data, {task['task_id']: task for task in data['tasks']}
+
+def _setup(client, headers, project_id):
+    first = create_task(client, headers, project_id, name='A', start_date='2024-02-01', end_date='2024-02-10')
+    second = create_task(client, headers, project_id, name='B', start_date='2024-02-05', end_date='2024-02-14')
+    loose = create_task(client, headers, project_id, name='C', start_date='2024-02-01', end_date='2024-02-03')
+    assert _add_dependency(client, headers, project_id, first, second, lag_days=2).status_code == 201
+    return first, second, loose
+
+def test_schedule_computes_critical_path(client, headers, project_id):
+    first, second, loose = _setup(client, headers, project_id)
+    data, tasks = _schedule(client, headers, project_id)
+
+    assert tasks[second]['earliest_start'] == '2024-02-13'
+    assert data['finish'] == tasks[second]['earliest_finish'] == '2024-02-22'
+    assert data['critical_path'] == [first, second]
+    assert tasks[first]['critical'] and tasks[second]['critical']
+    assert tasks[loose]['slack'] == 19 and not tasks[loose]['critical']
+
+def test_dependencies_reject_cycles(client, headers, project_id):
+    first, second, loose = _setup(client, headers, project_id)
+    assert _add_dependency(client, headers, project_id, second, loose).status_code == 201
+
+    assert _add_dependency(client, headers, project_id, loose, first).status_code == 400
+    assert _add_dependency(client, headers, project_id, first, first).status_code == 400
+    assert _add_dependency(client, headers, project_id, first, second).status_code == 400
+
+def test_incremental_updates_match_a_full_load(app, client, headers, project_id):
+    first, second, loose = _setup(client, headers, project_id)
+    _schedule(client, headers, project_id)
+
+    _add_dependency(client, headers, project_id, loose, second)
+    client.put(f'/api/tasks/tasks/{first}', headers=headers, json={'start_date': '2024-02-03', 'end_date': '2024-02-20'})
+    dependency_id = client.get(f'/api/tasks/{project_id}/dependencies', headers=headers).get_json()['dependencies'][0]['id']
+    assert client.delete(f'/api/tasks/dependencies/{dependency_id}', headers=headers).status_code == 200
+
+    data, _ = _schedule(client, headers, project_id)
+    with app.app_context():
+        expected = ScheduleService.load(project_id).to_dict()
+    assert {**data, 'tasks': sorted(data['tasks'], key=lambda task: task['task_id'])} == \
+        {'project_id': project_id, **expected, 'tasks': sorted(expected['tasks'], key=lambda task: task['task_id'])}
+
+def test_cached_schedule_is_not_modified_in_place(app, client, headers, project_id):
+    first, second, _ = _setup(client, headers, project_id)
+    with app.test_request_context():
+        cached = ScheduleService.get_schedule(db.session.get(Project, project_id))
+        before = cached.to_dict()
+
+    client.put(f'/api/tasks/tasks/{first}', headers=headers, json={'end_date': '2024-02-12'})
+
+    assert cached.to_dict() == before
+    _, tasks = _schedule(client, headers, project_id)
+    assert tasks[second]['earliest_start'] == '2024-02-15'
+
+def test_load_skips_dependencies_of_tasks_not_read(app, client, headers, project_id):
+    first, second, _ = _setup(client, headers, project_id)
+    with app.app_context():
+        # Como si otro proceso hubiera borrado la tarea entre ambas lecturas
+        db.session.execute(text('DELETE FROM tasks WHERE id = :id'), {'id': first})
+        schedule = ScheduleService.load(project_id)
+    assert first not in schedule.index
+    assert schedule.task_schedule(second)['earliest_start'] == '2024-02-05'
+
+def test_schedule_reports_cycles_saved_concurrently(app, client, headers, project_id):
+    first, second, _ = _setup(client, headers, project_id)
+    # Otro worker insertó el lado opuesto sin ver la primera dependencia
+    with app.app_context():
+        db.session.execute(text('INSERT INTO task_dependencies (project_id, predecessor_id, successor_id, lag_days) '
+                                'VALUES (:project_id, :second, :first, 0)'),
+                           {'project_id': project_id, 'first': first, 'second': second})
+        db.session.execute(text('UPDATE projects SET version = version + 1 WHERE id = :id'), {'id': project_id})
+        db.session.commit()
+
+    response = client.get(f'/api/tasks/{project_id}/schedule', headers=headers)
+    assert response.status_code == 409
+    assert response.get_json()['error'] == 'Las dependencias de las tareas forman un ciclo'
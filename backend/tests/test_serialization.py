@@ -0,0 +1,100 @@
+from sqlalchemy import event
+from models import db
+from conftest import create_project, create_task, create_subtask
+
+def _populate(client, headers, project_id, count):
+    response = client.post(f'/api/participants/{project_id}/participants',
+                           json={'name': 'Ana', 'role': 'collaborator'}, headers=headers)
+    participant_id = response.get_json()['participant']['id']
+    for number in range(count):
+        task_id = create_task(client, headers, project_id, name=f'Tarea {number}', assignee_id=participant_id)
+        create_subtask(client, headers, task_id)
+        client.post(f'/api/milestones/{project_id}/milestones',
+                    json={'name': f'Hito {number}', 'date': '2024-05-01', 'responsible_id': participant_id},
+                    headers=headers)
+
+def _count_queries(client, headers, queries, url):
+    with queries:
+        response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    return queries.count, response.get_json()
+
+def test_list_queries_do_not_grow_with_rows(client, headers, queries):
+    """Los listados cargan las relaciones por lotes: sin N+1"""
+    small = create_project(client, headers, name='Pequeño')
+    large = create_project(client, headers, name='Grande')
+    _populate(client, headers, small, 2)
+    _populate(client, headers, large, 12)
+
+    for path in ('/api/tasks/{}/tasks', '/api/milestones/{}/milestones', '/api/projects/{}/timeline',
+                 '/api/participants/{}/participants'):
+        small_count, _ = _count_queries(client, headers, queries, path.format(small))
+        large_count, _ = _count_queries(client, headers, queries, path.format(large))
+        assert large_count == small_count, path
+
+def test_task_list_includes_related_data(client, headers, project_id, queries):
+    _populate(client, headers, project_id, 3)
+    _, data = _count_queries(client, headers, queries, f'/api/tasks/{project_id}/tasks')
+
+    assert len(data['tasks']) == 3
+    for task in data['tasks']:
+        assert task['assignee_name'] == 'Ana'
+        assert task['subtasks_count'] == 1
+
+def _statements(app, client, headers, url):
+    """Sentencias SQL ejecutadas por una solicitud"""
+    statements = []
+    with app.app_context():
+        engine = db.engine
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        response = client.get(url, headers=headers)
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+    return response, statements
+
+def _task_selects(statements):
+    return [statement for statement in statements if 'FROM tasks' in statement]
+
+def _participant_selects(statements):
+    return [statement for statement in statements if 'FROM participants' in statement]
+
+def test_fields_select_only_the_requested_columns(app, client, headers, project_id):
+    _populate(client, headers, project_id, 2)
+    response, statements = _statements(app, client, headers,
+                                       f'/api/tasks/{project_id}/tasks?fields=name,progress')
+    assert response.status_code == 200
+    assert all(set(task) == {'id', 'name', 'progress'} for task in response.get_json()['tasks'])
+
+    [select] = _task_selects(statements)
+    columns = select.split(' FROM ')[0]
+    assert 'tasks.name' in columns and 'tasks.progress' in columns
+    # La columna de ordenamiento se lee aunque no se devuelva; la descripción no
+    assert 'tasks.end_date' in columns
+    for column in ('tasks.description', 'tasks.budget', 'tasks.assignee_id', 'tasks.created_at'):
+        assert column not in columns
+    assert _participant_selects(statements) == []
+
+def test_assignee_name_adds_one_participant_query(app, client, headers, project_id):
+    _populate(client, headers, project_id, 3)
+    response, statements = _statements(app, client, headers,
+                                       f'/api/tasks/{project_id}/tasks?fields=assignee_name')
+    assert response.status_code == 200
+    assert [task['assignee_name'] for task in response.get_json()['tasks']] == ['Ana'] * 3
+    assert 'assignee_id' not in response.get_json()['tasks'][0]
+    assert len(_participant_selects(statements)) == 1
+
+    _, statements = _statements(app, client, headers, f'/api/tasks/{project_id}/tasks?fields=assignee_id')
+    assert _participant_selects(statements) == []
+
+def test_unknown_fields_are_rejected(client, headers, project_id):
+    for url in (f'/api/tasks/{project_id}/tasks?fields=name,password',
+                f'/api/projects/{project_id}/timeline?fields=secret',
+                f'/api/projects/{project_id}/timeline?milestone_fields=name,secret'):
+        response = client.get(url, headers=headers)
+        assert response.status_code == 400, url
+        assert 'Campos inválidos' in response.get_json()['error']
@@ -0,0 +1,79 @@
+import pytest
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import Engine
+from config import TestingConfig
+from models import db
+
+@pytest.fixture
+def make_app(tmp_path, monkeypatch):
+    """Crea apps sobre una base en archivo con el modo de esquema indicado"""
+    from app import create_app
+
+    uri = f'sqlite:///{tmp_path / "app.db"}'
+    monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', uri)
+    apps = []
+
+    def make(schema_mode, **config):
+        monkeypatch.setattr(TestingConfig, 'SCHEMA_ON_STARTUP', schema_mode)
+        for name, value in config.items():
+            monkeypatch.setattr(TestingConfig, name, value)
+        app = create_app('testing')
+        apps.append(app)
+        return app
+
+    make.uri = uri
+    yield make
+    for app in apps:
+        with app.app_context():
+            db.engine.dispose()
+
+def _tables(uri):
+    engine = create_engine(uri)
+    try:
+        return set(inspect(engine).get_table_names())
+    finally:
+        engine.dispose()
+
+def test_check_rejects_a_missing_schema(make_app):
+    with pytest.raises(RuntimeError, match='Faltan tablas'):
+        make_app('check')
+
+def test_check_rejects_an_unstamped_schema(make_app):
+    make_app('create')
+    with pytest.raises(RuntimeError, match='versión 0'):
+        make_app('check')
+
+def test_check_accepts_an_upgraded_schema(make_app):
+    from migrations import upgrade
+
+    app = make_app('create')
+    with app.app_context():
+        upgrade(db.engine)
+    make_app('check')
+
+def test_skip_issues_no_ddl(make_app):
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(Engine, 'before_cursor_execute', record)
+    try:
+        make_app('skip')
+    finally:
+        event.remove(Engine, 'before_cursor_execute', record)
+
+    ddl = [statement for statement in statements if statement.lstrip().upper().startswith(('CREATE', 'ALTER', 'DROP'))]
+    assert ddl == []
+    assert _tables(make_app.uri) == set()
+
+def test_warmup_runs_against_an_empty_database(make_app, monkeypatch):
+    import utils.warmup as warmup_module
+
+    elapsed = []
+    warmup = warmup_module.warmup
+    monkeypatch.setattr(warmup_module, 'warmup', lambda app: elapsed.append(warmup(app)))
+    # create_app importa warmup al ejecutarse: toma la versión reemplazada
+    app = make_app('create', WARMUP_ON_STARTUP=True)
+    assert len(elapsed) == 1
+    assert app.test_client().get('/api/projects/').status_code == 401
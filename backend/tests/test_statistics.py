@@ -0,0 +1,37 @@
+from datetime import date, timedelta
+import models.milestone
+from conftest import create_project, create_task
+
+def _day(offset):
+    return (date.today() + timedelta(days=offset)).isoformat()
+
+def _statistics(client, headers, project_id):
+    response = client.get(f'/api/projects/{project_id}/statistics', headers=headers)
+    assert response.status_code == 200
+    return response.get_json()['statistics']
+
+def _setup(client, headers):
+    project_id = create_project(client, headers, start_date=_day(-60), end_date=_day(60))
+    for offset in (-1, 0, 3, 7, 8):
+        client.post(f'/api/milestones/{project_id}/milestones',
+                    json={'name': f'Hito {offset}', 'date': _day(offset)}, headers=headers)
+    create_task(client, headers, project_id, name='Vencida', start_date=_day(-30), end_date=_day(-1))
+    create_task(client, headers, project_id, name='Al día', start_date=_day(-30), end_date=_day(0))
+    return project_id
+
+def test_statistics_match_query_endpoints(client, headers):
+    project_id = _setup(client, headers)
+    statistics = _statistics(client, headers, project_id)
+
+    upcoming = client.get(f'/api/milestones/{project_id}/milestones/upcoming', headers=headers).get_json()
+    overdue = client.get(f'/api/tasks/{project_id}/tasks/overdue', headers=headers).get_json()
+    assert statistics['upcoming_milestones'] == len(upcoming['milestones']) == 3
+    assert statistics['overdue_tasks'] == len(overdue['tasks']) == 1
+    assert statistics['total_milestones'] == 5
+    assert statistics['total_tasks'] == 2
+
+def test_statistics_use_shared_upcoming_window(client, headers, monkeypatch):
+    project_id = _setup(client, headers)
+    monkeypatch.setattr(models.milestone, 'UPCOMING_DAYS', 3)
+
+    assert _statistics(client, headers, project_id)['upcoming_milestones'] == 2
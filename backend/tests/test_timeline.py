@@ -0,0 +1,144 @@
+import json
+from datetime import date
+import pytest
+from models import db, Task, Milestone
+from services.timeline_service import TimelineService
+from conftest import create_task
+
+def _starts(grid):
+    return [start.isoformat() for start, _ in grid]
+
+@pytest.mark.parametrize('view, starts', [
+    ('quarterly', ['2024-02-01', '2024-05-01', '2024-08-01', '2024-11-01', '2025-02-01']),
+    ('biannual', ['2024-02-01', '2024-08-01', '2025-02-01']),
+    ('annual', ['2024-02-01', '2025-02-01'])
+])
+def test_grid_starts_on_the_first_day_of_the_start_month(view, starts):
+    grid = TimelineService.build_grid(date(2024, 2, 15), date(2025, 2, 1), view)
+    assert _starts(grid) == starts
+    # Períodos contiguos: cada uno termina donde empieza el siguiente
+    assert all(end == following for (_, end), (following, _) in zip(grid, grid[1:]))
+
+@pytest.mark.parametrize('view, end_date, count', [
+    ('quarterly', date(2024, 3, 31), 1),
+    ('quarterly', date(2024, 4, 1), 2),
+    ('biannual', date(2024, 6, 30), 1),
+    ('biannual', date(2024, 7, 1), 2),
+    ('annual', date(2024, 12, 31), 1),
+    ('annual', date(2025, 1, 1), 2)
+])
+def test_grid_covers_the_project_end(view, end_date, count):
+    assert len(TimelineService.build_grid(date(2024, 1, 1), end_date, view)) == count
+
+def test_grid_crosses_the_year():
+    grid = TimelineService.build_grid(date(2024, 11, 10), date(2025, 1, 31), 'quarterly')
+    assert grid == [(date(2024, 11, 1), date(2025, 2, 1))]
+    assert TimelineService._label(grid[0][0], 'quarterly') == 'Q4 2024'
+    assert TimelineService._label(date(2024, 7, 1), 'biannual') == 'S2 2024'
+
+def _timeline(client, headers, project_id, **params):
+    response = client.get(f'/api/projects/{project_id}/timeline', query_string=params, headers=headers)
+    return response.status_code, response.get_json()
+
+@pytest.fixture
+def plan(app, client, headers, project_id):
+    """Tareas de un trimestre, que cruzan trimestres y de todo el año; hitos en bordes"""
+    ids = {
+        'q1': create_task(client, headers, project_id, name='Q1', start_date='2024-02-01', end_date='2024-03-31',
+                          budget=100),
+        'q1_q3': create_task(client, headers, project_id, name='Q1-Q3', start_date='2024-03-15',
+                             end_date='2024-07-01', budget=50),
+        'year': create_task(client, headers, project_id, name='Año', start_date='2024-01-01',
+                            end_date='2024-12-31', budget=10)
+    }
+    for name, day in (('Inicio Q2', '2024-04-01'), ('Fin Q2', '2024-06-30'), ('Q4', '2024-12-31')):
+        response = client.post(f'/api/milestones/{project_id}/milestones', json={'name': name, 'date': day},
+                               headers=headers)
+        assert response.status_code == 201
+    with app.app_context():
+        for task_id, progress in ((ids['q1'], 100), (ids['q1_q3'], 50), (ids['year'], 20)):
+            task = db.session.get(Task, task_id)
+            task.progress = progress
+            task.completed = progress >= 100
+        db.session.execute(db.update(Milestone).where(Milestone.name == 'Fin Q2').values(completed=True))
+        db.session.commit()
+    return ids
+
+def test_buckets_count_tasks_in_every_period_they_span(client, headers, project_id, plan):
+    status, data = _timeline(client, headers, project_id, buckets='true')
+    assert status == 200
+    summary = [(bucket['label'], bucket['active_tasks'], bucket['completed_tasks'], bucket['progress'],
+                bucket['budget'], bucket['milestones'], bucket['completed_milestones'])
+               for bucket in data['buckets']]
+    assert summary == [
+        ('Q1 2024', 3, 1, 56, 160.0, 0, 0),
+        ('Q2 2024', 2, 0, 35, 60.0, 2, 1),
+        ('Q3 2024', 2, 0, 35, 60.0, 0, 0),
+        ('Q4 2024', 1, 0, 20, 10.0, 1, 0)
+    ]
+    assert (data['buckets'][3]['start'], data['buckets'][3]['end']) == ('2024-10-01', '2024-12-31')
+
+    status, data = _timeline(client, headers, project_id, buckets='true', view='biannual')
+    assert [(bucket['label'], bucket['active_tasks'], bucket['milestones']) for bucket in data['buckets']] == [
+        ('S1 2024', 3, 2), ('S2 2024', 2, 1)
+    ]
+    status, data = _timeline(client, headers, project_id, buckets='true', view='annual')
+    assert [(bucket['active_tasks'], bucket['milestones'], bucket['budget']) for bucket in data['buckets']] == [
+        (3, 3, 160.0)
+    ]
+
+def test_bucket_drill_down_matches_the_aggregates(client, headers, project_id, plan):
+    _, aggregates = _timeline(client, headers, project_id, buckets='true')
+    for bucket in aggregates['buckets']:
+        status, data = _timeline(client, headers, project_id, bucket=bucket['index'])
+        assert status == 200
+        detail = data['bucket']
+        assert (detail['label'], detail['start'], detail['end']) == (bucket['label'], bucket['start'], bucket['end'])
+        assert len(detail['tasks']) == bucket['active_tasks']
+        assert len(detail['milestones']) == bucket['milestones']
+
+    _, data = _timeline(client, headers, project_id, bucket=2)
+    assert [task['name'] for task in data['bucket']['tasks']] == ['Año', 'Q1-Q3']
+
+def test_bucket_drill_down_rejects_bad_indexes(client, headers, project_id):
+    for index in ('4', '-1', 'x', ''):
+        status, data = _timeline(client, headers, project_id, bucket=index)
+        assert status == 404, index
+        assert data['error'] == 'Período no encontrado'
+    assert _timeline(client, headers, project_id, bucket=0, view='monthly')[0] == 400
+
+def _ndjson(client, headers, project_id, **params):
+    response = client.get(f'/api/projects/{project_id}/timeline', headers=headers,
+                          query_string={'format': 'ndjson', **params})
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    body = response.get_data(as_text=True)
+    assert body.endswith('\n')
+    return [json.loads(line) for line in body.splitlines()]
+
+def test_ndjson_timeline_matches_the_json_timeline(app, client, headers, project_id, plan):
+    create_task(client, headers, project_id, name='Extra')
+    records = _ndjson(client, headers, project_id, view='annual')
+    _, timeline = _timeline(client, headers, project_id, view='annual')
+
+    assert [record['type'] for record in records] == ['project'] + ['task'] * 4 + ['milestone'] * 3
+    assert records[0]['data'] == timeline['project']
+    assert records[0]['view'] == 'annual'
+    by_id = lambda items: sorted(items, key=lambda item: item['id'])
+    assert by_id(record['data'] for record in records if record['type'] == 'task') == by_id(timeline['tasks'])
+    assert (by_id(record['data'] for record in records if record['type'] == 'milestone')
+            == by_id(timeline['milestones']))
+
+def test_ndjson_timeline_applies_fields(client, headers, project_id, plan):
+    records = _ndjson(client, headers, project_id, fields='name,progress', milestone_fields='date')
+    assert {record['type'] for record in records} == {'project', 'task', 'milestone'}
+    for record in records[1:]:
+        expected = {'id', 'name', 'progress'} if record['type'] == 'task' else {'id', 'date'}
+        assert set(record['data']) == expected
+
+def test_ndjson_timeline_is_sent_in_batches(app, client, headers, project_id, plan, monkeypatch):
+    monkeypatch.setitem(app.config, 'STREAM_BATCH_SIZE', 2)
+    response = client.get(f'/api/projects/{project_id}/timeline', headers=headers,
+                          query_string={'format': 'ndjson', 'fields': 'name'})
+    # Proyecto, 3 tareas en bloques de 2 y 3 hitos en bloques de 2
+    assert [chunk.count(b'\n') for chunk in response.iter_encoded()] == [1, 2, 1, 2, 1]
@@ -1,2 +1,12 @@
 # Importamos las utilidades para que estén disponibles desde el módulo
-from .auth_utils import admin_required, project_access_required, project_admin_required
\ No newline at end of file
+from .auth_utils import admin_required, project_access_required, project_admin_required, has_project_access, get_project_role
+from .pagination import get_page_args, keyset_paginate, keyset_query, keyset_page, encode_cursor, decode_cursor
+from .filters import parse_date_arg, parse_int_arg, parse_fields_arg, apply_status_filter, apply_date_range_filter, apply_upcoming_filter, uses_current_date
+from .password_hasher import PasswordHasher, PasswordHasherBusy, init_password_hasher, get_password_hasher
+from .http_cache import conditional_project_get, project_etag
+from .database import init_database, engine_options, async_database_uri, create_async_database_engine
+from .replica import init_replica, sync_sqlite_replica
+from .response_cache import ResponseCacheBackend, LRUResponseCache, init_response_cache, get_response_cache
+from .json_provider import FastJSONProvider, init_json_provider
+from .profiling import init_profiling, get_profiles
+from .metrics import init_metrics
@@ -1,26 +1,74 @@
 from functools import wraps
-from flask import jsonify
+from flask import current_app, g, jsonify
 from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
-from models import User, Project, Participant
+from models import db, User, Project
+
+def get_project_role(project_id, user_id=None):
+    """
+    Obtiene el rol del usuario en un proyecto
+
+    La verificación es la lectura de la fila del proyecto: no hay caché entre
+    solicitudes. La ruta necesita esa fila de todos modos; se conserva una
+    referencia durante la solicitud (el mapa de identidad de la sesión es
+    débil), así que la ruta la obtiene de la sesión sin volver a consultarla.
+    El rol se recuerda solo durante la solicitud actual, para los decoradores
+    y rutas que verifican el acceso más de una vez.
+
+    Args:
+        project_id (int): ID del proyecto
+        user_id (int, optional): ID del usuario (por defecto el del token)
+
+    Returns:
+        str: 'owner' si el usuario creó el proyecto, None si no tiene acceso
+            o el proyecto no existe
+    """
+    if user_id is None:
+        user_id = get_jwt_identity()
+    key = (user_id, project_id)
+
+    request_roles = g.setdefault('_project_roles', {})
+    if key not in request_roles:
+        project = db.session.get(Project, project_id)
+        # Los participantes no están vinculados a usuarios: solo el creador tiene acceso
+        role = 'owner' if project is not None and project.user_id == user_id else None
+        request_roles[key] = (role, project)
+    return request_roles[key][0]
+
+def has_project_access(project_id, roles=None):
+    """
+    Verifica si el usuario actual tiene acceso a un proyecto
+
+    Args:
+        project_id (int): ID del proyecto
+        roles (tuple, optional): Roles permitidos (por defecto cualquiera)
+
+    Returns:
+        bool: True si tiene acceso
+    """
+    role = get_project_role(project_id)
+    return role is not None and (roles is None or role in roles)
 
 def admin_required(fn):
     """
     Decorador para proteger rutas que requieren permisos de administrador
+
+    No hay roles de usuario: los administradores son los IDs de la
+    configuración ADMIN_USER_IDS (vacía por defecto, sin administradores).
     """
     @wraps(fn)
     def wrapper(*args, **kwargs):
         verify_jwt_in_request()
         user_id = get_jwt_identity()
         user = User.query.get(user_id)
-        
+
         if not user:
             return jsonify({'error': 'Usuario no encontrado'}), 404
-        
-        # En este ejemplo no hay roles de usuario, se podría implementar
-        # un campo role en la tabla User si se necesita esta funcionalidad
-        
+
+        if user.id not in current_app.config.get('ADMIN_USER_IDS', set()):
+            return jsonify({'error': 'Necesitas ser administrador para realizar esta acción'}), 403
+
         return fn(*args, **kwargs)
-    
+
     return wrapper
 
 def project_access_required(fn):
@@ -31,34 +79,17 @@ def project_access_required(fn):
     @wraps(fn)
     def wrapper(*args, **kwargs):
         verify_jwt_in_request()
-        user_id = get_jwt_identity()
-        
+
         # Verificar si el ID del proyecto está en los argumentos
         project_id = kwargs.get('project_id')
         if not project_id:
             return jsonify({'error': 'ID de proyecto no proporcionado'}), 400
-        
-        # Verificar si el proyecto existe
-        project = Project.query.get(project_id)
-        if not project:
+
+        if not has_project_access(project_id):
             return jsonify({'error': 'Proyecto no encontrado'}), 404
-        
-        # Si el usuario es el creador del proyecto, permitir acceso
-        if project.user_id == user_id:
-            return fn(*args, **kwargs)
-        
-        # Verificar si el usuario es participante del proyecto
-        participant = Participant.query.filter_by(
-            project_id=project_id,
-            user_id=user_id
-        ).first()
-        
-        if not participant:
-            return jsonify({'error': 'No tienes permiso para acceder a este proyecto'}), 403
-        
-        # Permitir acceso
+
         return fn(*args, **kwargs)
-    
+
     return wrapper
 
 def project_admin_required(fn):
@@ -69,33 +100,19 @@ def project_admin_required(fn):
     @wraps(fn)
     def wrapper(*args, **kwargs):
         verify_jwt_in_request()
-        user_id = get_jwt_identity()
-        
+
         # Verificar si el ID del proyecto está en los argumentos
         project_id = kwargs.get('project_id')
         if not project_id:
             return jsonify({'error': 'ID de proyecto no proporcionado'}), 400
-        
-        # Verificar si el proyecto existe
-        project = Project.query.get(project_id)
-        if not project:
+
+        role = get_project_role(project_id)
+        if role is None:
             return jsonify({'error': 'Proyecto no encontrado'}), 404
-        
-        # Si el usuario es el creador del proyecto, permitir acceso
-        if project.user_id == user_id:
-            return fn(*args, **kwargs)
-        
-        # Verificar si el usuario es administrador del proyecto
-        participant = Participant.query.filter_by(
-            project_id=project_id,
-            user_id=user_id,
-            role='administrator'
-        ).first()
-        
-        if not participant:
+
+        if role != 'owner':
             return jsonify({'error': 'Necesitas ser administrador del proyecto para realizar esta acción'}), 403
-        
-        # Permitir acceso
+
         return fn(*args, **kwargs)
-    
-    return wrapper
\ No newline at end of file
+
+    return wrapper
@@ -0,0 +1,63 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+
+_MISSING = object()
+
+class TTLCache:
+    """
+    Caché en memoria acotada, con expiración por tiempo y desalojo LRU
+
+    Es segura para hilos y se comparte entre las solicitudes de un mismo
+    proceso (cada worker de gunicorn tiene la suya).
+    """
+
+    def __init__(self, maxsize=1024, ttl=60, timer=time.monotonic):
+        """
+        Args:
+            maxsize (int): Cantidad máxima de entradas
+            ttl (float): Segundos de vida de cada entrada
+            timer (callable): Reloj monotónico (inyectable para pruebas)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key, default=None):
+        """Obtiene un valor vigente o default"""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value = entry
+                if expires_at > self.timer():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        """Guarda un valor, desalojando el menos usado si se supera maxsize"""
+        with self._lock:
+            self._data[key] = (self.timer() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        """Elimina una entrada si existe"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Elimina todas las entradas"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
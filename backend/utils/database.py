@@ -0,0 +1,159 @@
+import os
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from models import db
+from .metrics import TimedQueuePool
+
+# Drivers asyncio equivalentes a los de la app síncrona
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'mysql': 'mysql+aiomysql'
+}
+
+def engine_options(config):
+    """
+    Construye SQLALCHEMY_ENGINE_OPTIONS a partir de la configuración
+
+    En MySQL (u otros servidores) define el tamaño del pool, el desborde, la
+    verificación de conexiones (pre-ping) y su reciclaje; con métricas
+    activas el pool mide la espera por conexión. SQLite no usa un pool de
+    tamaño fijo: solo se ajusta el tiempo de espera por bloqueos.
+
+    Args:
+        config (dict): Configuración de Flask
+
+    Returns:
+        dict: Opciones para create_engine
+    """
+    options = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+
+    if url.get_backend_name() == 'sqlite':
+        busy_timeout = config.get('SQLITE_PRAGMAS', {}).get('busy_timeout', 5000)
+        connect_args = options.setdefault('connect_args', {})
+        connect_args.setdefault('timeout', busy_timeout / 1000)
+        return options
+
+    options.setdefault('pool_size', config.get('DB_POOL_SIZE', 5))
+    options.setdefault('max_overflow', config.get('DB_MAX_OVERFLOW', 10))
+    options.setdefault('pool_timeout', config.get('DB_POOL_TIMEOUT', 30))
+    options.setdefault('pool_recycle', config.get('DB_POOL_RECYCLE', 280))
+    options.setdefault('pool_pre_ping', config.get('DB_POOL_PRE_PING', True))
+    if config.get('METRICS_ENABLED', True):
+        options.setdefault('poolclass', TimedQueuePool)
+    return options
+
+def _apply_sqlite_pragmas(pragmas):
+    """Crea el listener que aplica los PRAGMAs a cada conexión nueva"""
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
+    return on_connect
+
+def _protect_pool_across_forks(engine):
+    """
+    Evita que un proceso use conexiones abiertas por otro antes de un fork
+
+    Con gunicorn --preload la app se crea en el proceso maestro; si un worker
+    hereda una conexión del pool, se descarta y se abre una nueva.
+    """
+    @event.listens_for(engine, 'connect')
+    def on_connect(dbapi_connection, connection_record):
+        connection_record.info['pid'] = os.getpid()
+
+    @event.listens_for(engine, 'checkout')
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        if connection_record.info['pid'] != os.getpid():
+            connection_record.dbapi_connection = connection_proxy.dbapi_connection = None
+            raise exc.DisconnectionError('Conexión abierta en otro proceso')
+
+def release_connections(app):
+    """
+    Cierra las conexiones abiertas durante el arranque
+
+    Debe llamarse al final de create_app para que el proceso maestro de
+    gunicorn --preload no conserve conexiones. Las bases SQLite en memoria
+    se mantienen: cerrar su conexión borraría los datos.
+
+    Args:
+        app (Flask): Aplicación Flask
+    """
+    with app.app_context():
+        db.session.remove()
+        for engine in db.engines.values():
+            if engine.dialect.name == 'sqlite' and engine.url.database in (None, '', ':memory:'):
+                continue
+            engine.dispose()
+
+def init_database(app):
+    """
+    Configura el motor de la base de datos e inicializa Flask-SQLAlchemy
+
+    Debe llamarse en lugar de db.init_app(app). Si hay una réplica
+    configurada se registra como el motor 'replica'.
+
+    Args:
+        app (Flask): Aplicación Flask
+    """
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
+    replica_uri = app.config.get('SQLALCHEMY_REPLICA_URI')
+    if replica_uri:
+        binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+        binds['replica'] = replica_uri
+        app.config['SQLALCHEMY_BINDS'] = binds
+    db.init_app(app)
+
+    pragmas = app.config.get('SQLITE_PRAGMAS')
+    with app.app_context():
+        for engine in db.engines.values():
+            _protect_pool_across_forks(engine)
+            if pragmas and engine.dialect.name == 'sqlite':
+                event.listen(engine, 'connect', _apply_sqlite_pragmas(pragmas))
+
+def async_database_uri(uri):
+    """
+    Convierte una URI de base de datos a su driver asyncio
+
+    Args:
+        uri (str): URI síncrona (p. ej. mysql+pymysql://...)
+
+    Returns:
+        str: URI asíncrona (p. ej. mysql+aiomysql://...)
+
+    Raises:
+        ValueError: Si no hay un driver asyncio para el motor
+    """
+    url = make_url(uri)
+    if url.get_dialect().is_async:
+        return uri
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise ValueError(f'No hay un driver asyncio configurado para {url.get_backend_name()}')
+    return url.set(drivername=driver).render_as_string(hide_password=False)
+
+def create_async_database_engine(config, uri):
+    """
+    Crea un motor asyncio con las mismas opciones que init_database
+
+    Requiere el driver asyncio del motor (aiosqlite o aiomysql).
+
+    Args:
+        config (dict): Configuración de Flask
+        uri (str): URI de la base de datos (síncrona o asíncrona)
+
+    Returns:
+        AsyncEngine: Motor asíncrono
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    settings = dict(config, SQLALCHEMY_DATABASE_URI=uri)
+    engine = create_async_engine(async_database_uri(uri), **engine_options(settings))
+
+    pragmas = config.get('SQLITE_PRAGMAS')
+    if pragmas and engine.dialect.name == 'sqlite':
+        event.listen(engine.sync_engine, 'connect', _apply_sqlite_pragmas(pragmas))
+    return engine
@@ -0,0 +1,166 @@
+from datetime import datetime
+from flask import request
+
+VALID_STATUSES = ['pending', 'completed', 'overdue']
+
+def parse_date_arg(name, args=None):
+    """
+    Obtiene un parámetro de fecha opcional en formato YYYY-MM-DD
+
+    Args:
+        name (str): Nombre del parámetro
+        args (optional): Parámetros de consulta (por defecto los de la solicitud actual)
+
+    Returns:
+        date: Fecha o None si no se proporcionó
+
+    Raises:
+        ValueError: Si el formato es inválido
+    """
+    value = (request.args if args is None else args).get(name)
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError(f'Formato de fecha inválido en {name}. Utilice YYYY-MM-DD')
+
+def parse_int_arg(name, args=None):
+    """
+    Obtiene un parámetro entero opcional
+
+    Args:
+        name (str): Nombre del parámetro
+        args (optional): Parámetros de consulta (por defecto los de la solicitud actual)
+
+    Returns:
+        int: Valor o None si no se proporcionó
+
+    Raises:
+        ValueError: Si no es un número entero
+    """
+    value = (request.args if args is None else args).get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f'El parámetro {name} debe ser un número entero')
+
+def parse_fields_arg(allowed, name='fields', args=None):
+    """
+    Obtiene la lista de campos pedidos con ?fields=campo1,campo2
+
+    Args:
+        allowed: Campos disponibles (p. ej. TASK_FIELDS)
+        name (str): Nombre del parámetro
+        args (optional): Parámetros de consulta (por defecto los de la solicitud actual)
+
+    Returns:
+        list: Campos pedidos sin repetir, o None si no se proporcionó
+
+    Raises:
+        ValueError: Si algún campo no existe
+    """
+    value = (request.args if args is None else args).get(name)
+    if not value:
+        return None
+
+    fields = list(dict.fromkeys(field.strip() for field in value.split(',') if field.strip()))
+    invalid = [field for field in fields if field not in allowed]
+    if invalid:
+        raise ValueError(f'Campos inválidos en {name}: {", ".join(invalid)}. '
+                         f'Campos disponibles: {", ".join(allowed)}')
+    return fields
+
+def apply_status_filter(query, model, args=None):
+    """
+    Filtra por ?status=pending|completed|overdue
+
+    Args:
+        query (Query): Consulta a filtrar (Query o select())
+        model: Modelo con columna completed e híbrido is_overdue
+        args (optional): Parámetros de consulta (por defecto los de la solicitud actual)
+
+    Returns:
+        Query: Consulta filtrada
+
+    Raises:
+        ValueError: Si el estado no es válido
+    """
+    status = (request.args if args is None else args).get('status')
+    if not status:
+        return query
+    if status not in VALID_STATUSES:
+        raise ValueError(f'Estado inválido. Debe ser uno de: {", ".join(VALID_STATUSES)}')
+
+    if status == 'completed':
+        return query.filter(model.completed.is_(True))
+    if status == 'pending':
+        return query.filter(model.completed.isnot(True))
+    return query.filter(model.is_overdue)
+
+def uses_current_date(args=None):
+    """
+    Indica si los filtros de la solicitud dependen de la fecha actual
+
+    Con ?status=overdue o ?upcoming=true el resultado cambia al cambiar el
+    día aunque el proyecto no cambie.
+
+    Args:
+        args (optional): Parámetros de consulta (por defecto los de la solicitud actual)
+
+    Returns:
+        bool: True si la respuesta depende del día
+    """
+    args = request.args if args is None else args
+    return args.get('status') == 'overdue' or args.get('upcoming', '').lower() in ('true', '1')
+
+def apply_date_range_filter(query, start_column, end_column=None, args=None):
+    """
+    Filtra por ?date_from= y ?date_to= (YYYY-MM-DD)
+
+    Si se indica end_column, selecciona los elementos cuyo intervalo
+    [start_column, end_column] se cruza con el rango solicitado; si no,
+    los elementos cuya fecha start_column está dentro del rango.
+
+    Args:
+        query (Query): Consulta a filtrar (Query o select())
+        start_column: Columna de fecha de inicio (o fecha única)
+        end_column (optional): Columna de fecha de término
+        args (optional): Parámetros de consulta (por defecto los de la solicitud actual)
+
+    Returns:
+        Query: Consulta filtrada
+
+    Raises:
+        ValueError: Si alguna fecha es inválida
+    """
+    date_from = parse_date_arg('date_from', args)
+    date_to = parse_date_arg('date_to', args)
+    if date_from and date_to and date_from > date_to:
+        raise ValueError('date_from debe ser anterior a date_to')
+
+    if end_column is None:
+        end_column = start_column
+    if date_from:
+        query = query.filter(end_column >= date_from)
+    if date_to:
+        query = query.filter(start_column <= date_to)
+    return query
+
+def apply_upcoming_filter(query, model, args=None):
+    """
+    Filtra por ?upcoming=true: elementos pendientes con fecha en los próximos días
+
+    Args:
+        query (Query): Consulta a filtrar (Query o select())
+        model: Modelo con híbrido is_upcoming
+        args (optional): Parámetros de consulta (por defecto los de la solicitud actual)
+
+    Returns:
+        Query: Consulta filtrada
+    """
+    if (request.args if args is None else args).get('upcoming', '').lower() not in ('true', '1'):
+        return query
+    return query.filter(model.is_upcoming)
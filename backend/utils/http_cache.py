@@ -0,0 +1,106 @@
+import hashlib
+from datetime import date
+from functools import wraps
+from flask import current_app, make_response, request
+from models import db, Project
+from .response_cache import get_response_cache
+
+def project_etag(project, path=None, dated=False):
+    """
+    Calcula el ETag fuerte de una representación de un proyecto
+
+    Combina el ID y la versión del proyecto con la ruta y los parámetros de
+    la solicitud, ya que cada endpoint y filtro devuelve un cuerpo distinto.
+
+    Args:
+        project (Project): Proyecto
+        path (str, optional): Ruta con parámetros (por defecto la solicitud actual)
+        dated (bool): Incluir la fecha actual, para respuestas que cambian
+            con el día (tareas vencidas, hitos próximos)
+
+    Returns:
+        str: ETag sin comillas
+    """
+    path = path if path is not None else request.full_path
+    digest = hashlib.sha1(path.encode()).hexdigest()[:12]
+    if dated:
+        return f'p{project.id}-v{project.version}-d{date.today():%Y%m%d}-{digest}'
+    return f'p{project.id}-v{project.version}-{digest}'
+
+def is_dated(dated, args):
+    """
+    Evalúa la opción dated de conditional_project_get y project_route
+
+    Args:
+        dated (bool|callable): Valor fijo o función de los parámetros de consulta
+        args: Parámetros de consulta de la solicitud
+
+    Returns:
+        bool: True si la respuesta depende de la fecha actual
+    """
+    return bool(dated(args) if callable(dated) else dated)
+
+def conditional_project_get(fn=None, dated=False):
+    """
+    Decorador para GET de recursos de un proyecto con ETag y Last-Modified
+
+    Debe usarse después de verificar el acceso, en rutas con el parámetro
+    project_id. Si el cliente envía If-None-Match (o If-Modified-Since) y el
+    proyecto no cambió, responde 304 sin ejecutar la ruta. Si no, sirve el
+    cuerpo desde la caché de respuestas cuando está disponible para la
+    versión actual del proyecto.
+
+    Las respuestas que dependen del día (dated=True, o una función que
+    recibe los parámetros de consulta) llevan la fecha en el ETag y no
+    envían Last-Modified: el proyecto puede no cambiar y la respuesta sí.
+
+    Uso: @conditional_project_get o @conditional_project_get(dated=...)
+    """
+    if fn is None:
+        return lambda fn: conditional_project_get(fn, dated)
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        project = db.session.get(Project, kwargs.get('project_id'))
+        if project is None:
+            return fn(*args, **kwargs)
+
+        if is_dated(dated, request.args):
+            etag = project_etag(project, dated=True)
+            last_modified = None
+        else:
+            etag = project_etag(project)
+            last_modified = project.updated_at or project.created_at
+
+        not_modified = False
+        if request.if_none_match:
+            not_modified = request.if_none_match.contains(etag)
+        elif request.if_modified_since and last_modified:
+            not_modified = last_modified.replace(microsecond=0) <= request.if_modified_since.replace(tzinfo=None)
+
+        cache = get_response_cache()
+        cached = cache.get(project) if cache is not None and not not_modified else None
+        if not_modified:
+            response = make_response('', 304)
+        elif cached is not None:
+            body, mimetype = cached
+            response = current_app.response_class(body, mimetype=mimetype)
+            response.headers['X-Cache'] = 'HIT'
+        else:
+            response = make_response(fn(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            # Las respuestas en streaming no se cachean
+            if cache is not None and not response.is_streamed:
+                cache.set(project, response.get_data(), response.mimetype)
+                response.headers['X-Cache'] = 'MISS'
+
+        response.set_etag(etag)
+        if last_modified:
+            response.last_modified = last_modified
+        # El navegador debe revalidar siempre: los datos son privados del usuario
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response
+
+    return wrapper
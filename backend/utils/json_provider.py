@@ -0,0 +1,83 @@
+from datetime import date, datetime
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional
+    orjson = None
+
+def orjson_options(sort_keys=True, pretty=False):
+    """Opciones de orjson equivalentes a las del proveedor JSON de Flask"""
+    options = orjson.OPT_NON_STR_KEYS
+    if sort_keys:
+        options |= orjson.OPT_SORT_KEYS
+    if pretty:
+        options |= orjson.OPT_INDENT_2
+    return options
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Proveedor JSON de la app que usa orjson cuando está instalado
+
+    orjson codifica date y datetime de forma nativa, por lo que los
+    serializadores pueden entregar las fechas sin llamar a isoformat(). Sin
+    orjson se usa el módulo json estándar con el mismo formato ISO 8601
+    para las fechas, UTF-8 sin escapes y separadores compactos, así que la
+    salida es la misma en ambos casos. La excepción son las claves que no
+    son str: se escriben como texto, pero orjson las ordena como texto y
+    json por su valor.
+    """
+
+    use_orjson = orjson is not None
+    ensure_ascii = False
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, (date, datetime)):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+    def dumps(self, obj, **kwargs):
+        """Serializa a str; con argumentos propios de json se usa json estándar"""
+        if self.use_orjson and not kwargs:
+            return orjson.dumps(obj, default=self.default, option=orjson_options(self.sort_keys)).decode()
+        kwargs.setdefault('default', self.default)
+        if 'indent' not in kwargs:
+            kwargs.setdefault('separators', (',', ':'))
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if self.use_orjson and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        """Crea la respuesta codificando directamente a bytes"""
+        if not self.use_orjson:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self.compact is False or (self.compact is None and self._app.debug)
+        body = orjson.dumps(obj, default=self.default, option=orjson_options(self.sort_keys, pretty)) + b'\n'
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+def init_json_provider(app):
+    """
+    Instala el proveedor JSON según JSON_BACKEND
+
+    'auto' usa orjson si está instalado, 'orjson' lo exige y 'stdlib' usa
+    siempre el módulo json estándar.
+
+    Args:
+        app (Flask): Aplicación Flask
+
+    Raises:
+        RuntimeError: Si se exige orjson y no está instalado
+    """
+    backend = app.config.get('JSON_BACKEND', 'auto')
+    if backend == 'orjson' and orjson is None:
+        raise RuntimeError('JSON_BACKEND=orjson requiere el paquete orjson')
+
+    provider = FastJSONProvider(app)
+    provider.use_orjson = orjson is not None and backend != 'stdlib'
+    app.json = provider
@@ -0,0 +1,338 @@
+import time
+from bisect import bisect_left
+from math import inf
+from threading import Lock, current_thread, local
+from flask import current_app, g, request
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+from models import db
+
+# Límites (en segundos) de los histogramas de latencia
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+class _Shards:
+    """
+    Un fragmento de datos por hilo
+
+    Cada hilo escribe solo en su fragmento, así que registrar una medición no
+    toma ningún lock; el lock se usa una vez por hilo al crear el fragmento.
+    La lectura suma todos los fragmentos copiando cada uno (la copia de un
+    dict es atómica con el GIL). Al leer, los fragmentos de hilos terminados
+    se acumulan en un fragmento base y se descartan: los contadores nunca
+    retroceden y los workers que renuevan sus hilos no acumulan fragmentos.
+    """
+
+    def __init__(self, fold):
+        """
+        Args:
+            fold (callable): Recibe (base, etiquetas, valor) y suma el valor
+                en base sin modificar los valores ya guardados en ella
+        """
+        self._local = local()
+        self._fold = fold
+        self._base = {}
+        self._live = []
+        self._lock = Lock()
+
+    def mine(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._live.append((current_thread(), shard))
+        return shard
+
+    def snapshot(self):
+        with self._lock:
+            live = []
+            for thread, shard in self._live:
+                if thread.is_alive():
+                    live.append((thread, shard))
+                else:
+                    # El hilo terminó: su fragmento ya no cambia
+                    for labels, value in shard.items():
+                        self._fold(self._base, labels, value)
+            self._live = live
+            base = self._base.copy()
+        return [base] + [shard.copy() for _, shard in live]
+
+class Counter:
+    """Contador acumulativo con etiquetas"""
+
+    type = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._shards = _Shards(self._fold)
+
+    @staticmethod
+    def _fold(base, labels, value):
+        base[labels] = base.get(labels, 0) + value
+
+    def inc(self, labels=(), amount=1):
+        """
+        Incrementa el contador
+
+        Args:
+            labels (tuple): Valores de las etiquetas, en el orden de labelnames
+            amount (float): Incremento
+        """
+        shard = self._shards.mine()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def samples(self):
+        """Obtiene [(sufijo, etiquetas, valor)] sumando los fragmentos"""
+        totals = {}
+        for shard in self._shards.snapshot():
+            for labels, value in shard.items():
+                totals[labels] = totals.get(labels, 0) + value
+        return [('', dict(zip(self.labelnames, labels)), value) for labels, value in sorted(totals.items())]
+
+class Gauge(Counter):
+    """Valor que sube y baja (p. ej. solicitudes en curso)"""
+
+    type = 'gauge'
+
+    def dec(self, labels=(), amount=1):
+        self.inc(labels, -amount)
+
+class Histogram:
+    """Histograma acumulativo con límites fijos y etiquetas"""
+
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._shards = _Shards(self._fold)
+
+    @staticmethod
+    def _fold(base, labels, value):
+        counts, total = value
+        entry = base.get(labels)
+        if entry is None:
+            base[labels] = [list(counts), total]
+        else:
+            base[labels] = [[a + b for a, b in zip(entry[0], counts)], entry[1] + total]
+
+    def observe(self, value, labels=()):
+        """
+        Registra una medición
+
+        Args:
+            value (float): Valor medido (segundos)
+            labels (tuple): Valores de las etiquetas, en el orden de labelnames
+        """
+        shard = self._shards.mine()
+        entry = shard.get(labels)
+        if entry is None:
+            # Un contador por límite más el de +Inf, y la suma
+            entry = shard[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+
+    def samples(self):
+        totals = {}
+        for shard in self._shards.snapshot():
+            for labels, (counts, total) in shard.items():
+                merged = totals.setdefault(labels, [[0] * (len(self.buckets) + 1), 0.0])
+                merged[0] = [a + b for a, b in zip(merged[0], counts)]
+                merged[1] += total
+
+        samples = []
+        for labels, (counts, total) in sorted(totals.items()):
+            labels = dict(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (inf,), counts):
+                cumulative += bucket_count
+                samples.append(('_bucket', {**labels, 'le': _format_value(bound)}, cumulative))
+            samples.append(('_sum', labels, total))
+            samples.append(('_count', labels, cumulative))
+        return samples
+
+class CallbackMetric:
+    """Métrica calculada al exponerla a partir del estado actual de la app"""
+
+    def __init__(self, name, documentation, type, labelnames, collect):
+        """
+        Args:
+            name (str): Nombre de la métrica
+            documentation (str): Descripción
+            type (str): 'gauge' o 'counter'
+            labelnames (tuple): Nombres de las etiquetas
+            collect (callable): Recibe la app y devuelve {etiquetas: valor}
+        """
+        self.name = name
+        self.documentation = documentation
+        self.type = type
+        self.labelnames = tuple(labelnames)
+        self.collect = collect
+
+    def samples(self):
+        values = self.collect(current_app)
+        return [('', dict(zip(self.labelnames, labels)), value) for labels, value in sorted(values.items())]
+
+def _format_value(value):
+    return '+Inf' if value == inf else repr(value)
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def render(metrics):
+    """
+    Genera el formato de texto de Prometheus (versión 0.0.4)
+
+    Args:
+        metrics (list): Métricas a exponer
+
+    Returns:
+        str: Cuerpo de la respuesta
+    """
+    lines = []
+    for metric in metrics:
+        lines.append(f'# HELP {metric.name} {metric.documentation}')
+        lines.append(f'# TYPE {metric.name} {metric.type}')
+        for suffix, labels, value in metric.samples():
+            label_text = ','.join(f'{name}="{_escape(label)}"' for name, label in labels.items())
+            lines.append(f'{metric.name}{suffix}{{{label_text}}} {_format_value(value)}' if label_text
+                         else f'{metric.name}{suffix} {_format_value(value)}')
+    return '\n'.join(lines) + '\n'
+
+# Métricas del proceso (compartidas por todas las apps creadas en él)
+HTTP_REQUESTS = Counter('http_requests_total', 'Solicitudes atendidas',
+                        ('blueprint', 'endpoint', 'method', 'status'))
+HTTP_LATENCY = Histogram('http_request_duration_seconds', 'Duración de las solicitudes hasta devolver la respuesta',
+                         ('blueprint', 'endpoint', 'method'))
+HTTP_IN_FLIGHT = Gauge('http_requests_in_flight', 'Solicitudes en curso')
+POOL_CHECKOUTS = Counter('db_pool_checkouts_total', 'Conexiones entregadas por el pool', ('bind',))
+POOL_WAIT = Histogram('db_pool_checkout_wait_seconds',
+                      'Espera por una conexión del pool (solo servidores de bases de datos)',
+                      buckets=POOL_WAIT_BUCKETS)
+POOL_TIMEOUTS = Counter('db_pool_timeouts_total', 'Esperas por una conexión que superaron DB_POOL_TIMEOUT')
+
+PROCESS_METRICS = [HTTP_REQUESTS, HTTP_LATENCY, HTTP_IN_FLIGHT, POOL_CHECKOUTS, POOL_WAIT, POOL_TIMEOUTS]
+
+class TimedQueuePool(QueuePool):
+    """QueuePool que mide cuánto espera cada solicitud de conexión"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            POOL_TIMEOUTS.inc()
+            raise
+        finally:
+            POOL_WAIT.observe(time.perf_counter() - started)
+
+def _bind_name(key):
+    return 'default' if key is None else key
+
+def _pool_values(method):
+    """Colector de un dato de los pools que lo ofrecen (QueuePool)"""
+    def collect(app):
+        values = {}
+        with app.app_context():
+            for key, engine in db.engines.items():
+                if hasattr(engine.pool, method):
+                    values[(_bind_name(key),)] = getattr(engine.pool, method)()
+        return values
+    return collect
+
+def _caches(app):
+    """Cachés del proceso con sus contadores: {nombre: (aciertos, fallos, entradas)}"""
+    # Importación diferida: los servicios importan utils
+    from services.schedule_service import ScheduleService
+
+    caches = {}
+    response_cache = app.extensions.get('response_cache')
+    if response_cache is not None:
+        caches['response'] = (response_cache.hits, response_cache.misses, response_cache.backend.size()[0])
+    schedules = ScheduleService._schedules
+    if schedules is not None:
+        caches['schedules'] = (schedules.hits, schedules.misses, len(schedules))
+    return caches
+
+def _cache_values(index):
+    def collect(app):
+        return {(name,): values[index] for name, values in _caches(app).items()}
+    return collect
+
+def _cache_hit_ratios(app):
+    return {
+        (name,): round(hits / (hits + misses), 4) if hits + misses else 0.0
+        for name, (hits, misses, _) in _caches(app).items()
+    }
+
+APP_METRICS = [
+    CallbackMetric('db_pool_size', 'Tamaño del pool', 'gauge', ('bind',), _pool_values('size')),
+    CallbackMetric('db_pool_checked_out', 'Conexiones en uso', 'gauge', ('bind',), _pool_values('checkedout')),
+    CallbackMetric('db_pool_checked_in', 'Conexiones libres en el pool', 'gauge', ('bind',), _pool_values('checkedin')),
+    CallbackMetric('db_pool_overflow', 'Conexiones de desborde abiertas (negativo: capacidad sin usar)',
+                   'gauge', ('bind',), _pool_values('overflow')),
+    CallbackMetric('cache_hits_total', 'Aciertos de la caché', 'counter', ('cache',), _cache_values(0)),
+    CallbackMetric('cache_misses_total', 'Fallos de la caché', 'counter', ('cache',), _cache_values(1)),
+    CallbackMetric('cache_entries', 'Entradas almacenadas', 'gauge', ('cache',), _cache_values(2)),
+    CallbackMetric('cache_hit_ratio', 'Proporción de aciertos desde el inicio del proceso', 'gauge', ('cache',),
+                   _cache_hit_ratios),
+]
+
+def _start_request():
+    g._metrics_started = time.perf_counter()
+    HTTP_IN_FLIGHT.inc()
+
+def _record_request(response):
+    started = g.get('_metrics_started')
+    if started is not None:
+        endpoint = request.endpoint or 'unmatched'
+        blueprint = request.blueprint or ''
+        HTTP_LATENCY.observe(time.perf_counter() - started, (blueprint, endpoint, request.method))
+        HTTP_REQUESTS.inc((blueprint, endpoint, request.method, str(response.status_code)))
+    return response
+
+def _end_request(error=None):
+    if g.pop('_metrics_started', None) is not None:
+        HTTP_IN_FLIGHT.dec()
+
+def _pool_checkout_counter(bind):
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        POOL_CHECKOUTS.inc((bind,))
+    return on_checkout
+
+def init_metrics(app):
+    """
+    Activa las métricas y el endpoint /metrics (formato de Prometheus)
+
+    Registra la latencia por endpoint (histograma), las solicitudes por
+    código de estado y las que están en curso, las entregas del pool de
+    conexiones y los contadores de las cachés. Las métricas son del proceso:
+    con varios workers de gunicorn cada uno expone las suyas. Si
+    METRICS_TOKEN está definido, /metrics exige "Authorization: Bearer <token>".
+
+    Args:
+        app (Flask): Aplicación Flask
+    """
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+
+    with app.app_context():
+        for key, engine in db.engines.items():
+            event.listen(engine, 'checkout', _pool_checkout_counter(_bind_name(key)))
+
+    app.before_request(_start_request)
+    app.after_request(_record_request)
+    app.teardown_request(_end_request)
+
+    def metrics():
+        token = app.config.get('METRICS_TOKEN')
+        if token and request.headers.get('Authorization') != f'Bearer {token}':
+            return app.response_class('No autorizado\n', status=401, mimetype='text/plain')
+        return app.response_class(render(PROCESS_METRICS + APP_METRICS),
+                                  mimetype='text/plain; version=0.0.4')
+
+    app.add_url_rule('/metrics', 'metrics', metrics, methods=['GET'])
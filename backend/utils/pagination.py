@@ -0,0 +1,164 @@
+import base64
+import json
+from datetime import date, datetime
+from flask import current_app, request
+from sqlalchemy import and_, or_
+
+def _encode_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+def _decode_value(column, value):
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+def encode_cursor(values):
+    """
+    Codifica los valores de ordenamiento de la última fila como cursor opaco
+
+    Args:
+        values (list): Valores de las columnas de ordenamiento
+
+    Returns:
+        str: Cursor en base64 apto para URLs
+    """
+    raw = json.dumps([_encode_value(value) for value in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor, columns):
+    """
+    Decodifica un cursor generado por encode_cursor
+
+    Args:
+        cursor (str): Cursor recibido del cliente
+        columns (list): Columnas de ordenamiento
+
+    Returns:
+        list: Valores de las columnas de ordenamiento
+
+    Raises:
+        ValueError: Si el cursor no es válido
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError
+        return [_decode_value(column, value) for column, value in zip(columns, values)]
+    except (ValueError, TypeError):
+        raise ValueError('Cursor de paginación inválido')
+
+def get_page_args(args=None, config=None):
+    """
+    Obtiene los parámetros de paginación de la solicitud (?limit=, ?cursor=)
+
+    Args:
+        args (optional): Parámetros de consulta (por defecto los de la solicitud actual)
+        config (optional): Configuración (por defecto la de la app actual)
+
+    Returns:
+        tuple: (limit, cursor)
+
+    Raises:
+        ValueError: Si el límite no es un entero positivo
+    """
+    args = request.args if args is None else args
+    config = current_app.config if config is None else config
+    default_limit = config.get('PAGINATION_DEFAULT_LIMIT', 100)
+    max_limit = config.get('PAGINATION_MAX_LIMIT', 1000)
+
+    limit = args.get('limit', default_limit)
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise ValueError('El parámetro limit debe ser un número entero')
+    if limit < 1:
+        raise ValueError('El parámetro limit debe ser mayor que 0')
+
+    return min(limit, max_limit), args.get('cursor')
+
+def keyset_query(query, order_by, limit, cursor=None):
+    """
+    Aplica a una consulta el filtro, el orden y el límite de una página keyset
+
+    Funciona con Query y con select(); se pide una fila extra para saber si
+    hay otra página (ver keyset_page).
+
+    Args:
+        query (Query): Consulta ya filtrada
+        order_by (list): Lista de tuplas (columna, descendente)
+        limit (int): Tamaño de página
+        cursor (str, optional): Cursor de la página anterior
+
+    Returns:
+        Query: Consulta de la página
+
+    Raises:
+        ValueError: Si el cursor no es válido
+    """
+    columns = [column for column, _ in order_by]
+
+    if cursor:
+        values = decode_cursor(cursor, columns)
+
+        # Comparación lexicográfica: (a, b) > (va, vb) => a > va OR (a = va AND b > vb)
+        conditions = []
+        for index, (column, descending) in enumerate(order_by):
+            equal = [previous == values[i] for i, previous in enumerate(columns[:index])]
+            after = column < values[index] if descending else column > values[index]
+            conditions.append(and_(*equal, after))
+        query = query.filter(or_(*conditions))
+
+    query = query.order_by(*[column.desc() if descending else column.asc()
+                             for column, descending in order_by])
+    return query.limit(limit + 1)
+
+def keyset_page(items, order_by, limit):
+    """
+    Recorta los resultados de keyset_query y calcula el cursor siguiente
+
+    Args:
+        items (list): Resultados de la consulta de la página
+        order_by (list): Lista de tuplas (columna, descendente)
+        limit (int): Tamaño de página
+
+    Returns:
+        tuple: (items, next_cursor) donde next_cursor es None en la última página
+    """
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column, _ in order_by])
+
+    return items, next_cursor
+
+def keyset_paginate(query, order_by, limit, cursor=None):
+    """
+    Pagina una consulta por conjunto de claves (keyset)
+
+    La última columna de order_by debe ser única (normalmente el id) para que
+    el orden sea estable. Cada página filtra a partir de la última fila de la
+    anterior, por lo que el costo depende del tamaño de página y no del offset.
+
+    Args:
+        query (Query): Consulta ya filtrada
+        order_by (list): Lista de tuplas (columna, descendente)
+        limit (int): Tamaño de página
+        cursor (str, optional): Cursor de la página anterior
+
+    Returns:
+        tuple: (items, next_cursor) donde next_cursor es None en la última página
+
+    Raises:
+        ValueError: Si el cursor no es válido
+    """
+    items = keyset_query(query, order_by, limit, cursor).all()
+    return keyset_page(items, order_by, limit)
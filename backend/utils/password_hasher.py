@@ -0,0 +1,164 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError
+from threading import BoundedSemaphore, Lock
+from werkzeug.security import generate_password_hash, check_password_hash
+
+# Este módulo no importa modelos para poder usarse desde models/user.py
+
+class PasswordHasherBusy(RuntimeError):
+    """Se lanza cuando hay demasiadas operaciones de hash en espera"""
+
+class PasswordHasher:
+    """
+    Calcula y verifica hashes de contraseñas fuera del hilo de la solicitud
+
+    El trabajo se ejecuta en un pool acotado de hilos o procesos. Si el pool
+    y su cola están llenos, las nuevas operaciones fallan de inmediato con
+    PasswordHasherBusy en lugar de bloquear todos los workers.
+    """
+
+    def __init__(self, method='pbkdf2:sha256:600000', salt_length=16, executor='thread',
+                 workers=2, max_pending=32, timeout=10):
+        """
+        Args:
+            method (str): Método de werkzeug con sus parámetros de costo
+            salt_length (int): Largo de la sal
+            executor (str): 'thread', 'process' o 'inline' (sin pool)
+            workers (int): Tamaño del pool
+            max_pending (int): Operaciones en curso o en cola permitidas
+            timeout (float): Segundos máximos de espera por operación
+        """
+        self.method = method
+        self.salt_length = salt_length
+        self.executor = executor
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = BoundedSemaphore(max_pending)
+        self._pool = None
+        self._pool_pid = None
+        self._lock = Lock()
+        self._hash_prefix = None
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Crea un hasher a partir de la configuración de la app
+
+        Args:
+            config (dict): Configuración de Flask
+
+        Returns:
+            PasswordHasher: Hasher configurado
+        """
+        return cls(
+            method=config.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:600000'),
+            salt_length=config.get('PASSWORD_HASH_SALT_LENGTH', 16),
+            executor=config.get('PASSWORD_HASH_EXECUTOR', 'thread'),
+            workers=config.get('PASSWORD_HASH_WORKERS', 2),
+            max_pending=config.get('PASSWORD_HASH_MAX_PENDING', 32),
+            timeout=config.get('PASSWORD_HASH_TIMEOUT', 10)
+        )
+
+    def _get_pool(self):
+        # El pool se crea en cada proceso (p. ej. tras el fork de gunicorn)
+        with self._lock:
+            if self._pool is None or self._pool_pid != os.getpid():
+                pool_class = ProcessPoolExecutor if self.executor == 'process' else ThreadPoolExecutor
+                self._pool = pool_class(max_workers=self.workers)
+                self._pool_pid = os.getpid()
+            return self._pool
+
+    def _run(self, fn, *args):
+        if self.executor == 'inline':
+            return fn(*args)
+
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy('Demasiadas operaciones de contraseña en espera')
+        try:
+            future = self._get_pool().submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # El cupo se libera cuando la operación termina y no al agotarse la
+        # espera: cancel() no detiene una operación que ya está en ejecución
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            future.cancel()
+            raise PasswordHasherBusy('Tiempo de espera agotado al procesar la contraseña')
+
+    def hash(self, password):
+        """
+        Genera el hash de una contraseña con los parámetros configurados
+
+        Args:
+            password (str): Contraseña sin encriptar
+
+        Returns:
+            str: Hash en formato de werkzeug
+        """
+        return self._run(generate_password_hash, password, self.method, self.salt_length)
+
+    def verify(self, password_hash, password):
+        """
+        Verifica una contraseña contra su hash
+
+        Args:
+            password_hash (str): Hash almacenado
+            password (str): Contraseña sin encriptar
+
+        Returns:
+            bool: True si coincide
+        """
+        if not password_hash:
+            return False
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """
+        Indica si un hash fue generado con parámetros distintos a los actuales
+
+        Args:
+            password_hash (str): Hash almacenado
+
+        Returns:
+            bool: True si debe regenerarse
+        """
+        if not password_hash:
+            return False
+        return password_hash.split('$', 1)[0] != self._current_prefix()
+
+    def _current_prefix(self):
+        # werkzeug completa los parámetros omitidos en el método (p. ej.
+        # 'pbkdf2' se guarda como 'pbkdf2:sha256:600000'): se compara contra
+        # el prefijo de un hash real, calculado una sola vez
+        if self._hash_prefix is None:
+            sample = generate_password_hash('', self.method, self.salt_length)
+            self._hash_prefix = sample.split('$', 1)[0]
+        return self._hash_prefix
+
+    def shutdown(self):
+        """Detiene el pool de este proceso"""
+        with self._lock:
+            if self._pool is not None and self._pool_pid == os.getpid():
+                self._pool.shutdown(wait=False)
+            self._pool = None
+
+_hasher = PasswordHasher()
+
+def init_password_hasher(app):
+    """
+    Configura el hasher global a partir de la configuración de la app
+
+    Args:
+        app (Flask): Aplicación Flask
+    """
+    global _hasher
+    _hasher.shutdown()
+    _hasher = PasswordHasher.from_config(app.config)
+    app.extensions['password_hasher'] = _hasher
+
+def get_password_hasher():
+    """Obtiene el hasher global"""
+    return _hasher
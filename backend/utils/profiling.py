@@ -0,0 +1,187 @@
+import time
+import traceback
+from collections import deque
+from itertools import count
+from os.path import dirname
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from models import db
+
+# Archivos de la app (para ubicar el origen de las consultas repetidas)
+_APP_ROOT = dirname(dirname(__file__))
+
+_profile_ids = count(1)
+
+class RequestProfile:
+    """Tiempos y consultas SQL de una solicitud"""
+
+    def __init__(self):
+        self.id = next(_profile_ids)
+        self.started = time.perf_counter()
+        self.cpu_started = time.thread_time()
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.serialize_time = 0.0
+        self.serializing = False
+        # Texto de la sentencia -> [ejecuciones, segundos, origen]
+        self.statements = {}
+
+    def record_statement(self, statement, elapsed, threshold):
+        """Acumula una sentencia; al alcanzar el umbral guarda dónde se ejecutó"""
+        self.sql_count += 1
+        self.sql_time += elapsed
+        entry = self.statements.get(statement)
+        if entry is None:
+            self.statements[statement] = [1, elapsed, None]
+            return
+        entry[0] += 1
+        entry[1] += elapsed
+        if entry[0] == threshold:
+            entry[2] = _caller()
+
+    def finish(self, response, threshold):
+        """
+        Cierra el perfil
+
+        Args:
+            response (Response): Respuesta de la solicitud
+            threshold (int): Repeticiones de una misma sentencia que se
+                consideran N+1
+
+        Returns:
+            dict: Perfil de la solicitud
+        """
+        total = time.perf_counter() - self.started
+        repeated = [
+            {'statement': statement, 'count': executions,
+             'duration_ms': round(elapsed * 1000, 3), 'origin': origin}
+            for statement, (executions, elapsed, origin) in self.statements.items()
+            if executions >= threshold
+        ]
+        repeated.sort(key=lambda item: item['count'], reverse=True)
+        return {
+            'id': self.id,
+            'method': request.method,
+            'path': request.full_path.rstrip('?'),
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 3),
+            'cpu_ms': round((time.thread_time() - self.cpu_started) * 1000, 3),
+            'sql_ms': round(self.sql_time * 1000, 3),
+            'serialize_ms': round(self.serialize_time * 1000, 3),
+            'app_ms': round(max(total - self.sql_time - self.serialize_time, 0) * 1000, 3),
+            'sql_count': self.sql_count,
+            'sql_distinct': len(self.statements),
+            'n_plus_one': repeated
+        }
+
+def _caller():
+    """Primer marco de la pila que pertenece a la app (fuera de este módulo)"""
+    for frame in reversed(traceback.extract_stack()):
+        if frame.filename.startswith(_APP_ROOT) and frame.filename != __file__:
+            return f'{frame.filename[len(_APP_ROOT) + 1:]}:{frame.lineno} ({frame.name})'
+    return None
+
+def _current_profile():
+    if has_request_context():
+        return g.get('_profile')
+    return None
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile() is not None:
+        conn.info.setdefault('_profile_started', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile()
+    started = conn.info.get('_profile_started')
+    if profile is None or not started:
+        return
+    profile.record_statement(statement, time.perf_counter() - started.pop(),
+                             current_app.config.get('PROFILING_N_PLUS_ONE_THRESHOLD', 5))
+
+def _start_profile():
+    g._profile = RequestProfile()
+
+def _finish_profile(response):
+    profile = g.pop('_profile', None)
+    if profile is None:
+        return response
+
+    result = profile.finish(response, current_app.config.get('PROFILING_N_PLUS_ONE_THRESHOLD', 5))
+    current_app.extensions['profiling'].append(result)
+
+    response.headers['Server-Timing'] = ', '.join([
+        f'db;dur={result["sql_ms"]};desc="{result["sql_count"]} queries"',
+        f'serialize;dur={result["serialize_ms"]}',
+        f'app;dur={result["app_ms"]}',
+        f'cpu;dur={result["cpu_ms"]}',
+        f'total;dur={result["total_ms"]}'
+    ])
+    if result['n_plus_one']:
+        worst = result['n_plus_one'][0]
+        current_app.logger.warning('Posible N+1 en %s %s: %d ejecuciones de la misma sentencia desde %s',
+                                   result['method'], result['path'], worst['count'], worst['origin'])
+    return response
+
+def _timed_serialization(render):
+    """
+    Envuelve la codificación JSON para sumar su tiempo al perfil
+
+    Con el proveedor de la biblioteca estándar response() llama a dumps(),
+    ambos envueltos: la llamada anidada no se mide para no contarla dos veces.
+    """
+    def wrapper(*args, **kwargs):
+        profile = _current_profile()
+        if profile is None or profile.serializing:
+            return render(*args, **kwargs)
+        profile.serializing = True
+        started = time.perf_counter()
+        try:
+            return render(*args, **kwargs)
+        finally:
+            profile.serialize_time += time.perf_counter() - started
+            profile.serializing = False
+    return wrapper
+
+def get_profiles(limit=None, n_plus_one=False):
+    """
+    Obtiene los perfiles de las últimas solicitudes, del más reciente al más antiguo
+
+    Args:
+        limit (int, optional): Cantidad máxima de perfiles
+        n_plus_one (bool): Solo los que tienen sentencias repetidas
+
+    Returns:
+        list: Perfiles
+    """
+    profiles = [profile for profile in reversed(current_app.extensions['profiling'])
+                if not n_plus_one or profile['n_plus_one']]
+    return profiles[:limit] if limit else profiles
+
+def init_profiling(app):
+    """
+    Activa el perfilado por solicitud si PROFILING_ENABLED está activo
+
+    Cada respuesta lleva un encabezado Server-Timing con el tiempo en SQL
+    (y la cantidad de consultas), en codificar JSON, en el resto del código
+    y de CPU. Los perfiles de las últimas PROFILING_HISTORY solicitudes
+    quedan disponibles en /api/debug/profiles. Las respuestas en streaming
+    se codifican después de cerrar el perfil y no suman tiempo de
+    serialización.
+
+    Args:
+        app (Flask): Aplicación Flask
+    """
+    if not app.config.get('PROFILING_ENABLED'):
+        return
+
+    app.extensions['profiling'] = deque(maxlen=app.config.get('PROFILING_HISTORY', 200))
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+    app.json.dumps = _timed_serialization(app.json.dumps)
+    app.json.response = _timed_serialization(app.json.response)
+    app.before_request(_start_profile)
+    app.after_request(_finish_profile)
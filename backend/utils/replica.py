@@ -0,0 +1,116 @@
+import time
+from flask import current_app, g, request
+from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+from sqlalchemy import inspect
+from models import db
+from .cache import TTLCache
+
+# Solicitudes que pueden leer de la réplica
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Cookie con el instante (epoch) hasta el que el cliente debe leer del primario
+STICKY_COOKIE = 'db_primary_until'
+
+def _current_identity():
+    """Obtiene el usuario del token si viene uno válido, sin exigirlo"""
+    try:
+        verify_jwt_in_request(optional=True)
+        return get_jwt_identity()
+    except Exception:
+        return None
+
+def _route_reads():
+    """
+    Decide si la solicitud actual lee de la réplica
+
+    Las solicitudes GET van a la réplica salvo que el mismo usuario (o el
+    mismo cliente, según la cookie) haya escrito hace menos de
+    REPLICA_STICKY_SECONDS: así siempre ve sus propios cambios aunque la
+    réplica tenga retraso.
+    """
+    if request.method not in SAFE_METHODS:
+        return
+    try:
+        if float(request.cookies.get(STICKY_COOKIE, 0)) > time.time():
+            return
+    except ValueError:
+        pass
+
+    identity = _current_identity()
+    if identity is not None and current_app.extensions['replica'].get(identity):
+        return
+    g._db_read_replica = True
+
+def _remember_writes(response):
+    """Marca al usuario y al cliente para leer del primario tras escribir"""
+    if request.method in SAFE_METHODS or response.status_code >= 400:
+        return response
+
+    sticky_seconds = current_app.config.get('REPLICA_STICKY_SECONDS', 5)
+    identity = _current_identity()
+    if identity is not None:
+        current_app.extensions['replica'].set(identity, True)
+    response.set_cookie(STICKY_COOKIE, str(time.time() + sticky_seconds),
+                        max_age=int(sticky_seconds) + 1, httponly=True, samesite='Lax')
+
+    if current_app.config.get('REPLICA_SQLITE_AUTO_SYNC'):
+        sync_sqlite_replica()
+    return response
+
+def sync_sqlite_replica():
+    """
+    Copia la base SQLite principal sobre la réplica con la API de respaldo
+
+    Pensado para probar la réplica en desarrollo: la copia es completa y
+    consistente aunque haya escrituras en curso.
+
+    Raises:
+        ValueError: Si no hay réplica o alguna de las bases no es SQLite
+    """
+    primary = db.engines[None]
+    replica = db.engines.get('replica')
+    if replica is None:
+        raise ValueError('No hay una réplica configurada (SQLALCHEMY_REPLICA_URI)')
+    if primary.dialect.name != 'sqlite' or replica.dialect.name != 'sqlite':
+        raise ValueError('La sincronización solo está disponible entre bases SQLite')
+
+    source = primary.raw_connection()
+    target = replica.raw_connection()
+    try:
+        source.driver_connection.backup(target.driver_connection)
+    finally:
+        target.close()
+        source.close()
+
+def init_replica(app):
+    """
+    Activa el enrutamiento de lecturas a la réplica, si está configurada
+
+    Debe llamarse después de init_database y de crear las tablas: con
+    REPLICA_SQLITE_AUTO_SYNC la réplica SQLite se sincroniza al iniciar.
+    Si a la réplica le faltan tablas (p. ej. una réplica SQLite que aún no
+    se sincronizó con flask db-sync-replica) las lecturas siguen en el
+    primario hasta reiniciar la app con la réplica lista, en lugar de fallar.
+
+    Args:
+        app (Flask): Aplicación Flask
+    """
+    if not app.config.get('SQLALCHEMY_REPLICA_URI'):
+        return
+
+    with app.app_context():
+        if app.config.get('REPLICA_SQLITE_AUTO_SYNC'):
+            sync_sqlite_replica()
+        missing = sorted(set(db.metadata.tables) - set(inspect(db.engines['replica']).get_table_names()))
+    if missing:
+        app.logger.warning('A la réplica le faltan tablas (%s): las lecturas usan el primario',
+                           ', '.join(missing))
+        return
+
+    # Usuarios que escribieron recientemente; expiran solos tras el TTL
+    app.extensions['replica'] = TTLCache(
+        maxsize=app.config.get('REPLICA_STICKY_USERS', 10000),
+        ttl=app.config.get('REPLICA_STICKY_SECONDS', 5)
+    )
+    app.before_request(_route_reads)
+    app.after_request(_remember_writes)
@@ -0,0 +1,231 @@
+from collections import OrderedDict
+from datetime import date
+from importlib import import_module
+from threading import Lock
+from urllib.parse import urlencode
+from flask import current_app, has_app_context, jsonify, request
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from models import Project
+from .auth_utils import admin_required
+
+class ResponseCacheBackend:
+    """
+    Interfaz de los almacenes de la caché de respuestas
+
+    Las claves incluyen la versión del proyecto, por lo que un almacén
+    compartido entre procesos (p. ej. Redis) nunca devuelve una respuesta
+    obsoleta aunque otro proceso no haya recibido la invalidación;
+    delete_project solo libera espacio.
+    """
+
+    def get(self, key):
+        """Obtiene (cuerpo, mimetype) o None"""
+        raise NotImplementedError
+
+    def set(self, key, project_id, value):
+        """Guarda (cuerpo, mimetype) asociado a un proyecto"""
+        raise NotImplementedError
+
+    def delete_project(self, project_id):
+        """Elimina todas las respuestas de un proyecto"""
+        raise NotImplementedError
+
+    def clear(self):
+        """Elimina todas las respuestas"""
+        raise NotImplementedError
+
+    def size(self):
+        """Devuelve (entradas, bytes) almacenados"""
+        return 0, 0
+
+class LRUResponseCache(ResponseCacheBackend):
+    """Almacén en memoria del proceso, acotado en entradas y en bytes"""
+
+    def __init__(self, maxsize=1024, max_bytes=64 * 1024 * 1024):
+        """
+        Args:
+            maxsize (int): Cantidad máxima de respuestas
+            max_bytes (int): Tamaño máximo total de los cuerpos
+        """
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()
+        self._by_project = {}
+        self._bytes = 0
+        self._lock = Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, project_id, value):
+        size = len(value[0])
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._data[key] = (project_id, value)
+            self._by_project.setdefault(project_id, set()).add(key)
+            self._bytes += size
+            while len(self._data) > self.maxsize or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._data)))
+
+    def _remove(self, key):
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return
+        project_id, value = entry
+        self._bytes -= len(value[0])
+        keys = self._by_project.get(project_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_project[project_id]
+
+    def delete_project(self, project_id):
+        with self._lock:
+            for key in list(self._by_project.get(project_id, ())):
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._by_project.clear()
+            self._bytes = 0
+
+    def size(self):
+        return len(self._data), self._bytes
+
+class ResponseCache:
+    """
+    Caché de respuestas GET de los recursos de un proyecto
+
+    Las claves son (proyecto, versión, ruta con parámetros ordenados). Cada
+    escritura incrementa la versión del proyecto, así que una respuesta
+    cacheada nunca se sirve después de un cambio; además las entradas del
+    proyecto se eliminan del almacén al confirmarse la escritura. La clave
+    incluye la fecha porque filtros como status=overdue dependen del día.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._lock = Lock()
+
+    @staticmethod
+    def key(project):
+        """Clave de la solicitud actual para un proyecto"""
+        params = urlencode(sorted(request.args.items(multi=True)))
+        return f'{project.id}:{project.version}:{date.today().isoformat()}:{request.path}?{params}'
+
+    def get(self, project):
+        value = self.backend.get(self.key(project))
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, project, body, mimetype):
+        self.backend.set(self.key(project), project.id, (body, mimetype))
+
+    def invalidate_project(self, project_id):
+        self.backend.delete_project(project_id)
+        with self._lock:
+            self.invalidations += 1
+
+    def stats(self):
+        """
+        Obtiene los contadores de la caché en este proceso
+
+        Returns:
+            dict: Aciertos, fallos, proporción de aciertos, invalidaciones y tamaño
+        """
+        entries, size = self.backend.size()
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / total, 4) if total else 0.0,
+            'invalidations': self.invalidations,
+            'entries': entries,
+            'bytes': size
+        }
+
+def _load_backend(app):
+    """Crea el almacén configurado: 'memory' o una fábrica 'modulo:funcion'"""
+    backend = app.config.get('RESPONSE_CACHE_BACKEND', 'memory')
+    if backend == 'memory':
+        return LRUResponseCache(
+            maxsize=app.config.get('RESPONSE_CACHE_SIZE', 1024),
+            max_bytes=app.config.get('RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024)
+        )
+    module_name, _, factory = backend.partition(':')
+    return getattr(import_module(module_name), factory)(app.config)
+
+def get_response_cache():
+    """Obtiene la caché de respuestas de la app actual, o None si está desactivada"""
+    if not has_app_context():
+        return None
+    return current_app.extensions.get('response_cache')
+
+def init_response_cache(app):
+    """
+    Configura la caché de respuestas y el endpoint de sus contadores
+
+    El endpoint es solo para administradores (ADMIN_USER_IDS); /metrics
+    exporta los mismos contadores.
+
+    Args:
+        app (Flask): Aplicación Flask
+    """
+    if not app.config.get('RESPONSE_CACHE_ENABLED', True):
+        return
+    cache = ResponseCache(_load_backend(app))
+    app.extensions['response_cache'] = cache
+
+    @admin_required
+    def cache_stats():
+        return jsonify(cache.stats()), 200
+
+    app.add_url_rule('/api/cache/stats', 'cache_stats', cache_stats, methods=['GET'])
+
+@event.listens_for(Session, 'before_flush')
+def _collect_changed_projects(session, flush_context, instances):
+    """
+    Registra los proyectos cuya versión cambia en este flush
+
+    Se ejecuta después de models.change_tracking (registrado antes al
+    importar los modelos), que es quien incrementa las versiones.
+    """
+    changed = session.info.setdefault('response_cache_projects', set())
+    for obj in session.dirty:
+        if isinstance(obj, Project) and inspect(obj).attrs.version.history.has_changes():
+            changed.add(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, Project):
+            changed.add(obj.id)
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_changed_projects(session):
+    """Elimina las respuestas cacheadas de los proyectos modificados"""
+    changed = session.info.pop('response_cache_projects', None)
+    if not changed:
+        return
+    cache = get_response_cache()
+    if cache is None:
+        return
+    for project_id in changed:
+        cache.invalidate_project(project_id)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changed_projects(session):
+    session.info.pop('response_cache_projects', None)
@@ -0,0 +1,73 @@
+import time
+from datetime import date
+from sqlalchemy.orm import configure_mappers
+from models import db, User, Project, Task, Milestone
+from services import ProjectService, SerializationService, TimelineService
+from .pagination import keyset_paginate
+
+# ID que no existe: las consultas de calentamiento no devuelven filas
+_MISSING_ID = 0
+
+def _warmup_queries():
+    """
+    Ejecuta las consultas de las rutas más usadas con la misma forma que en
+    las rutas, para que queden en la caché de compilación del motor
+    """
+    project = Project(id=_MISSING_ID, start_date=date.today(), end_date=date.today())
+
+    # Inicio de sesión y autorización
+    User.query.filter_by(email='').first()
+    db.session.get(User, _MISSING_ID)
+    db.session.get(Project, _MISSING_ID)
+    db.session.get(Task, _MISSING_ID)
+    db.session.get(Milestone, _MISSING_ID)
+
+    # Listados paginados
+    keyset_paginate(Project.query.filter_by(user_id=_MISSING_ID),
+                    [(Project.created_at, True), (Project.id, True)], 1)
+    keyset_paginate(SerializationService.task_query(None, (Task.end_date,)).filter(Task.project_id == _MISSING_ID),
+                    [(Task.end_date, False), (Task.id, False)], 1)
+    keyset_paginate(SerializationService.milestone_query(None, (Milestone.date,)).filter(Milestone.project_id == _MISSING_ID),
+                    [(Milestone.date, False), (Milestone.id, False)], 1)
+
+    # Línea de tiempo y estadísticas
+    SerializationService.task_query().filter(Task.project_id == _MISSING_ID).all()
+    SerializationService.milestone_query().filter(Milestone.project_id == _MISSING_ID).all()
+    SerializationService.serialize_task_rows(
+        SerializationService.task_query().filter(Task.id == _MISSING_ID).all()
+    )
+    db.session.execute(SerializationService.participant_names_select({_MISSING_ID})).all()
+    TimelineService.bucket_project(project, 'quarterly')
+    ProjectService.get_project_statistics(_MISSING_ID)
+
+def warmup(app):
+    """
+    Prepara el proceso antes de recibir tráfico
+
+    Configura los mappers de SQLAlchemy, ejecuta las consultas frecuentes
+    (la primera ejecución de cada una la compila y abre la conexión) y
+    compila las plantillas. Con gunicorn --preload se ejecuta una vez en el
+    maestro y los workers heredan el resultado.
+
+    Args:
+        app (Flask): Aplicación Flask
+
+    Returns:
+        float: Segundos empleados
+    """
+    started = time.perf_counter()
+    configure_mappers()
+
+    with app.app_context():
+        try:
+            _warmup_queries()
+        finally:
+            db.session.rollback()
+            db.session.remove()
+
+    for name in app.jinja_env.list_templates(extensions=['html']):
+        app.jinja_env.get_template(name)
+
+    elapsed = time.perf_counter() - started
+    app.logger.info('Calentamiento completado en %.3f s', elapsed)
+    return elapsed
@@ -0,0 +1,14 @@
+"""
+Punto de entrada WSGI para producción
+
+La aplicación se crea al importar el módulo, de modo que con --preload el
+proceso maestro importa las librerías, verifica el esquema y ejecuta el
+calentamiento una sola vez; los workers la heredan al hacer fork (las
+conexiones abiertas en el maestro se cierran antes, ver
+utils/database.py). Ejemplo (desde backend/):
+    APP_CONFIG=production gunicorn --preload -w 4 wsgi:app
+"""
+from os import environ
+from app import create_app
+
+app = create_app(environ.get('APP_CONFIG', 'default'))
@@ -0,0 +1,562 @@
+"""
+Benchmark de latencia y rendimiento de todas las rutas /api/*
+
+Mide p50, p95, p99, promedio y solicitudes por segundo de cada ruta sobre
+una base generada con seed_data.py, con dos servidores:
+    - test-client: cliente de pruebas de Flask en el mismo proceso (solo la
+      app, sin red)
+    - gunicorn: servidor WSGI real (--workers procesos, --preload) con
+      --concurrency clientes HTTP
+
+Las lecturas usan el proyecto grande del usuario del benchmark; las
+escrituras usan un proyecto auxiliar creado al empezar, para que los datos
+que leen las demás rutas no cambien. Cada servidor trabaja sobre una copia
+temporal de la base (salvo con --in-place), así que las mediciones se
+pueden repetir sobre los mismos datos. Las rutas que eliminan crean antes lo
+que eliminan, sin medir ese paso. Antes de medir se comprueba que todas las
+rutas /api/* de la app tengan una entrada en ROUTES.
+
+Los resultados se guardan en JSON (--output) y se comparan con una línea
+base (--baseline): una ruta empeora si su p95 supera al de la base en más de
+--tolerance y en más de --min-delta-ms. Con regresiones el proceso termina
+con código 1. --save-baseline guarda los resultados como nueva línea base.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/seed_data.py --database /tmp/bench.db
+    python benchmarks/api_latency.py --database /tmp/bench.db --output /tmp/results.json
+    python benchmarks/api_latency.py --database /tmp/bench.db --servers test-client --save-baseline
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import shutil
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+from seed_data import BACKEND, BENCH_EMAIL, BENCH_PASSWORD
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'api_latency.json')
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def succeeded(status):
+    # 207: la operación masiva falló en parte
+    return 200 <= status < 300 and status != 207
+
+class Route:
+    """Una ruta a medir"""
+
+    def __init__(self, method, path, body=None, prepare=None):
+        """
+        Args:
+            method (str): Método HTTP
+            path (str): Ruta con campos {nombre} del contexto o de prepare
+            body (callable, optional): Recibe (contexto, número) y devuelve el JSON a enviar
+            prepare (callable, optional): Recibe (cliente, contexto, número) y devuelve
+                campos adicionales para path y body; no se mide
+        """
+        self.method = method
+        self.path = path
+        self.body = body
+        self.prepare = prepare
+
+    @property
+    def name(self):
+        return f'{self.method} {self.path}'
+
+class TestClientTransport:
+    """Solicitudes con el cliente de pruebas de Flask"""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def send(self, method, path, body=None, headers=None):
+        response = self.client.open(path, method=method, json=body, headers=headers)
+        data = response.get_data()
+        return response.status_code, data
+
+class HTTPTransport:
+    """Solicitudes HTTP/1.1 a un servidor local, una conexión por solicitud"""
+
+    def __init__(self, port):
+        self.port = port
+
+    def send(self, method, path, body=None, headers=None):
+        headers = dict(headers or {})
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers['Content-Type'] = 'application/json'
+        connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=60)
+        try:
+            connection.request(method, path, body=payload, headers=headers)
+            response = connection.getresponse()
+            return response.status, response.read()
+        finally:
+            connection.close()
+
+class Client:
+    """Transporte con el token del usuario del benchmark"""
+
+    def __init__(self, transport):
+        self.transport = transport
+        self.headers = {}
+
+    def login(self):
+        status, data = self.request('POST', '/api/auth/login', {'email': BENCH_EMAIL, 'password': BENCH_PASSWORD})
+        self.headers = {'Authorization': f"Bearer {data['access_token']}"}
+
+    def send(self, method, path, body=None):
+        return self.transport.send(method, path, body, self.headers)
+
+    def request(self, method, path, body=None):
+        """Solicitud auxiliar (no medida): exige éxito y devuelve el JSON"""
+        status, data = self.send(method, path, body)
+        if not succeeded(status):
+            raise RuntimeError(f'{method} {path} respondió {status}: {data[:200]!r}')
+        return status, json.loads(data)
+
+# Cuerpos y preparaciones de las rutas
+
+def _day(context, offset):
+    return (context['today'] + timedelta(days=offset)).isoformat()
+
+def _task_body(context, number):
+    return {'name': f'Tarea benchmark {number}', 'start_date': _day(context, -10), 'end_date': _day(context, 10)}
+
+def _subtask_body(context, number):
+    return {'name': f'Subtarea benchmark {number}', 'start_date': _day(context, -5), 'end_date': _day(context, 5)}
+
+def _new_project(client, context, number):
+    _, data = client.request('POST', '/api/projects/', {
+        'name': f'Eliminar {number}', 'start_date': _day(context, -30), 'end_date': _day(context, 30)
+    })
+    return {'project_id': data['project']['id']}
+
+def _new_participant(client, context, number):
+    _, data = client.request('POST', f"/api/participants/{context['scratch']}/participants", {
+        'name': f'Eliminar {number}', 'email': f'eliminar{number}@example.com', 'role': 'collaborator'
+    })
+    return {'participant_id': data['participant']['id']}
+
+def _new_task(client, context, number):
+    _, data = client.request('POST', f"/api/tasks/{context['scratch']}/tasks", _task_body(context, number))
+    return {'task_id': data['task']['id']}
+
+def _new_subtask(client, context, number):
+    _, data = client.request('POST', f"/api/tasks/tasks/{context['scratch_task']}/subtasks",
+                             _subtask_body(context, number))
+    return {'subtask_id': data['subtask']['id']}
+
+def _new_milestone(client, context, number):
+    _, data = client.request('POST', f"/api/milestones/{context['scratch']}/milestones",
+                             {'name': f'Eliminar {number}', 'date': _day(context, 5)})
+    return {'milestone_id': data['milestone']['id']}
+
+def _new_task_pair(client, context, number):
+    _, data = client.request('POST', f"/api/tasks/{context['scratch']}/tasks/bulk",
+                             {'tasks': [_task_body(context, number), _task_body(context, number)]})
+    predecessor, successor = (result['id'] for result in data['results'])
+    return {'predecessor_id': predecessor, 'successor_id': successor}
+
+def _new_dependency(client, context, number):
+    pair = _new_task_pair(client, context, number)
+    _, data = client.request('POST', f"/api/tasks/{context['scratch']}/dependencies", pair)
+    return {'dependency_id': data['dependency']['id']}
+
+ROUTES = [
+    # Autenticación
+    Route('POST', '/api/auth/login', body=lambda c, n: {'email': BENCH_EMAIL, 'password': BENCH_PASSWORD}),
+    Route('POST', '/api/auth/register',
+          body=lambda c, n: {'name': 'Benchmark', 'email': f"reg-{c['run']}-{n}@example.com", 'password': 'benchmark'}),
+    Route('GET', '/api/auth/me'),
+
+    # Proyectos
+    Route('GET', '/api/projects/'),
+    Route('GET', '/api/projects/{project}'),
+    Route('GET', '/api/projects/{project}/statistics'),
+    Route('GET', '/api/projects/{project}/timeline'),
+    Route('GET', '/api/projects/{project}/export'),
+    Route('POST', '/api/projects/',
+          body=lambda c, n: {'name': f'Proyecto {n}', 'start_date': _day(c, -30), 'end_date': _day(c, 30)}),
+    Route('PUT', '/api/projects/{scratch}', body=lambda c, n: {'description': f'Revisión {n}'}),
+    Route('DELETE', '/api/projects/{project_id}', prepare=_new_project),
+    # Un objeto JSON es un archivo NDJSON de una línea
+    Route('POST', '/api/projects/{scratch}/import?format=ndjson',
+          body=lambda c, n: {'type': 'task', **_task_body(c, f'importada-{n}')}),
+
+    # Participantes
+    Route('GET', '/api/participants/{project}/participants'),
+    Route('GET', '/api/participants/participants/{participant}'),
+    Route('POST', '/api/participants/{scratch}/participants',
+          body=lambda c, n: {'name': f'Participante {n}', 'email': f'p{n}@example.com', 'role': 'external'}),
+    Route('PUT', '/api/participants/participants/{scratch_participant}', body=lambda c, n: {'name': f'Nombre {n}'}),
+    Route('DELETE', '/api/participants/participants/{participant_id}', prepare=_new_participant),
+
+    # Tareas
+    Route('GET', '/api/tasks/{project}/tasks'),
+    Route('GET', '/api/tasks/{project}/tasks/overdue'),
+    Route('GET', '/api/tasks/overdue'),
+    Route('GET', '/api/tasks/tasks/{task}'),
+    Route('GET', '/api/tasks/tasks/{task}/subtasks'),
+    Route('GET', '/api/tasks/{project}/subtasks/overdue'),
+    Route('GET', '/api/tasks/subtasks/overdue'),
+    Route('GET', '/api/tasks/{project}/dependencies'),
+    Route('GET', '/api/tasks/{project}/schedule'),
+    Route('POST', '/api/tasks/{scratch}/tasks', body=_task_body),
+    Route('POST', '/api/tasks/{scratch}/tasks/bulk',
+          body=lambda c, n: {'tasks': [_task_body(c, f'{n}-{i}') for i in range(50)]}),
+    Route('PATCH', '/api/tasks/{scratch}/tasks/bulk',
+          body=lambda c, n: {'tasks': [{'id': task_id, 'progress': (n * 7 + i) % 100}
+                                       for i, task_id in enumerate(c['scratch_tasks'])]}),
+    Route('PUT', '/api/tasks/tasks/{scratch_task}', body=lambda c, n: {'budget': float(n % 1000)}),
+    Route('DELETE', '/api/tasks/tasks/{task_id}', prepare=_new_task),
+    Route('POST', '/api/tasks/tasks/{scratch_task}/subtasks', body=_subtask_body),
+    Route('POST', '/api/tasks/{scratch}/subtasks/bulk',
+          body=lambda c, n: {'subtasks': [{**_subtask_body(c, f'{n}-{i}'), 'task_id': c['scratch_tasks'][i]}
+                                          for i in range(len(c['scratch_tasks']))]}),
+    Route('PATCH', '/api/tasks/{scratch}/subtasks/bulk',
+          body=lambda c, n: {'subtasks': [{'id': c['scratch_subtask'], 'progress': n % 100}]}),
+    Route('PUT', '/api/tasks/subtasks/{scratch_subtask}', body=lambda c, n: {'budget': float(n % 1000)}),
+    Route('DELETE', '/api/tasks/subtasks/{subtask_id}', prepare=_new_subtask),
+    Route('POST', '/api/tasks/{scratch}/dependencies', prepare=_new_task_pair,
+          body=lambda c, n: {'predecessor_id': c['predecessor_id'], 'successor_id': c['successor_id']}),
+    Route('DELETE', '/api/tasks/dependencies/{dependency_id}', prepare=_new_dependency),
+
+    # Hitos
+    Route('GET', '/api/milestones/{project}/milestones'),
+    Route('GET', '/api/milestones/{project}/milestones/upcoming'),
+    Route('GET', '/api/milestones/upcoming'),
+    Route('GET', '/api/milestones/milestones/{milestone}'),
+    Route('POST', '/api/milestones/{scratch}/milestones',
+          body=lambda c, n: {'name': f'Hito {n}', 'date': _day(c, 3)}),
+    Route('PUT', '/api/milestones/milestones/{scratch_milestone}', body=lambda c, n: {'name': f'Hito {n}'}),
+    Route('DELETE', '/api/milestones/milestones/{milestone_id}', prepare=_new_milestone),
+
+    # Otros
+    Route('GET', '/api/cache/stats'),
+]
+
+def read_context(database):
+    """Obtiene de la base los IDs que leen las rutas (proyecto grande del usuario del benchmark)"""
+    connection = sqlite3.connect(database)
+    try:
+        def value(sql, *params):
+            row = connection.execute(sql, params).fetchone()
+            if row is None:
+                raise RuntimeError(f'La base no tiene los datos del benchmark ({sql})')
+            return row[0]
+
+        user = value('SELECT id FROM users WHERE email = ?', BENCH_EMAIL)
+        project = value('SELECT id FROM projects WHERE user_id = ? ORDER BY tasks_count DESC LIMIT 1', user)
+        task = value('SELECT id FROM tasks WHERE project_id = ? ORDER BY subtasks_count DESC LIMIT 1', project)
+        dataset = {table: value(f'SELECT COUNT(*) FROM {table}') for table in
+                   ('users', 'projects', 'participants', 'tasks', 'subtasks', 'milestones', 'task_dependencies')}
+        dataset['large_project_tasks'] = value('SELECT COUNT(*) FROM tasks WHERE project_id = ?', project)
+        return {
+            'project': project,
+            'task': task,
+            'participant': value('SELECT id FROM participants WHERE project_id = ? LIMIT 1', project),
+            'milestone': value('SELECT id FROM milestones WHERE project_id = ? LIMIT 1', project),
+        }, dataset
+    finally:
+        connection.close()
+
+def create_scratch(client, context):
+    """Crea el proyecto auxiliar de las escrituras con algunas tareas y subtareas"""
+    _, data = client.request('POST', '/api/projects/', {
+        'name': 'Escrituras del benchmark', 'start_date': _day(context, -60), 'end_date': _day(context, 60)
+    })
+    context['scratch'] = scratch = data['project']['id']
+    _, data = client.request('POST', f'/api/participants/{scratch}/participants',
+                             {'name': 'Participante', 'email': 'participante@example.com', 'role': 'collaborator'})
+    context['scratch_participant'] = data['participant']['id']
+    _, data = client.request('POST', f'/api/tasks/{scratch}/tasks/bulk',
+                             {'tasks': [_task_body(context, i) for i in range(20)]})
+    context['scratch_tasks'] = [result['id'] for result in data['results']]
+    context['scratch_task'] = context['scratch_tasks'][0]
+    context['scratch_subtask'] = _new_subtask(client, context, 0)['subtask_id']
+    _, data = client.request('POST', f'/api/milestones/{scratch}/milestones', {'name': 'Hito', 'date': _day(context, 5)})
+    context['scratch_milestone'] = data['milestone']['id']
+
+def measure(route, make_client, context, requests, warmup, concurrency):
+    """
+    Mide una ruta con concurrency hilos
+
+    Returns:
+        dict: Percentiles (ms), promedio, solicitudes por segundo y errores
+    """
+    latencies = []
+    errors = []
+    counter = iter(range(warmup + requests))
+    lock = threading.Lock()
+
+    def worker():
+        client = make_client()
+        while True:
+            with lock:
+                number = next(counter, None)
+            if number is None:
+                return
+            fields = dict(context)
+            if route.prepare:
+                try:
+                    fields.update(route.prepare(client, context, number))
+                except (RuntimeError, OSError) as e:
+                    with lock:
+                        errors.append(f'preparación: {e}'[:200])
+                    continue
+            body = route.body(fields, number) if route.body else None
+            path = route.path.format(**fields)
+
+            started = time.perf_counter()
+            status, data = client.send(route.method, path, body)
+            elapsed = time.perf_counter() - started
+            if number < warmup:
+                continue
+            with lock:
+                latencies.append(elapsed)
+                if not succeeded(status):
+                    errors.append(f'{status} {data[:120]!r}')
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    busy = sum(latencies) / concurrency
+    return {
+        'count': len(latencies),
+        'errors': len(errors),
+        'first_error': errors[0] if errors else None,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+        'rps': round(len(latencies) / busy, 1) if busy else 0.0
+    }
+
+def check_coverage(app):
+    """Verifica que todas las rutas /api/* de la app estén en ROUTES"""
+    import re
+    covered = {(route.method, re.sub(r'\{[^}]+\}', '<>', route.path.split('?')[0])) for route in ROUTES}
+    missing = []
+    for rule in app.url_map.iter_rules():
+        if not rule.rule.startswith('/api/'):
+            continue
+        path = re.sub(r'<[^>]+>', '<>', rule.rule)
+        for method in sorted(rule.methods - {'HEAD', 'OPTIONS'}):
+            if (method, path) not in covered:
+                missing.append(f'{method} {rule.rule}')
+    return missing
+
+def run_routes(label, make_client, context, args, results):
+    print(f'\n{label}')
+    print(f'  {"ruta":<58}{"p50":>9}{"p95":>9}{"p99":>9}{"req/s":>9}{"err":>5}')
+    for route in ROUTES:
+        if args.routes and not any(pattern in route.name for pattern in args.routes):
+            continue
+        result = measure(route, make_client, context, args.requests, args.warmup,
+                         1 if label == 'test-client' else args.concurrency)
+        results[route.name] = result
+        print(f'  {route.name:<58}{result["p50_ms"]:9.2f}{result["p95_ms"]:9.2f}{result["p99_ms"]:9.2f}'
+              f'{result["rps"]:9.1f}{result["errors"]:5d}')
+        if result['first_error']:
+            print(f'      {result["first_error"]}')
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def wait_until_ready(port, process, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError('El servidor terminó al iniciar')
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError('El servidor no respondió a tiempo')
+
+def run_test_client(context, args, results):
+    from app import create_app
+    app = create_app(args.config)
+    missing = check_coverage(app)
+    if missing:
+        print('Rutas /api/* sin entrada en ROUTES: ' + ', '.join(missing))
+
+    def make_client():
+        client = Client(TestClientTransport(app))
+        client.headers = context['headers']
+        return client
+
+    client = Client(TestClientTransport(app))
+    client.login()
+    context['headers'] = client.headers
+    create_scratch(client, context)
+    run_routes('test-client', make_client, context, args, results)
+
+def run_gunicorn(context, args, results, env, log_path):
+    port = free_port()
+    with open(log_path, 'w') as log:
+        process = subprocess.Popen([sys.executable, '-m', 'gunicorn', '--preload', '-w', str(args.workers),
+                                    '-b', f'127.0.0.1:{port}', 'wsgi:app'],
+                                   cwd=BACKEND, env=env, stdout=log, stderr=subprocess.STDOUT)
+    try:
+        wait_until_ready(port, process)
+
+        def make_client():
+            client = Client(HTTPTransport(port))
+            client.headers = context['headers']
+            return client
+
+        client = Client(HTTPTransport(port))
+        client.login()
+        context['headers'] = client.headers
+        create_scratch(client, context)
+        run_routes(f'gunicorn ({args.workers} workers, {args.concurrency} clientes)', make_client, context,
+                   args, results)
+    finally:
+        process.terminate()
+        process.wait()
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(current, baseline, tolerance, min_delta_ms):
+    """
+    Compara el p95 de cada ruta con la línea base
+
+    Returns:
+        list: Regresiones (servidor, ruta, p95 base, p95 actual)
+    """
+    base_dataset = baseline['meta'].get('dataset', {})
+    for table, rows in current['meta'].get('dataset', {}).items():
+        if abs(rows - base_dataset.get(table, 0)) > 0.05 * rows:
+            print('\nAviso: la línea base se midió con otro volumen de datos')
+            break
+
+    regressions = []
+    print(f'\nComparación con la línea base ({baseline["meta"].get("created_at")}, p95 en ms)')
+    for server, routes in current['results'].items():
+        base_routes = baseline['results'].get(server, {})
+        for name, result in routes.items():
+            base = base_routes.get(name)
+            if base is None:
+                continue
+            delta = result['p95_ms'] - base['p95_ms']
+            change = delta / base['p95_ms'] if base['p95_ms'] else 0.0
+            regressed = change > tolerance and delta > min_delta_ms
+            if regressed:
+                regressions.append((server, name, base['p95_ms'], result['p95_ms']))
+            if regressed or abs(change) > tolerance:
+                print(f'  {"EMPEORA" if regressed else "mejora " if delta < 0 else "       "} {server:<12}'
+                      f'{name:<58}{base["p95_ms"]:9.2f} -> {result["p95_ms"]:9.2f} ({change:+.0%})')
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database', required=True, help='Base generada con seed_data.py')
+    parser.add_argument('--in-place', action='store_true', help='Escribir en la base en lugar de una copia')
+    parser.add_argument('--servers', default='test-client,gunicorn')
+    parser.add_argument('--config', default='production', help='Configuración de la app')
+    parser.add_argument('--requests', type=int, default=200, help='Solicitudes medidas por ruta')
+    parser.add_argument('--warmup', type=int, default=10, help='Solicitudes sin medir por ruta')
+    parser.add_argument('--concurrency', type=int, default=8, help='Clientes simultáneos (gunicorn)')
+    parser.add_argument('--workers', type=int, default=4, help='Workers de gunicorn')
+    parser.add_argument('--routes', nargs='*', help='Medir solo las rutas que contengan estos textos')
+    parser.add_argument('--output', help='Archivo JSON de resultados')
+    parser.add_argument('--baseline', default=BASELINE, help='Línea base a comparar')
+    parser.add_argument('--save-baseline', action='store_true', help='Guardar los resultados como línea base')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Aumento relativo del p95 tolerado')
+    parser.add_argument('--min-delta-ms', type=float, default=2.0, help='Aumento absoluto del p95 ignorado')
+    args = parser.parse_args()
+
+    database = os.path.abspath(args.database)
+    context, dataset = read_context(database)
+    context['today'] = date.today()
+    context['run'] = int(time.time())
+
+    sys.path.insert(0, BACKEND)
+
+    current = {
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'config': args.config,
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'workers': args.workers,
+            'dataset': dataset
+        },
+        'results': {}
+    }
+    for server in args.servers.split(','):
+        if server not in ('test-client', 'gunicorn'):
+            parser.error(f'Servidor desconocido: {server}')
+        copy = None
+        if not args.in_place:
+            copy = os.path.join(tempfile.mkdtemp(), 'bench.db')
+            shutil.copyfile(database, copy)
+
+        env = dict(os.environ, DATABASE_URL=f'sqlite:///{copy or database}', APP_CONFIG=args.config)
+        env.setdefault('SECRET_KEY', 'benchmark')
+        env.setdefault('JWT_SECRET_KEY', 'benchmark')
+        results = current['results'].setdefault(server, {})
+        try:
+            if server == 'test-client':
+                # La app se crea en este proceso: la configuración lee el entorno al importarse
+                os.environ.update(env)
+                run_test_client(dict(context, run=f"{context['run']}-{server}"), args, results)
+            else:
+                log_path = os.path.join(tempfile.gettempdir(), f"api_latency-{context['run']}-gunicorn.log")
+                run_gunicorn(dict(context, run=f"{context['run']}-{server}"), args, results, env, log_path)
+                if any(result['errors'] for result in results.values()):
+                    print(f'\nRegistro del servidor: {log_path}')
+        finally:
+            if copy:
+                shutil.rmtree(os.path.dirname(copy), ignore_errors=True)
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(current, output, indent=2, sort_keys=True)
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w') as output:
+            json.dump(current, output, indent=2, sort_keys=True)
+        print(f'\nLínea base guardada en {args.baseline}')
+        return
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as baseline_file:
+            regressions = compare(current, json.load(baseline_file), args.tolerance, args.min_delta_ms)
+        if regressions:
+            print(f'\n{len(regressions)} rutas empeoraron')
+            sys.exit(1)
+        print('\nSin regresiones')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+"""
+Benchmark de la API de lectura: app WSGI (gunicorn, workers síncronos)
+frente a la app ASGI (uvicorn, motor asyncio de SQLAlchemy) sobre la misma
+base SQLite en archivo.
+
+Cada cliente repite GET sobre una ruta de lectura. Una parte de los clientes
+son lentos: envían la solicitud de a poco durante --slow-ms, como un móvil
+con mala conexión. Un worker síncrono queda ocupado mientras tanto; un
+worker asíncrono sigue atendiendo a los demás.
+
+Requiere gunicorn, uvicorn y aiosqlite. Uso (desde la raíz del repositorio):
+    python benchmarks/async_read_api.py --clients 200 --slow-clients 50 --seconds 10
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+sys.path.insert(0, BACKEND)
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def seed(tasks):
+    """Crea el usuario, el proyecto y las tareas; devuelve (token, project_id)"""
+    from app import create_app
+    app = create_app('testing')
+    client = app.test_client()
+
+    response = client.post('/api/auth/register', json={
+        'name': 'Benchmark', 'email': 'bench@example.com', 'password': 'benchmark'
+    })
+    token = response.get_json()['access_token']
+    headers = {'Authorization': f'Bearer {token}'}
+    response = client.post('/api/projects/', json={
+        'name': 'Benchmark', 'start_date': '2024-01-01', 'end_date': '2024-12-31'
+    }, headers=headers)
+    project_id = response.get_json()['project']['id']
+    client.post(f'/api/tasks/{project_id}/tasks/bulk', json={'tasks': [
+        {'name': f'Tarea {i}', 'start_date': '2024-01-01', 'end_date': f'2024-06-{1 + i % 28:02d}'}
+        for i in range(tasks)
+    ]}, headers=headers)
+    return token, project_id
+
+async def fetch(port, path, token, slow_seconds):
+    """Hace una solicitud HTTP/1.1; si slow_seconds > 0 la envía de a poco"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    request = (f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nAuthorization: Bearer {token}\r\n'
+               f'Connection: close\r\n\r\n').encode()
+    try:
+        if slow_seconds:
+            chunks = 10
+            size = -(-len(request) // chunks)
+            for offset in range(0, len(request), size):
+                writer.write(request[offset:offset + size])
+                await writer.drain()
+                await asyncio.sleep(slow_seconds / chunks)
+        else:
+            writer.write(request)
+            await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+
+async def drive(port, path, token, clients, slow_clients, slow_seconds, seconds):
+    """Ejecuta los clientes durante seconds y devuelve latencias y errores de los rápidos"""
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + seconds
+
+    async def client(slow):
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                ok = await fetch(port, path, token, slow_seconds if slow else 0) == 200
+            except (OSError, ValueError, IndexError):
+                ok = False
+            if slow:
+                continue
+            if ok:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors += 1
+
+    await asyncio.gather(*[client(index < slow_clients) for index in range(clients)])
+    return latencies, errors
+
+def wait_until_ready(port, process, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError('El servidor terminó al iniciar')
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError('El servidor no respondió a tiempo')
+
+def run(name, command, env, args, token, path):
+    port = free_port()
+    process = subprocess.Popen([part.format(port=port) for part in command], cwd=BACKEND, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_ready(port, process)
+        latencies, errors = asyncio.run(drive(port, path, token, args.clients, args.slow_clients,
+                                              args.slow_ms / 1000, args.seconds))
+    finally:
+        process.terminate()
+        process.wait()
+
+    print(f'{name}')
+    print(f'  {len(latencies) / args.seconds:8.1f} req/s'
+          f'  p50 {statistics.median(latencies) * 1000 if latencies else 0:7.1f} ms'
+          f'  p95 {percentile(latencies, 0.95) * 1000:7.1f} ms'
+          f'  errores {errors}')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=200)
+    parser.add_argument('--slow-clients', type=int, default=50)
+    parser.add_argument('--slow-ms', type=float, default=500)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--tasks', type=int, default=2000)
+    parser.add_argument('--wsgi-workers', type=int, default=4)
+    parser.add_argument('--asgi-workers', type=int, default=1)
+    parser.add_argument('--path', default='/api/tasks/{project_id}/tasks?limit=50')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(directory, 'bench.db')}", APP_CONFIG='testing')
+    os.environ.update(env)
+    token, project_id = seed(args.tasks)
+    path = args.path.format(project_id=project_id)
+
+    print(f'{args.clients} clientes ({args.slow_clients} lentos, {args.slow_ms:.0f} ms), '
+          f'{args.seconds:.0f} s, GET {path}')
+    run(f'WSGI (gunicorn, {args.wsgi_workers} workers sync)',
+        [sys.executable, '-m', 'gunicorn', '-w', str(args.wsgi_workers), '-b', '127.0.0.1:{port}',
+         "app:create_app('testing')"], env, args, token, path)
+    run(f'ASGI (uvicorn, {args.asgi_workers} workers)',
+        [sys.executable, '-m', 'uvicorn', '--workers', str(args.asgi_workers), '--port', '{port}',
+         '--log-level', 'warning', 'asgi:app'], env, args, token, path)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark de lecturas y escrituras concurrentes sobre SQLite en archivo,
+comparando el motor sin ajustes (journal por defecto, sin PRAGMAs) con los
+PRAGMAs de Config.SQLITE_PRAGMAS (WAL, synchronous=NORMAL, mmap, caché y
+busy_timeout).
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/db_concurrency.py --readers 8 --writers 2 --seconds 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from config import config, TestingConfig
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def run(name, pragmas, readers, writers, seconds, tasks):
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'bench.db')
+
+    # Una configuración por corrida: cada una con su archivo y sus PRAGMAs
+    config[name] = type(name, (TestingConfig,), {
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}',
+        'SQLITE_PRAGMAS': pragmas
+    })
+
+    from app import create_app
+    app = create_app(name)
+    client = app.test_client()
+
+    response = client.post('/api/auth/register', json={
+        'name': 'Benchmark', 'email': 'bench@example.com', 'password': 'benchmark'
+    })
+    headers = {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+    response = client.post('/api/projects/', json={
+        'name': 'Benchmark', 'start_date': '2024-01-01', 'end_date': '2024-12-31'
+    }, headers=headers)
+    project_id = response.get_json()['project']['id']
+    response = client.post(f'/api/tasks/{project_id}/tasks/bulk', json={'tasks': [
+        {'name': f'Tarea {i}', 'start_date': '2024-01-01', 'end_date': '2024-06-30'}
+        for i in range(tasks)
+    ]}, headers=headers)
+    task_ids = [result['id'] for result in response.get_json()['results']]
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    latencies = {'read': [], 'write': []}
+    errors = {'read': 0, 'write': 0}
+
+    def record(kind, started, ok):
+        with lock:
+            if ok:
+                latencies[kind].append(time.perf_counter() - started)
+            else:
+                errors[kind] += 1
+
+    def reader():
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                response = client.get(f'/api/tasks/{project_id}/tasks?limit=50', headers=headers)
+                ok = response.status_code == 200
+            except Exception:
+                ok = False
+            record('read', started, ok)
+
+    def writer(offset):
+        counter = offset
+        while not stop.is_set():
+            counter += 1
+            task_id = task_ids[counter % len(task_ids)]
+            started = time.perf_counter()
+            try:
+                response = client.put(f'/api/tasks/tasks/{task_id}', json={'progress': counter % 100},
+                                      headers=headers)
+                ok = response.status_code == 200
+            except Exception:
+                ok = False
+            record('write', started, ok)
+
+    pool = [threading.Thread(target=reader) for _ in range(readers)]
+    pool += [threading.Thread(target=writer, args=(index * 1000,)) for index in range(writers)]
+    for thread in pool:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in pool:
+        thread.join()
+
+    with app.app_context():
+        from models import db
+        journal = db.session.execute(db.text('PRAGMA journal_mode')).scalar()
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+    print(f'{name} (journal_mode={journal})')
+    for kind in ('read', 'write'):
+        values = latencies[kind]
+        print(f'  {kind:5}: {len(values) / seconds:8.1f} ops/s'
+              f'  p50 {statistics.median(values) * 1000 if values else 0:7.2f} ms'
+              f'  p95 {percentile(values, 0.95) * 1000:7.2f} ms'
+              f'  errores {errors[kind]}')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--tasks', type=int, default=500)
+    args = parser.parse_args()
+
+    run('sin_ajustes', {}, args.readers, args.writers, args.seconds, args.tasks)
+    run('ajustado', TestingConfig.SQLITE_PRAGMAS, args.readers, args.writers, args.seconds, args.tasks)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark de serialización de listados de tareas, comparando el camino ORM
+(instancias de Task, to_dict() y el módulo json estándar) con el camino por
+columnas (filas de SerializationService.task_query() codificadas con orjson,
+o con json estándar si orjson no está instalado).
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/json_serialization.py --tasks 50000 --repeat 5
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+from app import create_app
+from models import db, User, Project, Participant, Task
+from services import SerializationService
+
+def seed(tasks):
+    user = User(name='Benchmark', email='bench@example.com')
+    user.set_password('benchmark')
+    db.session.add(user)
+    db.session.flush()
+
+    project = Project(name='Benchmark', start_date=date(2024, 1, 1), end_date=date(2024, 12, 31), user_id=user.id)
+    db.session.add(project)
+    db.session.flush()
+
+    participants = [Participant(project_id=project.id, name=f'Participante {i}', role='collaborator')
+                    for i in range(20)]
+    db.session.add_all(participants)
+    db.session.flush()
+
+    db.session.execute(Task.__table__.insert(), [{
+        'project_id': project.id,
+        'name': f'Tarea {i}',
+        'description': 'Descripción de la tarea',
+        'start_date': date(2024, 1, 1 + i % 28),
+        'end_date': date(2024, 6, 1 + i % 28),
+        'progress': i % 101,
+        'budget': float(i % 1000),
+        'assignee_id': participants[i % len(participants)].id,
+        'completed': i % 7 == 0
+    } for i in range(tasks)])
+    db.session.commit()
+    return project.id
+
+def orm_path(project_id):
+    tasks = Task.query.filter_by(project_id=project_id).order_by(Task.id).all()
+    return json.dumps(SerializationService.serialize_tasks(tasks), default=str).encode()
+
+def column_path(app, project_id):
+    rows = SerializationService.task_query().filter(Task.project_id == project_id).order_by(Task.id).all()
+    return app.json.dumps(SerializationService.serialize_task_rows(rows)).encode()
+
+def measure(name, fn, repeat):
+    timings = []
+    body = b''
+    for _ in range(repeat):
+        db.session.expunge_all()
+        started = time.perf_counter()
+        body = fn()
+        timings.append(time.perf_counter() - started)
+    print(f'  {name:10}: mediana {statistics.median(timings) * 1000:8.1f} ms'
+          f'  mínimo {min(timings) * 1000:8.1f} ms  ({len(body) / 1024:.0f} KiB)')
+    return body
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app('testing')
+    with app.app_context():
+        project_id = seed(args.tasks)
+        encoder = 'orjson' if app.json.use_orjson else 'json'
+        print(f'{args.tasks} tareas, {args.repeat} repeticiones')
+        orm_body = measure('orm', lambda: orm_path(project_id), args.repeat)
+        column_body = measure(f'columnas ({encoder})', lambda: column_path(app, project_id), args.repeat)
+        print('  resultados equivalentes:', json.loads(orm_body) == json.loads(column_body))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark de inicio de sesión: logins por segundo y latencia de /api/auth/me
+mientras hay logins concurrentes, para cada modo del hasher de contraseñas.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/login_throughput.py --logins 200 --threads 8
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from app import create_app
+from utils.password_hasher import init_password_hasher
+
+def run(executor, method, logins, threads, workers):
+    app = create_app('testing')
+    app.config.update(PASSWORD_HASH_METHOD=method, PASSWORD_HASH_EXECUTOR=executor,
+                      PASSWORD_HASH_WORKERS=workers, PASSWORD_HASH_MAX_PENDING=logins)
+    init_password_hasher(app)
+    client = app.test_client()
+
+    response = client.post('/api/auth/register', json={
+        'name': 'Benchmark', 'email': 'bench@example.com', 'password': 'benchmark'
+    })
+    token = response.get_json()['access_token']
+
+    remaining = iter(range(logins))
+    lock = threading.Lock()
+    busy = []
+    me_latencies = []
+    done = threading.Event()
+
+    def login_worker():
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    return
+            response = client.post('/api/auth/login', json={
+                'email': 'bench@example.com', 'password': 'benchmark'
+            })
+            if response.status_code == 503:
+                busy.append(1)
+
+    def me_worker():
+        while not done.is_set():
+            start = time.perf_counter()
+            client.get('/api/auth/me', headers={'Authorization': f'Bearer {token}'})
+            me_latencies.append(time.perf_counter() - start)
+
+    probe = threading.Thread(target=me_worker)
+    probe.start()
+    start = time.perf_counter()
+    pool = [threading.Thread(target=login_worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    done.set()
+    probe.join()
+
+    app.extensions['password_hasher'].shutdown()
+    p95 = statistics.quantiles(me_latencies, n=20)[-1] * 1000 if len(me_latencies) > 1 else 0
+    return logins / elapsed, p95, len(busy)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+    parser.add_argument('--method', default='pbkdf2:sha256:600000')
+    parser.add_argument('--executors', default='inline,thread,process')
+    args = parser.parse_args()
+
+    print(f'método={args.method} logins={args.logins} hilos={args.threads} workers={args.workers}')
+    print(f"{'executor':<10}{'logins/s':>12}{'p95 /me (ms)':>16}{'503':>8}")
+    for executor in args.executors.split(','):
+        rate, p95, busy = run(executor, args.method, args.logins, args.threads, args.workers)
+        print(f'{executor:<10}{rate:>12.1f}{p95:>16.1f}{busy:>8}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,287 @@
+"""
+Generador de datos sintéticos para los benchmarks
+
+Crea (o recrea) una base SQLite migrada con volúmenes realistas usando
+inserciones masivas de SQLAlchemy Core. Con los valores por defecto:
+10.000 usuarios, 100.000 proyectos y, en promedio por proyecto, 5
+participantes, 12 tareas, 8 subtareas, 4 hitos y 3 dependencias (unos 2
+millones de tareas y subtareas). Los acumulados de progreso se calculan al
+generar, como los mantendría la app.
+
+El usuario BENCH_EMAIL / BENCH_PASSWORD es dueño de proyectos comunes y de
+un proyecto grande (--large-tasks tareas), que usa api_latency.py. Las
+fechas se generan alrededor de --today para que haya tareas vencidas e
+hitos próximos. La misma semilla produce siempre los mismos datos.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/seed_data.py --database /tmp/bench.db
+    python benchmarks/seed_data.py --database /tmp/small.db --scale 0.01
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+BACKEND = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+
+BENCH_EMAIL = 'bench@example.com'
+BENCH_PASSWORD = 'benchmark'
+
+ROLES = ('administrator', 'collaborator', 'external')
+WORDS = ('Diseño', 'Análisis', 'Pruebas', 'Despliegue', 'Revisión', 'Compras', 'Obra', 'Informe',
+         'Migración', 'Capacitación', 'Integración', 'Documentación', 'Auditoría', 'Soporte')
+
+class Seeder:
+    """Genera las filas y las inserta por lotes"""
+
+    def __init__(self, connection, tables, rng, today, chunk_size):
+        self.connection = connection
+        self.tables = tables
+        self.rng = rng
+        self.today = today
+        self.created_at = datetime.combine(today, datetime.min.time())
+        self.chunk_size = chunk_size
+        self.buffers = {name: [] for name in tables}
+        self.counts = {name: 0 for name in tables}
+        self.next_id = {name: 1 for name in tables}
+
+    def add(self, table, row):
+        """Agrega una fila con un ID explícito y devuelve el ID"""
+        row['id'] = self.next_id[table]
+        self.next_id[table] += 1
+        buffer = self.buffers[table]
+        buffer.append(row)
+        if len(buffer) >= self.chunk_size:
+            self.flush(table)
+        return row['id']
+
+    def flush(self, table=None):
+        for name in ([table] if table else self.tables):
+            buffer = self.buffers[name]
+            if buffer:
+                self.connection.execute(self.tables[name].insert(), buffer)
+                self.counts[name] += len(buffer)
+                buffer.clear()
+
+    def around(self, count):
+        """Cantidad aleatoria con promedio count (entre la mitad y 1,5 veces)"""
+        return self.rng.randint(count // 2, count + count // 2) if count else 0
+
+    def name(self, prefix, index):
+        return f'{prefix} {self.rng.choice(WORDS)} {index}'
+
+    def user(self, index, password_hash, email=None):
+        return self.add('users', {
+            'name': f'Usuario {index}',
+            'email': email or f'user{index}@example.com',
+            'password_hash': password_hash,
+            'created_at': self.created_at
+        })
+
+    def project(self, user_id, index, participants, tasks, subtasks, milestones, dependencies):
+        """Genera un proyecto completo y devuelve su ID"""
+        rng = self.rng
+        start = self.today - timedelta(days=rng.randint(30, 400))
+        end = self.today + timedelta(days=rng.randint(30, 400))
+        span = (end - start).days
+
+        project = {
+            'name': self.name('Proyecto', index),
+            'description': 'Proyecto generado para benchmarks',
+            'start_date': start,
+            'end_date': end,
+            'user_id': user_id,
+            'budget': float(rng.randint(10, 500) * 1000),
+            'created_at': self.created_at,
+            'updated_at': self.created_at,
+            'version': 1
+        }
+        # El ID se asigna ahora; la fila se agrega al final con los acumulados
+        project_id = self.next_id['projects']
+        self.next_id['projects'] += 1
+
+        participant_ids = [
+            self.add('participants', {
+                'project_id': project_id,
+                'name': f'Participante {project_id}-{number}',
+                'email': f'p{project_id}-{number}@example.com',
+                'role': rng.choice(ROLES),
+                'created_at': self.created_at
+            })
+            for number in range(self.around(participants))
+        ]
+
+        task_count = self.around(tasks)
+        # Reparte las subtareas del proyecto al azar entre sus tareas
+        subtask_counts = [0] * task_count
+        for _ in range(self.around(subtasks) if task_count else 0):
+            subtask_counts[rng.randrange(task_count)] += 1
+        task_ids = []
+        tasks_progress_sum = 0
+        for number in range(task_count):
+            task_start = start + timedelta(days=rng.randint(0, span - 1))
+            task_end = min(end, task_start + timedelta(days=rng.randint(1, 60)))
+            task_days = (task_end - task_start).days
+
+            subtask_rows = []
+            for sub_number in range(subtask_counts[number]):
+                sub_start = task_start + timedelta(days=rng.randint(0, task_days))
+                progress = rng.choice((0, 0, 25, 50, 75, 100, 100))
+                subtask_rows.append({
+                    'name': self.name('Subtarea', sub_number + 1),
+                    'description': None,
+                    'start_date': sub_start,
+                    'end_date': min(task_end, sub_start + timedelta(days=rng.randint(0, 14))),
+                    'progress': progress,
+                    'budget': float(rng.randint(0, 50) * 100),
+                    'completed': progress >= 100,
+                    'created_at': self.created_at
+                })
+
+            subtasks_progress_sum = sum(row['progress'] for row in subtask_rows)
+            if subtask_rows:
+                progress = int(subtasks_progress_sum / len(subtask_rows))
+            else:
+                progress = 100 if task_end < self.today and rng.random() < 0.7 else rng.choice((0, 10, 50, 80))
+            tasks_progress_sum += progress
+
+            task_id = self.add('tasks', {
+                'project_id': project_id,
+                'name': self.name('Tarea', number + 1),
+                'description': 'Tarea generada para benchmarks' if rng.random() < 0.5 else None,
+                'start_date': task_start,
+                'end_date': task_end,
+                'progress': progress,
+                'budget': float(rng.randint(0, 200) * 100),
+                'assignee_id': rng.choice(participant_ids) if participant_ids and rng.random() < 0.8 else None,
+                'completed': progress >= 100,
+                'created_at': self.created_at,
+                'subtasks_progress_sum': subtasks_progress_sum,
+                'subtasks_count': len(subtask_rows)
+            })
+            task_ids.append(task_id)
+            for row in subtask_rows:
+                row['task_id'] = task_id
+                self.add('subtasks', row)
+
+        for number in range(self.around(milestones)):
+            self.add('milestones', {
+                'project_id': project_id,
+                'name': self.name('Hito', number + 1),
+                'description': None,
+                'responsible_id': rng.choice(participant_ids) if participant_ids and rng.random() < 0.7 else None,
+                'date': start + timedelta(days=rng.randint(0, span)),
+                'completed': rng.random() < 0.3,
+                'created_at': self.created_at
+            })
+
+        # Solo de una tarea a otra posterior en la lista: nunca forman ciclos
+        pairs = set()
+        if len(task_ids) > 1:
+            for _ in range(min(self.around(dependencies), len(task_ids) - 1)):
+                position = rng.randrange(len(task_ids) - 1)
+                pair = (task_ids[position], task_ids[rng.randrange(position + 1, len(task_ids))])
+                if pair in pairs:
+                    continue
+                pairs.add(pair)
+                self.add('task_dependencies', {
+                    'project_id': project_id,
+                    'predecessor_id': pair[0],
+                    'successor_id': pair[1],
+                    'lag_days': rng.choice((0, 0, 1, 3)),
+                    'created_at': self.created_at
+                })
+
+        project.update({
+            'id': project_id,
+            'tasks_progress_sum': tasks_progress_sum,
+            'tasks_count': task_count,
+            'progress': int(tasks_progress_sum / task_count) if task_count else 0
+        })
+        self.buffers['projects'].append(project)
+        if len(self.buffers['projects']) >= self.chunk_size:
+            self.flush('projects')
+        return project_id
+
+def seed(path, users, projects, participants, tasks, subtasks, milestones, dependencies,
+         large_tasks, today, seed_value=1, chunk_size=20000, log=print):
+    """
+    Crea la base en path con los datos generados
+
+    Returns:
+        dict: Filas insertadas por tabla
+    """
+    if os.path.exists(path):
+        os.remove(path)
+    os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+    sys.path.insert(0, BACKEND)
+
+    from sqlalchemy import text
+    from werkzeug.security import generate_password_hash
+    from app import create_app
+    from config import config
+    from migrations import upgrade
+    from models import db
+
+    app = create_app('testing')
+    with app.app_context():
+        upgrade(db.engine)
+        tables = {name: db.metadata.tables[name] for name in
+                  ('users', 'projects', 'participants', 'tasks', 'subtasks', 'milestones', 'task_dependencies')}
+        # Mismo método de hash que en producción: el login del benchmark es realista
+        password_hash = generate_password_hash(BENCH_PASSWORD, method=config['production'].PASSWORD_HASH_METHOD)
+
+        started = time.perf_counter()
+        with db.engine.begin() as connection:
+            connection.execute(text('PRAGMA synchronous=OFF'))
+            seeder = Seeder(connection, tables, random.Random(seed_value), today, chunk_size)
+
+            bench_user = seeder.user(1, password_hash, BENCH_EMAIL)
+            seeder.project(bench_user, 1, participants, large_tasks, large_tasks, large_tasks // 10,
+                           large_tasks // 4)
+            for index in range(2, users + 1):
+                seeder.user(index, password_hash)
+
+            for index in range(2, projects + 1):
+                # El usuario del benchmark tiene tantos proyectos como el promedio
+                seeder.project(1 + (index - 1) % users, index, participants, tasks, subtasks, milestones,
+                               dependencies)
+                if index % 10000 == 0:
+                    log(f'  {index} proyectos ({time.perf_counter() - started:.0f} s)')
+            seeder.flush()
+
+        db.session.remove()
+        with db.engine.connect() as connection:
+            connection.execute(text('ANALYZE'))
+        db.engine.dispose()
+
+    log(f'Datos generados en {time.perf_counter() - started:.1f} s')
+    return seeder.counts
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database', required=True, help='Ruta del archivo SQLite (se reemplaza)')
+    parser.add_argument('--scale', type=float, default=1.0, help='Factor para usuarios y proyectos')
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--projects', type=int, default=100000)
+    parser.add_argument('--participants', type=int, default=5, help='Promedio por proyecto')
+    parser.add_argument('--tasks', type=int, default=12, help='Promedio por proyecto')
+    parser.add_argument('--subtasks', type=int, default=8, help='Promedio por proyecto')
+    parser.add_argument('--milestones', type=int, default=4, help='Promedio por proyecto')
+    parser.add_argument('--dependencies', type=int, default=3, help='Promedio por proyecto')
+    parser.add_argument('--large-tasks', type=int, default=5000, help='Tareas del proyecto grande')
+    parser.add_argument('--today', type=date.fromisoformat, default=date.today())
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    users = max(1, int(args.users * args.scale))
+    projects = max(1, int(args.projects * args.scale))
+    counts = seed(args.database, users, projects, args.participants, args.tasks, args.subtasks,
+                  args.milestones, args.dependencies, args.large_tasks, args.today, args.seed)
+    for table, rows in counts.items():
+        print(f'  {table:<18}{rows:>10}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark del arranque de la aplicación WSGI
+
+Cada medición se hace en un proceso nuevo (como un worker recién creado):
+    - import: tiempo de importar app.py
+    - create_app: tiempo de la fábrica con SCHEMA_ON_STARTUP='create'
+      (create_all) frente a 'check' (solo lectura del esquema)
+    - primera solicitud: latencia del primer GET autenticado con y sin
+      WARMUP_ON_STARTUP, y la de una segunda solicitud como referencia
+
+Usa una base SQLite en archivo ya migrada. Uso (desde la raíz del repositorio):
+    python benchmarks/startup_time.py --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+
+# Se ejecuta en un proceso nuevo por medición; imprime los tiempos en JSON
+PROBE = '''
+import json, sys, time
+started = time.perf_counter()
+from app import create_app
+from config import config
+imported = time.perf_counter()
+
+schema, warmup = sys.argv[1], sys.argv[2] == '1'
+class Probe(config['testing']):
+    SCHEMA_ON_STARTUP = schema
+    WARMUP_ON_STARTUP = warmup
+config['probe'] = Probe
+app = create_app('probe')
+created = time.perf_counter()
+
+from flask_jwt_extended import create_access_token
+with app.app_context():
+    headers = {'Authorization': 'Bearer ' + create_access_token(identity=1)}
+client = app.test_client()
+timings = []
+for _ in range(2):
+    before = time.perf_counter()
+    assert client.get('/api/tasks/1/tasks?limit=50', headers=headers).status_code == 200
+    timings.append(time.perf_counter() - before)
+
+print(json.dumps({'import': imported - started, 'create_app': created - imported,
+                  'first_request': timings[0], 'second_request': timings[1]}))
+'''
+
+def prepare(database_url):
+    """Crea la base migrada con un usuario, un proyecto y algunas tareas"""
+    script = '''
+from app import create_app
+from migrations import upgrade
+from models import db, User, Project, Task
+from datetime import date
+app = create_app('testing')
+with app.app_context():
+    upgrade(db.engine)
+    user = User(name='Benchmark', email='bench@example.com')
+    user.set_password('benchmark')
+    db.session.add(user)
+    db.session.flush()
+    project = Project(name='Benchmark', start_date=date(2024, 1, 1), end_date=date(2024, 12, 31), user_id=user.id)
+    db.session.add(project)
+    db.session.flush()
+    db.session.add_all([Task(name=f'Tarea {i}', project_id=project.id, start_date=date(2024, 1, 1),
+                             end_date=date(2024, 6, 1 + i % 28)) for i in range(200)])
+    db.session.commit()
+'''
+    subprocess.run([sys.executable, '-c', script], cwd=BACKEND, check=True,
+                   env=dict(os.environ, DATABASE_URL=database_url))
+
+def measure(database_url, schema, warmup, runs):
+    env = dict(os.environ, DATABASE_URL=database_url)
+    results = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', PROBE, schema, '1' if warmup else '0'],
+                                cwd=BACKEND, env=env, check=True, capture_output=True, text=True).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return {key: statistics.median(result[key] for result in results) for key in results[0]}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'startup.db')}"
+    prepare(database_url)
+
+    print(f'Mediana de {args.runs} procesos (ms)')
+    print(f'{"configuración":<24}{"import":>9}{"create_app":>12}{"1ª solicitud":>14}{"2ª solicitud":>14}')
+    for schema, warmup in (('create', False), ('check', False), ('check', True)):
+        timings = measure(database_url, schema, warmup, args.runs)
+        label = f'{schema}{" + warmup" if warmup else ""}'
+        print(f'{label:<24}{timings["import"] * 1000:9.1f}{timings["create_app"] * 1000:12.1f}'
+              f'{timings["first_request"] * 1000:14.1f}{timings["second_request"] * 1000:14.1f}')
+
+if __name__ == '__main__':
+    main()